@@ -1,5 +1,6 @@
 # coding: utf-8
 
+import os
 import sys
 import traceback
 
@@ -11,8 +12,12 @@ log = create_logger()
 # python 3 check
 is_python_3 = (sys.version_info[0] == 3)
 
+# null loader (headless sessions, see mikan.null)
+if os.environ.get('MIKAN_BACKEND') == 'null':
+    from ..null import *
+
 # maya loader
-if 'maya' in sys.executable or 'Maya' in sys.executable:
+elif 'maya' in sys.executable or 'Maya' in sys.executable:
     try:
         import maya.cmds as mc
         from ..maya import *
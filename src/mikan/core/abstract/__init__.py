@@ -6,3 +6,5 @@ from .template import *
 from .mod import *
 from .deformer import *
 from .asset import *
+from .scheduler import *
+from .buildstate import *
@@ -0,0 +1,280 @@
+# coding: utf-8
+
+"""Abstract Build State Module.
+
+This module provides the fingerprints used by incremental builds. The inputs
+of each template (options, names, guide nodes and their mod/deformer
+sections) are hashed after each build and compared on the next one, so that
+only the templates whose inputs changed are torn down and built again.
+
+The module supports:
+    - Fingerprinting template inputs, chained with their parent template
+    - Extracting the templates referenced by ID tags in section text
+    - Propagating changes to child and referencing templates
+    - Tracking sections stored outside of the templates
+    - Serialization of the state on the asset node
+
+Classes:
+    BuildState: Fingerprints of the inputs of an asset build.
+
+Examples:
+    Finding the templates to rebuild:
+        >>> state = BuildState(modes=['maya'])
+        >>> state.add_template('spine', None, {'opts': {'bones': 4}})
+        >>> state.add_template('arm', 'spine', {'opts': {'twist': True}}, 'target: spine::ctrls.chest')
+        >>> previous = BuildState.decode(data)  # stored by the previous build
+        >>> dirty, removed = state.get_dirty(previous)
+"""
+
+import re
+import json
+import hashlib
+
+from mikan.core.utils import ordered_dict
+from mikan.core.logger import create_logger
+
+__all__ = ['BuildState']
+
+log = create_logger()
+
+
+class BuildState(object):
+    """Fingerprints of the inputs of an asset build.
+
+    Each template fingerprint hashes the template inputs together with the
+    fingerprint of its parent template, so that editing a template also
+    changes the fingerprints of its child templates. Templates referencing
+    the ID tags of a changed template (in their sections or options) are
+    marked dirty as well when comparing two states.
+
+    Only fingerprints are serialized, references and parents are computed
+    again on each build.
+
+    Attributes:
+        version (int): Version of the serialized format.
+        WILDCARD (str): Reference to every template.
+        modes (list): Sorted build modes.
+        release (str): Version of the framework that made the build.
+        templates (OrderedDict): Fingerprints of the templates, by name.
+        sections (OrderedDict): Fingerprints of the sections stored outside
+            of the templates, by node path.
+        parents (dict): Parent template name of each template.
+        references (dict): Sets of referenced template names, by template
+            name or section node path.
+        mod_references (dict): Sets of template names referenced by the mod
+            sections of each template.
+    """
+
+    version = 1
+    WILDCARD = '*'
+
+    re_tag = re.compile(r'([\w.*]+)::')
+
+    def __init__(self, modes=None, release=None):
+        """Initialize an empty BuildState.
+
+        Args:
+            modes (iterable, optional): Build modes.
+            release (str, optional): Version of the framework.
+        """
+        self.modes = sorted(modes or ())
+        self.release = release
+        self.templates = ordered_dict()
+        self.sections = ordered_dict()
+        self.parents = {}
+        self.references = {}
+        self.mod_references = {}
+
+    @staticmethod
+    def get_fingerprint(*data):
+        """Hash build inputs.
+
+        Args:
+            *data: JSON serializable data (other objects are hashed from
+                their string representation).
+
+        Returns:
+            str: Hash of the data.
+        """
+        raw = json.dumps(data, sort_keys=True, default=str, separators=(',', ':'))
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def get_references(text):
+        """Get the templates referenced by the ID tags of a text.
+
+        Args:
+            text (str): Section text or option value.
+
+        Returns:
+            set: Referenced template names, WILDCARD if a tag matches any
+            template name.
+
+        Examples:
+            >>> BuildState.get_references('target: rig#arm.L::ctrls.ik@ry')
+            {'arm'}
+        """
+        names = set()
+        for key in BuildState.re_tag.findall(text or ''):
+            name = key.split('.')[0]
+            if '*' in name:
+                names.add(BuildState.WILDCARD)
+            elif name:
+                names.add(name)
+        return names
+
+    def add_template(self, name, parent, data, text='', references=None, mods=''):
+        """Add the fingerprint of a template.
+
+        Parent templates must be added before their children.
+
+        Args:
+            name (str): Name of the template.
+            parent (str): Name of the parent template, None for top templates.
+            data: Serializable inputs of the template.
+            text (str): Sections of the template nodes, parsed for references.
+            references (iterable, optional): Other referenced template names.
+            mods (str): Mod sections of the template nodes, parsed for the
+                templates they edit (see get_mod_references()).
+        """
+        self.templates[name] = self.get_fingerprint(data, self.templates.get(parent))
+        self.parents[name] = parent
+
+        refs = self.get_references(text)
+        if references:
+            refs.update(references)
+        refs.discard(name)
+        self.references[name] = refs
+
+        refs = self.get_references(mods)
+        refs.discard(name)
+        self.mod_references[name] = refs
+
+    def add_section(self, path, text):
+        """Add the fingerprint of sections stored outside of the templates.
+
+        Args:
+            path (str): Path of the node storing the sections.
+            text (str): Sections of the node.
+        """
+        self.sections[path] = self.get_fingerprint(text)
+        self.references[path] = self.get_references(text)
+
+    def get_dirty(self, previous):
+        """Get the templates to build again since a previous build.
+
+        Args:
+            previous (BuildState): State of the previous build.
+
+        Returns:
+            tuple: (dirty, removed) sets of template names. Dirty templates
+            are new or changed templates, their children and the templates
+            referencing them. Removed templates no longer exist.
+        """
+        dirty = set(name for name, key in self.templates.items() if previous.templates.get(name) != key)
+        removed = set(previous.templates) - set(self.templates)
+
+        changed = dirty | removed
+        while changed:
+            changed = set()
+            for name in self.templates:
+                if name in dirty:
+                    continue
+                refs = self.references.get(name, ())
+                if self.parents.get(name) in dirty or refs & (dirty | removed) or (self.WILDCARD in refs and (dirty or removed)):
+                    changed.add(name)
+            dirty |= changed
+
+        return dirty, removed
+
+    def get_mod_references(self, names):
+        """Get the other templates referenced by the mods of templates.
+
+        Mods edit the nodes they reference (attributes, connections,
+        constraints...) and are not undone by the cleanup of their template,
+        running them again on the nodes of a template kept from the previous
+        build would apply them twice.
+
+        Args:
+            names (set): Template names.
+
+        Returns:
+            set: Names of the existing templates outside of names referenced
+            by the mod sections of the templates, WILDCARD if a tag matches any
+            template name and some templates are outside of names.
+        """
+        refs = set()
+        for name in names:
+            refs.update(self.mod_references.get(name, ()))
+
+        others = set(self.templates) - set(names)
+        result = refs & others
+        if self.WILDCARD in refs and others:
+            result.add(self.WILDCARD)
+        return result
+
+    def get_changed_sections(self, previous):
+        """Get the sections outside of the templates changed since a previous build.
+
+        Args:
+            previous (BuildState): State of the previous build.
+
+        Returns:
+            set: Paths of the nodes whose sections were added, edited or removed.
+        """
+        paths = set(path for path, key in self.sections.items() if previous.sections.get(path) != key)
+        paths.update(set(previous.sections) - set(self.sections))
+        return paths
+
+    def get_dependents(self, names):
+        """Get the sections outside of the templates referencing templates.
+
+        Args:
+            names (set): Template names.
+
+        Returns:
+            list: Paths of the nodes whose sections reference the templates.
+        """
+        paths = []
+        for path in self.sections:
+            refs = self.references.get(path, ())
+            if refs & names or (self.WILDCARD in refs and names):
+                paths.append(path)
+        return paths
+
+    def encode(self):
+        """Serialize the fingerprints of the state.
+
+        Returns:
+            str: JSON encoded state.
+        """
+        return json.dumps({
+            'version': self.version,
+            'modes': self.modes,
+            'release': self.release,
+            'templates': list(self.templates.items()),
+            'sections': list(self.sections.items()),
+        }, separators=(',', ':'))
+
+    @classmethod
+    def decode(cls, data):
+        """Load a serialized state.
+
+        Args:
+            data (str): JSON encoded state, see encode().
+
+        Returns:
+            BuildState or None: Loaded state, None if the data is invalid or
+            from another version.
+        """
+        try:
+            data = json.loads(data)
+            if data.get('version') != cls.version:
+                return
+            state = cls(modes=data['modes'], release=data['release'])
+            state.templates = ordered_dict((k, v) for k, v in data['templates'])
+            state.sections = ordered_dict((k, v) for k, v in data['sections'])
+        except Exception as e:
+            log.debug('failed to read build state: {}'.format(e))
+            return
+        return state
@@ -9,6 +9,9 @@ by different DCC applications (Maya, Tangerine, etc.).
 The module supports:
     - Deformer data serialization and deserialization
     - Weight map management with RLE compression
+    - Sparse storage of skin weights and blendshape deltas
+    - Optional binary sidecar storage of weight data
+    - Concurrent decoding of weight payloads
     - Cross-platform deformer abstraction
     - Dynamic deformer class registration via templates
 
@@ -16,6 +19,10 @@ Classes:
     Deformer: Abstract base class for deformer management.
     DeformerError: Exception raised for deformer-related errors.
     WeightMap: Container for vertex weight data with compression support.
+    WeightMatrix: Sparse storage for a set of indexed weight maps.
+    DeltaMap: Sparse storage for per-vertex point deltas.
+    WeightStore: Content-addressed binary storage for weight data.
+    WeightDecoder: Concurrent decoding of encoded weight data.
     WeightMapInterface: Interface for weight map node management.
     DeformerDumper: YAML dumper for deformer data serialization.
     DeformerLoader: YAML loader for deformer data deserialization.
@@ -37,22 +44,28 @@ Examples:
 """
 
 import re
+import mmap
 import zlib
 import yaml
 import base64
 import struct
+import hashlib
 import pkgutil
 import os.path
 import logging
 import traceback
 import itertools
+import multiprocessing
+from multiprocessing.pool import ThreadPool
 from six.moves import range
 from six import string_types
 from copy import copy, deepcopy
+from contextlib import contextmanager
 
 has_numpy = False
 try:
     import numpy as np
+    from mikan.core.lib.symmetry import get_symmetry_arrays
 
     has_numpy = True
 except ImportError:
@@ -60,15 +73,16 @@ except ImportError:
 
 from mikan.core.logger import create_logger, timed_code
 from mikan.core import is_python_3
-from mikan.core.utils import YamlDumper, YamlLoader, ordered_load, ordered_dict
+from mikan.core.utils import YamlDumper, YamlLoader, ordered_dict, yaml_manifest
 
 from .monitor import JobMonitor
+from .node import ResolveCache
 
 import mikan.templates.deformer
 
 __all__ = [
     'Deformer', 'DeformerError',
-    'WeightMap', 'WeightMapInterface',
+    'WeightMap', 'WeightMatrix', 'DeltaMap', 'WeightStore', 'WeightDecoder', 'WeightMapInterface',
     'DeformerDumper', 'DeformerLoader'
 ]
 
@@ -176,6 +190,10 @@ class Deformer(JobMonitor):
         self.data = self.get_default_data()
         self.data.update(data.get('data', {}))
 
+        maps = self.data.get('maps')
+        if isinstance(maps, dict) and isinstance(maps.get('sparse'), WeightMatrix):
+            self.set_weight_matrix(maps.pop('sparse'))
+
         # conf
         self.priority = data.get('priority', 0)
         self.decimals = data.get('decimals', self.default_decimals)
@@ -328,7 +346,8 @@ class Deformer(JobMonitor):
 
         Scans the templates.deformer package for deformer implementations,
         loads their configuration from deformer.yml files, and registers
-        them in the modules dictionary.
+        them in the modules dictionary. Parsed files are cached on disk by
+        the yaml manifest.
 
         Args:
             module: The parent module to scan for deformer packages.
@@ -348,13 +367,14 @@ class Deformer(JobMonitor):
             path = package.__path__[0] + os.path.sep + 'deformer.yml'
             if os.path.exists(path):
                 try:
-                    with open(path, 'r') as stream:
-                        package.deformer_data = ordered_load(stream)
+                    package.deformer_data = yaml_manifest.load(path)
                 except Exception as e:
                     log.error('failed to load Deformer "{}" deformer.yml: {}'.format(modname, e))
 
             cls.modules[modname] = package
 
+        yaml_manifest.save()
+
     def get_default_data(self):
         """Get default data values from deformer configuration.
 
@@ -405,6 +425,13 @@ class Deformer(JobMonitor):
         data = deepcopy(self.data)
         data.pop('transform', None)
 
+        # serialize sparse maps as a single matrix
+        matrix = self.get_weight_matrix()
+        if matrix is not None:
+            for k in matrix.keys:
+                data['maps'].pop(k, None)
+            data['maps']['sparse'] = matrix
+
         default = self.get_default_data()
         for k in list(data):
             if k in default:
@@ -479,6 +506,9 @@ class Deformer(JobMonitor):
                 self.unresolved.append('{}->shape'.format(self.transform_id))
                 return Deformer.STATUS_DELAY
 
+        # deformer stacks change, drop the cached geometry tags
+        ResolveCache.notify_geometry()
+
         # bind
         try:
             if self.id:
@@ -781,6 +811,50 @@ class Deformer(JobMonitor):
         maps = [self.data['maps'][i] for i in ids]
         return ids, maps
 
+    def get_weight_matrix(self):
+        """Get the sparse matrix backing the indexed weight maps.
+
+        Returns:
+            WeightMatrix or None: The matrix viewed by every indexed map, or None
+                if the maps are dense or do not view the same matrix.
+
+        Examples:
+            >>> matrix = dfm.get_weight_matrix()
+            >>> if matrix is not None:
+            ...     print(matrix.nnz)
+        """
+        ids, maps = self.get_indexed_maps()
+        if not maps:
+            return
+
+        matrix = maps[0].matrix
+        if matrix is None or matrix.keys != ids:
+            return
+        for i, wm in zip(ids, maps):
+            if wm.matrix is not matrix or wm.matrix_key != i:
+                return
+        return matrix
+
+    def set_weight_matrix(self, matrix):
+        """Replace the indexed weight maps with views on a sparse matrix.
+
+        Lock and partition flags of the replaced maps are kept.
+
+        Args:
+            matrix (WeightMatrix): Sparse matrix of the indexed maps.
+        """
+        maps = self.data.setdefault('maps', ordered_dict())
+
+        for k in list(maps):
+            if isinstance(k, int) and k not in matrix:
+                del maps[k]
+
+        for k, wm in matrix.get_maps().items():
+            if k in maps:
+                wm.lock = maps[k].lock
+                wm.partition = maps[k].partition
+            maps[k] = wm
+
     def remap_indexed_maps(self):
         """Remap indexed maps to contiguous indices starting from 0.
 
@@ -818,6 +892,13 @@ class Deformer(JobMonitor):
             >>> dfm.normalize(only_excess=True)  # Only fix over-weighted
         """
         ids, maps = self.get_indexed_maps()
+        if not maps:
+            return
+
+        matrix = self.get_weight_matrix()
+        if matrix is not None:
+            self.set_weight_matrix(matrix.normalize(only_excess=only_excess, tolerance=tolerance))
+            return
 
         if has_numpy:
             if isinstance(maps[0].weights, np.ndarray):
@@ -858,6 +939,11 @@ class Deformer(JobMonitor):
         if not maps:
             return
 
+        matrix = self.get_weight_matrix()
+        if matrix is not None:
+            self.set_weight_matrix(matrix.round(self.decimals))
+            return
+
         if has_numpy and isinstance(maps[0].weights, np.ndarray):
             w = np.array([m.weights for m in maps], dtype=np.float32)
             r = np.round(w, self.decimals)
@@ -932,10 +1018,22 @@ class WeightMap(object):
     Stores per-vertex weight values and provides serialization using
     run-length encoding (RLE) with optional zlib compression.
 
+    A weight map can also be a view on one column of a WeightMatrix. In that
+    case the dense weights are only built the first time ``weights`` is
+    accessed, after which the map holds its own copy and is detached from
+    the matrix.
+
+    Binary payloads are decoded with NumPy as read only arrays sharing the
+    decoded buffer. Copies of the map share that array too, the weights are
+    only converted to an editable list the first time ``weights`` is
+    accessed. Use read_weights() to read them without conversion.
+
     Attributes:
         weights (list): List of weight values (float or int).
         lock (bool): Whether this weight map is locked from editing.
         partition (str): Partition identifier for weight partitioning.
+        matrix (WeightMatrix): Sparse matrix backing this map, if any.
+        matrix_key (int): Key of this map in the backing matrix.
 
     Examples:
         Creating from a list:
@@ -952,6 +1050,10 @@ class WeightMap(object):
             >>> result = wm1 + wm2  # Element-wise add
     """
 
+    matrix = None
+    matrix_key = None
+    _weights = None
+
     def __init__(self, weights, lock=False, partition=None):
         """Initialize a WeightMap.
 
@@ -964,15 +1066,80 @@ class WeightMap(object):
         if isinstance(weights, string_types):
             self.decode(weights)
         else:
-            # always copy weights when new
+            # always copy weights when new, read only arrays are shared
             if has_numpy and isinstance(weights, np.ndarray):
-                self.weights = np.copy(weights)
+                if weights.flags.writeable:
+                    weights = np.copy(weights)
+                self.weights = weights
             else:
                 self.weights = list(weights)
 
         self.lock = lock
         self.partition = partition
 
+    @classmethod
+    def from_matrix(cls, matrix, key, lock=False, partition=None):
+        """Create a weight map viewing one column of a sparse matrix.
+
+        Args:
+            matrix (WeightMatrix): Backing sparse matrix.
+            key (int): Key of the column in the matrix.
+            lock (bool): Whether to lock this weight map.
+            partition (str, optional): Partition identifier.
+
+        Returns:
+            WeightMap: Weight map view, densified on first weights access.
+        """
+        wm = cls.__new__(cls)
+        wm.matrix = matrix
+        wm.matrix_key = key
+        wm.lock = lock
+        wm.partition = partition
+        return wm
+
+    @property
+    def weights(self):
+        if self.matrix is not None:
+            self._weights = self.matrix.get_column(self.matrix_key)
+            self.matrix = None
+            self.matrix_key = None
+        elif has_numpy and isinstance(self._weights, np.ndarray) and not self._weights.flags.writeable:
+            self._weights = np.array(self._weights)
+        return self._weights
+
+    @weights.setter
+    def weights(self, weights):
+        self.matrix = None
+        self.matrix_key = None
+        self._weights = weights
+
+    def read_weights(self):
+        """Get the weight values without detaching from a backing matrix.
+
+        Returns:
+            list or np.ndarray: Weight values, not meant to be edited.
+        """
+        if self.matrix is not None:
+            return self.matrix.get_column(self.matrix_key)
+        return self._weights
+
+    def get_sparse(self):
+        """Get the non-zero weights of this map.
+
+        Returns:
+            tuple: (indices, values) of the non-zero weights.
+        """
+        if self.matrix is not None:
+            return self.matrix.get_sparse_column(self.matrix_key)
+
+        if has_numpy:
+            weights = np.asarray(self._weights, dtype=np.float32)
+            indices = np.flatnonzero(weights)
+            return indices, weights[indices]
+
+        indices = [i for i, w in enumerate(self._weights) if w]
+        return indices, [self._weights[i] for i in indices]
+
     def __getitem__(self, i):
         """Get weight value at index.
 
@@ -980,9 +1147,13 @@ class WeightMap(object):
             i (int): Vertex index.
 
         Returns:
-            float: Weight value at the index.
+            float: Weight value at the index (a Python number for array
+            weights).
         """
-        return self.weights[i]
+        value = self.read_weights()[i]
+        if has_numpy and isinstance(value, np.generic):
+            return value.item()
+        return value
 
     def __setitem__(self, i, value):
         """Set weight value at index.
@@ -993,13 +1164,26 @@ class WeightMap(object):
         """
         self.weights[i] = value
 
+    def extend(self, weights):
+        """Append weight values.
+
+        Args:
+            weights (iterable): Weight values to append.
+        """
+        if has_numpy and isinstance(self.weights, np.ndarray):
+            self.weights = np.concatenate((self.weights, np.asarray(weights, dtype=self.weights.dtype)))
+        else:
+            self.weights.extend(weights)
+
     def copy(self):
         """Create a copy of this weight map.
 
         Returns:
             WeightMap: New weight map with copied data.
         """
-        return WeightMap(self.weights, lock=self.lock, partition=self.partition)
+        if self.matrix is not None:
+            return WeightMap.from_matrix(self.matrix, self.matrix_key, lock=self.lock, partition=self.partition)
+        return WeightMap(self._weights, lock=self.lock, partition=self.partition)
 
     def encode(self, decimals=6, compress=True, max_rle_groups=16, mask=False):
         """Encode weight map to a string representation.
@@ -1020,45 +1204,37 @@ class WeightMap(object):
             >>> wm.encode()
             '1*3 0.5 0'
         """
-        wm = self.weights
-        if not mask:
-            if has_numpy:
-                wm = np.round(wm, decimals)
+        wm = self.read_weights()
+
+        if has_numpy:
+            if mask:
+                wm = np.asarray(wm)
             else:
-                wm = list(map(lambda w: round(w, decimals), wm))
+                wm = np.round(np.asarray(wm, dtype=np.float64), decimals)
+            starts, counts = self.get_runs(wm)
 
-        # check complexity
-        do_binary = False
+            # serialize
+            if compress and len(starts) > max_rle_groups:
+                raw_bin = self.to_bytes(decimals, mask=mask)
+                return base64.b64encode(zlib.compress(raw_bin, 1)).decode('ascii')
 
-        groups = []
-        groups_append = groups.append
-        for val, group in itertools.groupby(wm):
-            groups_append((val, sum(1 for _ in group)))
-            if len(groups) > max_rle_groups:
-                do_binary = True
-                break
+            rle_data = zip(wm[starts].tolist(), counts.tolist())
 
-        # serialize
-        if do_binary and compress:
-            if mask:
-                if has_numpy:
-                    raw_bin = b'msk:' + np.array(wm, dtype=np.uint8).tobytes()
-                else:
-                    wm_ints = [int(v) for v in wm]
-                    raw_bin = b'msk:' + struct.pack('<{}B'.format(len(wm)), *wm_ints)
-            else:
-                if has_numpy:
-                    raw_bin = b'f32:' + np.array(wm, dtype=np.float32).tobytes()
-                else:
-                    raw_bin = b'f32:' + struct.pack('<{}f'.format(len(wm)), *wm)
+        else:
+            if not mask:
+                wm = list(map(lambda w: round(w, decimals), wm))
 
-            return base64.b64encode(zlib.compress(raw_bin, 1)).decode('ascii')
+            # serialize
+            if compress and not self.is_rle(wm, max_rle_groups):
+                raw_bin = self.to_bytes(decimals, mask=mask)
+                return base64.b64encode(zlib.compress(raw_bin, 1)).decode('ascii')
+
+            rle_data = [
+                (val, sum(1 for _ in group))
+                for val, group in itertools.groupby(wm)
+            ]
 
         # rle encoding
-        rle_data = [
-            (val, sum(1 for _ in group))
-            for val, group in itertools.groupby(wm)
-        ]
 
         parts = []
         for val, count in rle_data:
@@ -1072,6 +1248,109 @@ class WeightMap(object):
 
         return ' '.join(parts)
 
+    @staticmethod
+    def is_rle(weights, max_rle_groups=16):
+        """Check if weights are simple enough to be run-length encoded.
+
+        Args:
+            weights (list): Weight values.
+            max_rle_groups (int): Maximum number of runs.
+
+        Returns:
+            bool: True if weights have at most max_rle_groups runs.
+        """
+        if has_numpy:
+            starts, counts = WeightMap.get_runs(weights)
+            return len(starts) <= max_rle_groups
+
+        groups = 0
+        for _ in itertools.groupby(weights):
+            groups += 1
+            if groups > max_rle_groups:
+                return False
+        return True
+
+    @staticmethod
+    def get_runs(weights):
+        """Find the runs of equal consecutive values.
+
+        Args:
+            weights (list or np.ndarray): Weight values.
+
+        Returns:
+            tuple: (starts, counts) arrays, index of the first value of each
+            run and length of the run.
+        """
+        weights = np.asarray(weights)
+        n = len(weights)
+        if not n:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+        starts = np.flatnonzero(weights[1:] != weights[:-1]) + 1
+        starts = np.concatenate(([0], starts))
+        counts = np.diff(np.append(starts, n))
+        return starts, counts
+
+    def to_bytes(self, decimals=6, mask=False):
+        """Get the binary representation of the weight map.
+
+        Args:
+            decimals (int): Number of decimal places for rounding.
+            mask (bool): Store weights as a uint8 mask instead of float32.
+
+        Returns:
+            bytes: Tagged binary weights ('f32:' or 'msk:' header).
+        """
+        wm = self.read_weights()
+
+        if mask:
+            if has_numpy:
+                return b'msk:' + np.array(wm, dtype=np.uint8).tobytes()
+            wm_ints = [int(v) for v in wm]
+            return b'msk:' + struct.pack('<{}B'.format(len(wm)), *wm_ints)
+
+        if has_numpy:
+            return b'f32:' + np.round(np.array(wm, dtype=np.float64), decimals).astype(np.float32).tobytes()
+        wm = [round(w, decimals) for w in wm]
+        return b'f32:' + struct.pack('<{}f'.format(len(wm)), *wm)
+
+    def from_bytes(self, raw_data):
+        """Load weights from their binary representation.
+
+        Args:
+            raw_data (bytes): Tagged binary weights, see to_bytes().
+
+        Returns:
+            bool: True if the data was recognized and loaded.
+
+        With NumPy the weights are a read only array sharing the memory of
+        raw_data, see weights.
+        """
+        header = bytes(raw_data[:4])
+
+        # float32
+        if header == b'f32:':
+            count = (len(raw_data) - 4) // 4
+            if has_numpy:
+                self.weights = np.frombuffer(raw_data, dtype='<f4', count=count, offset=4)
+                self._weights.flags.writeable = False
+                return True
+            self.weights = list(struct.unpack_from('<{}f'.format(count), raw_data, 4))
+            return True
+
+        # mask
+        elif header == b'msk:':
+            count = len(raw_data) - 4
+            if has_numpy:
+                self.weights = np.frombuffer(raw_data, dtype=np.uint8, count=count, offset=4)
+                self._weights.flags.writeable = False
+                return True
+            unpacked = struct.unpack_from('<{}B'.format(count), raw_data, 4)
+            self.weights = [int(v) for v in unpacked]
+            return True
+
+        return False
+
     def decode(self, data):
         """Decode weight map from a string representation.
 
@@ -1098,24 +1377,11 @@ class WeightMap(object):
                 pass
 
         if raw_data:
-            # float32
-            if raw_data.startswith(b'f32:'):
-                payload = raw_data[4:]
-                count = len(payload) // 4
-                self.weights = list(struct.unpack('<{}f'.format(count), payload))
-                return
-
-            # mask
-            elif raw_data.startswith(b'msk:'):
-                payload = raw_data[4:]
-                count = len(payload)
-                unpacked = struct.unpack('<{}B'.format(count), payload)
-                self.weights = [int(v) for v in unpacked]
+            if self.from_bytes(raw_data):
                 return
 
             # legacy RLE
-            else:
-                raw_data = raw_data.decode('ascii')
+            raw_data = raw_data.decode('ascii')
         else:
             # RLE
             raw_data = data
@@ -1138,6 +1404,15 @@ class WeightMap(object):
 
         Scales all weights so the maximum becomes 1.0.
         """
+        if has_numpy:
+            weights = self.weights
+            if isinstance(weights, np.ndarray):
+                np.multiply(weights, 1. / weights.max(), out=weights, casting='unsafe')
+            else:
+                _weights = np.asarray(weights)
+                weights[:] = (_weights * (1. / _weights.max())).tolist()
+            return
+
         f = 1. / max(self.weights)
         for i in range(len(self.weights)):
             self.weights[i] *= f
@@ -1149,6 +1424,18 @@ class WeightMap(object):
             sym (dict): Symmetry mapping with direction keys.
             direction (int): Direction of mirror (1 or -1).
         """
+        if has_numpy:
+            src, dst = get_symmetry_arrays(sym, direction)
+            weights = self.weights
+            if isinstance(weights, np.ndarray):
+                weights[dst] = weights[src]
+            else:
+                # permute the list items to keep their type (int masks)
+                order = np.arange(len(weights))
+                order[dst] = src
+                weights[:] = [weights[i] for i in order.tolist()]
+            return
+
         for i in sym[direction]:
             j = sym[direction][i]
             self.weights[j] = self.weights[i]
@@ -1159,6 +1446,18 @@ class WeightMap(object):
         Args:
             sym (dict): Symmetry mapping.
         """
+        if has_numpy:
+            src, dst = get_symmetry_arrays(sym, 1)
+            weights = self.weights
+            if isinstance(weights, np.ndarray):
+                weights[src], weights[dst] = weights[dst], weights[src]
+            else:
+                # permute the list items to keep their type (int masks)
+                order = np.arange(len(weights))
+                order[src], order[dst] = dst, src
+                weights[:] = [weights[i] for i in order.tolist()]
+            return
+
         for i in sym[1]:
             j = sym[1][i]
             self.weights[i], self.weights[j] = self.weights[j], self.weights[i]
@@ -1169,7 +1468,9 @@ class WeightMap(object):
         Returns:
             int: Number of weight values.
         """
-        return len(self.weights)
+        if self.matrix is not None:
+            return len(self.matrix)
+        return len(self._weights)
 
     def __mul__(self, other):
         """Multiply weights element-wise.
@@ -1183,6 +1484,9 @@ class WeightMap(object):
         Raises:
             RuntimeError: If weight maps have different lengths.
         """
+        if has_numpy:
+            return self._operate(other, np.multiply)
+
         new = self.copy()
         if isinstance(other, WeightMap):
             if len(self) != len(other):
@@ -1207,6 +1511,9 @@ class WeightMap(object):
         Raises:
             RuntimeError: If weight maps have different lengths.
         """
+        if has_numpy:
+            return self._operate(other, np.add)
+
         new = self.copy()
         if isinstance(other, WeightMap):
             if len(self) != len(other):
@@ -1231,6 +1538,9 @@ class WeightMap(object):
         Raises:
             RuntimeError: If weight maps have different lengths.
         """
+        if has_numpy:
+            return self._operate(other, np.subtract)
+
         new = self.copy()
         if isinstance(other, WeightMap):
             if len(self) != len(other):
@@ -1243,86 +1553,1494 @@ class WeightMap(object):
                 new[i] -= other
         return new
 
+    def _operate(self, other, ufunc):
+        """Apply an element-wise NumPy operation to a copy of this map.
 
-class WeightMapInterface(object):
-    """Interface for managing weight map nodes in DCC applications.
+        Editable arrays keep their dtype, like the in-place operators of the
+        list fallback. Other weights are computed in double precision (or as
+        integers).
+
+        Args:
+            other (WeightMap or float): Second operand.
+            ufunc (np.ufunc): Binary operation.
+
+        Returns:
+            WeightMap: New weight map with the result.
+        """
+        if isinstance(other, WeightMap):
+            if len(self) != len(other):
+                raise RuntimeError('weightmaps are different')
+            other = np.asarray(other.read_weights())
+        elif not isinstance(other, (int, float)):
+            return self.copy()
+
+        weights = self.read_weights()
+        if isinstance(weights, np.ndarray) and weights.flags.writeable:
+            weights = np.copy(weights)
+            ufunc(weights, other, out=weights, casting='unsafe')
+        else:
+            weights = np.asarray(weights)
+            if weights.dtype.kind == 'f':
+                weights = weights.astype(np.float64)
+            elif weights.dtype.kind in 'biu':
+                weights = weights.astype(np.int64)
+            weights = ufunc(weights, other)
+
+        new = self.copy()
+        new.weights = weights
+        return new
 
-    Wraps a WeightMap with additional metadata and tracks modifications.
+
+class WeightMatrix(object):
+    """Sparse storage for a set of indexed weight maps.
+
+    Stores the weights of several maps sharing the same vertices (such as
+    skin influences) in a compressed sparse row layout: for each vertex, only
+    the (map, weight) pairs with a non-zero weight are kept. Dense weights are
+    only built on demand, per column with get_column() or for the whole matrix
+    with to_flat() and to_dense().
+
+    Matrices are never edited in place: operations like normalize() and round()
+    return a new matrix, so weight maps viewing a matrix stay valid.
 
     Attributes:
-        weightmap (WeightMap): The underlying weight map data.
-        data (dict): Additional metadata (name, node reference, etc.).
-        modified (bool): Whether the weight map has been modified.
+        keys (list): Sorted keys of the stored maps (e.g. influence indices).
+        size (int): Number of vertices.
+        indptr: Offsets of the weights of each vertex (size + 1 values).
+        indices: Column (position in keys) of each stored weight.
+        values: Stored weight values.
 
     Examples:
-        >>> wmi = WeightMapInterface(WeightMap([1.0, 0.5, 0.0]), name='mask')
-        >>> wmi.weightmap[0] = 0.8
-        >>> wmi.modified = True
+        Building a matrix from dense influence maps:
+            >>> wmx = WeightMatrix.from_dense([0, 1], [[1, 0.5, 0], [0, 0.5, 1]])
+            >>> wmx.nnz
+            4
+            >>> [float(w) for w in wmx.get_column(1)]
+            [0.0, 0.5, 1.0]
+
+        Viewing the matrix as weight maps:
+            >>> maps = wmx.get_maps()
+            >>> len(maps[0])
+            3
     """
 
-    def __init__(self, wm, **data):
-        """Initialize a WeightMapInterface.
+    def __init__(self, keys, size, indptr=None, indices=None, values=None):
+        """Initialize a WeightMatrix.
 
         Args:
-            wm (WeightMap): The weight map to wrap.
-            **data: Additional metadata to store.
+            keys (list): Sorted keys of the stored maps.
+            size (int): Number of vertices.
+            indptr (list, optional): Offsets of the weights of each vertex.
+            indices (list, optional): Column of each stored weight.
+            values (list, optional): Stored weight values.
         """
-        self.weightmap = wm
-        self.data = data
+        self.keys = list(keys)
+        self.size = size
 
-        self.modified = False
+        if indptr is None:
+            indptr = [0] * (size + 1)
+            indices = []
+            values = []
 
-    def get_node(self):
-        """Get the DCC node associated with this weight map.
+        if has_numpy:
+            self.indptr = np.asarray(indptr, dtype=np.int64)
+            self.indices = np.asarray(indices, dtype=np.int32)
+            self.values = np.asarray(values, dtype=np.float32)
+        else:
+            self.indptr = list(indptr)
+            self.indices = list(indices)
+            self.values = list(values)
+
+        self._columns = dict((k, i) for i, k in enumerate(self.keys))
+        self._rows = None
+        self._csc = None
+
+    def __len__(self):
+        return self.size
+
+    def __contains__(self, key):
+        return key in self._columns
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        # immutable
+        return self
+
+    @property
+    def nnz(self):
+        """int: Number of stored (non-zero) weights."""
+        return len(self.values)
+
+    def get_rows(self):
+        """Get the vertex index of each stored weight.
 
         Returns:
-            Node reference or None.
+            list or np.ndarray: Vertex indices, aligned with indices and values.
+        """
+        if self._rows is None:
+            if has_numpy:
+                self._rows = np.repeat(np.arange(self.size, dtype=np.int64), np.diff(self.indptr))
+            else:
+                self._rows = []
+                for vtx in range(self.size):
+                    self._rows.extend([vtx] * (self.indptr[vtx + 1] - self.indptr[vtx]))
+        return self._rows
 
-        Note:
-            This is a placeholder. Override in subclasses.
+    def get_csc(self):
+        """Get the column-major order of the stored weights.
+
+        The order is built once per matrix, vertices stay sorted within each
+        column.
+
+        Returns:
+            tuple: (colptr, order) where order[colptr[c]:colptr[c + 1]] are the
+            positions of the weights of column c in indices and values.
         """
+        if self._csc is None:
+            n = len(self.keys)
+            if has_numpy:
+                order = np.argsort(self.indices, kind='stable')
+                colptr = np.zeros(n + 1, dtype=np.int64)
+                np.cumsum(np.bincount(self.indices, minlength=n), out=colptr[1:])
+            else:
+                columns = [[] for _ in range(n)]
+                for i, c in enumerate(self.indices):
+                    columns[c].append(i)
+                colptr = [0]
+                for positions in columns:
+                    colptr.append(colptr[-1] + len(positions))
+                order = list(itertools.chain.from_iterable(columns))
+            self._csc = (colptr, order)
+        return self._csc
+
+    # conversions ------------------------------------------------------------------------------------------------------
 
+    @classmethod
+    def from_coo(cls, keys, size, rows, columns, values):
+        """Create a matrix from (vertex, column, weight) triplets.
 
-class DeformerDumper(YamlDumper):
-    """Custom YAML dumper for deformer data serialization.
+        Args:
+            keys (list): Sorted keys of the stored maps.
+            size (int): Number of vertices.
+            rows (list): Vertex index of each weight.
+            columns (list): Column of each weight.
+            values (list): Weight values, zeros are dropped.
 
-    Handles WeightMap serialization using the !weightmap tag.
-    """
+        Returns:
+            WeightMatrix: New sparse matrix.
+        """
+        if has_numpy:
+            rows = np.asarray(rows, dtype=np.int64)
+            columns = np.asarray(columns, dtype=np.int32)
+            values = np.asarray(values, dtype=np.float32)
+
+            keep = values != 0
+            rows, columns, values = rows[keep], columns[keep], values[keep]
+
+            order = np.lexsort((columns, rows))
+            indptr = np.zeros(size + 1, dtype=np.int64)
+            np.cumsum(np.bincount(rows, minlength=size), out=indptr[1:])
+            return cls(keys, size, indptr, columns[order], values[order])
+
+        triplets = sorted((r, c, v) for r, c, v in zip(rows, columns, values) if v)
+        indptr = [0] * (size + 1)
+        for r, c, v in triplets:
+            indptr[r + 1] += 1
+        for vtx in range(size):
+            indptr[vtx + 1] += indptr[vtx]
+        return cls(keys, size, indptr, [t[1] for t in triplets], [t[2] for t in triplets])
 
+    @classmethod
+    def from_flat(cls, keys, weights):
+        """Create a matrix from a flat, vertex major, weight array.
 
-class DeformerLoader(YamlLoader):
-    """Custom YAML loader for deformer data deserialization.
+        This is the layout of the weights returned by the DCC skinning APIs.
 
-    Handles WeightMap deserialization from the !weightmap tag.
-    """
+        Args:
+            keys (list): Keys of the maps, in the order of the flat array.
+            weights (list): Flat weights (vertex 0 for all maps, then vertex 1...).
 
+        Returns:
+            WeightMatrix: New sparse matrix.
+        """
+        keys = list(keys)
+        n = len(keys)
+        size = len(weights) // n if n else 0
+        order = sorted(range(n), key=lambda c: keys[c])
 
-def _weight_map_representer(dumper, data):
-    """YAML representer for WeightMap objects.
+        if has_numpy:
+            w = np.asarray(weights, dtype=np.float32).reshape(size, n)[:, order]
+            rows, columns = np.nonzero(w)
+            indptr = np.zeros(size + 1, dtype=np.int64)
+            np.cumsum(np.count_nonzero(w, axis=1), out=indptr[1:])
+            return cls([keys[c] for c in order], size, indptr, columns, w[rows, columns])
+
+        rows, columns, values = [], [], []
+        for vtx in range(size):
+            for c, _c in enumerate(order):
+                v = weights[vtx * n + _c]
+                if v:
+                    rows.append(vtx)
+                    columns.append(c)
+                    values.append(v)
+        return cls.from_coo([keys[c] for c in order], size, rows, columns, values)
 
-    Args:
-        dumper: YAML dumper instance.
-        data (WeightMap): Weight map to serialize.
+    @classmethod
+    def from_dense(cls, keys, weights):
+        """Create a matrix from dense weight maps.
 
-    Returns:
-        YAML scalar node with !weightmap tag.
-    """
-    return dumper.represent_scalar('!weightmap', data.encode(), style='plain')
+        Args:
+            keys (list): Keys of the maps.
+            weights (list): Dense weights of each map (maps x vertices).
+
+        Returns:
+            WeightMatrix: New sparse matrix.
+        """
+        if has_numpy:
+            w = np.asarray(weights, dtype=np.float32)
+            if not len(keys):
+                return cls([], 0)
+            return cls.from_flat(keys, w.T.ravel())
 
+        flat = list(itertools.chain.from_iterable(zip(*weights)))
+        return cls.from_flat(keys, flat)
 
-def _weight_map_constructor(loader, node):
-    """YAML constructor for WeightMap objects.
+    @classmethod
+    def from_maps(cls, maps):
+        """Create a matrix from weight maps.
 
-    Args:
-        loader: YAML loader instance.
-        node: YAML node to deserialize.
+        Maps viewing a matrix are read without being densified.
 
-    Returns:
-        WeightMap: Deserialized weight map.
-    """
-    value = loader.construct_scalar(node)
-    return WeightMap(value)
+        Args:
+            maps (dict): Weight maps by key.
+
+        Returns:
+            WeightMatrix: New sparse matrix.
+        """
+        keys = sorted(maps)
+        if not keys:
+            return cls([], 0)
+        size = len(maps[keys[0]])
+
+        rows, columns, values = [], [], []
+        for c, k in enumerate(keys):
+            if len(maps[k]) != size:
+                raise RuntimeError('weightmaps are different')
+            _rows, _values = maps[k].get_sparse()
+            if has_numpy:
+                rows.append(_rows)
+                columns.append(np.full(len(_rows), c, dtype=np.int32))
+                values.append(_values)
+            else:
+                rows += _rows
+                columns += [c] * len(_rows)
+                values += _values
+
+        if has_numpy:
+            rows = np.concatenate(rows)
+            columns = np.concatenate(columns)
+            values = np.concatenate(values)
+        return cls.from_coo(keys, size, rows, columns, values)
+
+    def get_sparse_column(self, key):
+        """Get the non-zero weights of one map.
+
+        Args:
+            key (int): Key of the map.
+
+        Returns:
+            tuple: (indices, values) of the non-zero weights.
+        """
+        c = self._columns[key]
+        rows = self.get_rows()
+        colptr, order = self.get_csc()
+        pos = order[colptr[c]:colptr[c + 1]]
+
+        if has_numpy:
+            return rows[pos], self.values[pos]
+
+        return [rows[i] for i in pos], [self.values[i] for i in pos]
+
+    def get_column(self, key):
+        """Get the dense weights of one map.
+
+        Args:
+            key (int): Key of the map.
+
+        Returns:
+            list or np.ndarray: Dense weights of the map.
+        """
+        rows, values = self.get_sparse_column(key)
+        if has_numpy:
+            weights = np.zeros(self.size, dtype=np.float32)
+            weights[rows] = values
+            return weights
+
+        weights = [0.0] * self.size
+        for vtx, v in zip(rows, values):
+            weights[vtx] = v
+        return weights
+
+    def get_maps(self):
+        """Get weight maps viewing each column of this matrix.
+
+        Returns:
+            dict: Weight maps by key.
+        """
+        return ordered_dict((k, WeightMap.from_matrix(self, k)) for k in self.keys)
+
+    def to_flat(self):
+        """Get the dense weights as a flat, vertex major, array.
+
+        Returns:
+            list or np.ndarray: Flat weights, see from_flat().
+        """
+        n = len(self.keys)
+        rows = self.get_rows()
+
+        if has_numpy:
+            weights = np.zeros(self.size * n, dtype=np.float64)
+            weights[rows * n + self.indices] = self.values
+            return weights
+
+        weights = [0.0] * (self.size * n)
+        for vtx, c, v in zip(rows, self.indices, self.values):
+            weights[vtx * n + c] = v
+        return weights
+
+    def to_dense(self):
+        """Get the dense weights of all maps.
+
+        Returns:
+            list or np.ndarray: Dense weights (maps x vertices).
+        """
+        if has_numpy:
+            weights = np.zeros((len(self.keys), self.size), dtype=np.float64)
+            weights[self.indices, self.get_rows()] = self.values
+            return weights
+
+        return [list(self.get_column(k)) for k in self.keys]
+
+    # edit -------------------------------------------------------------------------------------------------------------
+
+    def prune(self):
+        """Get a copy of this matrix without stored zero weights.
+
+        Returns:
+            WeightMatrix: New sparse matrix.
+        """
+        return WeightMatrix.from_coo(self.keys, self.size, self.get_rows(), self.indices, self.values)
+
+    def normalize(self, only_excess=False, tolerance=1e-6):
+        """Normalize weights so they sum to 1.0 per vertex.
+
+        Args:
+            only_excess (bool): If True, only normalize vertices where the weight sum exceeds 1.0.
+            tolerance (float): The acceptable margin of error for floating-point comparisons.
+
+        Returns:
+            WeightMatrix: New normalized matrix.
+        """
+        rows = self.get_rows()
+
+        if has_numpy:
+            sums = np.bincount(rows, weights=self.values, minlength=self.size)
+            divisors = np.where(sums == 0, 1.0, sums)
+            if only_excess:
+                divisors = np.where(sums > (1.0 + tolerance), divisors, 1.0)
+            values = self.values / divisors[rows]
+            return WeightMatrix(self.keys, self.size, self.indptr, self.indices, values)
+
+        sums = [0.0] * self.size
+        for vtx, v in zip(rows, self.values):
+            sums[vtx] += v
+
+        values = list(self.values)
+        for i, vtx in enumerate(rows):
+            s = sums[vtx]
+            if s == 0 or (only_excess and s <= (1.0 + tolerance)):
+                continue
+            values[i] /= s
+        return WeightMatrix(self.keys, self.size, self.indptr, self.indices, values)
+
+    def round(self, decimals):
+        """Round weight values while keeping the weight sum of each vertex.
+
+        The rounding error of each vertex is given to the weight that was
+        the most affected by rounding, as done by Deformer.round().
+
+        Args:
+            decimals (int): Number of decimal places.
+
+        Returns:
+            WeightMatrix: New rounded matrix, without zero weights.
+        """
+        rows = self.get_rows()
+
+        if has_numpy:
+            w = self.values
+            r = np.round(w, decimals)
+
+            s = np.round(np.bincount(rows, weights=w, minlength=self.size), decimals)
+            s_r = np.round(np.bincount(rows, weights=r, minlength=self.size), decimals)
+            delta = np.round(s - s_r, decimals)
+
+            # sort weights of each vertex by rounding difference
+            order = np.lexsort((w - r, rows))
+            filled = np.diff(self.indptr) > 0
+
+            mask_pos = (delta > 0) & filled
+            if np.any(mask_pos):
+                r[order[self.indptr[1:][mask_pos] - 1]] += delta[mask_pos]
+
+            mask_neg = (delta < 0) & filled
+            if np.any(mask_neg):
+                r[order[self.indptr[:-1][mask_neg]]] += delta[mask_neg]
+
+            r = np.round(r, decimals)
+            return WeightMatrix.from_coo(self.keys, self.size, rows, self.indices, r)
+
+        values = []
+        for vtx in range(self.size):
+            w = self.values[self.indptr[vtx]:self.indptr[vtx + 1]]
+            s = round(sum(w), decimals)
+            r = [round(x, decimals) for x in w]
+
+            delta = round(s - sum(r), decimals)
+            if delta != 0 and r:
+                d = [orig - rnd for orig, rnd in zip(w, r)]
+                if delta > 0:
+                    idx = d.index(max(d))
+                else:
+                    idx = d.index(min(d))
+                r[idx] = round(r[idx] + delta, decimals)
+            values += r
+
+        return WeightMatrix.from_coo(self.keys, self.size, rows, self.indices, values)
+
+    # serialization ----------------------------------------------------------------------------------------------------
+
+    def encode(self, decimals=6):
+        """Encode the matrix to a compact string representation.
+
+        Args:
+            decimals (int): Number of decimal places for rounding.
+
+        Returns:
+            str: Base64 encoded, zlib compressed, binary matrix.
+        """
+        raw_bin = self.to_bytes(decimals)
+        return base64.b64encode(zlib.compress(raw_bin, 1)).decode('ascii')
+
+    @classmethod
+    def decode(cls, data):
+        """Decode a matrix from its string representation.
+
+        Args:
+            data (str): Encoded matrix string, see encode().
+
+        Returns:
+            WeightMatrix: Decoded sparse matrix.
+        """
+        return cls.from_bytes(zlib.decompress(base64.b64decode(data)))
+
+    def to_bytes(self, decimals=6):
+        """Get the binary representation of the matrix.
+
+        Only the non-zero weights are serialized as float32, with their
+        column indices and the weight count of each vertex.
+
+        Args:
+            decimals (int): Number of decimal places for rounding.
+
+        Returns:
+            bytes: Tagged binary matrix ('csr:' header).
+        """
+        if has_numpy:
+            values = np.round(self.values, decimals)
+        else:
+            values = [round(v, decimals) for v in self.values]
+        wmx = WeightMatrix.from_coo(self.keys, self.size, self.get_rows(), self.indices, values)
+
+        n = len(wmx.keys)
+        width = 2 if n < 0xffff else 4
+        fmt = 'H' if width == 2 else 'I'
+
+        header = struct.pack('<IIIB', n, wmx.size, wmx.nnz, width)
+        header += struct.pack('<{}i'.format(n), *wmx.keys)
+
+        if has_numpy:
+            counts = np.diff(wmx.indptr).astype('<' + fmt)
+            payload = counts.tobytes() + wmx.indices.astype('<' + fmt).tobytes() + wmx.values.astype('<f4').tobytes()
+        else:
+            counts = [wmx.indptr[i + 1] - wmx.indptr[i] for i in range(wmx.size)]
+            payload = struct.pack('<{}{}'.format(wmx.size, fmt), *counts)
+            payload += struct.pack('<{}{}'.format(wmx.nnz, fmt), *wmx.indices)
+            payload += struct.pack('<{}f'.format(wmx.nnz), *wmx.values)
+
+        return b'csr:' + header + payload
+
+    @classmethod
+    def from_bytes(cls, raw_data):
+        """Create a matrix from its binary representation.
+
+        Any buffer can be given (such as a memory mapped file); with numpy,
+        the stored values are read in place without being copied.
+
+        Args:
+            raw_data (bytes): Tagged binary matrix, see to_bytes().
+
+        Returns:
+            WeightMatrix: Decoded sparse matrix.
+        """
+        if bytes(raw_data[:4]) != b'csr:':
+            raise ValueError('invalid weight matrix data')
+
+        offset = 4
+        n, size, nnz, width = struct.unpack_from('<IIIB', raw_data, offset)
+        offset += struct.calcsize('<IIIB')
+        keys = list(struct.unpack_from('<{}i'.format(n), raw_data, offset))
+        offset += 4 * n
+
+        fmt = 'H' if width == 2 else 'I'
+
+        if has_numpy:
+            counts = np.frombuffer(raw_data, dtype='<' + fmt, count=size, offset=offset)
+            offset += width * size
+            indices = np.frombuffer(raw_data, dtype='<' + fmt, count=nnz, offset=offset)
+            offset += width * nnz
+            values = np.frombuffer(raw_data, dtype='<f4', count=nnz, offset=offset)
+
+            indptr = np.zeros(size + 1, dtype=np.int64)
+            np.cumsum(counts, out=indptr[1:])
+            return cls(keys, size, indptr, indices, values)
+
+        counts = struct.unpack_from('<{}{}'.format(size, fmt), raw_data, offset)
+        offset += width * size
+        indices = struct.unpack_from('<{}{}'.format(nnz, fmt), raw_data, offset)
+        offset += width * nnz
+        values = struct.unpack_from('<{}f'.format(nnz), raw_data, offset)
+
+        indptr = [0]
+        for c in counts:
+            indptr.append(indptr[-1] + c)
+        return cls(keys, size, indptr, indices, values)
+
+
+class DeltaMap(WeightMap):
+    """Sparse storage for per-vertex point deltas.
+
+    Stores only the moved vertices of a delta (such as a blendshape target)
+    as an array of vertex indices and an array of xyz offsets. A delta map
+    behaves as a flat xyz weight map of 3 values per vertex: the dense
+    weights are only built the first time ``weights`` is accessed, after
+    which the map holds its own copy like a weight map.
+
+    Attributes:
+        size (int): Number of vertices.
+        indices: Sorted indices of the moved vertices.
+        points: Offsets of the moved vertices (one xyz triplet per index).
+
+    Examples:
+        Building a delta from flat xyz weights:
+            >>> dm = DeltaMap.from_flat([0, 0, 0, 1, 2, 3, 0, 0, 0])
+            >>> dm.nnz
+            1
+            >>> len(dm)
+            9
+
+        Reading the moved vertices:
+            >>> indices, points = dm.get_sparse_points()
+            >>> [int(i) for i in indices]
+            [1]
+    """
+
+    indices = None
+    points = None
+
+    def __init__(self, size, indices=None, points=None, lock=False, partition=None):
+        """Initialize a DeltaMap.
+
+        Args:
+            size (int): Number of vertices.
+            indices (list, optional): Indices of the moved vertices.
+            points (list, optional): xyz offsets of the moved vertices.
+            lock (bool): Whether to lock this delta map.
+            partition (str, optional): Partition identifier.
+        """
+        self.size = size
+        if indices is None:
+            indices, points = [], []
+        self.set_sparse_points(indices, points)
+
+        self.lock = lock
+        self.partition = partition
+
+    @classmethod
+    def from_flat(cls, weights, lock=False, partition=None):
+        """Create a delta map from flat xyz weights, keeping the moved vertices only.
+
+        Args:
+            weights (list): Flat xyz values (3 values per vertex).
+            lock (bool): Whether to lock this delta map.
+            partition (str, optional): Partition identifier.
+
+        Returns:
+            DeltaMap: Sparse delta map.
+        """
+        dm = cls(len(weights) // 3, lock=lock, partition=partition)
+        dm.set_sparse_points(*cls.get_flat_sparse_points(weights))
+        return dm
+
+    @staticmethod
+    def get_flat_sparse_points(weights):
+        """Get the moved vertices of flat xyz weights.
+
+        Args:
+            weights (list): Flat xyz values (3 values per vertex).
+
+        Returns:
+            tuple: (indices, points) of the vertices with a non-zero offset.
+        """
+        if has_numpy:
+            points = np.asarray(weights, dtype=np.float64)
+            points = points[:len(points) // 3 * 3].reshape(-1, 3)
+            indices = np.flatnonzero(points.any(axis=1))
+            return indices, points[indices]
+
+        indices = []
+        points = []
+        for i in range(len(weights) // 3):
+            pt = tuple(weights[i * 3:i * 3 + 3])
+            if any(pt):
+                indices.append(i)
+                points.append(pt)
+        return indices, points
+
+    def set_sparse_points(self, indices, points):
+        """Replace the data of the map with moved vertices.
+
+        Args:
+            indices (list): Indices of the moved vertices.
+            points (list): xyz offsets of the moved vertices.
+        """
+        if has_numpy:
+            indices = np.asarray(indices, dtype=np.int64).reshape(-1)
+            points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+            if len(indices) > 1 and np.any(indices[1:] < indices[:-1]):
+                order = np.argsort(indices, kind='stable')
+                indices = indices[order]
+                points = points[order]
+        else:
+            pairs = sorted(zip(indices, points), key=lambda x: x[0])
+            indices = [int(i) for i, _ in pairs]
+            points = [tuple(pt)[:3] for _, pt in pairs]
+
+        self.indices = indices
+        self.points = points
+        self._weights = None
+
+    @property
+    def weights(self):
+        if self.indices is not None:
+            self._weights = self.get_flat()
+            self.indices = None
+            self.points = None
+        return self._weights
+
+    @weights.setter
+    def weights(self, weights):
+        self.indices = None
+        self.points = None
+        self._weights = weights
+
+    @property
+    def nnz(self):
+        """int: Number of moved vertices."""
+        return len(self.get_sparse_points()[0])
+
+    def get_flat(self):
+        """Get the dense flat xyz weights of the map.
+
+        Returns:
+            list or np.ndarray: Flat xyz values (3 values per vertex).
+        """
+        if self.indices is None:
+            return self._weights
+
+        if has_numpy:
+            weights = np.zeros((self.size, 3))
+            weights[self.indices] = self.points
+            return weights.reshape(-1)
+
+        weights = [0.0] * (self.size * 3)
+        for i, pt in zip(self.indices, self.points):
+            weights[i * 3:i * 3 + 3] = pt
+        return weights
+
+    def read_weights(self):
+        """Get the weight values without detaching from the sparse data.
+
+        Returns:
+            list or np.ndarray: Flat xyz values, not meant to be edited.
+        """
+        return self.get_flat()
+
+    def get_sparse_points(self):
+        """Get the moved vertices of this map.
+
+        Returns:
+            tuple: (indices, points) of the vertices with a non-zero offset.
+        """
+        if self.indices is not None:
+            return self.indices, self.points
+        return self.get_flat_sparse_points(self._weights)
+
+    def get_sparse(self):
+        """Get the non-zero flat weights of this map.
+
+        Returns:
+            tuple: (indices, values) of the non-zero flat xyz weights.
+        """
+        if self.indices is None:
+            return WeightMap.get_sparse(self)
+
+        if has_numpy:
+            indices = (self.indices[:, None] * 3 + np.arange(3)).reshape(-1)
+            values = np.asarray(self.points, dtype=np.float32).reshape(-1)
+            nz = np.flatnonzero(values)
+            return indices[nz], values[nz]
+
+        indices = []
+        values = []
+        for i, pt in zip(self.indices, self.points):
+            for c in range(3):
+                if pt[c]:
+                    indices.append(i * 3 + c)
+                    values.append(pt[c])
+        return indices, values
+
+    def __getitem__(self, i):
+        return self.weights[i]
+
+    def __len__(self):
+        if self.indices is not None:
+            return self.size * 3
+        return len(self._weights)
+
+    def copy(self):
+        """Create a copy of this delta map.
+
+        Returns:
+            DeltaMap: New delta map with copied data.
+        """
+        indices, points = self.get_sparse_points()
+        if has_numpy:
+            indices = np.copy(indices)
+            points = np.copy(points)
+        return DeltaMap(len(self) // 3, indices, points, lock=self.lock, partition=self.partition)
+
+    # serialization ----------------------------------------------------------------------------------------------------
+
+    def encode(self, decimals=6, **kw):
+        """Encode the delta map to a compact string representation.
+
+        Args:
+            decimals (int): Number of decimal places for rounding.
+
+        Returns:
+            str: Base64 encoded, zlib compressed, binary delta.
+        """
+        raw_bin = self.to_bytes(decimals)
+        return base64.b64encode(zlib.compress(raw_bin, 1)).decode('ascii')
+
+    def decode(self, data):
+        """Decode the delta map from its string representation.
+
+        Args:
+            data (str): Encoded delta string, see encode().
+        """
+        self.from_bytes(zlib.decompress(base64.b64decode(data)))
+
+    def to_bytes(self, decimals=6, **kw):
+        """Get the binary representation of the delta map.
+
+        Only the moved vertices are serialized, as the gaps between their
+        indices followed by their offsets as float32.
+
+        Args:
+            decimals (int): Number of decimal places for rounding.
+
+        Returns:
+            bytes: Tagged binary delta ('dlt:' header).
+        """
+        indices, points = self.get_sparse_points()
+        size = len(self) // 3
+
+        if has_numpy:
+            points = np.round(np.asarray(points, dtype=np.float64).reshape(-1, 3), decimals)
+            nz = np.flatnonzero(points.any(axis=1))
+            indices = np.asarray(indices, dtype=np.int64)[nz]
+            gaps = np.diff(indices, prepend=0).astype('<u4')
+            payload = gaps.tobytes() + points[nz].astype('<f4').tobytes()
+            return b'dlt:' + struct.pack('<II', size, len(indices)) + payload
+
+        pairs = []
+        for i, pt in zip(indices, points):
+            pt = [round(v, decimals) for v in pt]
+            if any(pt):
+                pairs.append((i, pt))
+
+        gaps = []
+        last = 0
+        for i, _ in pairs:
+            gaps.append(i - last)
+            last = i
+        values = [v for _, pt in pairs for v in pt]
+
+        payload = struct.pack('<{}I'.format(len(gaps)), *gaps)
+        payload += struct.pack('<{}f'.format(len(values)), *values)
+        return b'dlt:' + struct.pack('<II', size, len(pairs)) + payload
+
+    def from_bytes(self, raw_data):
+        """Load the delta map from its binary representation.
+
+        Args:
+            raw_data (bytes): Tagged binary delta, see to_bytes().
+
+        Returns:
+            bool: True if the data was recognized and loaded.
+        """
+        if bytes(raw_data[:4]) != b'dlt:':
+            return False
+
+        size, nnz = struct.unpack_from('<II', raw_data, 4)
+        offset = 4 + struct.calcsize('<II')
+        self.size = size
+
+        if has_numpy:
+            gaps = np.frombuffer(raw_data, dtype='<u4', count=nnz, offset=offset)
+            offset += 4 * nnz
+            points = np.frombuffer(raw_data, dtype='<f4', count=nnz * 3, offset=offset)
+            indices = np.cumsum(gaps, dtype=np.int64)
+            self.set_sparse_points(indices, points.astype(np.float64))
+            return True
+
+        gaps = struct.unpack_from('<{}I'.format(nnz), raw_data, offset)
+        offset += 4 * nnz
+        values = struct.unpack_from('<{}f'.format(nnz * 3), raw_data, offset)
+
+        indices = []
+        last = 0
+        for gap in gaps:
+            last += gap
+            indices.append(last)
+        points = [values[i * 3:i * 3 + 3] for i in range(nnz)]
+        self.set_sparse_points(indices, points)
+        return True
+
+
+class WeightStore(object):
+    """Content-addressed binary storage for weight data.
+
+    Large weight maps and weight matrices can be stored as raw binary files
+    in a directory next to the scene instead of being embedded as base64
+    strings in the deformer YAML data. Only the hash of each blob is then
+    serialized, with the !weightref tag.
+
+    Stores are enabled with the use() context: every weight data dumped or
+    loaded with DeformerDumper/DeformerLoader in this context goes through
+    the active stores. Blobs are memory mapped when loaded, weight matrices
+    read their values in place and are only paged in when accessed.
+
+    The directory of the store written to is recorded in the data with
+    '#@weights' comment lines (see set_path()), relative to the scene folder
+    and absolute, so that the blobs are still found once the scene folder is
+    moved or the scene is saved under another name or folder. Loading never
+    writes to a store: blobs read from another store are copied to the store
+    used for writing when the data are encoded again. Blobs are never deleted
+    implicitly, see prune().
+
+    Attributes:
+        stack (list): Active stores, the last one is used for writing.
+        stores (dict): Stores opened with open(), by path.
+        extension (str): File extension of the stored blobs.
+        min_size (int): Minimum number of weights to store a map as a blob.
+        re_path (re.Pattern): Line recording the store of the data.
+        re_ref (re.Pattern): Reference to a blob in the data.
+        path (str): Directory of the blobs.
+        buffers (dict): Memory mapped blobs, by hash.
+
+    Examples:
+        Writing deformer data with a sidecar store:
+            >>> store = WeightStore('/path/to/scene.weights')
+            >>> with WeightStore.use(store):
+            ...     data = dfm.encode_deformer_data()
+            >>> '!weightref' in data
+            True
+    """
+
+    stack = []
+    stores = {}
+    extension = '.bin'
+    min_size = 256
+
+    re_path = re.compile(r'^#@weights (.+)$\n?', re.M)
+    re_ref = re.compile(r'!weightref\s+(\w+)')
+
+    def __init__(self, path):
+        """Initialize a WeightStore.
+
+        Args:
+            path (str): Directory of the blobs, created on first write.
+        """
+        self.path = path
+        self.buffers = {}
+
+    def __repr__(self):
+        return "WeightStore('{}')".format(self.path)
+
+    @classmethod
+    def open(cls, path):
+        """Get the store of a directory, shared with previous calls.
+
+        Args:
+            path (str): Directory of the blobs.
+
+        Returns:
+            WeightStore: Store of the directory.
+        """
+        path = os.path.normpath(path)
+        if path not in cls.stores:
+            cls.stores[path] = cls(path)
+        return cls.stores[path]
+
+    @classmethod
+    @contextmanager
+    def use(cls, *stores):
+        """Context in which weight data are dumped to and loaded from stores.
+
+        Args:
+            *stores (WeightStore): Stores to activate, the last one is used
+                for writing, None values are ignored.
+        """
+        stores = [store for store in stores if store is not None]
+        cls.stack.extend(stores)
+        try:
+            yield stores[-1] if stores else None
+        finally:
+            for store in stores:
+                cls.stack.remove(store)
+
+    @classmethod
+    def get_current(cls):
+        """Get the store used for writing.
+
+        Returns:
+            WeightStore or None: Last activated store.
+        """
+        if cls.stack:
+            return cls.stack[-1]
+
+    @classmethod
+    def find(cls, key):
+        """Find a blob in the active stores.
+
+        Args:
+            key (str): Hash of the blob.
+
+        Returns:
+            Buffer of the blob.
+
+        Raises:
+            DeformerError: If no active store has the blob.
+        """
+        for store in reversed(cls.stack):
+            if store.has(key):
+                return store.get(key)
+        raise DeformerError('weight data {} not found in {}'.format(key, cls.stack))
+
+    @classmethod
+    def get_paths(cls, text, root=None):
+        """Get the directories of the store recorded in deformer data.
+
+        Args:
+            text (str): Serialized deformer data.
+            root (str, optional): Folder of the scene the data are read
+                from, relative paths are skipped without it.
+
+        Returns:
+            list: Directories of the store the data were written to, the
+            relative one first.
+        """
+        paths = []
+        for path in cls.re_path.findall(text or ''):
+            path = path.strip()
+            if path.startswith('./') or path.startswith('../'):
+                if not root:
+                    continue
+                path = os.path.join(root, path)
+            path = os.path.normpath(path)
+            if path not in paths:
+                paths.append(path)
+        return paths
+
+    @classmethod
+    def set_path(cls, text, store=None, root=None):
+        """Record the store written to in deformer data.
+
+        The store is recorded relative to the scene folder when possible,
+        followed by its absolute path as a fallback.
+
+        Args:
+            text (str): Serialized deformer data.
+            store (WeightStore, optional): Store written to, defaults to
+                the current store.
+            root (str, optional): Folder of the scene the data are written to.
+
+        Returns:
+            str: Data with '#@weights' lines if they reference blobs.
+        """
+        if store is None:
+            store = cls.get_current()
+
+        text = cls.re_path.sub('', text)
+        if store is None or '!weightref' not in text:
+            return text
+
+        paths = []
+        if root:
+            try:
+                path = os.path.relpath(store.path, root).replace('\\', '/')
+            except ValueError:
+                path = None  # other drive
+            if path is not None:
+                if not path.startswith('../'):
+                    path = './' + path
+                paths.append(path)
+        paths.append(os.path.abspath(store.path).replace('\\', '/'))
+
+        return ''.join('#@weights {}\n'.format(path) for path in paths) + text
+
+    def get_blob_path(self, key):
+        return os.path.join(self.path, key + self.extension)
+
+    def has(self, key):
+        return key in self.buffers or os.path.isfile(self.get_blob_path(key))
+
+    def put(self, raw_data):
+        """Store a blob.
+
+        Blobs are named after the hash of their content, an already stored
+        blob is never written again.
+
+        Args:
+            raw_data (bytes): Binary data.
+
+        Returns:
+            str: Hash of the blob.
+        """
+        key = hashlib.sha1(raw_data).hexdigest()
+        path = self.get_blob_path(key)
+        if os.path.isfile(path):
+            return key
+
+        if not os.path.isdir(self.path):
+            os.makedirs(self.path)
+
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(raw_data)
+        try:
+            os.rename(tmp_path, path)
+        except OSError:
+            os.remove(tmp_path)  # already written concurrently
+
+        return key
+
+    def get(self, key):
+        """Get a memory mapped blob.
+
+        Args:
+            key (str): Hash of the blob.
+
+        Returns:
+            mmap.mmap: Read only buffer of the blob.
+        """
+        if key not in self.buffers:
+            with open(self.get_blob_path(key), 'rb') as f:
+                self.buffers[key] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self.buffers[key]
+
+    def close(self):
+        """Release the memory mapped blobs."""
+        self.buffers.clear()
+
+    def prune(self, keys):
+        """Delete the blobs that are no longer referenced.
+
+        Blobs are shared by every data written to the store (and by the
+        scenes saved from them), keys must cover all of them.
+
+        Args:
+            keys (iterable): Hashes of the blobs to keep.
+
+        Returns:
+            int: Number of deleted blobs.
+        """
+        if not os.path.isdir(self.path):
+            return 0
+
+        keys = set(keys)
+        n = 0
+        for name in os.listdir(self.path):
+            key, ext = os.path.splitext(name)
+            if ext != self.extension or key in keys:
+                continue
+            self.buffers.pop(key, None)
+            try:
+                os.remove(os.path.join(self.path, name))
+                n += 1
+            except OSError as e:
+                log.warning('/!\\ failed to delete weight data {}: {}'.format(key, e))
+        return n
+
+
+class WeightDecoder(object):
+    """Concurrent decoding of encoded weight data.
+
+    While a decoder is active (see use()), the weight maps, weight matrices
+    and delta maps loaded with DeformerLoader are created empty and their
+    encoded payloads are queued. Leaving the context decodes every queued
+    payload in a thread pool (base64 decoding and zlib decompression of
+    large payloads release the GIL) and fills the objects, which are then
+    ready to use. A queued object accessed before that is decoded on the
+    spot (see PendingDecode). Payloads too short to benefit from a thread
+    are decoded right away.
+
+    Attributes:
+        stack (list): Active decoders, the last one queues the payloads.
+        max_workers (int): Maximum number of decoding threads.
+        min_size (int): Minimum length of an encoded payload to be queued.
+        workers (int): Number of decoding threads of this decoder.
+        jobs (list): Queued (object, decode function, payload) jobs.
+
+    Examples:
+        Decoding the weights of several deformers concurrently:
+            >>> with WeightDecoder.use():
+            ...     data = [Deformer.parse(ini) for ini in sections]
+            >>> # every weight map of data is decoded here
+    """
+
+    stack = []
+    max_workers = 8
+    min_size = 4096
+    pending_classes = {}
+
+    def __init__(self, workers=None):
+        """Initialize a WeightDecoder.
+
+        Args:
+            workers (int, optional): Number of decoding threads, defaults
+                to the number of CPUs (up to max_workers).
+        """
+        if workers is None:
+            try:
+                workers = multiprocessing.cpu_count()
+            except NotImplementedError:
+                workers = 1
+            workers = min(workers, self.max_workers)
+        self.workers = max(1, workers)
+        self.jobs = []
+
+    @classmethod
+    @contextmanager
+    def use(cls, decoder=None):
+        """Context in which encoded weight data are queued and decoded on exit.
+
+        Args:
+            decoder (WeightDecoder, optional): Decoder to activate, a new
+                one is created if None.
+        """
+        if decoder is None:
+            decoder = cls()
+        cls.stack.append(decoder)
+        try:
+            yield decoder
+        finally:
+            cls.stack.remove(decoder)
+        decoder.run()
+
+    @classmethod
+    def get_current(cls):
+        """Get the decoder queuing the payloads.
+
+        Returns:
+            WeightDecoder or None: Last activated decoder.
+        """
+        if cls.stack:
+            return cls.stack[-1]
+
+    @classmethod
+    def load(cls, obj_cls, func, data):
+        """Decode a payload, or queue it if a decoder is active.
+
+        Args:
+            obj_cls (type): Class of the decoded object.
+            func (callable): Function creating the object from the payload.
+            data (str): Encoded payload.
+
+        Returns:
+            Decoded object, or a pending instance of obj_cls filled when the
+            active decoder runs or when it is first accessed.
+        """
+        decoder = cls.get_current()
+        if decoder is None or len(data) < decoder.min_size:
+            return func(data)
+
+        pending_cls = cls.pending_classes.get(obj_cls)
+        if pending_cls is None:
+            pending_cls = type(obj_cls.__name__, (PendingDecode, obj_cls), {})
+            cls.pending_classes[obj_cls] = pending_cls
+
+        obj = pending_cls.__new__(pending_cls)
+        obj.__dict__['_decode_job'] = (obj_cls, func, data)
+        decoder.jobs.append(obj)
+        return obj
+
+    @staticmethod
+    def decode_job(obj):
+        # pop first: an object is decoded only once, by a worker or on access
+        job = obj.__dict__.pop('_decode_job', None)
+        if job is None:
+            return
+        obj_cls, func, data = job
+        obj.__dict__.update(func(data).__dict__)
+        obj.__class__ = obj_cls
+
+    def run(self):
+        """Decode every queued payload."""
+        jobs = self.jobs
+        self.jobs = []
+        if not jobs:
+            return
+
+        if self.workers == 1 or len(jobs) == 1:
+            for job in jobs:
+                self.decode_job(job)
+            return
+
+        with timed_code('decode {} weight payloads'.format(len(jobs))):
+            pool = ThreadPool(min(self.workers, len(jobs)))
+            try:
+                pool.map(self.decode_job, jobs, chunksize=1)
+            finally:
+                pool.close()
+                pool.join()
+
+
+class PendingDecode(object):
+    """Base of the objects queued by WeightDecoder.
+
+    The payload of a pending object is decoded as soon as any of its
+    attributes is looked up (instance or class attributes, properties and
+    the attributes read by its special methods), after which the object is
+    a plain instance of its class. Objects accessed before the decoder runs
+    are therefore never seen half built.
+    """
+
+    def __getattribute__(self, name):
+        if name not in ('__dict__', '__class__') and '_decode_job' in object.__getattribute__(self, '__dict__'):
+            WeightDecoder.decode_job(self)
+        return object.__getattribute__(self, name)
+
+
+class WeightMapInterface(object):
+    """Interface for managing weight map nodes in DCC applications.
+
+    Wraps a WeightMap with additional metadata and tracks modifications.
+
+    Attributes:
+        weightmap (WeightMap): The underlying weight map data.
+        data (dict): Additional metadata (name, node reference, etc.).
+        modified (bool): Whether the weight map has been modified.
+
+    Examples:
+        >>> wmi = WeightMapInterface(WeightMap([1.0, 0.5, 0.0]), name='mask')
+        >>> wmi.weightmap[0] = 0.8
+        >>> wmi.modified = True
+    """
+
+    def __init__(self, wm, **data):
+        """Initialize a WeightMapInterface.
+
+        Args:
+            wm (WeightMap): The weight map to wrap.
+            **data: Additional metadata to store.
+        """
+        self.weightmap = wm
+        self.data = data
+
+        self.modified = False
+
+    def get_node(self):
+        """Get the DCC node associated with this weight map.
+
+        Returns:
+            Node reference or None.
+
+        Note:
+            This is a placeholder. Override in subclasses.
+        """
+
+
+class DeformerDumper(YamlDumper):
+    """Custom YAML dumper for deformer data serialization.
+
+    Handles WeightMap serialization using the !weightmap tag.
+    """
+
+
+class DeformerLoader(YamlLoader):
+    """Custom YAML loader for deformer data deserialization.
+
+    Handles WeightMap deserialization from the !weightmap tag.
+    """
+
+
+def _weight_map_representer(dumper, data):
+    """YAML representer for WeightMap objects.
+
+    Args:
+        dumper: YAML dumper instance.
+        data (WeightMap): Weight map to serialize.
+
+    Returns:
+        YAML scalar node with !weightmap tag.
+    """
+    store = WeightStore.get_current()
+    if store is not None and len(data) >= store.min_size:
+        weights = data.read_weights()
+        if not WeightMap.is_rle(weights):
+            return dumper.represent_scalar('!weightref', store.put(data.to_bytes()), style='plain')
+
+    return dumper.represent_scalar('!weightmap', data.encode(), style='plain')
+
+
+def _weight_map_constructor(loader, node):
+    """YAML constructor for WeightMap objects.
+
+    Args:
+        loader: YAML loader instance.
+        node: YAML node to deserialize.
+
+    Returns:
+        WeightMap: Deserialized weight map.
+    """
+    value = loader.construct_scalar(node)
+    return WeightDecoder.load(WeightMap, WeightMap, value)
+
+
+def _weight_matrix_representer(dumper, data):
+    """YAML representer for WeightMatrix objects.
+
+    Args:
+        dumper: YAML dumper instance.
+        data (WeightMatrix): Weight matrix to serialize.
+
+    Returns:
+        YAML scalar node with !weightmatrix tag.
+    """
+    store = WeightStore.get_current()
+    if store is not None:
+        return dumper.represent_scalar('!weightref', store.put(data.to_bytes()), style='plain')
+
+    return dumper.represent_scalar('!weightmatrix', data.encode(), style='plain')
+
+
+def _weight_matrix_constructor(loader, node):
+    """YAML constructor for WeightMatrix objects.
+
+    Args:
+        loader: YAML loader instance.
+        node: YAML node to deserialize.
+
+    Returns:
+        WeightMatrix: Deserialized weight matrix.
+    """
+    value = loader.construct_scalar(node)
+    return WeightDecoder.load(WeightMatrix, WeightMatrix.decode, value)
+
+
+def _delta_map_representer(dumper, data):
+    """YAML representer for DeltaMap objects.
+
+    Args:
+        dumper: YAML dumper instance.
+        data (DeltaMap): Delta map to serialize.
+
+    Returns:
+        YAML scalar node with !deltamap tag.
+    """
+    store = WeightStore.get_current()
+    if store is not None and data.nnz * 3 >= store.min_size:
+        return dumper.represent_scalar('!weightref', store.put(data.to_bytes()), style='plain')
+
+    return dumper.represent_scalar('!deltamap', data.encode(), style='plain')
+
+
+def _delta_map_constructor(loader, node):
+    """YAML constructor for DeltaMap objects.
+
+    Args:
+        loader: YAML loader instance.
+        node: YAML node to deserialize.
+
+    Returns:
+        DeltaMap: Deserialized delta map.
+    """
+    value = loader.construct_scalar(node)
+    return WeightDecoder.load(DeltaMap, decode_delta_map, value)
+
+
+def decode_delta_map(data):
+    dm = DeltaMap(0)
+    dm.decode(data)
+    return dm
+
+
+def _weight_ref_constructor(loader, node):
+    """YAML constructor for weight data stored in a WeightStore.
+
+    Args:
+        loader: YAML loader instance.
+        node: YAML node to deserialize.
+
+    Returns:
+        WeightMap, WeightMatrix or DeltaMap: Weight data loaded from the active stores.
+    """
+    value = loader.construct_scalar(node)
+    raw_data = WeightStore.find(value)
+
+    if bytes(raw_data[:4]) == b'csr:':
+        return WeightMatrix.from_bytes(raw_data)
+
+    if bytes(raw_data[:4]) == b'dlt:':
+        dm = DeltaMap(0)
+        dm.from_bytes(raw_data)
+        return dm
+
+    wm = WeightMap([])
+    wm.from_bytes(raw_data)
+    return wm
 
 
 DeformerDumper.add_representer(WeightMap, _weight_map_representer)
 DeformerLoader.add_constructor('!weightmap', _weight_map_constructor)
+DeformerDumper.add_representer(WeightMatrix, _weight_matrix_representer)
+DeformerLoader.add_constructor('!weightmatrix', _weight_matrix_constructor)
+DeformerDumper.add_representer(DeltaMap, _delta_map_representer)
+DeformerLoader.add_constructor('!deltamap', _delta_map_constructor)
+DeformerLoader.add_constructor('!weightref', _weight_ref_constructor)
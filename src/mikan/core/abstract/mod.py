@@ -9,6 +9,7 @@ constraints, setting attributes, or performing custom actions during rig buildin
 The module supports:
     - Dynamic modifier class registration via templates
     - Variable substitution and parsing
+    - Persistent cache of parsed mod sections
     - Execution status tracking and error handling
     - Cross-platform modifier abstraction
 
@@ -32,12 +33,13 @@ import logging
 import os.path
 import pkgutil
 import traceback
-from copy import deepcopy
+from itertools import islice
 from six import string_types
 
-from mikan.core.utils import ordered_load, ordered_dict, re_is_int
+from mikan.core.utils import ordered_load, ordered_dict, re_is_int, yaml_manifest, ParseCache
 from mikan.core.logger import create_logger
 from mikan.core.prefs import Prefs
+from mikan.vendor import yamllint
 from .monitor import JobMonitor
 from .template import Template
 
@@ -64,9 +66,11 @@ class Mod(JobMonitor):
         nodes (dict): Node references for parser resolution.
         id_prefix (str): Prefix for modifier IDs, defaults to 'mod.'.
         node: The target node for this modifier.
-        data (dict): Dictionary containing modifier parameters.
+        data (dict): Dictionary containing modifier parameters. Shared with the
+            caller until parse_nodes() replaces it with the resolved copy.
         source: Source template or node for variable resolution.
         modes (set): Active modes for the modifier.
+        cache (ParseCache): Parsed commands of mod sections, keyed by section text.
 
     Examples:
         Creating a modifier from template data:
@@ -91,6 +95,7 @@ class Mod(JobMonitor):
 
     nodes = {}  # for parser
     id_prefix = 'mod.'
+    cache = ParseCache('mods')
 
     @classmethod
     def get_all_modules(cls, module=mikan.templates.mod):
@@ -99,6 +104,7 @@ class Mod(JobMonitor):
         Scans the templates.mod package for modifier implementations,
         loads their configuration from mod.yml files, and registers
         them in the modules dictionary. Also handles legacy name mappings.
+        Parsed files are cached on disk by the yaml manifest.
 
         Args:
             module: The parent module to scan for modifier packages.
@@ -139,8 +145,7 @@ class Mod(JobMonitor):
             path = base_path + os.path.sep + 'mod.yml'
             if os.path.exists(path):
                 try:
-                    with open(path, 'r') as stream:
-                        package.mod_data = ordered_load(stream)
+                    package.mod_data = yaml_manifest.load(path)
                 except Exception as e:
                     log.error('failed to load Modifier "{}" mod.yml: {}'.format(modname, e))
             else:
@@ -157,6 +162,8 @@ class Mod(JobMonitor):
             # register
             cls.modules[modname] = package
 
+        yaml_manifest.save()
+
         # renamed module for legacy
         renamed = {}
         prefs = Prefs.get('mod', {})
@@ -226,11 +233,12 @@ class Mod(JobMonitor):
             source: Source template for variable resolution.
         """
         self.node = node
+
+        # data is shared with the caller until parse_nodes() builds the resolved copy
         self.data = data or {}
-        self.data = deepcopy(self.data)
         if isinstance(self.data, dict) and 'node' in self.data:
-            self.node = self.data['node']
-            del self.data['node']
+            self.data = type(self.data)(self.data)
+            self.node = self.data.pop('node')
 
         self.source = source
 
@@ -319,7 +327,9 @@ class Mod(JobMonitor):
         """Parse and resolve node references in modifier data.
 
         Resolves string identifiers to actual DCC nodes.
-        Must be implemented by software-specific subclasses.
+        Must be implemented by software-specific subclasses, by replacing
+        self.data with a new resolved structure: the data given on
+        construction is shared with the caller and must not be edited.
 
         Note:
             This is a placeholder. Override in subclasses.
@@ -341,7 +351,9 @@ class Mod(JobMonitor):
         """Parse and substitute variables in data structures.
 
         Recursively processes data, replacing $variable references
-        with their resolved values from the source template.
+        with their resolved values from the source template. Containers
+        without any variable are returned as is, only the path to the
+        substituted values is copied.
 
         Args:
             data: Data structure to process (dict, list, or string).
@@ -357,17 +369,41 @@ class Mod(JobMonitor):
             'L_arm'
         """
         if isinstance(data, dict):
-            new_data = type(data)()
-            for k, v in data.items():
+            new_data = None
+            for i, (k, v) in enumerate(data.items()):
+                _k = k
                 if isinstance(k, string_types) and k.startswith('$'):
-                    k = self.get_var(k[1:], self.source)
-                new_data[k] = self.parse_vars(v)
+                    _k = self.get_var(k[1:], self.source)
+                _v = self.parse_vars(v)
+
+                if new_data is None:
+                    if _k is k and _v is v:
+                        continue
+                    # copy on first change
+                    new_data = type(data)()
+                    for k0, v0 in islice(data.items(), i):
+                        new_data[k0] = v0
+                new_data[_k] = _v
+
+            if new_data is None:
+                return data
             return new_data
 
         elif isinstance(data, list):
-            return [self.parse_vars(e) for e in data]
+            new_data = None
+            for i, e in enumerate(data):
+                _e = self.parse_vars(e)
+                if new_data is None:
+                    if _e is e:
+                        continue
+                    new_data = data[:i]
+                new_data.append(_e)
+
+            if new_data is None:
+                return data
+            return new_data
 
-        elif isinstance(data, string_types):
+        elif isinstance(data, string_types) and '$' in data:
 
             if ' ' in data:
                 _data = []
@@ -410,6 +446,92 @@ class Mod(JobMonitor):
         """
         return 0
 
+    @staticmethod
+    def load(cmd):
+        """Load the data of a mod command.
+
+        Args:
+            cmd (str): YAML text of the command.
+
+        Returns:
+            dict: {mod: data}, empty if the command is not valid.
+
+        Note:
+            This is a placeholder. Override in subclasses.
+        """
+        return {}
+
+    @classmethod
+    def parse_commands(cls, ini):
+        """Split a mod section into commands and load them.
+
+        Commands are expanded with the #> replace variables of the section
+        (see parse_replace) and their YAML is loaded. Sections parsed without
+        errors are stored in the mod cache with a hash of their text, which
+        also holds the replace variables, and are not parsed again while the
+        text does not change.
+
+        Args:
+            ini: INI parser instance with get_lines() method.
+
+        Returns:
+            dict: 'replace' variables and 'commands' list of dicts with 'yml',
+                'mod' and 'data' keys ('yml' and 'errors' for invalid commands).
+        """
+        lines = ini.get_lines()
+        key = ParseCache.get_key('\n'.join(lines))
+        data = cls.cache.get(key)
+        if data is not None:
+            return data
+
+        commands = []
+        for line in lines:
+            # preserve commands order by grouping them into a list
+            if len(line) == 0 or line.startswith('#') or len(line.strip()) == 0:
+                continue
+            elif not line.startswith(' '):
+                commands.append([line])
+            else:
+                if commands:
+                    commands[-1].append(line)
+                else:
+                    commands.append([line])
+
+        # inline replace/loops
+        data = {'replace': cls.parse_ini_replace(ini), 'commands': []}
+        valid = True
+
+        for i, lines in enumerate(commands):
+            _mod = '\n'.join(lines)
+
+            for _mod in cls.parse_replace(_mod, data['replace']):
+                cmd_data = {'yml': _mod}
+                data['commands'].append(cmd_data)
+
+                _cmd = cls.load(_mod)
+                if _cmd:
+                    cmd_data['mod'] = list(_cmd)[0]
+                    cmd_data['data'] = _cmd[cmd_data['mod']]
+                else:
+                    valid = False
+                    errors = []
+                    errors.append('-- failed to parse mod #{} of "{}" ({})'.format(i + 1, ini.parser.node, lines[0].strip(':')))
+                    for lint in yamllint.run(_mod):
+                        _lines = [
+                            str(lint),
+                            lines[lint.line - 1],
+                            ' ' * (lint.column - 1) + '^'
+                        ]
+                        errors.append('\n'.join(_lines) + '\n')
+                    cmd_data['errors'] = errors
+                    for error in errors:
+                        log.error(error)
+
+        # errors are reported again on next parse
+        if valid:
+            cls.cache.set(key, data)
+        return data
+
     @staticmethod
     def parse_ini_replace(ini):
         """Parse variable definitions from INI-style comments.
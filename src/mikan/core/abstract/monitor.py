@@ -205,6 +205,7 @@ class BuildMonitor(object):
         STEP_MODS_DEFORMERS (str): Step for applying modifiers and deformers.
         STEP_GROUPS (str): Step for organizing groups.
         STEP_CLEANUP (str): Step for final cleanup.
+        STEP_OPTIMIZE (str): Step for optimizing the rig graph.
         STEP_FINISHED (str): Step indicating build completion.
         scheduler: Reference to the build scheduler.
         current_step (str): Currently executing build step.
@@ -232,6 +233,7 @@ class BuildMonitor(object):
     STEP_MODS_DEFORMERS = 'mods/deformers'
     STEP_GROUPS = 'groups'
     STEP_CLEANUP = 'cleanup'
+    STEP_OPTIMIZE = 'optimize'
     STEP_FINISHED = 'build complete'
 
     def __init__(self):
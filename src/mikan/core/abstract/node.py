@@ -15,6 +15,7 @@ The module supports:
 Classes:
     MetaNodes: Metaclass providing class-level property access for current_asset.
     Nodes: Main registry class for node identification and retrieval.
+    ResolveCache: Build scoped memo of resolved tags, invalidated by ID changes.
 
 Examples:
     Retrieving a node by ID:
@@ -28,13 +29,17 @@ Examples:
         >>> plug = Nodes.get_id('arm.fk.ctrl@rotateX')
 """
 
+from functools import wraps
+from collections import defaultdict
+from contextlib import contextmanager
 from six import with_metaclass, iteritems
 
 from mikan.core.utils import ordered_dict
 from mikan.core.tree import Tree, SuperTree, Branch
 from mikan.core.logger import create_logger
+from .scheduler import DependencyIndex
 
-__all__ = ['Nodes']
+__all__ = ['Nodes', 'ResolveCache']
 
 log = create_logger()
 
@@ -81,6 +86,7 @@ class Nodes(with_metaclass(MetaNodes)):
         geometries (OrderedDict): Registry of geometry nodes.
         nodes (Tree): Hierarchical tree of registered nodes by ID.
         shapes (Tree): Hierarchical tree of shape nodes.
+        listeners (list): Callbacks notified with the tag of every registered ID.
         current_asset: The currently active asset context for node operations.
 
     Examples:
@@ -103,6 +109,7 @@ class Nodes(with_metaclass(MetaNodes)):
     geometries = ordered_dict()
     nodes = Tree()
     shapes = Tree()
+    listeners = []
 
     _current_asset = None
 
@@ -119,6 +126,9 @@ class Nodes(with_metaclass(MetaNodes)):
         cls.geometries.clear()
         cls.current_asset = None
 
+        if ResolveCache.active is not None:
+            ResolveCache.active.clear()
+
     @classmethod
     def rebuild(cls):
         """Rebuild the node registry from the current scene.
@@ -283,6 +293,40 @@ class Nodes(with_metaclass(MetaNodes)):
             cls.rebuild()
 
         cls.nodes[cls.current_asset][tag] = node
+        cls.notify_id(tag)
+
+    @classmethod
+    def add_listener(cls, callback):
+        """Register a callback notified whenever an ID is set or removed.
+
+        Args:
+            callback (callable): Function called with the registered tag.
+
+        Examples:
+            >>> Nodes.add_listener(index.notify)
+        """
+        if callback not in cls.listeners:
+            cls.listeners.append(callback)
+
+    @classmethod
+    def remove_listener(cls, callback):
+        """Unregister a callback previously added with add_listener.
+
+        Args:
+            callback (callable): Function to remove.
+        """
+        if callback in cls.listeners:
+            cls.listeners.remove(callback)
+
+    @classmethod
+    def notify_id(cls, tag):
+        """Notify registered listeners that an ID has been set or removed.
+
+        Args:
+            tag (str): The registered or removed tag.
+        """
+        for callback in cls.listeners:
+            callback(tag)
 
     @classmethod
     def check_nodes(cls):
@@ -291,3 +335,188 @@ class Nodes(with_metaclass(MetaNodes)):
         Note:
             This is a placeholder. Override in subclasses.
         """
+
+
+class ResolveCache(object):
+    """Build scoped memo of the nodes resolved from tags by parse_node.
+
+    While a cache is active (see use()), the parse_node functions of the
+    backends decorated with memoize() store their results by tag, root,
+    add_hook flag and current asset. Mods, deformers and scheduler retries
+    resolving the same tags then skip the registry and deformer stack lookups.
+
+    Entries are indexed like the delayed jobs of DependencyIndex, by the main
+    key of the IDs of their tag: registering or removing an ID (see
+    Nodes.notify_id) drops the entries that may resolve differently, and
+    flushing the registry clears the cache. Children tags (':::') are also
+    indexed under the wildcard key and dropped on any ID change. Tags resolved through deformer
+    stacks ('->' tags) are dropped whenever a deformer is bound. Failures are
+    only kept for single ID tags, the only ones that cannot be resolved
+    otherwise than by registering that ID. Cached nodes are checked on each
+    hit, entries holding deleted nodes are resolved again.
+
+    Attributes:
+        active (ResolveCache): Cache used by parse_node, None when disabled.
+        entries (dict): Result and failed tags, by key.
+        index (dict): Sets of keys, by index key.
+        hits (int): Number of resolutions answered from the cache.
+        misses (int): Number of resolutions computed.
+
+    Examples:
+        Memoizing the resolution of tags during a build:
+            >>> with ResolveCache.use(ResolveCache()):
+            ...     node = parse_node('arm.L::ctrls.ik')
+    """
+
+    active = None
+
+    def __init__(self):
+        """Initialize an empty ResolveCache."""
+        self.entries = {}
+        self.index = defaultdict(set)
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    @classmethod
+    @contextmanager
+    def use(cls, cache):
+        """Activate a cache for the duration of the context.
+
+        Args:
+            cache (ResolveCache): Cache to activate, None to disable caching.
+        """
+        previous = cls.active
+        cls.active = cache
+        if cache is not None:
+            Nodes.add_listener(cache.notify)
+        try:
+            yield cache
+        finally:
+            if cache is not None:
+                Nodes.remove_listener(cache.notify)
+                log.debug('resolve cache: {} hits, {} misses'.format(cache.hits, cache.misses))
+            cls.active = previous
+
+    @classmethod
+    def memoize(cls, exists=None):
+        """Decorate a parse_node function to use the active cache.
+
+        Args:
+            exists (callable, optional): Check called with each cached node
+                (or plug), returning False if it was deleted from the scene.
+
+        Returns:
+            callable: Decorator.
+        """
+
+        def decorator(func):
+            @wraps(func)
+            def parse_node(tag, failed=None, root=None, silent=False, add_hook=True):
+                cache = cls.active
+                if cache is None:
+                    return func(tag, failed=failed, root=root, silent=silent, add_hook=add_hook)
+
+                if failed is None:
+                    failed = []
+
+                key = (tag, root, add_hook, Nodes.current_asset)
+                try:
+                    entry = cache.entries.get(key)
+                except TypeError:
+                    # unhashable root
+                    return func(tag, failed=failed, root=root, silent=silent, add_hook=add_hook)
+
+                if entry is not None:
+                    result, _failed = entry
+                    if exists is None or cache.check(result, exists):
+                        cache.hits += 1
+                        failed.extend(_failed)
+                        if isinstance(result, list):
+                            return list(result)
+                        return result
+
+                cache.misses += 1
+                _failed = []
+                result = func(tag, failed=_failed, root=root, silent=silent, add_hook=add_hook)
+                failed.extend(_failed)
+
+                if not _failed or ('->' not in tag and len(tag.split()) == 1):
+                    cache.add(key, tag, list(result) if isinstance(result, list) else result, tuple(_failed))
+                return result
+
+            return parse_node
+
+        return decorator
+
+    @staticmethod
+    def check(result, exists):
+        """Check that the nodes of a cached result still exist.
+
+        Args:
+            result: Cached node, plug or list of them.
+            exists (callable): Check called with each node.
+
+        Returns:
+            bool: False if any node of the result was deleted.
+        """
+        if not isinstance(result, (list, tuple)):
+            result = [result]
+        for node in result:
+            if node is not None and not exists(node):
+                return False
+        return True
+
+    def add(self, key, tag, result, failed=()):
+        """Store the result of a tag.
+
+        Args:
+            key (tuple): Cache key (tag, root, add_hook, current asset).
+            tag (str): Resolved tag.
+            result: Resolved node, plug or list of them.
+            failed (tuple): Tags that failed to resolve.
+        """
+        self.entries[key] = result, failed
+
+        keys = DependencyIndex.get_keys(tag)
+        if ':::' in tag:
+            # children tags also resolve the nodes of child and grouped templates
+            keys.add(DependencyIndex.WILDCARD)
+        for k in keys:
+            self.index[k].add(key)
+
+    def discard(self, k):
+        """Drop every entry indexed under a key.
+
+        Args:
+            k (str): Index key.
+        """
+        keys = self.index.pop(k, None)
+        if not keys:
+            return
+        for key in keys:
+            self.entries.pop(key, None)
+
+    def notify(self, tag):
+        """Drop the entries that may be resolved differently since an ID changed.
+
+        Meant to be registered as a Nodes ID listener.
+
+        Args:
+            tag (str): Registered or removed ID tag.
+        """
+        for k in DependencyIndex.get_notify_keys(tag):
+            self.discard(k)
+
+    @classmethod
+    def notify_geometry(cls):
+        """Drop the entries resolved through deformer stacks of the active cache."""
+        if cls.active is not None:
+            cls.active.discard(DependencyIndex.GEOMETRY)
+
+    def clear(self):
+        """Drop every entry."""
+        self.entries.clear()
+        self.index.clear()
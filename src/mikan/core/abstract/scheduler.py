@@ -0,0 +1,805 @@
+# coding: utf-8
+
+"""Abstract Scheduler Module.
+
+This module provides the mod and deformer scheduler of the Mikan framework
+and its dependency index. The scheduler parses the mod and deformer sections
+of a hierarchy into jobs and runs them by priority. Instead of re-running
+every delayed job until the stack stops shrinking, delayed jobs are parked in
+an inverted index keyed by the IDs they are waiting for, and are woken only
+when a matching ID gets registered in the node registry.
+
+The module supports:
+    - Parsing jobs from the notes of a hierarchy, with their priority, modes
+      and conditions
+    - Indexing delayed jobs by the tags they failed to resolve
+    - Waking jobs from Nodes.set_id notifications
+    - Waking jobs waiting on geometry IDs when deformers are bound
+    - Sweeping every remaining job once a fixpoint is reached
+
+Classes:
+    Scheduler: Base class of the software-specific schedulers.
+    SchedulerError: Raised to halt a build on the first error.
+    DependencyIndex: Inverted index of delayed jobs keyed by unresolved tags.
+
+Examples:
+    Waking a delayed job when its missing ID gets registered:
+        >>> index = DependencyIndex()
+        >>> index.add(3, ['arm.L::mod.ik'])
+        >>> index.notify('arm.L::mod.ik')
+        >>> index.pop_woken()
+        [3]
+"""
+
+__all__ = ['Scheduler', 'SchedulerError', 'DependencyIndex']
+
+import re
+import logging
+from collections import defaultdict
+
+from mikan.core.utils import re_is_int, ordered_load
+from mikan.core.logger import create_logger, timed_code, BuildProfiler
+from .monitor import BuildMonitor
+
+log = create_logger()
+
+
+class Scheduler(object):
+    """Scheduler of the mod and deformer jobs of a hierarchy.
+
+    The mod and deformer sections found in the notes of the parsed nodes are
+    split into jobs, sorted by priority (mods first) and run. Jobs that fail to
+    resolve some IDs are delayed and run again once these IDs are registered.
+
+    Software-specific subclasses provide the classes of their backend and the
+    access to their scene: the nodes to parse (walk()), their helpers, node
+    names and plug values.
+
+    Attributes:
+        mod_flags (list): Section names of the mod jobs.
+        dfm_flags (list): Section names of the deformer jobs.
+        indexed (bool): Run delayed jobs from a DependencyIndex by default.
+        skip_level (int): Log level of the jobs skipped by their condition.
+        mod_class (type): Mod class of the backend.
+        deformer_class (type): Deformer class of the backend.
+        nodes_class (type): Node registry of the backend.
+        config_class (type): ConfigParser class of the backend.
+        roots (list): Root nodes of the parsed hierarchies.
+        modes (list): Build modes.
+        monitor (BuildMonitor): Monitor logging the job states.
+        stack (list): Jobs to run, by priority.
+    """
+
+    mod_flags = ['mod']
+    dfm_flags = ['deformer']
+    indexed = True
+    skip_level = logging.WARNING
+
+    mod_class = None
+    deformer_class = None
+    nodes_class = None
+    config_class = None
+
+    def __init__(self, roots, modes=None, mod_flags=None, dfm_flags=None, monitor=None):
+        """Parse the jobs of a hierarchy.
+
+        Args:
+            roots (list): Root nodes of the hierarchies to parse.
+            modes (list, optional): Build modes.
+            mod_flags (list, optional): Section names of the mod jobs.
+            dfm_flags (list, optional): Section names of the deformer jobs.
+            monitor (BuildMonitor, optional): Monitor logging the job states.
+        """
+        self.roots = roots
+        self.stack = []
+
+        if monitor is None:
+            monitor = BuildMonitor()
+        self.monitor = monitor
+
+        # parse hierarchy
+        self.modes = modes
+        if mod_flags is None:
+            mod_flags = self.mod_flags
+        if dfm_flags is None:
+            dfm_flags = self.dfm_flags
+
+        # not imported at module level: the deformer module depends on the node module, which uses DependencyIndex
+        from .deformer import WeightDecoder
+
+        # weight payloads are decoded concurrently once every deformer is parsed
+        with WeightDecoder.use():
+            for node in self.walk():
+                self.parse_notes(node, self.get_helper(node), mod_flags, dfm_flags)
+        self.post_parse()
+
+        # keep parsed mod sections for the next builds
+        self.mod_class.cache.save()
+
+        # first pass reorder
+        stack_mod = []
+        stack_dfm = []
+        for cmd in self.stack:
+            if cmd['class'] is self.mod_class:
+                stack_mod.append(cmd)
+            else:
+                stack_dfm.append(cmd)
+        self.stack = stack_mod + stack_dfm
+
+        self.stack = sorted(self.stack, key=lambda x: (x['priority'] * -1))
+
+    # scene ------------------------------------------------------------------------------------------------------------
+
+    def walk(self):
+        """Get the nodes to parse.
+
+        Must be implemented by software-specific subclasses.
+
+        Returns:
+            iterable: Nodes of the hierarchies of the roots.
+        """
+        raise NotImplementedError
+
+    @staticmethod
+    def get_helper(node):
+        """Get the Helper of a node, to check if it is disabled.
+
+        Must be implemented by software-specific subclasses.
+        """
+        raise NotImplementedError
+
+    @staticmethod
+    def has_notes(node):
+        """Check if a node has notes to parse.
+
+        Must be implemented by software-specific subclasses.
+        """
+        raise NotImplementedError
+
+    @staticmethod
+    def get_node_name(node):
+        """Get the name of a node, as reported in the logs.
+
+        Must be implemented by software-specific subclasses.
+        """
+        raise NotImplementedError
+
+    @staticmethod
+    def node_exists(node):
+        """Check if the node of a mod job is still in the scene.
+
+        Must be implemented by software-specific subclasses.
+        """
+        raise NotImplementedError
+
+    @staticmethod
+    def parse_node(tag, **kwargs):
+        """Resolve a node or plug tag, see the parse_node function of the backend.
+
+        Must be implemented by software-specific subclasses.
+        """
+        raise NotImplementedError
+
+    @staticmethod
+    def is_plug(obj):
+        """Check if an object is a plug.
+
+        Must be implemented by software-specific subclasses.
+        """
+        raise NotImplementedError
+
+    @staticmethod
+    def read_plug(plug):
+        """Get the value of a plug.
+
+        Must be implemented by software-specific subclasses.
+        """
+        raise NotImplementedError
+
+    @staticmethod
+    def write_plug(plug, value):
+        """Set the value of a plug.
+
+        Must be implemented by software-specific subclasses.
+        """
+        raise NotImplementedError
+
+    # parsing ----------------------------------------------------------------------------------------------------------
+
+    def parse_notes(self, node, helper, mod_flags, dfm_flags):
+        """Add the jobs of the sections of a node to the stack.
+
+        Args:
+            node: Node to parse.
+            helper: Helper of the node.
+            mod_flags (list): Section names of the mod jobs.
+            dfm_flags (list): Section names of the deformer jobs.
+        """
+        if not self.has_notes(node) or helper.disabled(self.modes):
+            return
+
+        Mod = self.mod_class
+        Deformer = self.deformer_class
+        cfg = self.config_class(node)
+
+        for flag in mod_flags:
+            for ini in cfg[flag]:
+
+                args = self.get_args(ini)
+                if helper.disabled(self.modes, args['mode']):
+                    continue
+
+                data = Mod.parse(ini)
+                if data:
+                    # split block
+                    for cmd in data['commands']:
+
+                        if 'errors' in cmd:
+                            self.monitor.log(
+                                Mod.STATUS_CANCEL,
+                                [(logging.ERROR, msg) for msg in cmd['errors']],
+                                'mod',
+                                self.get_node_name(node),
+                                cmd['yml']
+                            )
+                            continue
+
+                        mod_data = {
+                            'data': {
+                                'mod': cmd['mod'],
+                                'data': cmd['data'],
+                                'node': data['node']
+                            },
+                            'class': Mod,
+                            'source': node,
+                            'yml': cmd['yml']
+                        }
+
+                        mod_data.update(args)
+                        self.stack.append(mod_data)
+
+        for flag in dfm_flags:
+            for ini in cfg[flag]:
+
+                args = self.get_args(ini)
+                if helper.disabled(self.modes, args['mode']):
+                    continue
+
+                data = Deformer.parse(ini)
+                if data:
+                    dfm_data = {
+                        'class': Deformer,
+                        'data': data,
+                        'source': node,
+                        'yml': ini.read()
+                    }
+                    dfm_data.update(args)
+                    self.stack.append(dfm_data)
+
+    def post_parse(self):
+        """Called once every node is parsed and every weight payload decoded."""
+
+    def get_args(self, ini):
+        """Get the scheduling arguments of a section.
+
+        Args:
+            ini: Section of a ConfigParser.
+
+        Returns:
+            dict: Priority, modes ('mode', joined with ';') and failed
+            condition of the section.
+        """
+        data = {'priority': 0, 'condition': None}
+        modes = []
+
+        for line in ini.get_lines():
+            if line.startswith('#/') and 'ignore' in line[2:].split():
+                modes.append('ignore')
+
+            elif line.startswith('#!'):
+                for arg in re.findall(r"[\w'^!*~+-]+", line[2:]):
+                    if re_is_int.match(arg):
+                        data['priority'] = int(arg)
+                    else:
+                        modes.append(arg)
+
+            elif line.startswith('#?'):
+                condition = line[2:].strip()
+                if not self.evaluate_condition(condition, ini.parser.node):
+                    data['condition'] = condition
+
+            elif line.startswith('#$'):
+                line = line[2:].strip()
+                var, sep, plug = line.partition(':')
+                var_plug = self.mod_class.add_var(var.strip(), ini.parser.node)
+
+                plug = self.parse_node(plug.strip(), silent=True, add_hook=False)
+                if self.is_plug(plug):
+                    self.write_plug(var_plug, self.read_plug(plug))
+
+        data['mode'] = ';'.join(modes)
+        return data
+
+    @staticmethod
+    def uniq(seq):
+        seen = set()
+        seen_add = seen.add
+        return [x for x in seq if x not in seen and not seen_add(x)]
+
+    # run --------------------------------------------------------------------------------------------------------------
+
+    def run(self, pipeline=False, indexed=None):
+        """Run the jobs of the stack.
+
+        Args:
+            pipeline (bool): Halt on the first error.
+            indexed (bool, optional): Run delayed jobs from a DependencyIndex
+                instead of retrying the whole delayed stack, defaults to
+                the indexed attribute.
+        """
+        if len(self.stack) == 0:
+            return
+
+        if indexed is None:
+            indexed = self.indexed
+
+        debug = 'debug' in self.modes
+        halt_on_error = debug or pipeline
+
+        if indexed:
+            self.run_indexed(halt_on_error)
+        else:
+            self.run_stack(halt_on_error)
+
+        self.monitor.current_task = None
+        self.monitor.current_yaml = None
+
+    def run_stack(self, halt_on_error=False):
+        failed_count = 0
+        failed_stack = []
+        while True:
+            if failed_count:
+                log.debug('scheduler: delayed stack')
+
+            for job in self.stack:
+                state = self.run_job(job, halt_on_error)
+                if state == self.mod_class.STATUS_DELAY:
+                    failed_stack.append(job)
+
+            # retry failed stack
+            if len(failed_stack) != failed_count:
+                self.stack = failed_stack
+                failed_count = len(failed_stack)
+                failed_stack = []
+
+            else:
+                for job in failed_stack:
+                    self.cancel_job(job)
+
+                # stop retry stack when unchanged
+                break
+
+    def run_indexed(self, halt_on_error=False):
+        index = DependencyIndex()
+        self.nodes_class.add_listener(index.notify)
+
+        try:
+            queue = list(range(len(self.stack)))
+            done = 0
+
+            while True:
+                for i in queue:
+                    job = self.stack[i]
+                    state = self.run_job(job, halt_on_error)
+
+                    if state == self.mod_class.STATUS_DELAY:
+                        index.add(i, job['unresolved'])
+                        continue
+                    if state is None:
+                        continue
+
+                    done += 1
+                    if job['class'] is self.deformer_class:
+                        index.notify_geometry()
+
+                # wake jobs waiting on registered ids
+                queue = index.pop_woken()
+                if queue:
+                    log.debug('scheduler: woke {} delayed job{}'.format(len(queue), 's' if len(queue) > 1 else ''))
+                    continue
+
+                # fixpoint reached, sweep remaining jobs once if anything was done since last sweep
+                if not index or not done:
+                    break
+
+                queue = index.pop_all()
+                done = 0
+                log.debug('scheduler: delayed stack')
+
+        finally:
+            self.nodes_class.remove_listener(index.notify)
+
+        for i in index.pop_all():
+            self.cancel_job(self.stack[i])
+
+    def run_job(self, job, halt_on_error=False):
+        """Run a job.
+
+        Args:
+            job (dict): Job of the stack.
+            halt_on_error (bool): Raise SchedulerError on errors.
+
+        Returns:
+            int or None: State of the job, None if it was skipped.
+        """
+        Mod = self.mod_class
+        Deformer = self.deformer_class
+
+        cls = job['class']
+        data = job['data']
+        source = job['source']
+        source_str = self.get_node_name(source)
+
+        self.monitor.current_task = None
+        self.monitor.current_yaml = job['yml']
+
+        if job['condition']:
+            data.pop('ini', None)  # strip ini repr from deformers
+            log.log(self.skip_level, '/!\\ {} skip: {}, {}'.format(job['condition'], cls.__name__, data))
+            return
+
+        if cls is Mod:
+            if not self.node_exists(data['node']):
+                return
+
+            # check if module exists
+            cmd = data['mod']
+            if cmd not in Mod.modules:
+                msg = "-- mod '{}' does not exist ({})".format(cmd, source_str)
+                log.error(msg)
+                if halt_on_error:
+                    raise SchedulerError()
+                self.monitor.log(Mod.STATUS_CANCEL, [(logging.ERROR, msg)], 'mod', source_str, job['yml'])
+                return Mod.STATUS_CANCEL
+
+            mod = Mod(cmd, node=data['node'], data=data['data'], source=source)
+            if not mod:
+                return
+
+            self.monitor.current_task = mod
+            with BuildProfiler.span('mod: ' + cmd, 'mod', source=source_str, yml=job['yml']):
+                state = mod.execute(modes=self.modes, source=source_str)
+                BuildProfiler.annotate(status=state)
+
+            if state == Mod.STATUS_DELAY:
+                job['unresolved'] = mod.unresolved[:]
+                return state
+
+            self.monitor.log(state, mod.logs, 'mod', source_str, job['yml'])
+            if state == Mod.STATUS_CRASH and halt_on_error:
+                raise SchedulerError()
+            return state
+
+        elif cls is Deformer:
+            if job['priority'] != 0:
+                data['priority'] = job['priority']
+
+            dfm = Deformer(**data)
+            if 'transform' not in data:
+                return
+            if not dfm:  # hotfix
+                return
+
+            with BuildProfiler.span('deformer: ' + data['deformer'], 'deformer', source=source_str, yml=job['yml']):
+                with timed_code('binding {}.{}'.format(data['transform'], data.get('id', data['deformer'])), level='debug'):
+                    self.monitor.current_task = dfm
+                    state = dfm.bind(modes=self.modes, source=source_str)
+                BuildProfiler.annotate(status=state)
+
+            if state == Deformer.STATUS_DELAY:
+                job['unresolved'] = dfm.unresolved[:]
+                return state
+
+            self.monitor.log(state, dfm.logs, 'deformer', source_str, job['yml'])
+            if state == Deformer.STATUS_CRASH and halt_on_error:
+                raise SchedulerError()
+            return state
+
+    def cancel_job(self, job):
+        """Cancel a job still delayed once every other job has run.
+
+        Args:
+            job (dict): Job of the stack.
+        """
+        Mod = self.mod_class
+        Deformer = self.deformer_class
+
+        cls = job['class']
+        data = job['data']
+        source = job['source']
+        source_str = self.get_node_name(source)
+
+        if cls is Mod:
+            cmd = data['mod']
+            mod = Mod(cmd, node=data['node'], data=data['data'], source=source)
+            if mod:
+                mod.log_error('-- cancel: {}  # source: {}'.format(mod, source_str))
+                mod.log_warning('unresolved ids: {}'.format(job['unresolved']))
+                mod.log_summary()
+                self.monitor.log(Mod.STATUS_CANCEL, mod.logs, 'mod', source_str, job['yml'])
+
+        elif cls is Deformer:
+            dfm = Deformer(**data)
+            if dfm:
+                dfm.log_error('-- cancel: {}  # source: {}'.format(dfm, source_str))
+                dfm.log_warning('unresolved ids: {}'.format(job['unresolved']))
+                dfm.log_summary()
+                self.monitor.log(Deformer.STATUS_CANCEL, dfm.logs, 'deformer', source_str, job['yml'])
+
+    def evaluate_condition(self, condition, parser_node):
+        """Evaluate the condition of a section.
+
+        Args:
+            condition (str): Condition, a value or a comparison of two values
+                (IDs, plugs, $variables or YAML values).
+            parser_node: Node of the section, to look up variables.
+
+        Returns:
+            bool: False if the condition fails or references missing IDs.
+        """
+        if not condition:
+            return True
+
+        # parse condition
+        condition = condition.replace('->', '--')
+        tokens = re.split(r"(==|!=|<=|>=|<|>|&&|\|\|)", condition)
+        tokens = [token.strip().replace('--', '->') for token in tokens if token.strip()]
+
+        # get nodes and plug values
+        for i, e in enumerate(tokens):
+
+            if e.startswith('$'):
+                tokens[i] = self.mod_class.get_var(e[1:], parser_node)
+
+            elif '::' in e or '->' in e:
+                failed = []
+                node = self.parse_node(e, failed=failed, silent=True)
+                if failed:
+                    return False
+                tokens[i] = node
+                if isinstance(node, list):
+                    tokens[i] = node[0]
+            else:
+                tokens[i] = ordered_load(tokens[i])
+
+            if self.is_plug(tokens[i]):
+                tokens[i] = self.read_plug(tokens[i])
+
+        # evaluate
+        if len(tokens) == 1:
+            return bool(tokens[0])
+        elif len(tokens) == 2:
+            a, b = tokens
+            return a == b
+        elif len(tokens) == 3 and tokens[1] in ('==', '!=', '<', '<=', '>', '>='):
+            a, op, b = tokens
+            if op == '==':
+                return a == b
+            elif op == '!=':
+                return a != b
+            elif op == '<':
+                return a < b
+            elif op == '<=':
+                return a <= b
+            elif op == '>':
+                return a > b
+            elif op == '>=':
+                return a >= b
+
+        log.warning('/!\\ invalid condition: {}'.format(condition))
+        return True
+
+
+class SchedulerError(Exception):
+    pass
+
+
+class DependencyIndex(object):
+    """Inverted index of delayed jobs keyed by their unresolved tags.
+
+    Jobs are referenced by their position in the scheduler stack so that
+    woken jobs can be replayed in the original (priority) order.
+
+    Tags are indexed by the main key of their ID (the part before '::'),
+    which matches the way SuperTree resolves branches: a job waiting for
+    'arm::mod.x' is woken by the registration of 'arm.L::mod.x'. This is
+    deliberately conservative, a woken job that still cannot resolve its
+    tags is simply delayed again.
+
+    Attributes:
+        WILDCARD (str): Key of jobs waiting on wildcard IDs, woken by any ID.
+        GEOMETRY (str): Key of jobs waiting on geometry IDs ('->' tags),
+            woken when a deformer is bound.
+        jobs (dict): Index keys of waiting jobs, by job index.
+        index (dict): Sets of waiting job indices, by key.
+        woken (set): Indices of jobs woken since the last pop.
+    """
+
+    WILDCARD = '*'
+    GEOMETRY = '->'
+
+    def __init__(self):
+        """Initialize an empty DependencyIndex."""
+        self.jobs = {}
+        self.index = defaultdict(set)
+        self.woken = set()
+
+    def __len__(self):
+        return len(self.jobs)
+
+    def __contains__(self, i):
+        return i in self.jobs
+
+    @staticmethod
+    def get_main_key(tag):
+        """Get the main key of an ID tag.
+
+        Args:
+            tag (str): ID tag, optionally prefixed by an asset and
+                suffixed by a plug (e.g. 'asset#arm.L::ctrls.ik@ry').
+
+        Returns:
+            str or None: Main key of the tag, or None if the tag is not an ID.
+
+        Examples:
+            >>> DependencyIndex.get_main_key('rig#arm.L::ctrls.ik@ry')
+            'arm.L'
+        """
+        tag = tag.partition('@')[0]
+        tag = tag.rpartition('#')[-1]
+        if '::' not in tag:
+            return
+        return tag.split('::')[0].strip()
+
+    @staticmethod
+    def get_keys(tag):
+        """Get the index keys of an unresolved tag.
+
+        Args:
+            tag (str): Tag that failed to resolve.
+
+        Returns:
+            set: Keys under which a job waiting for this tag is indexed.
+        """
+        keys = set()
+        words = tag.split()
+
+        for word in words:
+            if '->' in word:
+                keys.add(DependencyIndex.GEOMETRY)
+                word = word.partition('->')[0]
+
+            key = DependencyIndex.get_main_key(word)
+            if key is None:
+                continue
+            if '*' in key:
+                # index wildcards under their static lead only
+                lead = []
+                for part in key.split('.'):
+                    if '*' in part:
+                        break
+                    lead.append(part)
+                key = '.'.join(lead)
+                if not key:
+                    keys.add(DependencyIndex.WILDCARD)
+                    continue
+            keys.add(key)
+
+        if not keys:
+            keys.add(DependencyIndex.WILDCARD)
+        return keys
+
+    @staticmethod
+    def get_notify_keys(tag):
+        """Get the index keys woken by the registration of a tag.
+
+        Args:
+            tag (str): Registered ID tag.
+
+        Returns:
+            list: Keys of every branch level of the tag main key, plus
+            the wildcard key.
+
+        Examples:
+            >>> DependencyIndex.get_notify_keys('arm.L::ctrls.ik')
+            ['arm', 'arm.L', '*']
+        """
+        keys = []
+        key = DependencyIndex.get_main_key(tag)
+        if key is not None:
+            parts = key.split('.')
+            for i in range(1, len(parts) + 1):
+                keys.append('.'.join(parts[:i]))
+        keys.append(DependencyIndex.WILDCARD)
+        return keys
+
+    def add(self, i, unresolved):
+        """Park a delayed job in the index.
+
+        Args:
+            i (int): Index of the job in the scheduler stack.
+            unresolved (list): Tags the job failed to resolve.
+        """
+        keys = set()
+        for tag in unresolved:
+            keys.update(self.get_keys(tag))
+        if not keys:
+            keys.add(DependencyIndex.WILDCARD)
+
+        self.jobs[i] = keys
+        for key in keys:
+            self.index[key].add(i)
+
+    def discard(self, i):
+        """Remove a job from the index.
+
+        Args:
+            i (int): Index of the job in the scheduler stack.
+        """
+        keys = self.jobs.pop(i, ())
+        for key in keys:
+            jobs = self.index.get(key)
+            if jobs is not None:
+                jobs.discard(i)
+                if not jobs:
+                    del self.index[key]
+
+    def wake(self, key):
+        """Wake every job indexed under a key.
+
+        Args:
+            key (str): Index key.
+        """
+        jobs = self.index.get(key)
+        if not jobs:
+            return
+        for i in list(jobs):
+            self.discard(i)
+            self.woken.add(i)
+
+    def notify(self, tag):
+        """Wake the jobs that may be waiting for a newly registered ID.
+
+        Meant to be registered as a Nodes ID listener.
+
+        Args:
+            tag (str): Registered ID tag.
+        """
+        for key in self.get_notify_keys(tag):
+            self.wake(key)
+
+    def notify_geometry(self):
+        """Wake the jobs waiting for geometry IDs."""
+        self.wake(DependencyIndex.GEOMETRY)
+
+    def pop_woken(self):
+        """Get and clear the jobs woken since the last call.
+
+        Returns:
+            list: Sorted indices of woken jobs.
+        """
+        woken = sorted(self.woken)
+        self.woken.clear()
+        return woken
+
+    def pop_all(self):
+        """Get and clear every job still waiting in the index.
+
+        Returns:
+            list: Sorted indices of waiting jobs.
+        """
+        jobs = sorted(set(self.jobs) | self.woken)
+        self.jobs.clear()
+        self.index.clear()
+        self.woken.clear()
+        return jobs
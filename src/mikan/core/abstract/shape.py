@@ -40,7 +40,7 @@ import re
 import colorsys
 import math
 
-from mikan.core.utils.yamlutils import ordered_load
+from mikan.core.utils.yamlutils import yaml_manifest
 
 import mikan.templates.shapes
 
@@ -91,8 +91,9 @@ class Shape(object):
         for f in os.listdir(path):
             if f.endswith('.yml'):
                 p = os.path.join(path, f)
-                with open(p, "r") as stream:
-                    Shape.shapes[f[:-4]] = ordered_load(stream)
+                Shape.shapes[f[:-4]] = yaml_manifest.load(p)
+
+        yaml_manifest.save()
 
     color_names = dict(
         aliceblue='#f0f8ff', antiquewhite='#faebd7', aqua='#00ffff', aquamarine='#7fffd4',
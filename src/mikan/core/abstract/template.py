@@ -11,6 +11,7 @@ The module supports:
     - Template branching for symmetrical rigs (left/right, up/down)
     - Hierarchical template navigation (parent/child relationships)
     - Option management with common defaults
+    - Build scoped snapshot of option and name values
     - Build pipeline integration
     - Tag and hook systems for node identification
 
@@ -40,9 +41,10 @@ import sys
 import os.path
 import pkgutil
 from copy import deepcopy
+from contextlib import contextmanager
 from six import string_types
 
-from mikan.core.utils import ordered_load, ordered_dict
+from mikan.core.utils import ordered_load, ordered_dict, yaml_manifest
 from mikan.core.logger import create_logger
 from mikan.core.abstract.node import Nodes
 from mikan.core.prefs import Prefs
@@ -167,6 +169,8 @@ class Template(object):
         branches (list): Current branch identifiers for this instance.
         root: The root node for the current branch.
         modes (set): Active build modes for this instance.
+        opts_snapshot (dict): Option and name values read once for the
+            current build, see snapshot_opts().
 
     Examples:
         Creating and building a template:
@@ -195,6 +199,8 @@ class Template(object):
     template = None
     template_data = ordered_dict()
 
+    opts_snapshot = None
+
     @classmethod
     def get_all_modules(cls, module=mikan.templates.template):
         """Discover and register all available template modules.
@@ -202,6 +208,7 @@ class Template(object):
         Scans the templates.template package for template implementations,
         loads their configuration from template.yml files, and registers
         them in the modules dictionary. Also handles legacy name mappings.
+        Parsed files are cached on disk by the yaml manifest.
 
         Args:
             module: The parent module to scan for template packages.
@@ -255,8 +262,7 @@ class Template(object):
                 path = package.__path__[0] + os.path.sep + 'template.yml'
                 if os.path.exists(path):
                     try:
-                        with open(path, 'r') as stream:
-                            package.template_data = ordered_load(stream)
+                        package.template_data = yaml_manifest.load(path)
                     except Exception as e:
                         log.error('failed to load Template "{}" template.yml: {}'.format(tpl_name, e))
                         continue
@@ -275,6 +281,8 @@ class Template(object):
                 # register
                 cls.modules[tpl_name] = package
 
+        yaml_manifest.save()
+
         # renamed module for legacy
         renamed = {}
         prefs = Prefs.get('template', {})
@@ -715,6 +723,105 @@ class Template(object):
         """
         pass
 
+    @contextmanager
+    def snapshot_opts(self):
+        """Read the options and names of the template once for a build.
+
+        Every option and name is read and decoded (yaml, enum) when entering
+        the context. Within the context, get_opt, get_branch_opt, get_name
+        and do_flip answer from the snapshot instead of reading the node
+        plugs again. Editing an option or a name through this instance
+        discards its entry, which is read again on next access. Nested
+        contexts reuse the active snapshot.
+
+        Yields:
+            dict: The snapshot, with 'opts', 'names' and 'flips' entries.
+
+        Examples:
+            >>> with tpl.snapshot_opts():
+            ...     tpl.build_rig()
+        """
+        if self.opts_snapshot is not None:
+            yield self.opts_snapshot
+            return
+
+        snapshot = {'opts': {}, 'names': {}, 'flips': {}}
+        for opt in self.template_data.get('opts', {}):
+            try:
+                snapshot['opts'][opt] = self.read_opt(opt)
+            except Exception:
+                pass  # read again (and raise) on access
+        for name in self.template_data.get('names', {}):
+            try:
+                snapshot['names'][name] = self.read_name(name)
+            except Exception:
+                pass
+
+        self.opts_snapshot = snapshot
+        try:
+            yield snapshot
+        finally:
+            self.opts_snapshot = None
+
+    def get_snapshot_value(self, key, name, read):
+        """Get a value from the active snapshot, reading it if missing.
+
+        Args:
+            key (str): Snapshot entry ('opts' or 'names').
+            name (str): Option or name to get.
+            read (callable): Function reading the value from the node.
+
+        Returns:
+            object: The value, mutable values are copied.
+        """
+        values = self.opts_snapshot[key]
+        if name not in values:
+            values[name] = read(name)
+
+        v = values[name]
+        if isinstance(v, (list, dict)):
+            v = deepcopy(v)
+        return v
+
+    def discard_snapshot_value(self, key, name):
+        """Remove an edited option or name from the active snapshot.
+
+        Args:
+            key (str): Snapshot entry ('opts' or 'names').
+            name (str): Option or name that was edited.
+        """
+        if self.opts_snapshot is not None:
+            self.opts_snapshot[key].pop(name, None)
+
+    def read_name(self, name):
+        """Read a named value from the template node.
+
+        Args:
+            name (str): Name key to read.
+
+        Returns:
+            str: The value.
+
+        Note:
+            This is a placeholder. Override in subclasses.
+        """
+        return ''
+
+    def read_opt(self, opt, default=False):
+        """Read an option value from the template node.
+
+        Args:
+            opt (str): Option name to read.
+            default (bool): Ignore the value saved on the node.
+
+        Returns:
+            object: The decoded option value.
+
+        Note:
+            This is a placeholder. Override in subclasses.
+        """
+        return object()
+
     # navigation -------------------------------------------------------------------------------------------------------
 
     @staticmethod
@@ -1140,6 +1247,15 @@ class Template(object):
         Returns:
             bool: True if transforms should be flipped.
         """
+        if self.opts_snapshot is not None:
+            key = tuple(self.branches)
+            flips = self.opts_snapshot['flips']
+            if key not in flips:
+                flips[key] = self.read_flip()
+            return flips[key]
+        return self.read_flip()
+
+    def read_flip(self):
         flip = False
         for branch in self.branches:
             for axis, pairs in Template.branch_pairs.items():
@@ -14,6 +14,9 @@ Adaptation: Thomas Guittonneau, 2025
 """
 
 import math
+import threading
+from contextlib import contextmanager
+from collections import OrderedDict
 
 from mikan.vendor import pyparsing as pp
 
@@ -22,9 +25,29 @@ from mikan.core.logger import create_logger
 
 log = create_logger()
 
+_grammar = None
+_stacks = OrderedDict()
+_parsing = threading.local()
+
+
+def _parse_action(name):
+    # dispatch grammar parse actions to the parser currently parsing
+    def action(tokens):
+        return getattr(_parsing.parser, name)(tokens)
+
+    return action
+
 
 class ExpressionParser(object):
 
+    conditionals = ('==', '!=', '>', '>=', '<', '<=')
+    rotate_orders = {'XYZ', 'YZX', 'ZXY', 'XZY', 'YXZ', 'ZYX'}
+
+    cache_size = 512
+
+    # build scoped cache of created nodes, shared by all evaluations (see node_cache)
+    shared_nodes = None
+
     def __init__(self):
         self.kwargs = {}
         self._reverse_kwargs = {}
@@ -49,10 +72,6 @@ class ExpressionParser(object):
             '|': self.logical_or,
             '&': self.logical_and,
         }
-        self.conditionals = ('==', '!=', '>', '>=', '<', '<=')
-
-        self.rotate_orders = {'XYZ', 'YZX', 'ZXY', 'XZY', 'YXZ', 'ZYX'}
-
         self.fn = {
             'inverse': self.inverse,
             'pow': self.pow,
@@ -91,6 +110,20 @@ class ExpressionParser(object):
             'value': self.value,
         }
 
+        self.bnf = self.get_grammar()
+
+    @classmethod
+    def get_grammar(cls):
+        """Get the expression grammar, built once and shared by all parsers."""
+        global _grammar
+        if _grammar is None:
+            _grammar = ExpressionParser.build_grammar()
+        return _grammar
+
+    @classmethod
+    def build_grammar(cls):
+        push_first = _parse_action('push_first')
+
         float_literal = pp.Regex(r'[+-]?\d*\.\d+(?:[eE][+-]?\d+)?|[+-]?\d+(?:\.\d*)?(?:[eE][+-]?\d+)?')
         var_id = pp.Word(pp.alphas, pp.alphanums + '_$')
 
@@ -98,7 +131,7 @@ class ExpressionParser(object):
         false = pp.CaselessKeyword('FALSE') | pp.CaselessKeyword('OFF')
         e = pp.CaselessKeyword('E')
         pi = pp.CaselessKeyword('PI')
-        xyz, yzx, zxy, xzy, yxz, zyx = map(pp.CaselessKeyword, self.rotate_orders)
+        xyz, yzx, zxy, xzy, yxz, zyx = map(pp.CaselessKeyword, cls.rotate_orders)
         constants = true | false | e | pi | xyz | yzx | zxy | xzy | yxz | zyx
 
         plus_op, minus_op, mult_op, div_op, exp_op, mod_op, or_op, and_op, not_op = map(pp.Literal, '+-*/^%|&!')
@@ -109,7 +142,7 @@ class ExpressionParser(object):
         l_par, r_par = map(pp.Suppress, '()')
         l_bra, r_bra = map(pp.Suppress, '[]')
 
-        comparison_op = pp.oneOf(' '.join(self.conditionals))
+        comparison_op = pp.oneOf(' '.join(cls.conditionals))
         if_op = pp.Literal('?')
         else_op = pp.Literal(':')
         assignment_op = pp.Literal('=')
@@ -129,39 +162,39 @@ class ExpressionParser(object):
         )
 
         atom = (
-                (fn_call | list_literal | float_literal | constants | var_id).setParseAction(self.push_first)
+                (fn_call | list_literal | float_literal | constants | var_id).setParseAction(push_first)
                 | pp.Group(l_par + expr + r_par)
         )
 
         atom = (
                 add_ops[...]
                 + atom
-                + (pp.Suppress('.') + pp.Word(pp.alphas)).setParseAction(self.push_component)[...]
-        ).setParseAction(self.push_unary_minus)
+                + (pp.Suppress('.') + pp.Word(pp.alphas)).setParseAction(_parse_action('push_component'))[...]
+        ).setParseAction(_parse_action('push_unary_minus'))
 
         atom = (
                 not_op[...]
                 + atom
-        ).setParseAction(self.push_unary_not)
+        ).setParseAction(_parse_action('push_unary_not'))
 
         # by defining exponentiation as "atom [ ^ factor ]..." instead of "atom [ ^ atom ]...", we get right-to-left
         # exponents, instead of left-to-right that is, 2^3^2 = 2^(3^2), not (2^3)^2.
         factor = pp.Forward()
-        factor <<= atom + (exp_op + factor).setParseAction(self.push_first)[...]
+        factor <<= atom + (exp_op + factor).setParseAction(push_first)[...]
 
-        term = factor + (mult_ops + factor).setParseAction(self.push_first)[...]
-        term = term + (add_ops + term).setParseAction(self.push_first)[...]
-        _expr = term + (logical_ops + term).setParseAction(self.push_first)[...]
+        term = factor + (mult_ops + factor).setParseAction(push_first)[...]
+        term = term + (add_ops + term).setParseAction(push_first)[...]
+        _expr = term + (logical_ops + term).setParseAction(push_first)[...]
 
-        comparison = pp.Group(_expr) + (comparison_op + pp.Group(_expr)).setParseAction(self.push_first)[...]
+        comparison = pp.Group(_expr) + (comparison_op + pp.Group(_expr)).setParseAction(push_first)[...]
         ternary = (
-                comparison + (if_op + pp.Group(_expr) + else_op + pp.Group(_expr)).setParseAction(self.push_first)[...]
+                comparison + (if_op + pp.Group(_expr) + else_op + pp.Group(_expr)).setParseAction(push_first)[...]
         )
 
         expr <<= ternary | _expr  # ternary recursion
 
         assignment = var_id + assignment_op + ~pp.FollowedBy(assignment_op)
-        self.bnf = pp.Optional(assignment).setParseAction(self.push_last) + expr
+        return pp.Optional(assignment).setParseAction(_parse_action('push_last')) + expr
 
     def clear(self):
         self.kwargs.clear()
@@ -198,9 +231,7 @@ class ExpressionParser(object):
 
         # expression
         self.expression_string = expression_string
-        self.results = self.bnf.parseString(expression_string, True)
-        stack = self.expr_stack[:] + self.assignment_stack[:]
-        stack = self.fix_unary_stack(stack)
+        stack = self.parse(expression_string)
         result = self.evaluate_stack(stack)
 
         if self.connect:
@@ -212,6 +243,36 @@ class ExpressionParser(object):
                 self.parsed_kw['unused'].append(k)
         return self.parsed_kw
 
+    def parse(self, expression_string):
+        """Get the postfix stack of an expression.
+
+        Stacks only depend on the expression string, they are cached
+        (by expression with normalized whitespaces) and shared by all parsers.
+        """
+        key = ' '.join(expression_string.split())
+
+        try:
+            stack, self.results = _stacks.pop(key)
+        except KeyError:
+            del self.expr_stack[:]
+            del self.assignment_stack[:]
+
+            parser = getattr(_parsing, 'parser', None)
+            _parsing.parser = self
+            try:
+                self.results = self.bnf.parseString(expression_string, True)
+            finally:
+                _parsing.parser = parser
+
+            stack = self.expr_stack[:] + self.assignment_stack[:]
+            stack = tuple(self.fix_unary_stack(stack))
+
+            if len(_stacks) >= self.cache_size:
+                _stacks.popitem(last=False)
+
+        _stacks[key] = stack, self.results
+        return list(stack)
+
     def push_first(self, tokens):
         self.expr_stack.append(tokens[0])
 
@@ -344,10 +405,64 @@ class ExpressionParser(object):
         op_str = self.op_str(op, *args)
         result = self.created_nodes.get(op_str)
         if result is None and self.connect:
-            result = func(*args)
+            shared = ExpressionParser.shared_nodes
+            key = None
+            if shared is not None:
+                key = self.get_shared_key(op, *args)
+                result = shared.get(key)
+                if result is not None and not self.is_node_result(result):
+                    result = None
+                    del shared[key]
+
+            if result is None:
+                result = func(*args)
+                if key is not None and self.is_node_result(result):
+                    shared[key] = result
+
             self.created_nodes[op_str] = result
         return result
 
+    @staticmethod
+    @contextmanager
+    def node_cache(enabled=True):
+        """Share the nodes created by all evaluations made in this context.
+
+        Evaluations of the same op with the same inputs reuse the output of
+        the first node created instead of building a new one. The cache is
+        flushed when leaving the outermost context.
+        """
+        if not enabled or ExpressionParser.shared_nodes is not None:
+            yield
+            return
+
+        ExpressionParser.shared_nodes = {}
+        try:
+            yield
+        finally:
+            ExpressionParser.shared_nodes = None
+
+    def get_shared_key(self, op, *args):
+        """Get the key of an op in the shared node cache.
+
+        Unlike op_str, keys never use the names of the keyword arguments of
+        the evaluation, only the string form of the inputs.
+        """
+        key = [op]
+        for arg in args:
+            if isinstance(arg, (list, tuple)):
+                key.append(tuple(self.args_str(*arg)))
+            else:
+                key.extend(self.args_str(arg))
+        return tuple(key)
+
+    def is_node_result(self, result):
+        """Check if an op result is the valid output of a created node.
+
+        Only node results are shared between evaluations, this has to be
+        implemented by the DCC parsers to enable the shared node cache.
+        """
+        return False
+
     def args_str(self, *args):
         return [str(v) for v in args]
 
@@ -0,0 +1,219 @@
+# coding: utf-8
+"""
+Vectorized NURBS evaluation.
+
+Evaluates B-spline basis functions for many parameters at once (The NURBS Book,
+algorithms A2.1 and A2.2) and answers batched point, arc length and parameter
+queries on curves from cumulative arc length tables.
+"""
+
+try:
+    import numpy as np
+
+    HAS_NUMPY = True
+except:
+    HAS_NUMPY = False
+
+__all__ = ['generate_knots', 'find_spans', 'basis_functions', 'basis_matrix', 'NurbsCurve']
+
+
+def generate_knots(degree, n):
+    """
+    Clamped uniform knot vector normalized in [0, 1] (same as geomdl generate_knot_vector).
+
+    Parameters:
+    - degree: int, degree of the curve
+    - n: int, number of control points
+
+    Returns:
+    - knots: list of n + degree + 1 floats
+    """
+    num_segments = n - (degree + 1)
+    middle = [(i + 1) / float(num_segments + 1) for i in range(num_segments)]
+    return [0.0] * (degree + 1) + middle + [1.0] * (degree + 1)
+
+
+def find_spans(degree, knots, n, u):
+    """
+    Knot span of each parameter (same as geomdl find_span_linear).
+
+    Parameters:
+    - degree: int, degree of the curve
+    - knots: knot vector
+    - n: int, number of control points
+    - u: L array of parameters
+
+    Returns:
+    - spans: L array of span indices in [degree, n - 1]
+    """
+    knots = np.asarray(knots, dtype=np.float64)
+    spans = np.searchsorted(knots, u, side='right') - 1
+    return np.clip(spans, degree, n - 1)
+
+
+def basis_functions(degree, knots, spans, u):
+    """
+    Non zero basis functions of each parameter.
+
+    Parameters:
+    - degree: int, degree of the curve
+    - knots: knot vector
+    - spans: L array of knot spans (see find_spans)
+    - u: L array of parameters
+
+    Returns:
+    - basis: Lx(degree+1) array, values of the basis functions spans-degree to spans
+    """
+    knots = np.asarray(knots, dtype=np.float64)
+    u = np.asarray(u, dtype=np.float64)
+
+    m = len(u)
+    basis = np.ones((m, degree + 1))
+    left = np.zeros((m, degree + 1))
+    right = np.zeros((m, degree + 1))
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for j in range(1, degree + 1):
+            left[:, j] = u - knots[spans + 1 - j]
+            right[:, j] = knots[spans + j] - u
+            saved = np.zeros(m)
+            for r in range(j):
+                temp = basis[:, r] / (right[:, r + 1] + left[:, j - r])
+                temp[~np.isfinite(temp)] = 0
+                basis[:, r] = saved + right[:, r + 1] * temp
+                saved = left[:, j - r] * temp
+            basis[:, j] = saved
+
+    return basis
+
+
+def basis_matrix(degree, knots, n, u):
+    """
+    Dense matrix of all basis functions of each parameter.
+
+    Parameters:
+    - degree: int, degree of the curve
+    - knots: knot vector
+    - n: int, number of control points
+    - u: L array of parameters
+
+    Returns:
+    - matrix: Lxn array, row i holds the weights of the control points at u[i]
+    """
+    u = np.atleast_1d(np.asarray(u, dtype=np.float64))
+    spans = find_spans(degree, knots, n, u)
+    basis = basis_functions(degree, knots, spans, u)
+
+    matrix = np.zeros((len(u), n))
+    rows = np.arange(len(u))
+    for k in range(degree + 1):
+        matrix[rows, spans - degree + k] = basis[:, k]
+    return matrix
+
+
+class NurbsCurve(object):
+    """
+    NURBS curve evaluated with NumPy.
+
+    The arc length table is built on first use by sampling the curve and
+    accumulating chord lengths, parameter and length queries are then
+    interpolated from it.
+    """
+
+    samples_per_span = 128
+
+    def __init__(self, cps, degree, knots=None, weights=None):
+        """
+        Parameters:
+        - cps: NxD array of control points
+        - degree: int, degree of the curve
+        - knots: knot vector (clamped uniform if None)
+        - weights: N array of control point weights (non rational if None)
+        """
+        if not HAS_NUMPY:
+            raise ImportError("This class requires NumPy. Please install it using 'pip install numpy'.")
+
+        self.cps = np.asarray(cps, dtype=np.float64)
+        self.degree = degree
+        if knots is None:
+            knots = generate_knots(degree, len(self.cps))
+        self.knots = np.asarray(knots, dtype=np.float64)
+        self.weights = None if weights is None else np.asarray(weights, dtype=np.float64)
+
+        self.domain = (self.knots[degree], self.knots[-(degree + 1)])
+        self._lengths = None
+
+    def get_basis(self, u):
+        """
+        Parameters:
+        - u: L array of parameters
+
+        Returns:
+        - matrix: Lxn array of control point weights (rational weights included)
+        """
+        matrix = basis_matrix(self.degree, self.knots, len(self.cps), u)
+        if self.weights is not None:
+            matrix *= self.weights
+            matrix /= matrix.sum(axis=1)[:, None]
+        return matrix
+
+    def get_points(self, u):
+        """
+        Parameters:
+        - u: L array of parameters
+
+        Returns:
+        - points: LxD array of points
+        """
+        return np.dot(self.get_basis(u), self.cps)
+
+    def get_lengths(self):
+        """
+        Returns:
+        - params: S array of sampled parameters
+        - lengths: S array of arc lengths at the sampled parameters
+        """
+        if self._lengths is None:
+            spans = max(1, len(set(self.knots.tolist())) - 1)
+            params = np.linspace(self.domain[0], self.domain[1], spans * self.samples_per_span + 1)
+            points = self.get_points(params)
+            chords = np.sqrt(((points[1:] - points[:-1]) ** 2).sum(axis=1))
+            lengths = np.concatenate([[0], np.cumsum(chords)])
+            self._lengths = (params, lengths)
+        return self._lengths
+
+    @property
+    def length(self):
+        return self.get_lengths()[1][-1]
+
+    def get_length(self, u):
+        """
+        Parameters:
+        - u: parameter or array of parameters
+
+        Returns:
+        - length: arc length from the start of the curve to each parameter
+        """
+        params, lengths = self.get_lengths()
+        return np.interp(u, params, lengths)
+
+    def get_param(self, length):
+        """
+        Parameters:
+        - length: arc length or array of arc lengths
+
+        Returns:
+        - u: parameter at each arc length from the start of the curve
+        """
+        params, lengths = self.get_lengths()
+        return np.interp(length, lengths, params)
+
+    def get_param_from_ratio(self, ratio):
+        """
+        Parameters:
+        - ratio: ratio or array of ratios of the total arc length
+
+        Returns:
+        - u: parameter at each ratio of the curve length
+        """
+        return self.get_param(np.asarray(ratio, dtype=np.float64) * self.length)
@@ -4,6 +4,14 @@ Refactored RBF interpolator based on:
 https://github.com/mathLab/PyGeM/blob/master/pygem/rbf_factory.py
 
 Performs RBF interpolation with several kernel options.
+
+The interpolation system is assembled and factorized once by RBFSolver, then
+reused for every right-hand side and evaluation. Callers solving several
+target sets for the same centers keep their own RBFSolver, nothing is cached
+at module level. Distances are computed in
+memory-bounded chunks. Compact support kernels (Wendland C2 and compact) only
+look up the pairs of points closer than the radius, and use a sparse
+factorization when SciPy is available.
 """
 
 try:
@@ -13,7 +21,221 @@ try:
 except:
     HAS_NUMPY = False
 
-__all__ = ['RBF']
+try:
+    import scipy.linalg
+    import scipy.sparse
+    import scipy.sparse.linalg
+
+    HAS_SCIPY = True
+except:
+    HAS_SCIPY = False
+
+from .spatial import PointGrid
+
+__all__ = ['RBF', 'RBFSolver']
+
+COMPACT_KERNELS = (5, 6)
+
+
+class RBFSolver(object):
+    """
+    Factorized RBF interpolation system of a set of centers.
+
+    The system [[K + λI, P], [Pᵀ, 0]] (kernel block K, affine block P) is
+    factorized on first solve with LU (SciPy) or inverted (NumPy only), solving
+    for new target values is then a back substitution or a matrix product.
+    Evaluation only needs the centers and never factorizes the system.
+
+    The system is singular when the centers are coplanar (or too few), and
+    close to singular with wide gaussian or multiquadric kernels. When the
+    factorization fails or its estimated reciprocal condition number is below
+    min_rcond / N², the solver falls back to the regularized least-squares
+    solve (AᵀA + λI)⁻¹ Aᵀ, computed once with a pseudo-inverse. The condition
+    number of well behaved kernels grows with the number of centers, hence the
+    threshold scaled by the system size.
+    """
+
+    max_chunk = 1 << 22
+    min_rcond = 1e-3
+
+    def __init__(self, centers, radius=1.0, regularization=1e-8, kernel_mode=0):
+        """
+        Parameters:
+        - centers: Nx3 array, RBF centers
+        - radius: float, kernel scale (σ)
+        - regularization: float, small diagonal term to avoid singularity
+        - kernel_mode: int, selects kernel type (0 = identity, 1 = Gaussian, ...)
+        """
+        if not HAS_NUMPY:
+            raise ImportError("This class requires NumPy. Please install it using 'pip install numpy'.")
+
+        self.centers = np.asarray(centers, dtype=np.float64).reshape(-1, 3)
+        self.radius = float(radius)
+        self.regularization = float(regularization)
+        self.kernel_mode = kernel_mode
+
+        self.compact = kernel_mode in COMPACT_KERNELS
+        self.grid = None
+        if self.compact:
+            self.grid = PointGrid(self.centers, self.radius)
+
+        self.factor = None
+        self.least_squares = False
+
+    def __len__(self):
+        return len(self.centers)
+
+    def factorize(self):
+        """
+        Assemble and factorize the interpolation system, done on first solve.
+        """
+        n = len(self.centers)
+        affine_block = get_affine_block(self.centers)
+
+        if self.compact and HAS_SCIPY:
+            rows, cols, values = self.get_kernel_pairs(self.centers)
+            kernel_block = scipy.sparse.coo_matrix((values, (rows, cols)), shape=(n, n))
+            kernel_block = kernel_block + scipy.sparse.identity(n) * self.regularization
+            system = scipy.sparse.bmat([[kernel_block, affine_block], [affine_block.T, None]], format='csc')
+            try:
+                self.factor = scipy.sparse.linalg.splu(system)
+            except RuntimeError:
+                # exactly singular
+                self.factorize_least_squares(system.toarray())
+                return
+            if np.all(np.isfinite(self.factor.U.data)):
+                return
+            self.factorize_least_squares(system.toarray())
+            return
+
+        system = np.zeros((n + 4, n + 4))
+        if self.compact:
+            rows, cols, values = self.get_kernel_pairs(self.centers)
+            system[rows, cols] = values
+        else:
+            for i, j, block in self.iter_kernel_blocks(self.centers):
+                system[i:j, :n] = block
+        system[np.arange(n), np.arange(n)] += self.regularization
+        system[:n, n:] = affine_block
+        system[n:, :n] = affine_block.T
+
+        norm = np.abs(system).sum(axis=0).max()
+        min_rcond = self.min_rcond / float(max(1, n * n))
+        if HAS_SCIPY:
+            lu, piv = scipy.linalg.lu_factor(system, check_finite=False)
+            if np.all(np.isfinite(lu)):
+                rcond, info = scipy.linalg.lapack.dgecon(lu, norm)
+                if info == 0 and rcond >= min_rcond:
+                    self.factor = lu, piv
+                    return
+        else:
+            try:
+                inverse = np.linalg.inv(system)
+            except np.linalg.LinAlgError:
+                inverse = None
+            if inverse is not None and np.all(np.isfinite(inverse)):
+                rcond = 1.0 / (norm * np.abs(inverse).sum(axis=0).max())
+                if rcond >= min_rcond:
+                    self.factor = inverse
+                    return
+
+        self.factorize_least_squares(system)
+
+    def factorize_least_squares(self, system):
+        """
+        Factorize a singular or ill-conditioned system as a regularized least-squares solve.
+
+        Parameters:
+        - system: (N+4)x(N+4) array, interpolation system
+        """
+        lhs = np.dot(system.T, system)
+        lhs[np.diag_indices_from(lhs)] += self.regularization
+        self.factor = np.dot(np.linalg.pinv(lhs), system.T)
+        self.least_squares = True
+
+    def get_kernel_pairs(self, points):
+        """
+        Parameters:
+        - points: Lx3 array of points
+
+        Returns:
+        - rows: K array, indices of the points
+        - cols: K array, indices of the centers closer than the radius
+        - values: K array, kernel values of the pairs
+        """
+        rows, cols, dist = self.grid.query_radius(points, self.radius)
+        return rows, cols, apply_rbf_kernel(dist, self.radius, self.kernel_mode)
+
+    def iter_kernel_blocks(self, points):
+        """
+        Parameters:
+        - points: Lx3 array of points
+
+        Yields:
+        - start, end: range of the points in the block
+        - block: (end-start)xN array of kernel values
+        """
+        chunk = max(1, self.max_chunk // max(1, 3 * len(self.centers)))
+        for i in range(0, len(points), chunk):
+            j = min(i + chunk, len(points))
+            block = compute_pairwise_distances(points[i:j], self.centers)
+            if self.kernel_mode != 0:
+                block = apply_rbf_kernel(block, self.radius, self.kernel_mode)
+            yield i, j, block
+
+    def solve(self, target_values):
+        """
+        Computes RBF interpolation coefficients (theta) for given target values.
+
+        Parameters:
+        - target_values: NxK array, output vectors at centers (Y)
+
+        Returns:
+        - theta: (N+4)xK matrix of interpolation weights
+        """
+        if self.factor is None:
+            self.factorize()
+
+        values = np.asarray(target_values, dtype=np.float64)
+        values = values.reshape(len(self.centers), -1)
+
+        rhs = np.zeros((len(self.centers) + 4, values.shape[1]))
+        rhs[:len(self.centers)] = values
+
+        if self.least_squares:
+            return np.dot(self.factor, rhs)
+        if self.compact and HAS_SCIPY:
+            return self.factor.solve(rhs)
+        if HAS_SCIPY:
+            return scipy.linalg.lu_solve(self.factor, rhs, check_finite=False)
+        return np.dot(self.factor, rhs)
+
+    def evaluate(self, points, coefficients):
+        """
+        Evaluate the RBF interpolator at new points.
+
+        Parameters:
+        - points: Lx3 array of new input points
+        - coefficients: (N+4)xK coefficient matrix from solve
+
+        Returns:
+        - interpolated_values: LxK array of predicted values
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        coefficients = np.asarray(coefficients, dtype=np.float64)
+        n = len(self.centers)
+
+        result = np.dot(get_affine_block(points), coefficients[n:])
+
+        if self.compact:
+            rows, cols, values = self.get_kernel_pairs(points)
+            for k in range(coefficients.shape[1]):
+                result[:, k] += np.bincount(rows, values * coefficients[cols, k], minlength=len(points))
+        else:
+            for i, j, block in self.iter_kernel_blocks(points):
+                result[i:j] += np.dot(block, coefficients[:n])
+
+        return result
 
 
 class RBF(object):
@@ -26,60 +248,55 @@ class RBF(object):
         Parameters:
         - centers: Nx3 array, input points (P)
         - centers_targets: Mx3 array, RBF centers (X)
-        - target_values: Mx3 array, output vectors at centers (Y)
+        - target_values: Nx3 array, output vectors at input points (Y)
         - radius: float, kernel scale (σ)
         - regularization: float, small diagonal term to avoid singularity
         - kernel_mode: int, selects kernel type (0 = identity, 1 = Gaussian, ...)
 
         Returns:
-        - theta: (N+4)x3 matrix of interpolation weights
+        - theta: (M+4)x3 matrix of interpolation weights
         """
         if not HAS_NUMPY:
             raise ImportError("This class requires NumPy. Please install it using 'pip install numpy'.")
 
-        n_input = len(centers)
-        n_centers = len(centers_targets)
-
-        P = np.array(centers)  # Shape: N x 3
-        X = np.array(centers_targets)  # Shape: M x 3
-        Y = np.array(target_values)  # Shape: M x 3
-
-        # Compute pairwise distance matrix between centers and inputs
-        distance_matrix = compute_pairwise_distances(X, P)  # Shape: M x N
+        P = np.asarray(centers, dtype=np.float64).reshape(-1, 3)
+        X = np.asarray(centers_targets, dtype=np.float64).reshape(-1, 3)
 
-        if kernel_mode != 0:
-            distance_matrix = apply_rbf_kernel(distance_matrix, radius, kernel_mode)
+        if P.shape == X.shape and np.array_equal(P, X):
+            solver = RBFSolver(X, radius=radius, regularization=regularization, kernel_mode=kernel_mode)
+            return solver.solve(target_values)
 
-        # Add affine term
-        affine_block = np.insert(P, 0, 1, axis=1)  # Add constant 1 as bias term (Shape: N x 4)
+        # input points differ from the centers: regularized least-squares fit
+        n_input = len(P)
+        n_centers = len(X)
+        solver = RBFSolver(X, radius=radius, kernel_mode=kernel_mode)
 
-        # Build interpolation matrix
         interpolation_matrix = np.zeros((n_input + 4, n_centers + 4))
-        interpolation_matrix[:n_input, :n_centers] = distance_matrix
-        interpolation_matrix[:n_input, n_centers:] = affine_block
-        interpolation_matrix[n_input:, :n_centers] = affine_block.T
+        if solver.compact:
+            rows, cols, values = solver.get_kernel_pairs(P)
+            interpolation_matrix[rows, cols] = values
+        else:
+            for i, j, block in solver.iter_kernel_blocks(P):
+                interpolation_matrix[i:j, :n_centers] = block
+        interpolation_matrix[:n_input, n_centers:] = get_affine_block(P)
+        interpolation_matrix[n_input:, :n_centers] = get_affine_block(X).T
 
-        # Right-hand side
         rhs = np.zeros((n_input + 4, 3))
-        rhs[:n_input, :] = Y
+        rhs[:n_input] = np.asarray(target_values, dtype=np.float64).reshape(-1, 3)
 
-        # Regularized least-squares solve: theta = (AᵀA + λI)⁻¹ Aᵀ y
-        regularizer = np.identity(n_input + 4) * regularization
-        A_T = interpolation_matrix.T
-        lhs = np.dot(A_T, interpolation_matrix) + regularizer
-        pseudo_inv = np.linalg.pinv(lhs)
-        theta = np.dot(np.dot(pseudo_inv, A_T), rhs)
-
-        return theta
+        # theta = (AᵀA + λI)⁻¹ Aᵀ y
+        lhs = np.dot(interpolation_matrix.T, interpolation_matrix)
+        lhs[np.diag_indices_from(lhs)] += regularization
+        return np.linalg.solve(lhs, np.dot(interpolation_matrix.T, rhs))
 
     @staticmethod
-    def evaluate(query_points, centers, coefficients, radius=1.0, kernel_mode=0):
+    def evaluate(centers, query_points, coefficients, radius=1.0, kernel_mode=0):
         """
         Evaluate the RBF interpolator at new points.
 
         Parameters:
-        - query_points: Lx3 array of new input points
         - centers: Mx3 array of RBF centers
+        - query_points: Lx3 array of new input points
         - coefficients: (M+4)x3 coefficient matrix from get_coefficients
         - radius: float, kernel scale
         - kernel_mode: int, kernel type
@@ -90,53 +307,43 @@ class RBF(object):
         if not HAS_NUMPY:
             raise ImportError("This class requires NumPy. Please install it using 'pip install numpy'.")
 
-        n_query = len(query_points)
-        n_centers = len(centers)
-
-        Q = np.array(query_points)
-        C = np.array(centers)
-
-        distance_matrix = compute_pairwise_distances(C, Q)  # Shape: M x L
+        solver = RBFSolver(centers, radius=radius, kernel_mode=kernel_mode)
+        return solver.evaluate(query_points, coefficients)
 
-        if kernel_mode != 0:
-            distance_matrix = apply_rbf_kernel(distance_matrix, radius, kernel_mode)
 
-        affine_block = np.insert(C, 0, 1, axis=1)  # Shape: M x 4
-
-        evaluation_matrix = np.zeros((n_centers, n_query + 4))
-        evaluation_matrix[:, :n_query] = distance_matrix
-        evaluation_matrix[:, n_query:] = affine_block
+# --- Utility Functions --- #
 
-        interpolated_values = np.dot(evaluation_matrix, coefficients)
-        return interpolated_values.reshape(n_centers, 3)
+def get_affine_block(points):
+    """
+    Parameters:
+    - points: Nx3 array
 
+    Returns:
+    - affine_block: Nx4 array, constant 1 as bias term followed by the coordinates
+    """
+    return np.insert(points, 0, 1, axis=1)
 
-# --- Utility Functions --- #
 
-def compute_pairwise_distances(x, y):
+def compute_pairwise_distances(x, y, chunk_size=1 << 22):
     """
-    Efficient Euclidean distance matrix between points in x and y.
+    Euclidean distance matrix between points in x and y, computed by chunks of rows.
 
     Parameters:
     - x: Nx3 array
     - y: Mx3 array
+    - chunk_size: int, maximum number of coordinate differences held in memory
 
     Returns:
     - dist_matrix: NxM array of distances
     """
-    x = np.array(x)
-    y = np.array(y)
-    npts_x = x.shape[0]
-    npts_y = y.shape[0]
-
-    expander_x = np.ones((1, npts_y, 3))
-    expander_y = np.ones((npts_x, 1, 3))
-
-    x_exp = np.expand_dims(x, 1)  # Shape: N x 1 x 3
-    y_exp = np.expand_dims(y, 0)  # Shape: 1 x M x 3
+    x = np.asarray(x, dtype=np.float64).reshape(-1, 3)
+    y = np.asarray(y, dtype=np.float64).reshape(-1, 3)
 
-    diff = -x_exp * expander_x + y_exp * expander_y
-    dist_matrix = np.sqrt(np.sum(diff ** 2, axis=2))
+    dist_matrix = np.empty((len(x), len(y)))
+    chunk = max(1, chunk_size // max(1, 3 * len(y)))
+    for i in range(0, len(x), chunk):
+        diff = x[i:i + chunk, None, :] - y[None, :, :]
+        np.sqrt(np.einsum('ijk,ijk->ij', diff, diff), out=dist_matrix[i:i + chunk])
 
     return dist_matrix
 
@@ -177,7 +384,8 @@ def gaussian_rbf(d, r):
 
 def thin_plate_rbf(d, r):
     v = d / r
-    return np.where(v > 0, v ** 2 * np.log(v), 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(v > 0, v ** 2 * np.log(v), 0)
 
 
 def multi_quad_rbf(d, r):
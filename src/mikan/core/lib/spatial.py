@@ -0,0 +1,462 @@
+# coding: utf-8
+"""
+Spatial queries over NumPy point and triangle arrays.
+
+Provides uniform hash grids over points and triangle bounding boxes answering
+radius, k-nearest and exact closest point queries for large batches of points,
+without any DCC dependency.
+"""
+
+try:
+    import numpy as np
+
+    HAS_NUMPY = True
+except:
+    HAS_NUMPY = False
+
+__all__ = ['PointGrid', 'TriangleGrid', 'get_box_distance', 'closest_point_on_triangles']
+
+
+class PointGrid(object):
+    """
+    Uniform hash grid of points for batched proximity queries.
+
+    Only occupied cells are stored (sorted by cell key), so the cell size can
+    be much smaller than the extent of the points.
+    """
+
+    max_pairs = 1 << 20
+
+    def __init__(self, points, cell_size):
+        """
+        Parameters:
+        - points: Nx3 array of points
+        - cell_size: float, size of the grid cells (usually the query radius)
+        """
+        if not HAS_NUMPY:
+            raise ImportError("This class requires NumPy. Please install it using 'pip install numpy'.")
+
+        self.points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        self.cell_size = max(float(cell_size), 1e-9)
+
+        if len(self.points):
+            self.lo = self.points.min(axis=0)
+            self.dims = np.floor((self.points.max(axis=0) - self.lo) / self.cell_size).astype(np.int64) + 1
+        else:
+            self.lo = np.zeros(3)
+            self.dims = np.ones(3, dtype=np.int64)
+
+        keys = self.get_cell_ids(self.get_cells(self.points))
+        self.order = np.argsort(keys, kind='stable')
+        self.keys = keys[self.order]
+
+    def __len__(self):
+        return len(self.points)
+
+    def get_cells(self, points):
+        return np.floor((points - self.lo) / self.cell_size).astype(np.int64)
+
+    def get_cell_ids(self, cells):
+        return cells[:, 0] + self.dims[0] * (cells[:, 1] + self.dims[1] * cells[:, 2])
+
+    def query_radius(self, points, radius):
+        """
+        Find all the pairs of query points and grid points closer than a radius.
+
+        Parameters:
+        - points: Lx3 array of query points
+        - radius: float, search radius
+
+        Returns:
+        - queries: K array, indices of the query points
+        - indices: K array, indices of the grid points
+        - distances: K array, distances between the pairs
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+
+        r = int(np.ceil(radius / self.cell_size))
+        offsets = np.arange(-r, r + 1)
+        offsets = np.stack(np.meshgrid(offsets, offsets, offsets, indexing='ij'), axis=-1).reshape(-1, 3)
+
+        result = ([], [], [])
+        chunk = max(1, self.max_pairs // len(offsets))
+        for i in range(0, len(points), chunk):
+            ids = np.arange(i, min(i + chunk, len(points)))
+            for item, _result in zip(self._query_radius(points, ids, offsets, radius), result):
+                _result.append(item)
+
+        if not result[0]:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0)
+        return tuple(np.concatenate(item) for item in result)
+
+    def _query_radius(self, points, ids, offsets, radius):
+        # candidate cells of each query point
+        cells = (self.get_cells(points[ids])[:, None, :] + offsets[None, :, :]).reshape(-1, 3)
+        owner = np.repeat(ids, len(offsets))
+        valid = np.all((cells >= 0) & (cells < self.dims), axis=1)
+        cells = self.get_cell_ids(cells[valid])
+        owner = owner[valid]
+
+        # expand (query, point) pairs
+        starts = np.searchsorted(self.keys, cells, side='left')
+        count = np.searchsorted(self.keys, cells, side='right') - starts
+
+        owner = np.repeat(owner, count)
+        local = np.arange(count.sum()) - np.repeat(np.cumsum(count) - count, count)
+        indices = self.order[np.repeat(starts, count) + local]
+
+        d = np.sqrt(((points[owner] - self.points[indices]) ** 2).sum(axis=1))
+        valid = d <= radius
+        return owner[valid], indices[valid], d[valid]
+
+    def query_nearest(self, points, k=1):
+        """
+        Find the k nearest grid points of each query point.
+
+        Parameters:
+        - points: Lx3 array of query points
+        - k: int, number of neighbours
+
+        Returns:
+        - indices: Lxk array, indices of the nearest grid points (-1 if missing)
+        - distances: Lxk array, distances to the nearest grid points (inf if missing)
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        n = len(points)
+
+        indices = np.full((n, k), -1, dtype=np.int64)
+        distances = np.full((n, k), np.inf)
+        if not len(self.points):
+            return indices, distances
+
+        found = min(k, len(self.points))
+        pending = np.arange(n)
+        radius = self.cell_size
+
+        while len(pending):
+            # search every point once blocks get larger than the grid
+            r = int(np.ceil(radius / self.cell_size))
+            if (2 * r + 1) ** 3 >= len(self.points):
+                chunk = max(1, self.max_pairs // len(self.points))
+                for i in range(0, len(pending), chunk):
+                    ids = pending[i:i + chunk]
+                    d = np.sqrt(((points[ids][:, None, :] - self.points[None, :, :]) ** 2).sum(axis=2))
+                    owner = np.repeat(np.arange(len(ids)), len(self.points))
+                    self._set_nearest(ids, owner, np.tile(np.arange(len(self.points)), len(ids)), d.ravel(), indices, distances)
+                break
+
+            # points with enough neighbours within the radius are resolved
+            owner, _indices, d = self.query_radius(points[pending], radius)
+            done = np.bincount(owner, minlength=len(pending)) >= found
+            valid = done[owner]
+            self._set_nearest(pending, owner[valid], _indices[valid], d[valid], indices, distances)
+
+            pending = pending[~done]
+            radius *= 2
+
+        return indices, distances
+
+    @staticmethod
+    def _set_nearest(ids, owner, indices, d, result_indices, result_distances):
+        k = result_indices.shape[1]
+
+        order = np.lexsort((d, owner))
+        owner = owner[order]
+        first = np.ones(len(owner), dtype=bool)
+        first[1:] = owner[1:] != owner[:-1]
+        starts = np.flatnonzero(first)
+        rank = np.arange(len(owner)) - np.repeat(starts, np.diff(np.append(starts, len(owner))))
+
+        valid = rank < k
+        order = order[valid]
+        target = ids[owner[valid]]
+        rank = rank[valid]
+
+        result_indices[target, rank] = indices[order]
+        result_distances[target, rank] = d[order]
+
+
+class TriangleGrid(object):
+    """
+    Uniform grid of triangles for batched closest point queries.
+
+    Each triangle is registered in every cell overlapped by its bounding box,
+    queries then search growing blocks of cells around each point until the
+    closest triangle found is guaranteed to be the closest of the whole mesh.
+    """
+
+    max_cells = 1 << 21
+    max_pairs = 1 << 18
+
+    def __init__(self, points, triangles, cell_size=None):
+        """
+        Parameters:
+        - points: Nx3 array, vertices of the mesh
+        - triangles: Tx3 array, vertex indices of each triangle
+        - cell_size: float, size of the grid cells (estimated from the triangles if None)
+        """
+        if not HAS_NUMPY:
+            raise ImportError("This class requires NumPy. Please install it using 'pip install numpy'.")
+
+        self.points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        self.triangles = np.asarray(triangles, dtype=np.int64).reshape(-1, 3)
+        if not len(self.triangles):
+            raise ValueError('cannot build a triangle grid without triangles')
+
+        corners = self.points[self.triangles]  # Shape: T x 3 x 3
+        tri_min = corners.min(axis=1)
+        tri_max = corners.max(axis=1)
+        self.tri_min = tri_min
+        self.tri_max = tri_max
+
+        self.lo = tri_min.min(axis=0)
+        extent = np.maximum(tri_max.max(axis=0) - self.lo, 1e-9)
+
+        if cell_size is None:
+            cell_size = (tri_max - tri_min).max(axis=1).mean()
+        cell_size = max(float(cell_size), extent.max() / 1024., 1e-9)
+        while np.prod(np.floor(extent / cell_size) + 1) > self.max_cells:
+            cell_size *= 1.25
+
+        self.cell_size = cell_size
+        self.dims = (np.floor(extent / cell_size) + 1).astype(np.int64)
+
+        # register triangles in every cell of their bounding box
+        cmin = self.get_cells(tri_min)
+        cmax = self.get_cells(tri_max)
+        span = cmax - cmin + 1
+        count = np.prod(span, axis=1)
+
+        tri_ids = np.repeat(np.arange(len(self.triangles)), count)
+        local = np.arange(count.sum()) - np.repeat(np.cumsum(count) - count, count)
+        span = span[tri_ids]
+        ix = local % span[:, 0]
+        iy = (local // span[:, 0]) % span[:, 1]
+        iz = local // (span[:, 0] * span[:, 1])
+        cells = cmin[tri_ids] + np.stack([ix, iy, iz], axis=1)
+
+        cell_ids = self.get_cell_ids(cells)
+        order = np.argsort(cell_ids, kind='stable')
+        self.cell_triangles = tri_ids[order]
+        self.cell_starts = np.searchsorted(cell_ids[order], np.arange(np.prod(self.dims) + 1))
+
+    def get_cells(self, points):
+        cells = np.floor((points - self.lo) / self.cell_size).astype(np.int64)
+        return np.clip(cells, 0, self.dims - 1)
+
+    def get_cell_ids(self, cells):
+        return cells[:, 0] + self.dims[0] * (cells[:, 1] + self.dims[1] * cells[:, 2])
+
+    def closest(self, points):
+        """
+        Find the closest triangle of each query point.
+
+        Parameters:
+        - points: Lx3 array of query points
+
+        Returns:
+        - triangles: L array, index of the closest triangle
+        - barycentric: Lx3 array, barycentric coordinates of the closest point
+        - distances: L array, distance to the closest point
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        n = len(points)
+
+        best_tri = np.zeros(n, dtype=np.int64)
+        best_bary = np.zeros((n, 3))
+        best_d2 = np.full(n, np.inf)
+
+        cells = self.get_cells(points)
+        pending = np.arange(n)
+        inner = -1
+        radius = 0
+
+        while len(pending):
+            lo = cells[pending] - radius
+            hi = cells[pending] + radius
+            full = np.all(lo <= 0, axis=1) & np.all(hi >= self.dims - 1, axis=1)
+
+            # search every triangle once blocks get larger than the mesh
+            if (2 * radius + 1) ** 3 >= len(self.triangles):
+                self._search_all(points, pending, best_tri, best_bary, best_d2)
+                break
+
+            # search the shell of cells around each pending point
+            offsets = np.arange(-radius, radius + 1)
+            offsets = np.stack(np.meshgrid(offsets, offsets, offsets, indexing='ij'), axis=-1).reshape(-1, 3)
+            offsets = offsets[np.abs(offsets).max(axis=1) > inner]
+
+            self._search(points, pending, cells[pending], offsets, best_tri, best_bary, best_d2)
+
+            # a point is resolved once no triangle outside the searched block can be closer
+            q = points[pending]
+            box_lo = self.lo + lo * self.cell_size
+            box_hi = self.lo + (hi + 1) * self.cell_size
+            margin_lo = np.where(lo <= 0, np.inf, q - box_lo)
+            margin_hi = np.where(hi >= self.dims - 1, np.inf, box_hi - q)
+            margin = np.minimum(margin_lo, margin_hi).min(axis=1)
+
+            resolved = full | (best_d2[pending] <= margin ** 2)
+            pending = pending[~resolved]
+            inner = radius
+            radius = max(1, radius * 2)
+
+        return best_tri, best_bary, np.sqrt(best_d2)
+
+    def _search(self, points, ids, cells, offsets, best_tri, best_bary, best_d2):
+        if len(ids) > 1 and len(ids) * len(offsets) > self.max_pairs:
+            half = len(ids) // 2
+            self._search(points, ids[:half], cells[:half], offsets, best_tri, best_bary, best_d2)
+            self._search(points, ids[half:], cells[half:], offsets, best_tri, best_bary, best_d2)
+            return
+
+        # candidate cells of each point, closer than the current best distance
+        block = (cells[:, None, :] + offsets[None, :, :]).reshape(-1, 3)
+        owner = np.repeat(np.arange(len(ids)), len(offsets))
+        valid = np.all((block >= 0) & (block < self.dims), axis=1)
+        block = block[valid]
+        owner = owner[valid]
+
+        cell_lo = self.lo + block * self.cell_size
+        valid = get_box_distance(points[ids[owner]], cell_lo, cell_lo + self.cell_size) < best_d2[ids[owner]]
+        block = self.get_cell_ids(block[valid])
+        owner = owner[valid]
+
+        # expand (point, triangle) pairs
+        starts = self.cell_starts[block]
+        count = self.cell_starts[block + 1] - starts
+        if not count.sum():
+            return
+
+        # split large batches to bound memory
+        if count.sum() > self.max_pairs and len(ids) > 1:
+            half = len(ids) // 2
+            self._search(points, ids[:half], cells[:half], offsets, best_tri, best_bary, best_d2)
+            self._search(points, ids[half:], cells[half:], offsets, best_tri, best_bary, best_d2)
+            return
+
+        owner = np.repeat(owner, count)
+        local = np.arange(count.sum()) - np.repeat(np.cumsum(count) - count, count)
+        tris = self.cell_triangles[np.repeat(starts, count) + local]
+
+        self._update(points, ids, owner, tris, best_tri, best_bary, best_d2)
+
+    def _search_all(self, points, ids, best_tri, best_bary, best_d2):
+        n = len(self.triangles)
+        chunk = max(1, self.max_pairs // n)
+        for i in range(0, len(ids), chunk):
+            _ids = ids[i:i + chunk]
+            owner = np.repeat(np.arange(len(_ids)), n)
+            tris = np.tile(np.arange(n), len(_ids))
+            self._update(points, _ids, owner, tris, best_tri, best_bary, best_d2)
+
+    def _update(self, points, ids, owner, tris, best_tri, best_bary, best_d2):
+        # skip triangles whose bounding box is farther than the current best
+        p = points[ids[owner]]
+        valid = get_box_distance(p, self.tri_min[tris], self.tri_max[tris]) < best_d2[ids[owner]]
+        if not valid.any():
+            return
+        owner = owner[valid]
+        tris = tris[valid]
+        p = p[valid]
+
+        corners = self.points[self.triangles[tris]]
+        bary = closest_point_on_triangles(p, corners[:, 0], corners[:, 1], corners[:, 2])
+        closest = np.einsum('ij,ijk->ik', bary, corners)
+        d2 = ((closest - p) ** 2).sum(axis=1)
+
+        # keep the closest pair of each point (pairs are sorted by point)
+        first = np.ones(len(owner), dtype=bool)
+        first[1:] = owner[1:] != owner[:-1]
+        segment = np.cumsum(first) - 1
+        closest = np.minimum.reduceat(d2, np.flatnonzero(first))
+        order = np.flatnonzero(d2 == closest[segment])
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = segment[order][1:] != segment[order][:-1]
+        order = order[first]
+
+        target = ids[owner[order]]
+        better = d2[order] < best_d2[target]
+        order = order[better]
+        target = target[better]
+
+        best_tri[target] = tris[order]
+        best_bary[target] = bary[order]
+        best_d2[target] = d2[order]
+
+
+def get_box_distance(p, lo, hi):
+    """
+    Squared distances from points to axis aligned boxes.
+
+    Parameters:
+    - p: Nx3 array of points
+    - lo, hi: Nx3 arrays of box corners
+
+    Returns:
+    - distances: N array of squared distances (0 inside the boxes)
+    """
+    d = np.maximum(np.maximum(lo - p, p - hi), 0)
+    return (d * d).sum(axis=1)
+
+
+def closest_point_on_triangles(p, a, b, c):
+    """
+    Barycentric coordinates of the closest points on triangles (abc) from points p.
+
+    Parameters:
+    - p: Nx3 array of query points
+    - a, b, c: Nx3 arrays of triangle corners
+
+    Returns:
+    - barycentric: Nx3 array of weights of a, b and c
+    """
+    ab = b - a
+    ac = c - a
+    ap = p - a
+    bp = p - b
+    cp = p - c
+
+    d1 = (ab * ap).sum(axis=1)
+    d2 = (ac * ap).sum(axis=1)
+    d3 = (ab * bp).sum(axis=1)
+    d4 = (ac * bp).sum(axis=1)
+    d5 = (ab * cp).sum(axis=1)
+    d6 = (ac * cp).sum(axis=1)
+
+    va = d3 * d6 - d5 * d4
+    vb = d5 * d2 - d1 * d6
+    vc = d1 * d4 - d3 * d2
+
+    def div(x, y):
+        return np.divide(x, y, out=np.zeros_like(x), where=y != 0)
+
+    # inside face region
+    denom = va + vb + vc
+    v = div(vb, denom)
+    w = div(vc, denom)
+    bary = np.stack([1 - v - w, v, w], axis=1)
+
+    # edge and vertex regions, from the lowest to the highest priority
+    e = (va <= 0) & (d4 - d3 >= 0) & (d5 - d6 >= 0)
+    w = div(d4 - d3, (d4 - d3) + (d5 - d6))
+    bary[e] = np.stack([np.zeros_like(w), 1 - w, w], axis=1)[e]
+
+    e = (vb <= 0) & (d2 >= 0) & (d6 <= 0)
+    w = div(d2, d2 - d6)
+    bary[e] = np.stack([1 - w, np.zeros_like(w), w], axis=1)[e]
+
+    e = (d6 >= 0) & (d5 <= d6)
+    bary[e] = (0, 0, 1)
+
+    e = (vc <= 0) & (d1 >= 0) & (d3 <= 0)
+    v = div(d1, d1 - d3)
+    bary[e] = np.stack([1 - v, v, np.zeros_like(v)], axis=1)[e]
+
+    e = (d3 >= 0) & (d4 <= d3)
+    bary[e] = (0, 1, 0)
+
+    e = (d1 <= 0) & (d2 <= 0)
+    bary[e] = (1, 0, 0)
+
+    return bary
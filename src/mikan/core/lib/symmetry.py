@@ -0,0 +1,154 @@
+# coding: utf-8
+"""
+Symmetry tables of point sets.
+
+Mirrored points are matched by nearest neighbour search within a tolerance
+instead of rounding coordinates, so pairs straddling a rounding boundary are
+not missed. Tables keep the mapping format used by WeightMap.mirror/flip and
+cache the index arrays of each direction for vectorized mirroring.
+"""
+
+try:
+    import numpy as np
+
+    HAS_NUMPY = True
+except:
+    HAS_NUMPY = False
+
+from .spatial import PointGrid
+
+__all__ = ['SymmetryTable', 'get_symmetry_table', 'get_symmetry_arrays']
+
+
+class SymmetryTable(dict):
+    """
+    Symmetry mapping of point indices.
+
+    Keys:
+    - 1: dict, positive side index -> negative side index
+    - -1: dict, negative side index -> positive side index
+    - 0: dict, middle index -> itself
+    - None: list, indices without symmetry
+    """
+
+    def __init__(self, *args, **kw):
+        dict.__init__(self, *args, **kw)
+        self.arrays = {}
+
+    def copy(self):
+        table = SymmetryTable()
+        for key, value in self.items():
+            table[key] = value.copy() if isinstance(value, dict) else list(value)
+        table.arrays = self.arrays
+        return table
+
+    def get_arrays(self, key):
+        """
+        Parameters:
+        - key: direction of the mapping (1, -1 or 0)
+
+        Returns:
+        - src: array of source indices
+        - dst: array of destination indices
+        """
+        if key not in self.arrays:
+            n = len(self[key])
+            src = np.fromiter(self[key].keys(), dtype=np.int64, count=n)
+            dst = np.fromiter(self[key].values(), dtype=np.int64, count=n)
+            self.arrays[key] = src, dst
+        return self.arrays[key]
+
+
+def get_symmetry_arrays(sym, key):
+    """
+    Index arrays of a symmetry mapping, cached if sym is a SymmetryTable.
+
+    Parameters:
+    - sym: symmetry mapping (SymmetryTable or plain dict)
+    - key: direction of the mapping (1, -1 or 0)
+
+    Returns:
+    - src: array of source indices
+    - dst: array of destination indices
+    """
+    if isinstance(sym, SymmetryTable):
+        return sym.get_arrays(key)
+    n = len(sym[key])
+    src = np.fromiter(sym[key].keys(), dtype=np.int64, count=n)
+    dst = np.fromiter(sym[key].values(), dtype=np.int64, count=n)
+    return src, dst
+
+
+def get_symmetry_table(points, axis=0, center=(0, 0, 0), epsilon=0.001):
+    """
+    Build the symmetry table of a point set.
+
+    Points closer than epsilon to the symmetry plane are middle points, each
+    positive point is paired with the closest unpaired negative point found
+    within epsilon of its mirror, closest pairs first.
+
+    Parameters:
+    - points: Nx3 array of points
+    - axis: int, axis normal to the symmetry plane (0 for yz, 1 for xz, 2 for xy)
+    - center: point of the symmetry plane
+    - epsilon: float, matching tolerance
+
+    Returns:
+    - table: SymmetryTable
+    """
+    if not HAS_NUMPY:
+        raise ImportError("This function requires NumPy. Please install it using 'pip install numpy'.")
+
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 3) - np.asarray(center, dtype=np.float64)
+    n = len(points)
+
+    mid = np.flatnonzero(np.abs(points[:, axis]) < epsilon)
+    pos = np.flatnonzero(points[:, axis] >= epsilon)
+    neg = np.flatnonzero(points[:, axis] <= -epsilon)
+
+    # match mirrored positive points with negative points
+    mirrored = points[pos]
+    mirrored[:, axis] *= -1
+
+    grid = PointGrid(points[neg], epsilon)
+    queries, indices, distances = grid.query_radius(mirrored, epsilon)
+
+    order = np.lexsort((indices, queries, distances))
+    queries = queries[order]
+    indices = indices[order]
+
+    pairs = []
+    used_pos = np.zeros(len(pos), dtype=bool)
+    used_neg = np.zeros(len(neg), dtype=bool)
+    for q, i in zip(queries.tolist(), indices.tolist()):
+        if used_pos[q] or used_neg[i]:
+            continue
+        used_pos[q] = True
+        used_neg[i] = True
+        pairs.append((q, i))
+
+    table = SymmetryTable()
+    table[1] = {}
+    table[-1] = {}
+    table[0] = dict((i, i) for i in mid.tolist())
+
+    if pairs:
+        pairs = np.array(pairs, dtype=np.int64)
+        src = pos[pairs[:, 0]]
+        dst = neg[pairs[:, 1]]
+        order = np.argsort(src)
+        src = src[order]
+        dst = dst[order]
+
+        table[1] = dict(zip(src.tolist(), dst.tolist()))
+        table[-1] = dict(zip(dst.tolist(), src.tolist()))
+        table.arrays[1] = src, dst
+        table.arrays[-1] = dst, src
+
+    done = np.zeros(n, dtype=bool)
+    done[mid] = True
+    done[pos[used_pos]] = True
+    done[neg[used_neg]] = True
+    table[None] = np.flatnonzero(~done).tolist()
+
+    return table
@@ -0,0 +1,98 @@
+# coding: utf-8
+"""
+Closest point transfer of per vertex data between geometries.
+
+Destination points are projected once on the closest triangles of the source
+mesh, every map is then interpolated from the barycentric coordinates of
+these projections in a single matrix product.
+"""
+
+try:
+    import numpy as np
+
+    HAS_NUMPY = True
+except:
+    HAS_NUMPY = False
+
+from .spatial import TriangleGrid
+
+__all__ = ['ClosestPointTransfer']
+
+
+class ClosestPointTransfer(object):
+    """
+    Interpolation of source vertex values at destination points.
+
+    Flipping mirrors the destination points across the given axis before the
+    projection. Mirroring projects both the points and their mirror, and keeps
+    the highest of both interpolated values.
+    """
+
+    axes = {'x': 0, 'y': 1, 'z': 2}
+
+    def __init__(self, points, triangles, targets, flip=False, mirror=False, axis='x'):
+        """
+        Parameters:
+        - points: Nx3 array, vertices of the source mesh
+        - triangles: Tx3 array, vertex indices of the source triangles
+        - targets: Lx3 array, destination points (same space as the source)
+        - flip: bool, flip the destination points across the axis
+        - mirror: bool, merge the destination points with their mirror
+        - axis: str, mirror axis ('x', 'y' or 'z')
+        """
+        if not HAS_NUMPY:
+            raise ImportError("This class requires NumPy. Please install it using 'pip install numpy'.")
+        if axis not in self.axes:
+            raise ValueError('wrong axis')
+
+        self.n_points = len(points)
+        self.grid = TriangleGrid(points, triangles)
+
+        targets = np.asarray(targets, dtype=np.float64).reshape(-1, 3)
+        self.n_targets = len(targets)
+
+        self.projections = []
+        if not flip or mirror:
+            self.projections.append(self.project(targets))
+        if flip or mirror:
+            targets = targets.copy()
+            targets[:, self.axes[axis]] *= -1
+            self.projections.append(self.project(targets))
+
+    def project(self, targets):
+        """
+        Parameters:
+        - targets: Lx3 array of points
+
+        Returns:
+        - indices: Lx3 array, source vertices of the closest triangles
+        - weights: Lx3 array, barycentric weights of these vertices
+        """
+        tris, bary, _ = self.grid.closest(targets)
+        return self.grid.triangles[tris], bary
+
+    def apply(self, values):
+        """
+        Interpolate source values at the destination points.
+
+        Parameters:
+        - values: N or NxK array of values per source vertex
+
+        Returns:
+        - values: L or LxK array of values per destination point
+        """
+        values = np.asarray(values, dtype=np.float64)
+        if len(values) != self.n_points:
+            raise ValueError('expected {} values, got {}'.format(self.n_points, len(values)))
+
+        result = None
+        for indices, weights in self.projections:
+            if values.ndim == 1:
+                _result = (values[indices] * weights).sum(axis=1)
+            else:
+                _result = np.einsum('ij,ijk->ik', weights, values[indices])
+            if result is None:
+                result = _result
+            else:
+                result = np.maximum(result, _result)
+        return result
@@ -1,6 +1,7 @@
 # coding: utf-8
 
 import time
+import json
 import os.path
 import logging
 import platform
@@ -24,7 +25,7 @@ __all__ = [
     'create_logger', 'SafeHandler', 'get_formatter',
     'timed_code', 'set_time_logging', 'get_date_str',
     'get_version',
-    'MultiTimer'
+    'MultiTimer', 'BuildProfiler'
 ]
 
 logging.SUCCESS = 25  # between WARNING and INFO
@@ -268,7 +269,8 @@ def timed_code(name=None, level='INFO', force=False):
     msg = '{} took'.format(name) if name else 'section took'
     t0 = default_timer()
     try:
-        yield
+        with BuildProfiler.span(name or 'section', 'timed'):
+            yield
     finally:
         if debug_timings or force:
             delta = default_timer() - t0
@@ -324,7 +326,8 @@ class MultiTimer(object):
 
         start = default_timer()
         try:
-            yield
+            with BuildProfiler.span(name, 'timer'):
+                yield
         finally:
             duration = default_timer() - start
             cls.timings[name][0] += duration
@@ -348,3 +351,143 @@ class MultiTimer(object):
     @classmethod
     def reset(cls):
         cls.timings.clear()
+
+
+class BuildProfiler(object):
+    """
+    Record nested spans of a build (wall time, call counts and node count deltas).
+
+    Spans are opened with BuildProfiler.span, they are only recorded while a
+    profiler is active (see BuildProfiler.use), timed_code and MultiTimer
+    blocks are recorded as spans too.
+
+    The optional counter is a callable returning the number of nodes of the
+    scene, it is entered as a context while the profiler is active if it is one.
+
+    Usage:
+        profiler = BuildProfiler()
+        with BuildProfiler.use(profiler):
+            with BuildProfiler.span('template: arm.leg', 'template', template='leg'):
+                ...
+        profiler.report(20)
+        profiler.save('build.trace.json')  # chrome://tracing, perfetto or speedscope
+    """
+
+    active = None
+
+    def __init__(self, counter=None):
+        self.counter = counter
+        self.events = []
+        self.stack = []
+        self.start = default_timer()
+
+    @classmethod
+    @contextmanager
+    def use(cls, profiler):
+        previous = cls.active
+        cls.active = profiler
+        try:
+            if profiler is not None and hasattr(profiler.counter, '__enter__'):
+                with profiler.counter:
+                    yield profiler
+            else:
+                yield profiler
+        finally:
+            cls.active = previous
+
+    def count_nodes(self):
+        if self.counter is None:
+            return 0
+        return self.counter()
+
+    @classmethod
+    @contextmanager
+    def span(cls, name, cat='build', **args):
+        profiler = cls.active
+        if profiler is None:
+            yield
+            return
+
+        event = {'name': name, 'cat': cat, 'args': args, 'child_time': 0., 'child_nodes': 0}
+        stack = profiler.stack
+        stack.append(event)
+
+        nodes = profiler.count_nodes()
+        t0 = default_timer()
+        try:
+            yield
+        finally:
+            event['ts'] = t0 - profiler.start
+            event['dur'] = default_timer() - t0
+            event['nodes'] = profiler.count_nodes() - nodes
+
+            stack.pop()
+            if stack:
+                stack[-1]['child_time'] += event['dur']
+                stack[-1]['child_nodes'] += event['nodes']
+            profiler.events.append(event)
+
+    @classmethod
+    def annotate(cls, **args):
+        """Add arguments to the innermost open span."""
+        profiler = cls.active
+        if profiler is not None and profiler.stack:
+            profiler.stack[-1]['args'].update(args)
+
+    def get_stats(self, sort='self'):
+        """
+        Aggregate the recorded spans by name.
+
+        Returns:
+        - list of dict: name, cat, count, total and self times, total and self node deltas, sorted by the given key
+        """
+        stats = {}
+        for event in self.events:
+            key = event['name']
+            if key not in stats:
+                stats[key] = {'name': key, 'cat': event['cat'], 'count': 0, 'total': 0., 'self': 0., 'nodes': 0, 'self_nodes': 0}
+            row = stats[key]
+            row['count'] += 1
+            row['total'] += event['dur']
+            row['self'] += event['dur'] - event['child_time']
+            row['nodes'] += event['nodes']
+            row['self_nodes'] += event['nodes'] - event['child_nodes']
+
+        return sorted(stats.values(), key=lambda row: row[sort], reverse=True)
+
+    def report(self, n=20, sort='self'):
+        stats = self.get_stats(sort=sort)
+        if not stats:
+            return
+
+        log.info('profile: top {} spans by {} time'.format(min(n, len(stats)), sort))
+        log.info(u'{:>10} {:>10} {:>7} {:>8}  {}'.format('self', 'total', 'count', 'nodes', 'name'))
+        for row in stats[:n]:
+            log.info(u'{:>10} {:>10} {:>7} {:>8}  {}'.format(
+                time_to_str(row['self']), time_to_str(row['total']), row['count'], row['self_nodes'], row['name']
+            ))
+
+    def to_chrome_trace(self):
+        """
+        Export the recorded spans as Chrome trace events (complete events, times in microseconds).
+        """
+        events = []
+        for event in sorted(self.events, key=lambda e: (e['ts'], -e['dur'])):
+            args = dict(event['args'])
+            args['nodes'] = event['nodes']
+            events.append({
+                'name': event['name'],
+                'cat': event['cat'],
+                'ph': 'X',
+                'ts': round(event['ts'] * 1e6, 3),
+                'dur': round(event['dur'] * 1e6, 3),
+                'pid': 1,
+                'tid': 1,
+                'args': args,
+            })
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def save(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.to_chrome_trace(), f, default=str)
+        log.info('profile: saved trace to {}'.format(path))
@@ -33,10 +33,11 @@ class UserPrefs(object):
 
     @classmethod
     def get_path(cls):
-        if QStandardPaths is None:
-            raise RuntimeError('PySide is required for saving user preferences.')
-
-        base_dir = QStandardPaths.writableLocation(QStandardPaths.DocumentsLocation)
+        if QStandardPaths is not None:
+            base_dir = QStandardPaths.writableLocation(QStandardPaths.DocumentsLocation)
+        else:
+            # headless sessions (null backend, batch tools)
+            base_dir = os.path.join(os.path.expanduser('~'), 'Documents')
 
         full_dir = os.path.join(base_dir, cls.name)
         if not os.path.exists(full_dir):
@@ -2,7 +2,7 @@
 
 import re
 import sys
-from fnmatch import fnmatch
+from fnmatch import translate
 from abc import abstractmethod
 from copy import copy, deepcopy
 from collections import defaultdict, OrderedDict
@@ -134,18 +134,36 @@ class BaseTree(MutableMapping):
 
 _void = object()
 
+_wildcards = re.compile(r'[*?[]')
+_patterns = {}
+
+
+def _compile_pattern(pattern):
+    try:
+        return _patterns[pattern]
+    except KeyError:
+        if len(_patterns) >= 1024:
+            _patterns.clear()
+        match = _patterns[pattern] = re.compile(translate(pattern)).match
+        return match
+
 
 class Tree(BaseTree):
 
+    cache_size = 256
+
     def __init__(self, data=None, sep='.'):
         BaseTree.__init__(self, sep=sep)
 
         self._branches = defaultdict(OrderedSet)
         self._items = {}
+        self._matches = OrderedDict()
         if data:
             self.update(data)
 
     def __setitem__(self, key, value):
+        if key not in self._items:
+            self._matches.clear()
         if key in self._branches:
             del self[key]
         self._items[key] = value
@@ -163,15 +181,15 @@ class Tree(BaseTree):
             return self._items[key]
         except KeyError:
             if '*' in key:
-                tree = Subtree()
-                for _key in self._items:
-                    if fnmatch(_key, key):
-                        tree[_key] = self._items[_key]
-                if not tree:
+                keys = self.match(key)
+                if not keys:
                     raise KeyError(key)
-                elif len(tree) == 1:
-                    return list(tree._items.values())[0]
+                elif len(keys) == 1:
+                    return self._items[keys[0]]
                 else:
+                    tree = Subtree()
+                    for _key in keys:
+                        tree[_key] = self._items[_key]
                     return tree
             else:
                 if key not in self._branches:
@@ -179,6 +197,7 @@ class Tree(BaseTree):
                 return self.branch(key)
 
     def __delitem__(self, key):
+        self._matches.clear()
         try:
             del self._items[key]
             if self._key_sep in key:
@@ -216,6 +235,39 @@ class Tree(BaseTree):
 
     copy = __copy__
 
+    def match(self, pattern):
+        """
+        Returns the keys matching a wildcard ``pattern``.
+        Results are cached until a key is added or removed.
+        """
+        try:
+            keys = self._matches.pop(pattern)
+        except KeyError:
+            keys = self._match(pattern)
+            if len(self._matches) >= self.cache_size:
+                self._matches.popitem(last=False)
+        self._matches[pattern] = keys
+        return keys
+
+    def _match(self, pattern):
+        match = _compile_pattern(pattern)
+
+        # only scan the branch of the static lead of the pattern
+        lead = []
+        for part in pattern.split(self._key_sep)[:-1]:
+            if _wildcards.search(part):
+                break
+            lead.append(part)
+
+        if not lead:
+            return [key for key in self._items if match(key)]
+
+        lead = self._key_sep.join(lead)
+        if lead not in self._branches:
+            return []
+        prefix = lead + self._key_sep
+        return [prefix + tail for tail in self._branches[lead] if match(prefix + tail)]
+
     def branch(self, key):
         """ Returns a :class:`BranchProxy` object for specified ``key`` """
         return Branch(key, self)
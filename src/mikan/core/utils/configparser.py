@@ -1,10 +1,18 @@
 # coding: utf-8
 
+from bisect import bisect_left
 from six.moves import range
 
 
 class ConfigParser(object):
 
+    # section index cache, rebuilt when the stored data changes
+    _data = None
+    _lines = ()
+    _sections = ()
+    _headers = {}
+    _brackets = ()
+
     def __init__(self, node, attr='notes'):
         """placeholder"""
         self.node = node
@@ -25,12 +33,14 @@ class ConfigParser(object):
         for s in self.sections():
             if s not in counter:
                 counter[s] = 0
-            section = ConfigSection(self, s)[counter[s]]
+            section = ConfigSection(self, s)
+            section.n = counter[s]
             counter[s] += 1
             yield section
 
     def __contains__(self, key):
-        return key in self.sections()
+        self.update_index()
+        return key in self._headers
 
     def _read(self):
         """placeholder"""
@@ -41,26 +51,71 @@ class ConfigParser(object):
         pass
 
     def append(self, section):
-        return ConfigSection(self, section)[self.sections().count(section)]
+        return ConfigSection(self, section)[self.count(section)]
 
-    def get_lines(self):
+    def update_index(self):
+        """Read the stored data and rebuild the section index if it changed."""
         data = self._read()
-        if data:
-            return data.split('\n')
-        else:
-            return []
+        if data != self._data:
+            self.set_index(data)
 
-    def set_lines(self, lines):
-        self._write('\n'.join(lines))
+    def set_index(self, data, lines=None):
+        """Cache the lines of the stored data and the position of their sections."""
+        if lines is None:
+            lines = data.split('\n') if data else []
 
-    def sections(self):
-        lines = self.get_lines()
-        s = []
-        for line in lines:
+        sections = []
+        headers = {}
+        brackets = []
+        for i, line in enumerate(lines):
+            if line.startswith('['):
+                brackets.append(i)
             line = line.strip()
             if line.startswith('[') and line.endswith(']'):
-                s.append(line[1:-1])
-        return s
+                name = line[1:-1]
+                sections.append(name)
+                headers.setdefault(name, []).append(i)
+
+        self._data = data
+        self._lines = lines
+        self._sections = sections
+        self._headers = headers
+        self._brackets = brackets
+
+    def get_span(self, name, n=0):
+        """Get the line range of the nth section of a given name.
+
+        Returns:
+            tuple: (start, end) line indices of the section content (end is None for the last section),
+            or None if the section does not exist.
+        """
+        self.update_index()
+        headers = self._headers.get(name, ())
+        if n >= len(headers):
+            return
+
+        start = headers[n] + 1
+        i = bisect_left(self._brackets, start)
+        if i < len(self._brackets):
+            return start, self._brackets[i]
+        return start, None
+
+    def get_lines(self):
+        self.update_index()
+        return list(self._lines)
+
+    def set_lines(self, lines):
+        data = '\n'.join(lines)
+        self._write(data)
+        self.set_index(data, list(lines))
+
+    def sections(self):
+        self.update_index()
+        return list(self._sections)
+
+    def count(self, name):
+        self.update_index()
+        return len(self._headers.get(name, ()))
 
     def get_all(self):
         s = []
@@ -95,7 +150,7 @@ class ConfigSection(object):
 
     def __getitem__(self, n):
         n = int(n)
-        s = self.parser.sections().count(self.name)
+        s = self.parser.count(self.name)
         if s == 0 and n == -1:
             n = 0
         if n < 0:
@@ -115,7 +170,7 @@ class ConfigSection(object):
         section.delete()
 
     def __iter__(self):
-        s = self.parser.sections().count(self.name)
+        s = self.parser.count(self.name)
         if self.n is None:
             return iter([ConfigSection(self.parser, self.name)[x] for x in range(s)])
         else:
@@ -143,34 +198,18 @@ class ConfigSection(object):
         return 0
 
     def parse(self):
-        lines = self.parser.get_lines()
-        line_start = -1
-        line_end = -1
-        n = 0
-        _n = self.index
-
-        for i, line in enumerate(lines):
-            if line_start != -1 and line_end == -1:
-                if line.startswith('['):
-                    line_end = i
-            if line.strip() == self.header and n != -1:
-                if n == _n:
-                    line_start = i + 1
-                    n = -1
-                else:
-                    n += 1
-        if line_end == -1:
-            line_end = None
-        if line_start == -1:
+        span = self.parser.get_span(self.name, self.index)
+        if span is None:
             return dict(lines=[])
-        return dict(lines=lines[line_start:line_end], start=line_start, end=line_end)
+        line_start, line_end = span
+        return dict(lines=self.parser._lines[line_start:line_end], start=line_start, end=line_end)
 
     def get_lines(self):
         return self.parse()['lines']
 
     def set_lines(self, lines):
         p = self.parse()
-        old = self.parser.get_lines()
+        old = self.parser._lines
 
         start = p.get('start')
         end = p.get('end')
@@ -180,7 +219,7 @@ class ConfigSection(object):
             for line in old[:start - 1]:
                 new.append(line)
         else:
-            new = old
+            new = list(old)
 
         new.append(self.header)
         for line in lines:
@@ -209,7 +248,7 @@ class ConfigSection(object):
 
     def delete(self):
         p = self.parse()
-        old = self.parser.get_lines()
+        old = self.parser._lines
 
         start = p.get('start')
         end = p.get('end')
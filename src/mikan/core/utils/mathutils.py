@@ -7,6 +7,8 @@ from mikan.vendor.geomdl import BSpline
 from mikan.vendor.geomdl.linalg import vector_normalize
 from mikan.vendor.geomdl.utilities import generate_knot_vector
 
+from mikan.core.lib.nurbs import HAS_NUMPY, basis_matrix
+
 __all__ = [
     'fexp', 'fman',
     'lerp', 'ease_in_quad', 'ease_out_quad', 'ease_in_out_quad',
@@ -302,6 +304,14 @@ class NurbsCurveRemap(object):
 
         self.periodic = periodic
         self.curves = []
+
+        # vectorized basis
+        self.n = n
+        self.degree = degree
+        self.knots = get_remap_knots(n, degree, periodic)
+        if HAS_NUMPY:
+            return
+
         for i in range(n):
             curve = BSpline.Curve()
             curve.degree = degree
@@ -320,6 +330,8 @@ class NurbsCurveRemap(object):
             self.curves.append(curve)
 
     def get(self, u):
+        if HAS_NUMPY:
+            return self.get_array([u])[0].tolist()
 
         curve = self.curves[0]
         if self.periodic:
@@ -333,11 +345,32 @@ class NurbsCurveRemap(object):
             result.append(curve.evaluate_single(u)[0])
         return result
 
+    def get_array(self, u):
+        """Get the weights of all control points for many parameters at once.
+
+        Args:
+            u (list): Normalized parameters.
+
+        Returns:
+            numpy.ndarray: Array of shape (len(u), n).
+        """
+        return get_remap_basis(self.n, self.degree, self.knots, self.periodic, u)
+
 
 class NurbsSurfaceRemap(object):
     def __init__(self, nu, nv, degree=(3, 3), periodic=(False, False)):
         self.periodic = periodic
         self.surfs = []
+
+        # vectorized basis
+        self.nu = nu
+        self.nv = nv
+        self.degree = degree
+        self.knots_u = get_remap_knots(nu, degree[0], periodic[0])
+        self.knots_v = get_remap_knots(nv, degree[1], periodic[1])
+        if HAS_NUMPY:
+            return
+
         for i in range(nu * nv):
             surf = BSpline.Surface()
             surf.degree_u = degree[0]
@@ -386,6 +419,9 @@ class NurbsSurfaceRemap(object):
             self.surfs.append(surf)
 
     def get(self, u, v):
+        if HAS_NUMPY:
+            return self.get_array([u], [v])[0].tolist()
+
         surf = self.surfs[0]
         if self.periodic[0]:
             start = surf.knotvector_u[surf.degree_u]
@@ -403,6 +439,41 @@ class NurbsSurfaceRemap(object):
             result.append(surf.evaluate_single((u, v))[0])
         return result
 
+    def get_array(self, u, v):
+        """Get the weights of all control points for many parameters at once.
+
+        Args:
+            u (list): Normalized parameters in u.
+            v (list): Normalized parameters in v.
+
+        Returns:
+            numpy.ndarray: Array of shape (len(u), nu * nv), u varying first.
+        """
+        bu = get_remap_basis(self.nu, self.degree[0], self.knots_u, self.periodic[0], u)
+        bv = get_remap_basis(self.nv, self.degree[1], self.knots_v, self.periodic[1], v)
+        return (bv[:, :, None] * bu[:, None, :]).reshape(len(bu), -1)
+
+
+def get_remap_knots(n, degree, periodic):
+    if not periodic:
+        return generate_knot_vector(degree, n)
+    return [float(x) for x in range(n + degree + degree + 1)]
+
+
+def get_remap_basis(n, degree, knots, periodic, u):
+    u = [float(_u) for _u in u]
+    if not periodic:
+        return basis_matrix(degree, knots, n, u)
+
+    start = knots[degree]
+    stop = knots[-(degree + 1)]
+    u = [_u * (stop - start) + start for _u in u]
+
+    # fold wrapped control points back
+    matrix = basis_matrix(degree, knots, n + degree, u)
+    matrix[:, :degree] += matrix[:, n:]
+    return matrix[:, :n]
+
 
 def find_greatest_common_divisor(a, b, rtol=1e-05, atol=1e-08):
     t = min(abs(a), abs(b))
@@ -1,14 +1,21 @@
 # coding: utf-8
 
+import os
 import sys
 import yaml
+import pickle
+import hashlib
 from collections import OrderedDict
 from yaml.representer import SafeRepresenter
 from ..utils import ordered_dict
+from ..logger import create_logger
 
 is_python_3 = (sys.version_info[0] == 3)
 
-__all__ = ['YamlDumper', 'YamlLoader', 'ordered_dump', 'ordered_load']
+__all__ = ['YamlDumper', 'YamlLoader', 'ordered_dump', 'ordered_load', 'YamlManifest', 'yaml_manifest', 'ParseCache']
+
+log = create_logger()
+
 
 try:
     BaseLoader = yaml.CSafeLoader
@@ -83,3 +90,167 @@ def ordered_load(stream, Loader=YamlLoader):
 
 def ordered_dump(data, stream=None, Dumper=YamlDumper, **kwds):
     return yaml.dump(data, stream, Dumper=Dumper, **kwds)
+
+
+# parsed files cache
+class YamlManifest(object):
+    """On-disk cache of parsed YAML files.
+
+    Parsed data are stored in a pickle file with the modification time and
+    size of their source file, and are only parsed again when the source file
+    changes. Each load returns a new copy of the data.
+
+    The cache directory can be set with the MIKAN_CACHE_PATH environment variable.
+    """
+
+    version = 1
+
+    def __init__(self, name='manifest'):
+        self.name = name
+        self.entries = None
+        self.dirty = False
+
+    def get_path(self):
+        path = os.environ.get('MIKAN_CACHE_PATH')
+        if not path:
+            path = os.path.join(os.path.expanduser('~'), '.cache', 'mikan')
+        filename = '{}.py{}{}.pkl'.format(self.name, *sys.version_info[:2])
+        return os.path.join(path, filename)
+
+    def read(self):
+        self.entries = {}
+        path = self.get_path()
+        if not os.path.isfile(path):
+            return
+        try:
+            with open(path, 'rb') as f:
+                data = pickle.load(f)
+            if data.get('version') == self.version:
+                self.entries = data['entries']
+        except Exception as e:
+            log.debug('failed to read yaml manifest "{}": {}'.format(path, e))
+
+    def save(self):
+        if not self.dirty:
+            return
+
+        path = self.get_path()
+        tmp_path = '{}.{}.tmp'.format(path, os.getpid())
+        try:
+            if not os.path.isdir(os.path.dirname(path)):
+                os.makedirs(os.path.dirname(path))
+            with open(tmp_path, 'wb') as f:
+                pickle.dump({'version': self.version, 'entries': self.entries}, f, pickle.HIGHEST_PROTOCOL)
+            if hasattr(os, 'replace'):
+                os.replace(tmp_path, path)
+            else:
+                # python 2 has no atomic replace on windows
+                if os.path.exists(path):
+                    os.remove(path)
+                os.rename(tmp_path, path)
+            self.dirty = False
+        except Exception as e:
+            log.debug('failed to write yaml manifest "{}": {}'.format(path, e))
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def load(self, path):
+        """Load a YAML file, from the cache if it did not change.
+
+        Args:
+            path (str): Path of the YAML file.
+
+        Returns:
+            Parsed data of the file.
+        """
+        if self.entries is None:
+            self.read()
+
+        path = os.path.normpath(path)
+        stat = os.stat(path)
+        key = (stat.st_mtime, stat.st_size)
+
+        entry = self.entries.get(path)
+        if entry is not None and entry[0] == key:
+            try:
+                return pickle.loads(entry[1])
+            except Exception:
+                pass
+
+        with open(path, 'r') as stream:
+            data = ordered_load(stream)
+
+        try:
+            self.entries[path] = (key, pickle.dumps(data, pickle.HIGHEST_PROTOCOL))
+            self.dirty = True
+        except Exception:
+            pass
+        return data
+
+
+yaml_manifest = YamlManifest()
+
+
+class ParseCache(YamlManifest):
+    """Content addressed cache of parsed data.
+
+    Entries are keyed by a hash of the text they were parsed from, so they
+    stay valid across sessions as long as the text does not change. They are
+    kept in memory and saved on disk with save(), the least recently used
+    entries are dropped past max_entries. Each get returns a new copy of
+    the data.
+    """
+
+    max_entries = 20000
+
+    def read(self):
+        YamlManifest.read(self)
+        self.entries = OrderedDict(self.entries)
+
+    @staticmethod
+    def get_key(text):
+        if not isinstance(text, bytes):
+            text = text.encode('utf-8')
+        return hashlib.sha1(text).hexdigest()
+
+    def get(self, key):
+        """Get the data stored for a key.
+
+        Args:
+            key (str): Hash of the source text, see get_key().
+
+        Returns:
+            Copy of the stored data, or None if missing.
+        """
+        if self.entries is None:
+            self.read()
+
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return None
+        self.entries[key] = entry  # most recently used last
+
+        try:
+            return pickle.loads(entry)
+        except Exception:
+            del self.entries[key]
+            return None
+
+    def set(self, key, data):
+        """Store the data parsed from a text.
+
+        Args:
+            key (str): Hash of the source text, see get_key().
+            data: Picklable parsed data.
+        """
+        if self.entries is None:
+            self.read()
+
+        try:
+            self.entries[key] = pickle.dumps(data, pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            return
+        self.dirty = True
+
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
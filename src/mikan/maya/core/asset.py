@@ -16,9 +16,10 @@ import maya.cmds as mc
 
 from mikan.core import abstract
 from mikan.core.ascii import ascii_title
+from mikan.core.expression import ExpressionParser
 from mikan.core.abstract.monitor import BuildMonitor
-from mikan.core.utils import re_is_int, flatten_list, ordered_load, unique
-from mikan.core.logger import create_logger, timed_code, get_version
+from mikan.core.utils import flatten_list, unique
+from mikan.core.logger import create_logger, timed_code, get_version, BuildProfiler
 from mikan.core.prefs import Prefs
 
 from .node import Nodes, parse_node
@@ -29,7 +30,8 @@ from .template import Template
 from .shape import Shape
 
 from ..lib.configparser import ConfigParser
-from ..lib.connect import cleanup_linear_anim_curves
+from ..lib.optimize import GraphOptimizer, NodeTracker
+from ..lib.profiler import NodeCounter
 from ..lib.rig import reorder_vdag_set
 from ..lib.cleanup import (
     cleanup_shape_orig, cleanup_references, cleanup_layers,
@@ -60,6 +62,7 @@ class Asset(abstract.Asset):
 
         # debug data
         self.monitor = None
+        self.profiler = None
 
         # cosmetics
         set_outliner_color(self.node, (1, 0.73, 0.33))
@@ -120,21 +123,7 @@ class Asset(abstract.Asset):
             log.debug('removed {} empty groups'.format(len(grp_nodes)))
             mx.delete(grp_nodes)
 
-        # reset rig if any
-        if 'gem_group' in self.node:
-            grp = self.node['gem_group'].input()
-            if grp:
-                grp = Group(grp)
-                for cmd in grp.get_bind_pose_cmds():
-                    try:
-                        cmd()
-                    except:
-                        # TODO: allow constraints for mocap build?
-                        log.error('/!\\ could not reset: {}'.format(cmd))
-
-        # reset all pose if any
-        for node in Nodes.get_id('*::mod.reset') or []:
-            get_bind_pose(node, 'reset_pose')
+        self.reset_pose()
 
         # delete all built nodes (from current asset)
         current_asset = Nodes.current_asset
@@ -154,24 +143,11 @@ class Asset(abstract.Asset):
 
                     if _asset_id != Nodes.current_asset:
                         continue
-
-                    _deformer = node['gem_deformer'].read()
-                    if 'layer.' in _deformer:
-                        Deformer.toggle_layers(node.parent(), top=True)
-                    if 'data.' in _deformer:
-                        continue
-                    if 'proxy.' in _deformer:
-                        continue
                     _nodes.append(node)
-
-                    # maya 2018 cleanup
-                    if node.is_a(mx.kGeometryFilter):
-                        _nodes += node.inputs(type=(mx.tGroupId, mx.tGroupParts))
-
                 except:
                     pass
 
-        dfm_nodes = [str(node) for node in _nodes]
+        dfm_nodes = self.get_deformer_nodes(_nodes)
 
         remove_tags = (
             '*#::menu', '*::group*',
@@ -179,38 +155,7 @@ class Asset(abstract.Asset):
             '*::hook*', '*::root*', '*::node', '*::ctrl*',
             '::bind', '::rig',
         )
-
-        dg_nodes = []
-        dag_nodes = []
-        for tag in remove_tags:
-            nodes = Nodes.get_id(tag) or []
-            if not isinstance(nodes, list):
-                nodes = [nodes]
-            for node in nodes:
-                if node.is_a((mx.tTransform, mx.tJoint)):
-                    dag_nodes.append(node)
-                else:
-                    dg_nodes.append(node)
-
-        dgb_nodes = []
-        dga_nodes = []
-        for node in dg_nodes:
-            if node.is_a((mx.tDecomposeMatrix, mx.kConstraint)):
-                dgb_nodes.append(node)
-            else:
-                dga_nodes.append(node)
-
-        for node in dag_nodes:
-            for n in set(node.connections(type=mx.kConstraint)):
-                dga_nodes.append(n)
-
-        dgb_nodes = [str(node) for node in dgb_nodes]
-        dga_nodes = [str(node) for node in dga_nodes]
-        dag_nodes = [str(node) for node in dag_nodes]
-
-        for node in itertools.chain(dgb_nodes, dfm_nodes, dga_nodes, dag_nodes):
-            if mc.objExists(node):
-                mc.delete(node)
+        self.delete_rig_nodes(remove_tags, dfm_nodes)
 
         cleanup_shape_orig()
 
@@ -243,9 +188,133 @@ class Asset(abstract.Asset):
                 curves.append(node)
         mx.delete(curves, ch=1)
 
+        # built rig is gone
+        self.write_build_state(None)
+
         Nodes.rebuild()
         Nodes.current_asset = current_asset
 
+    def cleanup_templates(self, names, nodes=None):
+        """Delete the rig nodes built by the given templates only.
+
+        Deformers built from the sections of the given nodes are deleted too.
+        """
+        self.reset_pose()
+
+        current_asset = Nodes.current_asset
+        Nodes.rebuild()
+        Nodes.current_asset = Nodes.get_asset_id(self.node)
+
+        dfm_nodes = self.get_deformer_nodes(self.get_section_deformers(nodes or []))
+
+        remove_tags = []
+        for name in names:
+            for tag in ('group*', 'mod', 'hook*', 'root*', 'node', 'ctrl*'):
+                remove_tags.append('{}::{}'.format(name, tag))
+        self.delete_rig_nodes(remove_tags, dfm_nodes)
+
+        cleanup_shape_orig()
+
+        Nodes.rebuild()
+        Nodes.current_asset = current_asset
+
+    def reset_pose(self):
+
+        # reset rig if any
+        if 'gem_group' in self.node:
+            grp = self.node['gem_group'].input()
+            if grp:
+                grp = Group(grp)
+                for cmd in grp.get_bind_pose_cmds():
+                    try:
+                        cmd()
+                    except:
+                        # TODO: allow constraints for mocap build?
+                        log.error('/!\\ could not reset: {}'.format(cmd))
+
+        # reset all pose if any
+        for node in Nodes.get_id('*::mod.reset') or []:
+            get_bind_pose(node, 'reset_pose')
+
+    @staticmethod
+    def get_section_deformers(nodes):
+        """Get the existing deformer nodes built from the deformer sections of nodes."""
+        dfm_nodes = []
+        for node in nodes:
+            if 'notes' not in node:
+                continue
+            cfg = ConfigParser(node)
+            for flag in Scheduler.dfm_flags:
+                for ini in cfg[flag]:
+                    try:
+                        dfm = Deformer(**Deformer.parse(ini))
+                    except:
+                        continue
+                    if dfm is not None and dfm.node is not None and dfm.node.exists:
+                        dfm_nodes.append(dfm.node)
+        return dfm_nodes
+
+    @staticmethod
+    def get_deformer_nodes(nodes):
+        """Filter the built deformer nodes to delete, layers are switched back to their top layer."""
+        _nodes = []
+        for node in nodes:
+            if not node.exists or 'gem_deformer' not in node:
+                continue
+            try:
+                _deformer = node['gem_deformer'].read()
+                if 'layer.' in _deformer:
+                    Deformer.toggle_layers(node.parent(), top=True)
+                if 'data.' in _deformer:
+                    continue
+                if 'proxy.' in _deformer:
+                    continue
+                _nodes.append(node)
+
+                # maya 2018 cleanup
+                if node.is_a(mx.kGeometryFilter):
+                    _nodes += node.inputs(type=(mx.tGroupId, mx.tGroupParts))
+
+            except:
+                pass
+
+        return _nodes
+
+    @staticmethod
+    def delete_rig_nodes(tags, dfm_nodes=None):
+        dg_nodes = []
+        dag_nodes = []
+        for tag in tags:
+            nodes = Nodes.get_id(tag) or []
+            if not isinstance(nodes, list):
+                nodes = [nodes]
+            for node in nodes:
+                if node.is_a((mx.tTransform, mx.tJoint)):
+                    dag_nodes.append(node)
+                else:
+                    dg_nodes.append(node)
+
+        dgb_nodes = []
+        dga_nodes = []
+        for node in dg_nodes:
+            if node.is_a((mx.tDecomposeMatrix, mx.kConstraint)):
+                dgb_nodes.append(node)
+            else:
+                dga_nodes.append(node)
+
+        for node in dag_nodes:
+            for n in set(node.connections(type=mx.kConstraint)):
+                dga_nodes.append(n)
+
+        dgb_nodes = [str(node) for node in dgb_nodes]
+        dfm_nodes = [str(node) for node in dfm_nodes or []]
+        dga_nodes = [str(node) for node in dga_nodes]
+        dag_nodes = [str(node) for node in dag_nodes]
+
+        for node in itertools.chain(dgb_nodes, dfm_nodes, dga_nodes, dag_nodes):
+            if mc.objExists(node):
+                mc.delete(node)
+
     def cleanup(self, modes=None):
 
         # node space
@@ -296,11 +365,6 @@ class Asset(abstract.Asset):
         if release:
             cleanup_skin_clusters()
 
-        # optimize graphs
-        if release:
-            cleanup_linear_anim_curves()
-        # cleanup_mult_matrix()
-
         # kill me nodes
         nodes = mx.ls('*.kill_me', o=1)
         if nodes:
@@ -309,6 +373,27 @@ class Asset(abstract.Asset):
         # node space
         Nodes.current_asset = current_asset
 
+    def optimize(self, modes=None, nodes=None):
+        """Run the graph optimization passes (see GraphOptimizer for the build modes toggling them).
+
+        Only the given nodes (the nodes created by the build) are optimized, the history of the asset hierarchy otherwise.
+        """
+
+        # node space
+        current_asset = Nodes.current_asset
+        Nodes.current_asset = Nodes.get_asset_id(self.node)
+
+        if nodes is None:
+            dag = [str(self.node)] + (mc.listRelatives(str(self.node), ad=True, f=True) or [])
+            nodes = mx.ls(mc.listHistory(dag) or [])
+
+        optimizer = GraphOptimizer(nodes, modes=modes)
+        optimizer.run()
+
+        # node space
+        Nodes.current_asset = current_asset
+        return optimizer.stats
+
     def set_version(self):
         if 'gem_version' not in self.node:
             self.node.add_attr(mx.String('gem_version'))
@@ -467,6 +552,163 @@ class Asset(abstract.Asset):
 
         Nodes.set_id(scr, '::menu')
 
+    # build state ------------------------------------------------------------------------------------------------------
+
+    def read_build_state(self):
+        if 'gem_build_state' in self.node:
+            data = self.node['gem_build_state'].read()
+            if data:
+                return abstract.BuildState.decode(data)
+
+    def write_build_state(self, state):
+        if state is None:
+            if 'gem_build_state' in self.node:
+                self.node['gem_build_state'] = ''
+            return
+
+        if 'gem_build_state' not in self.node:
+            self.node.add_attr(mx.String('gem_build_state'))
+        self.node['gem_build_state'] = state.encode()
+
+    @staticmethod
+    def get_node_inputs(node):
+        path = node.path()
+        data = {
+            'name': node.name(namespace=False),
+            'xfo': [round(v, 4) for v in mc.xform(path, q=1, ws=1, m=1)],
+        }
+
+        attrs = {}
+        for attr in mc.listAttr(path, ud=True) or []:
+            if attr == 'gem_branch':
+                continue  # written by the branch builder
+            try:
+                attrs[attr] = mc.getAttr('{}.{}'.format(path, attr))
+            except:
+                pass
+        data['attrs'] = attrs
+
+        for shape in node.shapes(type=mx.tNurbsCurve):
+            data.setdefault('cvs', []).append(mc.getAttr('{}.cv[*]'.format(shape.path())))
+
+        return data
+
+    def get_build_state(self, templates, modes=None):
+        """Fingerprint the inputs of the templates and the sections stored outside of the templates.
+
+        Returns the state and the nodes storing the sections outside of the templates, by path.
+        """
+        state = abstract.BuildState(modes=modes, release=get_version())
+
+        for tpl in templates:
+            nodes = tpl.get_template_nodes(root=tpl.node)
+            with tpl.snapshot_opts() as snapshot:
+                data = {
+                    'module': tpl.node['gem_module'].read(),
+                    'opts': snapshot['opts'],
+                    'names': snapshot['names'],
+                    'nodes': [self.get_node_inputs(node) for node in nodes],
+                }
+            text = '\n'.join(node['notes'].read() or '' for node in nodes if 'notes' in node)
+
+            mods = []
+            for node in nodes:
+                if 'notes' in node:
+                    cfg = ConfigParser(node)
+                    mods += [ini.read() for flag in Scheduler.mod_flags if flag in cfg for ini in cfg[flag]]
+
+            # grouped templates are parented to the groups of another template
+            group = data['opts'].get('group')
+            references = [group] if group and isinstance(group, string_types) else None
+
+            parent = tpl.get_parent()
+            if parent is not None:
+                parent = parent.name
+            state.add_template(tpl.name, parent, data, text, references=references, mods='\n'.join(mods))
+
+        # sections of geometries and other helpers
+        skip = {self.get_template_root()}
+        for tag in ('::rig', '::bind'):
+            skip.update(Nodes.get_id(tag, asset=Nodes.get_asset_id(self.node), as_list=True))
+
+        flags = Scheduler.mod_flags + Scheduler.dfm_flags
+        section_nodes = {}
+
+        def _walk(node):
+            if node in skip:
+                return
+            if 'notes' in node:
+                cfg = ConfigParser(node)
+                text = '\n'.join(ini.read() for flag in flags if flag in cfg for ini in cfg[flag])
+                if text:
+                    path = node.path()
+                    section_nodes[path] = node
+                    state.add_section(path, text)
+            for child in node.children():
+                _walk(child)
+
+        _walk(self.node)
+
+        return state, section_nodes
+
+    @staticmethod
+    def get_template_branch_roots(templates):
+        """Get the nodes of the top-most templates and of their built branches."""
+        names = set(tpl.name for tpl in templates)
+
+        roots = []
+        for tpl in templates:
+            if any(_tpl.name in names for _tpl in tpl.get_all_parents()):
+                continue
+            roots.append(tpl.node)
+            for node in Nodes.get_id('{}::branch'.format(tpl.name), as_list=True):
+                if node is not None and node not in roots:
+                    roots.append(node)
+        return roots
+
+    def get_dirty_templates(self, templates, modes=None):
+        """Compare the inputs of the templates with the previous build.
+
+        Returns None when a full build is needed, the templates to build again, the removed templates names
+        and the nodes whose sections reference them otherwise.
+        """
+        previous = self.read_build_state()
+        if previous is None:
+            log.info('make: no previous build state, full build')
+            return
+
+        if previous.modes != sorted(modes or ()) or previous.release != get_version():
+            log.info('make: build modes or release changed, full build')
+            return
+
+        if not Nodes.get_id('::rig', asset=Nodes.get_asset_id(self.node)):
+            log.info('make: no rig to update, full build')
+            return
+
+        state, section_nodes = self.get_build_state(templates, modes=modes)
+
+        if state.get_changed_sections(previous):
+            log.info('make: sections changed outside of the templates, full build')
+            return
+
+        dirty, removed = state.get_dirty(previous)
+
+        # mods are not undone by the template cleanup
+        kept = state.get_mod_references(dirty)
+        if kept:
+            log.info('make: mods of changed templates edit unchanged templates ({}), full build'.format(', '.join(sorted(kept))))
+            return
+
+        dependents = [section_nodes[path] for path in state.get_dependents(dirty | removed)]
+        for node in dependents:
+            cfg = ConfigParser(node)
+            if any(flag in cfg for flag in Scheduler.mod_flags):
+                log.info('make: mods of {} depend on changed templates, full build'.format(node))
+                return
+
+        dirty = [tpl for tpl in templates if tpl.name in dirty]
+        return dirty, removed, dependents
+
     # processor --------------------------------------------------------------------------------------------------------
 
     def build_template_groups(self, templates):
@@ -568,9 +810,10 @@ class Asset(abstract.Asset):
                 log.exception(e)
 
     @LogFilter()
-    def make(self, modes=None, pipeline=False, roots=None, exclude=None):
+    def make(self, modes=None, pipeline=False, roots=None, exclude=None, incremental=False, profile=None):
         monitor = BuildMonitor()
         self.monitor = monitor
+        self.profiler = None
 
         # dagmenu injection v1 kill switch
         if __main__.__dict__.get('_mikan_dagmenu_injection') is not None:
@@ -612,8 +855,10 @@ class Asset(abstract.Asset):
             template_roots = list(self.get_top_templates())
             templates = list(self.get_templates(modes=modes))
             roots = [self.node]
+            full = True
         else:
             roots = list(flatten_list([roots]))
+            full = False
 
             template_exclude = []
             if exclude is not None:
@@ -641,13 +886,55 @@ class Asset(abstract.Asset):
                         continue
                     templates.append(_tpl)
 
-        # processor
-        with timed_code('make', force=True):
+        # incremental build
+        dependents = None
+        if incremental and not full:
+            log.warning('make: incremental build ignored for partial builds')
+        elif incremental:
+            current_asset = Nodes.current_asset
+            Nodes.current_asset = asset_id
+            with timed_code('make: build state'):
+                update = self.get_dirty_templates(templates, modes=modes)
+            Nodes.current_asset = current_asset
+
+            if update is not None:
+                dirty, removed, dependents = update
+                if not dirty and not removed:
+                    log.success(u'make: rig is up to date')
+                    monitor.set_step(monitor.STEP_FINISHED)
+                    return
+
+                log.info('make: update {} templates'.format(len(dirty)))
+                if removed:
+                    log.info('make: remove {} templates'.format(len(removed)))
+
+                # build only the dirty subtrees
+                names = set(tpl.name for tpl in dirty)
+                template_roots = []
+                for tpl in dirty:
+                    top = ([tpl] + tpl.get_all_parents())[-1]
+                    if top not in template_roots:
+                        template_roots.append(top)
+                templates = dirty
+
+        # profiling (trace saved if profile is a path)
+        if profile or 'profile' in modes:
+            self.profiler = BuildProfiler(counter=NodeCounter())
+
+        # processor (tags resolved by parse_node are memoized for the whole build, created nodes are tracked for the optimizer)
+        tracker = NodeTracker()
+        with BuildProfiler.use(self.profiler), abstract.ResolveCache.use(abstract.ResolveCache()), tracker, timed_code('make', force=True):
 
             # cleanup
             with timed_code('make: ' + monitor.set_step(monitor.STEP_CLEANUP_RIG)):
                 mc.refresh()
-                self.init_cleanup()
+                if dependents is None:
+                    self.init_cleanup()
+                else:
+                    nodes = list(dependents)
+                    for tpl in templates:
+                        nodes += tpl.get_template_nodes(root=tpl.node)
+                    self.cleanup_templates(names | removed, nodes)
 
             # build all templates
             exception = None
@@ -662,26 +949,36 @@ class Asset(abstract.Asset):
                     if not tpl.check_validity():
                         raise RuntimeError('/!\\ "{}" shares the same id with another template'.format(tpl))
 
-                with timed_code('make: branches'):
-                    for template in template_roots:
-                        template.build_template_branches()
-
-                with timed_code('make: templates'):
-                    for tpl in templates:
-                        monitor.current_task = tpl
-                        tpl.add_shapes()
-                        tpl.build(modes=modes)
-                    monitor.current_task = None
-
-                # tmp cmdx cache flush
-                if len(templates) > 1000:
-                    mx.clear_instances()
-
-                # schedule and run mod and deformers
-                with timed_code('make: ' + monitor.set_step(monitor.STEP_SCHEDULER)):
-                    scheduler = Scheduler(roots, modes=modes, exclude=exclude, monitor=monitor)
-                with timed_code('make: ' + monitor.set_step(monitor.STEP_MODS_DEFORMERS)):
-                    scheduler.run(pipeline=pipeline)
+                # opt-in reuse of expression nodes across the whole build
+                share_nodes = Prefs.get('build/share_expression_nodes', False)
+
+                with ExpressionParser.node_cache(share_nodes):
+                    with timed_code('make: branches'):
+                        for template in template_roots:
+                            template.build_template_branches()
+
+                    with timed_code('make: templates'):
+                        for tpl in templates:
+                            monitor.current_task = tpl
+                            module = tpl.get_module_from_node(tpl.node)
+                            with BuildProfiler.span('template: ' + module, 'template', template=tpl.name):
+                                with BuildProfiler.span('add_shapes', 'template'):
+                                    tpl.add_shapes()
+                                with BuildProfiler.span('build', 'template'):
+                                    tpl.build(modes=modes)
+                        monitor.current_task = None
+
+                    # tmp cmdx cache flush
+                    if len(templates) > 1000:
+                        mx.clear_instances()
+
+                    # schedule and run mod and deformers
+                    with timed_code('make: ' + monitor.set_step(monitor.STEP_SCHEDULER)):
+                        if dependents is not None:
+                            roots = self.get_template_branch_roots(templates)
+                        scheduler = Scheduler(roots, modes=modes, exclude=exclude, monitor=monitor, nodes=dependents)
+                    with timed_code('make: ' + monitor.set_step(monitor.STEP_MODS_DEFORMERS)):
+                        scheduler.run(pipeline=pipeline)
 
                 # finalize rig
                 with timed_code('make: ' + monitor.set_step(monitor.STEP_GROUPS)):
@@ -724,10 +1021,30 @@ class Asset(abstract.Asset):
 
                 self.run_custom_patch('cleanup')
 
+            # optimize graphs
+            with timed_code('make: ' + monitor.set_step(monitor.STEP_OPTIMIZE)):
+                self.optimize(modes=modes, nodes=tracker.get_nodes())
+                mx.clear_instances()
+
             # exit
             self.set_version()
 
+            # fingerprint the inputs of this build for the next incremental builds
+            if full and exception is None:
+                with timed_code('make: build state'):
+                    Nodes.current_asset = asset_id
+                    state = self.get_build_state(list(self.get_templates(modes=modes)), modes=modes)[0]
+                    Nodes.current_asset = current_asset
+                    self.write_build_state(state)
+            else:
+                self.write_build_state(None)
+
         monitor.report()
+        if self.profiler:
+            self.profiler.report()
+            if isinstance(profile, string_types):
+                self.profiler.save(profile)
+
         if monitor.errors:
             log.info(u'make: job\'s done! 🧐')
         else:
@@ -745,319 +1062,79 @@ except ImportError as e:
 '''
 
 
-class Scheduler(object):
-    mod_flags = ['mod']
-    dfm_flags = ['deformer']
+class Scheduler(abstract.Scheduler):
+    skip_level = logging.DEBUG
 
-    def __init__(self, roots, modes=None, mod_flags=None, dfm_flags=None, exclude=None, monitor=None):
-        self.roots = roots
-        self.stack = []
+    mod_class = Mod
+    deformer_class = Deformer
+    nodes_class = Nodes
+    config_class = ConfigParser
+
+    parse_node = staticmethod(parse_node)
+
+    def __init__(self, roots, modes=None, mod_flags=None, dfm_flags=None, exclude=None, monitor=None, nodes=None):
         if exclude is None:
             exclude = []
         elif not isinstance(exclude, list):
             exclude = [exclude]
+        self.exclude = exclude
+        self.nodes = nodes
+        self.groups = []
 
-        if monitor is None:
-            monitor = BuildMonitor()
-        self.monitor = monitor
+        super(Scheduler, self).__init__(roots, modes=modes, mod_flags=mod_flags, dfm_flags=dfm_flags, monitor=monitor)
 
-        # parse hierarchy
-        self.modes = modes
-        if mod_flags is None:
-            mod_flags = Scheduler.mod_flags
-        if dfm_flags is None:
-            dfm_flags = Scheduler.dfm_flags
+    def walk(self):
+        # single nodes are parsed without their hierarchy
+        walk = [itertools.chain([root], root.descendents()) for root in self.roots]
+        if self.nodes:
+            walk.append(self.nodes)
 
-        for root in self.roots:
-            for node in itertools.chain([root], root.descendents()):
-                if node in exclude:
-                    continue
-                helper = Helper(node)
-                if 'notes' in node and not helper.disabled(self.modes):
-                    cfg = ConfigParser(node)
-
-                    for flag in mod_flags:
-                        for ini in cfg[flag]:
-
-                            args = self.get_args(ini)
-                            if helper.disabled(self.modes, args['mode']):
-                                continue
-
-                            data = Mod.parse(ini)
-                            if data:
-                                # split block
-                                for cmd in data['commands']:
-
-                                    if 'errors' in cmd:
-                                        monitor.log(
-                                            Mod.STATUS_CANCEL,
-                                            [(logging.ERROR, msg) for msg in cmd['errors']],
-                                            'mod',
-                                            node.name(namespace=True),
-                                            cmd['yml']
-                                        )
-                                        continue
-
-                                    mod_data = {
-                                        'class': Mod,
-                                        'data': {
-                                            'mod': cmd['mod'],
-                                            'data': cmd['data'],
-                                            'node': data['node']
-                                        },
-                                        'source': node,
-                                        'yml': cmd['yml']
-                                    }
-
-                                    mod_data.update(args)
-                                    self.stack.append(mod_data)
-
-                    for flag in dfm_flags:
-                        for ini in cfg[flag]:
-
-                            args = self.get_args(ini)
-                            if helper.disabled(self.modes, args['mode']):
-                                continue
-
-                            data = Deformer.parse(ini)
-                            if data:
-                                dfm_data = {
-                                    'class': Deformer,
-                                    'data': data,
-                                    'source': node,
-                                    'yml': ini.read()
-                                }
-                                dfm_data.update(args)
-                                self.stack.append(dfm_data)
-
-                # link group if needed
-                if helper.is_deformer_group():
-                    DeformerGroup(node).set_filtered()
-
-        # first pass reorder
-        stack_mod = []
-        stack_dfm = []
-        stack_mod_dfm = []
-        for cmd in self.stack:
-            if cmd['class'] == Mod:
-                # if '->' in cmd['yml']:
-                #     stack_mod_dfm.append(cmd)
-                # else:
-                stack_mod.append(cmd)
-            else:
-                stack_dfm.append(cmd)
-        self.stack = stack_mod + stack_dfm + stack_mod_dfm
-
-        self.stack = sorted(self.stack, key=lambda x: (x['priority'] * -1))
-
-    @staticmethod
-    def get_args(ini):
-        data = {'priority': 0, 'condition': None}
-        modes = []
-
-        for line in ini.get_lines():
-            if line.startswith('#/') and 'ignore' in line[2:].split():
-                modes.append('ignore')
-
-            elif line.startswith('#!'):
-                for arg in re.findall(r"[\w'^!*~+-]+", line[2:]):
-                    if re_is_int.match(arg):
-                        data['priority'] = int(arg)
-                    else:
-                        modes.append(arg)
-
-            elif line.startswith('#?'):
-                condition = line[2:].strip()
-                if not Scheduler.evaluate_condition(condition, ini.parser.node):
-                    data['condition'] = condition
+        for node in itertools.chain(*walk):
+            if node not in self.exclude:
+                yield node
 
-            elif line.startswith('#$'):
-                line = line[2:].strip()
-                var, sep, plug = line.partition(':')
-                var_plug = Mod.add_var(var.strip(), ini.parser.node)
+    def parse_notes(self, node, helper, mod_flags, dfm_flags):
+        super(Scheduler, self).parse_notes(node, helper, mod_flags, dfm_flags)
 
-                plug = parse_node(plug.strip(), silent=True, add_hook=False)
-                if isinstance(plug, mx.Plug):
-                    var_plug.write(plug.read())
+        # link group if needed
+        if helper.is_deformer_group():
+            self.groups.append(node)
 
-        data['mode'] = ';'.join(modes)
-        return data
+    def post_parse(self):
+        # groups build deformers from their weights, once decoded
+        for node in self.groups:
+            DeformerGroup(node).set_filtered()
 
     @staticmethod
-    def uniq(seq):
-        seen = set()
-        seen_add = seen.add
-        return [x for x in seq if x not in seen and not seen_add(x)]
-
-    def run(self, pipeline=False):
-        if len(self.stack) == 0:
-            return
-
-        debug = 'debug' in self.modes
-        halt_on_error = debug or pipeline
+    def get_helper(node):
+        return Helper(node)
 
-        failed_count = 0
-        failed_stack = []
-        while True:
-            if failed_count:
-                log.debug('scheduler: delayed stack')
-
-            for job in self.stack:
-                cls = job['class']
-                data = job['data']
-                source = job['source']
-                source_str = source.name(namespace=True)
-
-                self.monitor.current_task = None
-                self.monitor.current_yaml = job['yml']
-
-                if job['condition']:
-                    data.pop('ini', None)  # strip ini repr from deformers
-                    log.debug('/!\\ {} skip: {}, {}'.format(job['condition'], cls.__name__, data))
-                    continue
-
-                if cls is Mod:
-                    if not data['node'].exists:
-                        continue
-
-                    # check if module exists
-                    cmd = data['mod']
-                    if cmd not in Mod.modules:
-                        msg = "-- mod '{}' does not exist ({})".format(cmd, source_str)
-                        log.error(msg)
-                        if halt_on_error:
-                            raise SchedulerError()
-                        self.monitor.log(Mod.STATUS_CANCEL, [(logging.ERROR, msg)], 'mod', source_str, job['yml'])
-                        continue
-
-                    mod = Mod(cmd, node=data['node'], data=data['data'], source=source)
-                    if mod:
-                        self.monitor.current_task = mod
-                        state = mod.execute(modes=self.modes, source=source_str)
-
-                        if state == Mod.STATUS_DELAY:
-                            job['unresolved'] = mod.unresolved[:]
-                            failed_stack.append(job)
-                            continue
-
-                        self.monitor.log(state, mod.logs, 'mod', source_str, job['yml'])
-                        if state == Mod.STATUS_CRASH and halt_on_error:
-                            raise SchedulerError()
-
-                elif cls is Deformer:
-                    if job['priority'] != 0:
-                        data['priority'] = job['priority']
-
-                    dfm = Deformer(**data)
-                    if 'transform' not in data:
-                        continue
-
-                    with timed_code('binding {}.{}'.format(data['transform'], data.get('id', data['deformer'])), level='debug'):
-                        self.monitor.current_task = dfm
-                        state = dfm.bind(modes=self.modes, source=source_str)
-
-                    if state == Deformer.STATUS_DELAY:
-                        job['unresolved'] = dfm.unresolved[:]
-                        failed_stack.append(job)
-                        continue
-
-                    self.monitor.log(state, dfm.logs, 'deformer', source_str, job['yml'])
-                    if state == Deformer.STATUS_CRASH and halt_on_error:
-                        raise SchedulerError()
+    @staticmethod
+    def has_notes(node):
+        return 'notes' in node
 
-            # retry failed stack
-            if len(failed_stack) != failed_count:
-                self.stack = failed_stack
-                failed_count = len(failed_stack)
-                failed_stack = []
+    @staticmethod
+    def get_node_name(node):
+        return node.name(namespace=True)
 
-            else:
-                for job in failed_stack:
-                    cls = job['class']
-                    data = job['data']
-                    source = job['source']
-                    source_str = source.name(namespace=True)
-
-                    if cls is Mod:
-                        cmd = data['mod']
-                        mod = Mod(cmd, node=data['node'], data=data['data'], source=source)
-                        if mod:
-                            mod.log_error('-- cancel: {}  # source: {}'.format(mod, source_str))
-                            mod.log_warning('unresolved ids: {}'.format(job['unresolved']))
-                            mod.log_summary()
-                            self.monitor.log(Mod.STATUS_CANCEL, mod.logs, 'mod', source_str, job['yml'])
-
-                    elif cls is Deformer:
-                        dfm = Deformer(**data)
-                        if dfm:
-                            dfm.log_error('-- cancel: {}  # source: {}'.format(dfm, source_str))
-                            dfm.log_warning('unresolved ids: {}'.format(job['unresolved']))
-                            dfm.log_summary()
-                            self.monitor.log(Deformer.STATUS_CANCEL, dfm.logs, 'deformer', source_str, job['yml'])
-
-                # stop retry stack when unchanged
-                break
+    @staticmethod
+    def node_exists(node):
+        return node.exists
 
-        self.monitor.current_task = None
-        self.monitor.current_yaml = None
+    @staticmethod
+    def is_plug(obj):
+        return isinstance(obj, mx.Plug)
 
     @staticmethod
-    def evaluate_condition(condition, parser_node):
-        if not condition:
-            return True
+    def read_plug(plug):
+        return plug.read()
 
-        # parse condition
-        condition = condition.replace('->', '--')
-        tokens = re.split(r"(==|!=|<=|>=|<|>|&&|\|\|)", condition)
-        tokens = [token.strip().replace('--', '->') for token in tokens if token.strip()]
-
-        # get nodes and plug values
-        for i, e in enumerate(tokens):
-
-            if e.startswith('$'):
-                tokens[i] = Mod.get_var(e[1:], parser_node)
-
-            elif '::' in e or '->' in e:
-                failed = []
-                node = parse_node(e, failed=failed, silent=True)
-                if failed:
-                    return False
-                tokens[i] = node
-                if isinstance(node, list):
-                    tokens[i] = node[0]
-            else:
-                tokens[i] = ordered_load(tokens[i])
-
-            if isinstance(tokens[i], mx.Plug):
-                tokens[i] = tokens[i].read()
-
-        # evaluate
-        if len(tokens) == 1:
-            return bool(tokens[0])
-        elif len(tokens) == 2:
-            a, b = tokens
-            return a == b
-        elif len(tokens) == 3 and tokens[1] in ('==', '!=', '<', '<=', '>', '>='):
-            a, op, b = tokens
-            if op == '==':
-                return a == b
-            elif op == '!=':
-                return a != b
-            elif op == '<':
-                return a < b
-            elif op == '<=':
-                return a <= b
-            elif op == '>':
-                return a > b
-            elif op == '>=':
-                return a >= b
-
-        log.warning('/!\\ invalid condition: {}'.format(' '.join(condition)))
-        return True
+    @staticmethod
+    def write_plug(plug, value):
+        plug.write(value)
 
 
-class SchedulerError(Exception):
-    pass
+SchedulerError = abstract.SchedulerError
 
 
 class Helper(object):
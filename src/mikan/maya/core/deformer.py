@@ -32,6 +32,7 @@ Examples:
         >>> new_dfm = dfm.transfer(target_geometry, mirror=True, axis='x')
 """
 
+import os
 import uuid
 import yaml
 import time
@@ -54,14 +55,26 @@ from mikan.core.utils import ordered_load
 from mikan.core.utils.mathutils import SplineRemap, NurbsCurveRemap, NurbsSurfaceRemap
 from .node import Nodes, parse_nodes
 from ..lib.configparser import ConfigParser
-from ..lib.geometry import create_mesh_copy, create_lattice_proxy
+from ..lib.geometry import Mesh, create_mesh_copy, create_lattice_proxy, get_lattice_points
+
+has_numpy = False
+try:
+    import numpy as np
+    from mikan.core.lib.transfer import ClosestPointTransfer
+
+    has_numpy = True
+except ImportError:
+    pass
 
 __all__ = [
-    'WeightMap', 'Deformer', 'DeformerGroup', 'WeightMapInterface', 'DeformerError',
-    'NurbsWeightMap'
+    'WeightMap', 'WeightMatrix', 'WeightStore', 'Deformer', 'DeformerGroup', 'WeightMapInterface', 'DeformerError',
+    'NurbsWeightMap', 'DeltaMap'
 ]
 
 WeightMap = abstract.WeightMap
+WeightMatrix = abstract.WeightMatrix
+DeltaMap = abstract.DeltaMap
+WeightStore = abstract.WeightStore
 
 log = create_logger()
 
@@ -232,10 +245,17 @@ class Deformer(abstract.Deformer):
         if self.ini is None:
             return
 
-        data = self.encode_data()
+        node = self.ini.parser.node
+        stores = []
+        if '!weightref' in self.ini.read():
+            stores = Deformer.get_weight_stores(node, self.ini.read())
+
+        with WeightStore.use(*stores) as store:
+            data = self.encode_data()
+        data = WeightStore.set_path(data, store, root=Deformer.get_scene_dir(node))
 
         lines = self.ini.get_lines()
-        lines = [l for l in lines if l.strip().startswith('#')]
+        lines = [l for l in lines if l.strip().startswith('#') and not l.startswith('#@weights')]
         data = '\n'.join(lines) + '\n' + data
 
         self.ini.write(data)
@@ -271,7 +291,14 @@ class Deformer(abstract.Deformer):
         else:
             raw_data = str(ini)
 
-        data = yaml.load(raw_data, abstract.DeformerLoader)
+        # binary weight data
+        stores = []
+        if '!weightref' in raw_data and not WeightStore.stack:
+            node = ini.parser.node if ConfigParser.is_section(ini) else None
+            stores = Deformer.get_weight_stores(node, raw_data)
+
+        with WeightStore.use(*stores):
+            data = yaml.load(raw_data, abstract.DeformerLoader)
         if root:
             data['root'] = root
 
@@ -280,6 +307,101 @@ class Deformer(abstract.Deformer):
 
         return data
 
+    @staticmethod
+    def get_scene_path(node=None):
+        """Get the scene file storing a node.
+
+        Args:
+            node (mx.Node, optional): Node storing the deformer data, referenced nodes are stored in their reference
+                file.
+
+        Returns:
+            str or None: Path of the scene, None if the scene was never saved.
+        """
+        path = None
+        if node is not None and node.is_referenced():
+            path = mc.referenceQuery(str(node), filename=True, withoutCopyNumber=True)
+        if not path:
+            path = mc.file(q=True, sceneName=True)
+        return path or None
+
+    @staticmethod
+    def get_scene_dir(node=None):
+        """Get the folder of the scene file storing a node, see get_scene_path().
+
+        Returns:
+            str or None: Folder of the scene, None if the scene was never saved.
+        """
+        path = Deformer.get_scene_path(node)
+        if path:
+            return os.path.dirname(path)
+
+    @staticmethod
+    def get_weight_store(node=None):
+        """Get the binary weight store next to the scene file.
+
+        Weight data of referenced nodes are looked up next to their
+        reference file.
+
+        Args:
+            node (mx.Node, optional): Node storing the deformer data.
+
+        Returns:
+            WeightStore or None: Store of the scene, None if the scene was never saved.
+        """
+        path = Deformer.get_scene_path(node)
+        if not path:
+            return
+
+        return WeightStore.open(os.path.splitext(path)[0] + '.weights')
+
+    @staticmethod
+    def get_weight_stores(node=None, data=None):
+        """Get the binary weight stores to read deformer data from.
+
+        The store recorded in the data (see WeightStore.set_path) is looked up before the store next to the scene,
+        so that data keep loading after the scene is saved under another name or folder. Its path relative to the
+        scene folder is looked up before its absolute path.
+
+        Args:
+            node (mx.Node, optional): Node storing the deformer data.
+            data (str, optional): Serialized deformer data.
+
+        Returns:
+            list: Stores to activate, the store next to the scene (used for writing) is the last one.
+        """
+        stores = []
+        for path in reversed(WeightStore.get_paths(data, root=Deformer.get_scene_dir(node))):
+            stores.append(WeightStore.open(path))
+
+        store = Deformer.get_weight_store(node)
+        if store is not None:
+            if store in stores:
+                stores.remove(store)
+            stores.append(store)
+        return stores
+
+    @staticmethod
+    def prune_weight_store():
+        """Delete the blobs of the store next to the scene that the notes of the scene no longer reference.
+
+        Scenes saved from this one read their blobs from this store until their deformer data are updated or
+        written again (blobs are then copied next to them), this should be done before pruning.
+
+        Returns:
+            int: Number of deleted blobs.
+        """
+        store = Deformer.get_weight_store()
+        if store is None:
+            return 0
+
+        keys = set()
+        for node in mx.ls('*.notes', o=True, r=True):
+            keys.update(WeightStore.re_ref.findall(node['notes'].read() or ''))
+        n = store.prune(keys)
+        log.info('deleted {} unused weight data from {}'.format(n, store))
+        return n
+
     def parse_root(self, namespace=None):
         if self.root is None and self.root_id:
             try:
@@ -1966,7 +2088,8 @@ class Deformer(abstract.Deformer):
             RuntimeError: If axis is invalid or geometry type not supported.
 
         Note:
-            Uses temporary skin clusters and closest point transfer.
+            Maps are interpolated from the closest points of the source mesh with NumPy,
+            temporary skin clusters are only used when NumPy is not available.
             The returned deformer has not been built yet. Call build() to create the actual Maya node.
 
         Examples:
@@ -1997,6 +2120,10 @@ class Deformer(abstract.Deformer):
             if axis not in ['x', 'y', 'z']:
                 raise RuntimeError('wrong axis')
 
+        if has_numpy:
+            self.transfer_data(dfm, flip=flip, mirror=mirror, axis=axis)
+            return dfm
+
         # build temp transfer geometries
         with mx.DagModifier() as md:
             root = md.create_node(mx.tTransform, name='__transfer__')
@@ -2091,6 +2218,77 @@ class Deformer(abstract.Deformer):
         mc.select(_sl)
         return dfm
 
+    def transfer_data(self, dfm, flip=False, mirror=False, axis='x'):
+        """Interpolate the data of this deformer onto the geometry of another deformer.
+
+        Source points and triangles are read once, destination points are projected on their
+        closest source triangles and all maps and deltas are interpolated in a single pass.
+
+        Args:
+            dfm (Deformer): Destination deformer, its data is updated in place.
+            flip (bool): If True, flip data across the specified axis.
+            mirror (bool): If True, mirror data across the specified axis.
+            axis (str): Axis for flip/mirror operation ('x', 'y', or 'z').
+
+        Raises:
+            RuntimeError: If the source is not a mesh or the destination geometry is not supported.
+        """
+        src = Mesh(self.transform)
+        if src.shape is None:
+            raise RuntimeError('/!\\ cannot transfer from {}'.format(self.transform))
+
+        points = [(p.x, p.y, p.z) for p in src.get_points(mx.sWorld)]
+        triangles = src.get_triangles()
+
+        if dfm.geometry.is_a(mx.tLattice):
+            targets = get_lattice_points(dfm.transform)
+        elif dfm.geometry.is_a((mx.tNurbsCurve, mx.tNurbsSurface)):
+            # TODO: extrude/convert to polygon
+            raise RuntimeError('nurbs not yet implemented')
+        else:
+            targets = [(p.x, p.y, p.z) for p in Mesh(dfm.transform).get_points(mx.sWorld)]
+
+        transfer = ClosestPointTransfer(points, triangles, targets, flip=flip, mirror=mirror, axis=axis)
+        n = len(points)
+
+        # stack every map as columns of a single matrix
+        columns = []
+        keys = []
+
+        for i in list(self.data.get('maps', [])):
+            keys.append(('maps', i))
+            columns.append(self.data['maps'][i].weights)
+
+        if 'membership' in self.data:
+            keys.append(('membership', None))
+            columns.append(self.data['membership'].weights)
+
+        for i in self.data.get('delta', []):
+            for b in self.data['delta'][i]:
+                delta = self.data['delta'][i][b].weights
+                for c in range(3):
+                    keys.append(('delta', (i, b, c)))
+                    columns.append(delta[c::3])
+
+        if not columns:
+            return
+
+        values = np.zeros((n, len(columns)))
+        for c, weights in enumerate(columns):
+            weights = np.asarray(weights, dtype=np.float64)[:n]
+            values[:len(weights), c] = weights
+
+        values = transfer.apply(values)
+
+        for c, (key, i) in enumerate(keys):
+            if key == 'maps':
+                dfm.data['maps'][i] = WeightMap(values[:, c].tolist())
+            elif key == 'membership':
+                dfm.data['membership'] = WeightMap(values[:, c].tolist())
+            elif i[2] == 0:
+                delta = values[:, c:c + 3].ravel()
+                dfm.data['delta'][i[0]][i[1]].weights = delta.tolist()
+
     top_layer = float('inf')
 
     @classmethod
@@ -2548,8 +2746,13 @@ class DeformerGroup(object):
                 dfm.round()
 
                 # update notes
-                data = dfm.encode_data()
-                ini.write(data)
+                stores = []
+                if '!weightref' in ini.read():
+                    stores = Deformer.get_weight_stores(ini.parser.node, ini.read())
+
+                with WeightStore.use(*stores) as store:
+                    data = dfm.encode_data()
+                ini.write(WeightStore.set_path(data, store, root=Deformer.get_scene_dir(ini.parser.node)))
 
     def read(self, protected=False, read=True):
 
@@ -2656,11 +2859,25 @@ class DeformerGroup(object):
 
         return grp
 
-    def write(self, recursive=True):
+    def write(self, recursive=True, store=False):
+        """Write the deformers data to a new storage node.
+
+        Args:
+            recursive (bool): Store data of each deformer under a node mirroring its transform hierarchy.
+            store (bool or WeightStore): Write large weight data to a binary store instead of the notes,
+                True uses the store next to the scene file.
+        """
 
         if self.node is not None:
             raise RuntimeError('/!\\ already written')
 
+        if store is True:
+            store = Deformer.get_weight_store()
+            if store is None:
+                log.warning('/!\\ scene is not saved, weight data are written to notes')
+        elif not store:
+            store = None
+
         if self.root is None:
             root_path = ''
             grp_name = 'group'
@@ -2684,7 +2901,9 @@ class DeformerGroup(object):
 
         for dfm in self.data:
             dfm.set_id()
-            data = dfm.encode_data()
+            with WeightStore.use(store):
+                data = dfm.encode_data()
+            data = WeightStore.set_path(data, store, root=Deformer.get_scene_dir())
 
             # multiple storage nodes
             if recursive:
@@ -3176,6 +3395,20 @@ class NurbsWeightMap(object):
             for _u in range(nu):
                 infs.append(self.mapping[_v][_u])
 
+        if has_numpy:
+            if not v:
+                remap = self.remap.get_array(u)
+            else:
+                remap = self.remap.get_array(u, v)
+
+            for i, _infs in enumerate(infs):
+                for inf, f in _infs:
+                    weights = np.asarray(dfm.data['maps'][inf].weights, dtype=np.float64)
+                    dfm.data['maps'][inf] = WeightMap((weights + remap[:, i] * f).tolist())
+
+            dfm.normalize()
+            return dfm
+
         for vtx in range(n):
             if not v:
                 weights = self.remap.get(u[vtx])
@@ -1,6 +1,5 @@
 # coding: utf-8
 
-from copy import deepcopy
 from six import string_types, iteritems
 
 import maya.cmds as mc
@@ -10,7 +9,6 @@ from mikan.core import abstract
 from mikan.core.logger import create_logger
 from mikan.core.abstract.mod import ModError, ModArgumentError
 from mikan.core.utils import re_is_int, re_is_float, ordered_load, ordered_dump
-from mikan.vendor import yamllint
 from .node import *
 from .template import Template
 from ..lib.configparser import ConfigParser
@@ -74,24 +72,12 @@ class Mod(abstract.Mod):
 
     @staticmethod
     def parse(ini):
-        commands = []
         data = {'node': ini.parser.node}
         data['source'] = data['node']
 
-        for line in ini.get_lines():
-            # preserve commands order by grouping them into a list
-            if len(line) == 0 or line.startswith('#') or len(line.strip()) == 0:
-                continue
-            elif not line.startswith(' '):
-                commands.append([line])
-            else:
-                if commands:
-                    commands[-1].append(line)
-                else:
-                    commands.append([line])
-
-        # inline replace/loops
-        data['replace'] = Mod.parse_ini_replace(ini)
+        # commands and inline replace/loops
+        parsed = Mod.parse_commands(ini)
+        data['replace'] = parsed['replace']
 
         # update node
         hook = data['node']
@@ -105,37 +91,10 @@ class Mod(abstract.Mod):
                 break
             hook = hook.parent()
 
-        # sort commands
-        parsed_commands = []
-        for i, lines in enumerate(commands):
-            _mod = '\n'.join(lines)
-
-            for _mod in Mod.parse_replace(_mod, data['replace']):
-                cmd_data = {'yml': _mod}
-                parsed_commands.append(cmd_data)
-
-                _cmd = Mod.load(_mod)
-                if _cmd:
-                    cmd_data['mod'] = list(_cmd)[0]
-                    cmd_data['data'] = _cmd[cmd_data['mod']]
-                else:
-                    errors = []
-                    errors.append('-- failed to parse mod #{} of "{}" ({})'.format(i + 1, ini.parser.node, lines[0].strip(':')))
-                    for lint in yamllint.run(_mod):
-                        _lines = [
-                            str(lint),
-                            lines[lint.line - 1],
-                            ' ' * (lint.column - 1) + '^'
-                        ]
-                        errors.append('\n'.join(_lines) + '\n')
-                    cmd_data['errors'] = errors
-                    for error in errors:
-                        log.error(error)
-
-        if not parsed_commands:
+        if not parsed['commands']:
             return
 
-        data['commands'] = parsed_commands
+        data['commands'] = parsed['commands']
         return data
 
     def parse_nodes(self):
@@ -146,8 +105,7 @@ class Mod(abstract.Mod):
             self.node = self.parse_vars(self.node)
             self.node = parse_nodes(self.node, failed=self.unresolved, silent=True)
 
-        parsed_data = deepcopy(self.data)
-        parsed_data = self.parse_vars(parsed_data)
+        parsed_data = self.parse_vars(self.data)
         parsed_data = parse_nodes(parsed_data, failed=self.unresolved, silent=True)
         self.data = parsed_data
 
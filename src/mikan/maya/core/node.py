@@ -218,6 +218,7 @@ class Nodes(abstract.Nodes):
             asset = cls.get_asset_id(node)
 
         cls.nodes[asset][tag] = node
+        cls.notify_id(tag)
 
     @classmethod
     def remove_id(cls, tag):
@@ -232,6 +233,7 @@ class Nodes(abstract.Nodes):
             return
 
         del cls.nodes[asset][tag]
+        cls.notify_id(tag)
 
         # cleanup node id
         if not isinstance(node, mx.Node):
@@ -498,6 +500,15 @@ def parse_nodes(data, failed=None, exclude=None, root=None, silent=False):
     return data
 
 
+def node_exists(node):
+    if isinstance(node, mx.Plug):
+        node = node.node()
+    if isinstance(node, mx.Node):
+        return node.exists
+    return True
+
+
+@abstract.ResolveCache.memoize(exists=node_exists)
 def parse_node(tag, failed=None, root=None, silent=False, add_hook=True):
     from .deformer import Deformer
 
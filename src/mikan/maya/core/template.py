@@ -12,7 +12,7 @@ from mikan.maya import cmdx as mx
 from mikan.core import abstract
 from mikan.core.utils import get_slice, re_is_int, re_get_keys, flatten_list
 from mikan.core.utils.yamlutils import YamlLoader
-from mikan.core.logger import create_logger, timed_code
+from mikan.core.logger import create_logger, timed_code, BuildProfiler
 
 from .node import Nodes
 from .control import Group, Control
@@ -300,30 +300,35 @@ class Template(abstract.Template):
             modes = set()
         self.modes = modes
 
-        isolate = False
-        if self.get_opt('isolate_skin'):
-            isolate = True
+        with self.snapshot_opts():
+            isolate = False
+            if self.get_opt('isolate_skin'):
+                isolate = True
 
-        for self.branches, self.root in self.get_branches():
-            msg = '-- build: {}'.format(repr(self))
-            if len(self.branches) > 1 or self.branches[0] != '':
-                msg += ' {}'.format(self.branches)
-            log.debug(msg)
+            for self.branches, self.root in self.get_branches():
+                msg = '-- build: {}'.format(repr(self))
+                if len(self.branches) > 1 or self.branches[0] != '':
+                    msg += ' {}'.format(self.branches)
+                log.debug(msg)
 
-            if not self.root:
-                log.warning('/!\\ no template root, skip for this branch')
-                continue
+                if not self.root:
+                    log.warning('/!\\ no template root, skip for this branch')
+                    continue
 
-            # get valid hook
-            self.hook = self.get_hook()
-            if not self.hook:
-                log.warning('/!\\ no hook, skip build for this branch')
-                continue
+                # get valid hook
+                self.hook = self.get_hook()
+                if not self.hook:
+                    log.warning('/!\\ no hook, skip build for this branch')
+                    continue
 
-            self.build_rig()
-            self.build_shapes()
-            if isolate:
-                self.build_isolate_skin()
+                branch = '.'.join(self.branches)
+                with BuildProfiler.span('build_rig', 'template', branch=branch):
+                    self.build_rig()
+                with BuildProfiler.span('build_shapes', 'template', branch=branch):
+                    self.build_shapes()
+                if isolate:
+                    with BuildProfiler.span('build_isolate_skin', 'template', branch=branch):
+                        self.build_isolate_skin()
 
     @staticmethod
     def get_from_node(node):
@@ -367,6 +372,11 @@ class Template(abstract.Template):
         return attr in self.node
 
     def get_name(self, name):
+        if self.opts_snapshot is not None:
+            return self.get_snapshot_value('names', name, self.read_name)
+        return self.read_name(name)
+
+    def read_name(self, name):
         data = self.template_data.get('names', {})
 
         if name not in data:
@@ -380,6 +390,7 @@ class Template(abstract.Template):
         return data[name]
 
     def set_name(self, name, v):
+        self.discard_snapshot_value('names', name)
         data = self.template_data.get('names', {})
 
         if name not in data:
@@ -405,6 +416,7 @@ class Template(abstract.Template):
         return True
 
     def reset_name(self, name):
+        self.discard_snapshot_value('names', name)
         attr = 'gem_name_{}'.format(name)
 
         if attr in self.node:
@@ -436,6 +448,11 @@ class Template(abstract.Template):
         return self.get_opt_plug(opt) is not None
 
     def get_opt(self, opt, default=False):
+        if self.opts_snapshot is not None and not default:
+            return self.get_snapshot_value('opts', opt, self.read_opt)
+        return self.read_opt(opt, default=default)
+
+    def read_opt(self, opt, default=False):
         data = self.template_data['opts']
 
         if opt not in data:
@@ -459,7 +476,7 @@ class Template(abstract.Template):
             elif str(v) in data[opt]['enum'].values():
                 return str(v)
             else:
-                return self.get_opt(opt, default=True)
+                return self.read_opt(opt, default=True)
 
         return v
 
@@ -471,6 +488,7 @@ class Template(abstract.Template):
         return v
 
     def set_opt(self, opt, v):
+        self.discard_snapshot_value('opts', opt)
         data = self.template_data['opts']
 
         if opt not in data:
@@ -540,6 +558,7 @@ class Template(abstract.Template):
             self.check_shapes_id()
 
     def reset_opt(self, opt):
+        self.discard_snapshot_value('opts', opt)
         plug = self.get_opt_plug(opt)
         if plug is None:
             return
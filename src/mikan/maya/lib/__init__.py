@@ -3,6 +3,8 @@
 from .nurbs import *
 from .configparser import *
 from .connect import *
+from .optimize import *
+from .profiler import *
 from .shaders import *
 from .rig import *
 from .pose import *
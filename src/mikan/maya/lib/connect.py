@@ -5,6 +5,7 @@ from six import iteritems
 
 import maya.cmds as mc
 import maya.api.OpenMaya as om
+import maya.api.OpenMayaAnim as oma
 from mikan.maya import cmdx as mx
 
 from mikan.core.utils.typeutils import singleton
@@ -14,7 +15,7 @@ from mikan.core.logger import create_logger
 __all__ = [
     'connect_add', 'connect_mult', 'connect_div', 'connect_sub', 'connect_reverse', 'connect_power',
     'connect_matrix', 'connect_blend_weighted', 'connect_driven_curve', 'find_anim_curve',
-    'get_linear_anim_curves', 'cleanup_linear_anim_curves', 'cleanup_mult_matrix',
+    'get_anim_curve_keys', 'get_linear_anim_curves', 'cleanup_linear_anim_curves', 'cleanup_mult_matrix',
     'connect_remap', 'blend_smooth_remap', 'blend_smooth_weights',
     'connect_expr'
 ]
@@ -471,10 +472,63 @@ def find_anim_curve(plug_in, plug_out=None, plugs=False):
         return curves
 
 
-def get_linear_anim_curves(filter=None, check_infinity=True):
+def get_anim_curve_keys(anm):
+    """
+    Read the keys of an animCurve in ui units (same values as a keyframe query) and their tangent types.
+
+    Returns:
+    - keys: list of (input, value) tuples, None if the curve output is a time
+    - tangents: set of in and out tangent types
+    """
+    fn = oma.MFnAnimCurve(anm.object())
+
+    curve_type = fn.animCurveType
+    if curve_type in (oma.MFnAnimCurve.kAnimCurveTA, oma.MFnAnimCurve.kAnimCurveUA):
+        unit = om.MAngle.uiUnit()
+
+        def convert(v):
+            return om.MAngle(v).asUnits(unit)
+
+    elif curve_type in (oma.MFnAnimCurve.kAnimCurveTL, oma.MFnAnimCurve.kAnimCurveUL):
+        unit = om.MDistance.uiUnit()
+
+        def convert(v):
+            return om.MDistance(v).asUnits(unit)
+
+    elif curve_type in (oma.MFnAnimCurve.kAnimCurveTU, oma.MFnAnimCurve.kAnimCurveUU):
+
+        def convert(v):
+            return v
+
+    else:
+        return None, set()
+
+    if fn.isUnitlessInput:
+        get_input = fn.unitlessInput
+    else:
+        time_unit = om.MTime.uiUnit()
+
+        def get_input(i):
+            return fn.input(i).asUnits(time_unit)
+
+    keys = []
+    tangents = set()
+    for i in range(fn.numKeys):
+        keys.append((get_input(i), convert(fn.value(i))))
+        tangents.add(fn.inTangentType(i))
+        tangents.add(fn.outTangentType(i))
+
+    return keys, tangents
+
+
+def get_linear_anim_curves(filter=None, check_infinity=True, nodes=None):
     linear_anim_curves = []
+    linear_tangents = {oma.MFnAnimCurve.kTangentSmooth, oma.MFnAnimCurve.kTangentClamped}
+
+    if nodes is None:
+        nodes = mx.ls(type='animCurve')
 
-    for anm in mx.ls(type='animCurve'):
+    for anm in nodes:
         if filter and not anm.is_a(filter):
             continue
 
@@ -490,13 +544,13 @@ def get_linear_anim_curves(filter=None, check_infinity=True):
         if n_keys <= 1:
             continue
 
-        values = mc.keyframe(str(anm), q=1, tc=1, fc=1, vc=1)
+        keys, tangents = get_anim_curve_keys(anm)
+        if not keys:
+            continue
 
         # compute linear equation (y=ax+b) a and b
-        x0 = values[0]
-        y0 = values[1]
-        x1 = values[2]
-        y1 = values[3]
+        x0, y0 = keys[0]
+        x1, y1 = keys[1]
 
         if y1 == y0:
             a = 0
@@ -508,10 +562,7 @@ def get_linear_anim_curves(filter=None, check_infinity=True):
         x0 = x1
         y0 = y1
         linear = True
-        for k in range(4, len(values), 2):
-            x1 = values[k]
-            y1 = values[k + 1]
-
+        for x1, y1 in keys[2:]:
             if y1 == y0:
                 ap = 0
             else:
@@ -527,9 +578,8 @@ def get_linear_anim_curves(filter=None, check_infinity=True):
         if not linear:
             continue
 
-        # check tangents
-        tangents = mc.keyTangent(str(anm), query=True, inTangentType=True, outTangentType=True)
-        if set(tangents).difference({'spline', 'clamped'}):
+        # check tangents (spline or clamped)
+        if tangents.difference(linear_tangents):
             continue
 
         # store the linear animCurve with its (a, b) parameters
@@ -538,10 +588,10 @@ def get_linear_anim_curves(filter=None, check_infinity=True):
     return linear_anim_curves
 
 
-def cleanup_linear_anim_curves():
-    n = 0
+def cleanup_linear_anim_curves(nodes=None):
+    curves = []
 
-    for curve, a, b in get_linear_anim_curves():
+    for curve, a, b in get_linear_anim_curves(nodes=nodes):
         # only use linear equation with b=0
         if b != 0:
             continue
@@ -586,9 +636,10 @@ def cleanup_linear_anim_curves():
 
         # remove the resulting unused animCurve
         curve.add_attr(mx.Message('kill_me'))
-        n += 1
+        curves.append(curve)
 
-    log.debug('optimized {} linear anim curves'.format(n))
+    log.debug('optimized {} linear anim curves'.format(len(curves)))
+    return curves
 
 
 def cleanup_mult_matrix(nodes=None):
@@ -753,6 +804,17 @@ class ExpressionParser(_ExpressionParser):
 
         return strs
 
+    def is_node_result(self, result):
+        plugs = result if isinstance(result, (list, tuple)) else [result]
+
+        found = False
+        for plug in plugs:
+            if isinstance(plug, mx.Plug):
+                if not plug.node().exists:
+                    return False
+                found = True
+        return found
+
     def equal(self, src, dst):
 
         # check args
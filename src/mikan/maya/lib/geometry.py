@@ -7,7 +7,7 @@ import marshal
 import itertools
 from six.moves import range
 from six import string_types
-from collections import deque
+from collections import deque, OrderedDict
 
 import maya.mel
 import maya.api.OpenMaya as om
@@ -20,6 +20,16 @@ from mikan.core.utils.mathutils import eigh
 
 from .rig import copy_transform
 
+has_numpy = False
+try:
+    import numpy as np
+    from mikan.core.lib.spatial import PointGrid, TriangleGrid
+    from mikan.core.lib.symmetry import get_symmetry_table
+
+    has_numpy = True
+except ImportError:
+    pass
+
 log = create_logger('mikan.geometry')
 
 __all__ = [
@@ -30,7 +40,7 @@ __all__ = [
     'get_nearby_point_indices',
     'NurbsCurve', 'NurbsSurface',
     'MeshMap', 'mesh_remap', 'mesh_reorder',
-    'create_mesh_copy', 'create_lattice_proxy', 'cleanup_normals', 'get_hard_edges', 'transfer_invisible_faces',
+    'create_mesh_copy', 'create_lattice_proxy', 'get_lattice_points', 'cleanup_normals', 'get_hard_edges', 'transfer_invisible_faces',
     'get_transform_from_components', 'get_transform_from_points',
     'OBB', 'QuickHull',
 ]
@@ -92,6 +102,9 @@ class Mesh(object):
 
         return self.fn.getPoints(space)
 
+    def get_triangles(self):
+        return self.fn.getTriangles()[1]
+
     def set_points(self, points, space=mx.sObject):
 
         if isinstance(space, string_types):
@@ -130,6 +143,10 @@ def get_meshes(nodes=None, ref=False):
     return meshes
 
 
+_sym_maps = OrderedDict()
+_sym_maps_size = 16
+
+
 def get_sym_map(geo, plane='yz', center=(0, 0, 0), epsilon=0.001, decimals=4, space=mx.sTransform, select=True):
     if not isinstance(geo, mx.Node):
         geo = mx.encode(str(geo))
@@ -174,10 +191,55 @@ def get_sym_map(geo, plane='yz', center=(0, 0, 0), epsilon=0.001, decimals=4, sp
     fn = om.MFnMesh(msh.dag_path())
     vtx = fn.getPoints(space)
 
-    center = mx.Vector(center)
+    if has_numpy:
+        # matched with a tolerance, decimals are only kept for compatibility
+        points = np.array([(p.x, p.y, p.z) for p in vtx], dtype=np.float64)
+
+        key = (get_mesh_hash(msh), hashlib.md5(points.tobytes()).hexdigest(), axis, tuple(center), epsilon)
+        symt = _sym_maps.pop(key, None)
+        if symt is None:
+            symt = get_symmetry_table(points, axis=axis, center=center, epsilon=epsilon)
+            while len(_sym_maps) >= _sym_maps_size:
+                _sym_maps.popitem(last=False)
+        _sym_maps[key] = symt
+        symt = symt.copy()
+
+        vtx_mid = symt[0]
+        vtx_sym = symt[1]
+        vtx_nosym = symt[None]
+
+    else:
+        vtx_mid, vtx_sym, vtx_nosym = get_sym_map_rounded(fn, vtx, axis, rev, epsilon, decimals)
+        symt = {0: {}, 1: {}, -1: {}}
+
+        for i, j in vtx_sym:
+            symt[1][i] = j
+            symt[-1][j] = i
+
+        for i in vtx_mid:
+            symt[0][i] = i
+
+        symt[None] = vtx_nosym
+
+    log.info('symtable:')
+    log.info(' o  {0} middle points'.format(len(vtx_mid)))
+    log.info('o|o {0} symmetrical points'.format(len(vtx_sym) * 2))
+    log.info('x|o {0} not symmetrical'.format(len(vtx_nosym)))
+
+    if len(vtx_nosym) and select:
+        mc.select(cl=1)
+        mc.select(['{}.vtx[{}]'.format(str(msh), x) for x in vtx_nosym])
+        mc.warning('{0} non symmetrical points'.format(len(vtx_nosym)))
+
+    if ffd:
+        mx.delete(proxy)
+
+    return symt
+
+
+def get_sym_map_rounded(fn, vtx, axis, rev, epsilon, decimals):
     vtx_sym = []
     vtx_nosym = []
-    symt = {0: {}, 1: {}, -1: {}}
 
     vtx = [tuple([int(round(x * 10 ** decimals)) for x in mx.Vector(vtx[x])]) for x in range(fn.numVertices)]
     vtx_done = [False] * fn.numVertices
@@ -204,13 +266,10 @@ def get_sym_map(geo, plane='yz', center=(0, 0, 0), epsilon=0.001, decimals=4, sp
             vtx_nosym.append(i)
 
     for i, j in vtx_sym:
-        symt[1][i] = j
-        symt[-1][j] = i
         vtx_done[i] = True
         vtx_done[j] = True
 
     for i in vtx_mid:
-        symt[0][i] = i
         vtx_done[i] = True
 
     for i in vtx_nosym:
@@ -219,22 +278,8 @@ def get_sym_map(geo, plane='yz', center=(0, 0, 0), epsilon=0.001, decimals=4, sp
     for i, v in enumerate(vtx_done):
         if not v:
             vtx_nosym.append(i)
-    symt[None] = vtx_nosym
-
-    log.info('symtable:')
-    log.info(' o  {0} middle points'.format(len(vtx_mid)))
-    log.info('o|o {0} symmetrical points'.format(len(vtx_sym) * 2))
-    log.info('x|o {0} not symmetrical'.format(len(vtx_nosym)))
-
-    if len(vtx_nosym) and select:
-        mc.select(cl=1)
-        mc.select(['{}.vtx[{}]'.format(str(msh), x) for x in vtx_nosym])
-        mc.warning('{0} non symmetrical points'.format(len(vtx_nosym)))
 
-    if ffd:
-        mx.delete(proxy)
-
-    return symt
+    return vtx_mid, vtx_sym, vtx_nosym
 
 
 def get_sym_map_topology(geo, edge_mid, select=True):
@@ -488,12 +533,29 @@ def get_mesh_hash(msh):
     if not msh.is_a(mx.tMesh):
         msh = msh.shape()
 
+    if has_numpy:
+        # sorted connected vertices of each vertex, from the face edges
+        counts, connects = om.MFnMesh(msh.dag_path()).getVertices()
+        counts = np.array(counts, dtype=np.int64)
+        v0 = np.array(connects, dtype=np.int64)
+
+        starts = np.repeat(np.cumsum(counts) - counts, counts)
+        local = np.arange(len(v0)) - starts
+        v1 = v0[starts + (local + 1) % np.repeat(counts, counts)]
+
+        edges = np.concatenate([np.stack([v0, v1], axis=1), np.stack([v1, v0], axis=1)])
+        edges = edges[edges[:, 0] != edges[:, 1]]
+        edges = np.unique(edges, axis=0)
+
+        m = marshal.dumps(edges[:, 1].tolist(), 2)
+        return hashlib.md5(m).hexdigest()
+
     it = om.MItMeshVertex(msh.object())
     while not it.isDone():
         vtx.extend(sorted(it.getConnectedVertices()))
         it.next()
 
-    m = marshal.dumps(vtx)
+    m = marshal.dumps(vtx, 2)
     return hashlib.md5(m).hexdigest()
 
 
@@ -667,6 +729,16 @@ def get_nearby_point_indices(source_points, reference_points, radius=0.0):
     if radius <= 0.0:
         return list(range(len(source_points)))
 
+    if has_numpy:
+        if not len(source_points) or not len(reference_points):
+            return []
+        source = np.array([(p[0], p[1], p[2]) for p in source_points], dtype=np.float64)
+        reference = np.array([(p[0], p[1], p[2]) for p in reference_points], dtype=np.float64)
+
+        grid = PointGrid(reference, radius)
+        queries, _, distances = grid.query_radius(source, radius)
+        return np.unique(queries[distances < radius]).tolist()
+
     nearby_indices = []
     for i, point in enumerate(source_points):
         p_vec = om.MVector(point)
@@ -1164,6 +1236,24 @@ def create_lattice_proxy(node):
         return prx
 
 
+def get_lattice_points(node):
+    if not isinstance(node, mx.Node):
+        node = mx.encode(str(node))
+
+    for lat in node.shapes(type=mx.tLattice):
+        u = lat['uDivisions'].read()
+        t = lat['tDivisions'].read()
+        s = lat['sDivisions'].read()
+
+        # same order as the lattice proxy vertices
+        points = []
+        for _u in range(u):
+            for _t in range(t):
+                for _s in range(s):
+                    points.append(mc.xform('{}.pt[{}][{}][{}]'.format(lat, _s, _t, _u), q=1, t=1, ws=1))
+        return points
+
+
 def cleanup_normals(*args):
     nodes = []
     for node in flatten_list(args):
@@ -1292,7 +1382,31 @@ def transfer_invisible_faces(src, dst):
     fn_src = om.MFnMesh(src.object())
     inv = fn_src.getInvisibleFaces()
 
-    if inv:
+    if inv and has_numpy:
+        fn_dst = om.MFnMesh(dst.dag_path())
+        points = fn_dst.getPoints(mx.sWorld)
+        points = np.array([(p.x, p.y, p.z) for p in points], dtype=np.float64)
+
+        # closest source face of every destination vertex
+        src_points = np.array([(p.x, p.y, p.z) for p in fn_src.getPoints()], dtype=np.float64)
+        counts, triangles = fn_src.getTriangles()
+        tri_faces = np.repeat(np.arange(len(counts)), counts)
+
+        grid = TriangleGrid(src_points, triangles)
+        tris, _, _ = grid.closest(points)
+        is_inv = np.isin(tri_faces[tris], np.array(inv, dtype=np.int64)).astype(np.float64)
+
+        # faces with more than half of their vertices on invisible faces
+        counts, connects = fn_dst.getVertices()
+        counts = np.array(counts, dtype=np.int64)
+        faces = np.repeat(np.arange(len(counts)), counts)
+        ratio = np.bincount(faces, weights=is_inv[np.array(connects, dtype=np.int64)], minlength=len(counts))
+        ratio /= np.maximum(counts, 1)
+        new_inv = set(np.flatnonzero(ratio > 0.5).tolist())
+
+        transfer_invisible_faces_state(dst, fn_dst, new_inv)
+
+    elif inv:
         inv = set(inv)
         fn_dst = om.MFnMesh(dst.dag_path())
         points = fn_dst.getPoints(mx.sWorld)
@@ -1319,19 +1433,7 @@ def transfer_invisible_faces(src, dst):
             except:
                 it.next(None)
 
-        # transfer
-        old_inv = set(fn_dst.getInvisibleFaces())
-
-        show = old_inv.difference(new_inv)
-        hide = new_inv.difference(old_inv)
-
-        if hide:
-            mc.polyHole(mc.ls([dst.path() + '.f[{}]'.format(i) for i in list(hide)]), assignHole=1)
-        if show:
-            mc.polyHole(mc.ls([dst.path() + '.f[{}]'.format(i) for i in list(show)]), assignHole=0)
-
-        dst['displayInvisibleFaces'] = False
-        dst['displayInvisibleFaces'] = True
+        transfer_invisible_faces_state(dst, fn_dst, new_inv)
 
     else:
         fn_dst = om.MFnMesh(dst.dag_path())
@@ -1343,6 +1445,21 @@ def transfer_invisible_faces(src, dst):
         dst['displayInvisibleFaces'] = src['displayInvisibleFaces']
 
 
+def transfer_invisible_faces_state(dst, fn_dst, new_inv):
+    old_inv = set(fn_dst.getInvisibleFaces())
+
+    show = old_inv.difference(new_inv)
+    hide = new_inv.difference(old_inv)
+
+    if hide:
+        mc.polyHole(mc.ls([dst.path() + '.f[{}]'.format(i) for i in list(hide)]), assignHole=1)
+    if show:
+        mc.polyHole(mc.ls([dst.path() + '.f[{}]'.format(i) for i in list(show)]), assignHole=0)
+
+    dst['displayInvisibleFaces'] = False
+    dst['displayInvisibleFaces'] = True
+
+
 def get_vertex_face_vectors(msh, normalize=True, indices=None):
     """ Prototype/Snippet to get vertex tangents from a mesh """
     if not isinstance(msh, mx.Node):
@@ -0,0 +1,459 @@
+# coding: utf-8
+
+"""
+Post-build optimization of the rig dependency graph.
+
+Optimization passes are registered on GraphOptimizer and run in order once the
+asset is cleaned up. Each pass rewires the graph and returns the nodes it made
+obsolete, which are deleted before the next pass runs.
+
+Passes only edit their candidate nodes: the nodes created by the build of the
+asset (recorded with NodeTracker) and by the previous passes, never the other
+nodes of the scene.
+
+Passes are toggled with build modes:
+- no_optimize: skip the optimization stage
+- optimize: run the stage in dev builds too
+- optimize_<pass>: enable a pass that is disabled by default
+- no_optimize_<pass>: disable a pass
+"""
+
+from collections import OrderedDict
+
+import maya.cmds as mc
+import maya.api.OpenMaya as om
+from mikan.maya import cmdx as mx
+
+from mikan.core.logger import create_logger, timed_code
+from .connect import cleanup_linear_anim_curves, cleanup_mult_matrix
+
+__all__ = ['GraphOptimizer', 'NodeTracker']
+
+log = create_logger()
+
+# input attributes defining the result of math nodes, compound attributes are given with their children
+MATH_NODES = {
+    'multDoubleLinear': ('input1', 'input2'),
+    'addDoubleLinear': ('input1', 'input2'),
+    'multiplyDivide': (
+        'operation',
+        ('input1', 'input1X', 'input1Y', 'input1Z'),
+        ('input2', 'input2X', 'input2Y', 'input2Z'),
+    ),
+    'reverse': (('input', 'inputX', 'inputY', 'inputZ'),),
+    'unitConversion': ('input', 'conversionFactor'),
+    'inverseMatrix': ('inputMatrix',),
+    'decomposeMatrix': ('inputMatrix', 'inputRotateOrder'),
+    'composeMatrix': (
+        'useEulerRotation', 'inputRotateOrder',
+        ('inputTranslate', 'inputTranslateX', 'inputTranslateY', 'inputTranslateZ'),
+        ('inputRotate', 'inputRotateX', 'inputRotateY', 'inputRotateZ'),
+        ('inputScale', 'inputScaleX', 'inputScaleY', 'inputScaleZ'),
+        ('inputShear', 'inputShearX', 'inputShearY', 'inputShearZ'),
+        ('inputQuat', 'inputQuatX', 'inputQuatY', 'inputQuatZ', 'inputQuatW'),
+    ),
+}
+
+# utility nodes without side effect, deleted when nothing reads them
+DEAD_NODES = (
+    'multDoubleLinear', 'addDoubleLinear', 'multiplyDivide', 'plusMinusAverage', 'reverse',
+    'unitConversion', 'condition', 'clamp', 'setRange', 'remapValue', 'blendColors', 'blendTwoAttr',
+    'blendWeighted', 'pairBlend', 'distanceBetween', 'vectorProduct', 'angleBetween',
+    'multMatrix', 'wtAddMatrix', 'inverseMatrix', 'decomposeMatrix', 'composeMatrix',
+    'animCurveUU', 'animCurveUA', 'animCurveUL', 'animCurveUT',
+)
+
+
+class GraphOptimizer(object):
+    """
+    Pass manager of the post-build graph optimization.
+
+    Passes are functions registered with GraphOptimizer.register, they take the
+    list of candidate nodes and return the list of nodes they removed or left
+    unused (the nodes still existing are deleted after the pass).
+
+    Usage:
+        optimizer = GraphOptimizer(nodes, modes)
+        optimizer.run()
+        optimizer.stats  # {pass name: number of removed nodes}
+    """
+
+    passes = OrderedDict()
+
+    def __init__(self, nodes, modes=None):
+        self.nodes = list(nodes)
+        self.modes = set(modes or ())
+        self.stats = OrderedDict()
+
+    @classmethod
+    def register(cls, name, default=True):
+        """
+        Register an optimization pass, passes are run in registration order.
+
+        Parameters:
+        - name: str, name of the pass (used by the optimize_<name>/no_optimize_<name> modes)
+        - default: bool, run the pass when no mode toggles it
+        """
+
+        def decorator(func):
+            cls.passes[name] = (func, default)
+            return func
+
+        return decorator
+
+    def is_enabled(self, name):
+        if 'no_optimize_' + name in self.modes:
+            return False
+        if 'optimize_' + name in self.modes:
+            return True
+        return self.passes[name][1]
+
+    def run(self):
+        if 'no_optimize' in self.modes:
+            return self.stats
+        if 'dev' in self.modes and 'optimize' not in self.modes:
+            return self.stats
+
+        # nodes created by the passes are candidates of the next ones
+        with NodeTracker() as tracker:
+            for name, (func, default) in self.passes.items():
+                if not self.is_enabled(name):
+                    continue
+
+                with timed_code('optimize: ' + name):
+                    nodes = [node for node in self.nodes if node.exists] + tracker.get_nodes()
+                    removed = func(nodes) or []
+                    nodes = [node for node in removed if node.exists]
+                    if nodes:
+                        mx.delete(nodes)
+                self.stats[name] = len(removed)
+
+        removed = sum(self.stats.values())
+        if removed:
+            stats = ', '.join('{} {}'.format(n, name) for name, n in self.stats.items() if n)
+            log.info('optimize: removed {} nodes ({})'.format(removed, stats))
+        return self.stats
+
+
+class NodeTracker(object):
+    """
+    Context recording the dependency nodes (not DAG nodes) added to the scene.
+
+    Usage:
+        with NodeTracker() as tracker:
+            build()
+        nodes = tracker.get_nodes()
+    """
+
+    def __init__(self):
+        self.handles = []
+        self.callbacks = []
+
+    def node_added(self, node, data):
+        if not node.hasFn(om.MFn.kDagNode):
+            self.handles.append(om.MObjectHandle(node))
+
+    def __enter__(self):
+        self.callbacks = [om.MDGMessage.addNodeAddedCallback(self.node_added, 'dependNode')]
+        return self
+
+    def __exit__(self, *args):
+        if self.callbacks:
+            om.MMessage.removeCallbacks(self.callbacks)
+        self.callbacks = []
+
+    def get_nodes(self):
+        """
+        Returns:
+        - list: recorded nodes still in the scene, in creation order
+        """
+        handles = [handle for handle in self.handles if handle.isValid()]
+        self.handles = handles
+        return [mx.Node(handle.object()) for handle in handles]
+
+
+# utils ----------------------------------------------------------------------------------------------------------------
+
+def is_editable(node):
+    if node.is_referenced() or node.is_locked():
+        return False
+    if 'gem_id' in node or 'kill_me' in node:
+        return False
+    return True
+
+
+def get_input_key(node, attr):
+    """
+    Hashable description of an input attribute: its source plug if connected, its value otherwise.
+    """
+    if isinstance(attr, tuple):
+        plug = node[attr[0]].input(plug=True)
+        if plug is not None:
+            return 'plug', plug.path(full=True)
+        return tuple(get_input_key(node, child) for child in attr[1:])
+
+    plug = node[attr].input(plug=True)
+    if plug is not None:
+        return 'plug', plug.path(full=True)
+
+    value = mc.getAttr(node[attr].path(full=True))
+    if isinstance(value, list):
+        value = tuple(tuple(v) if isinstance(v, (list, tuple)) else v for v in value)
+    return value
+
+
+def has_inputs(node, attrs):
+    for attr in attrs:
+        if isinstance(attr, tuple):
+            if any(node[a].input() is not None for a in attr):
+                return True
+        elif node[attr].input() is not None:
+            return True
+    return False
+
+
+def get_unit_type(plug):
+    obj = plug._mplug.attribute()
+    if plug._mplug.isCompound:
+        return False
+    if obj.hasFn(om.MFn.kUnitAttribute):
+        return om.MFnUnitAttribute(obj).unitType()
+
+
+def redirect_outputs(node, target):
+    """
+    Connect the outputs of a node from the same attributes of another node.
+
+    Returns:
+    - bool: False if an output could not be reconnected
+    """
+    done = True
+    for dst, src in list(node.outputs(plugs=True, connections=True)):
+        if dst.locked:
+            done = False
+            continue
+        try:
+            mc.connectAttr('{}.{}'.format(target, src.name(full=True)), dst.path(full=True), force=True)
+        except RuntimeError:
+            done = False
+    return done
+
+
+def is_dead(node):
+    return node.output() is None
+
+
+def filter_nodes(nodes, types):
+    return [node for node in nodes if node.exists and node.type() in types]
+
+
+# passes ---------------------------------------------------------------------------------------------------------------
+
+@GraphOptimizer.register('linear_anim_curves')
+def optimize_linear_anim_curves(nodes):
+    """Replace linear driven keys with multDoubleLinear nodes."""
+    return cleanup_linear_anim_curves(nodes=[node for node in nodes if node.is_a(om.MFn.kAnimCurve)])
+
+
+@GraphOptimizer.register('mult_matrix', default=False)
+def optimize_mult_matrix(nodes):
+    """Merge chained multMatrix nodes."""
+    return cleanup_mult_matrix(filter_nodes(nodes, ('multMatrix',)))
+
+
+@GraphOptimizer.register('unit_conversions')
+def optimize_unit_conversions(nodes):
+    """Merge chained unitConversion nodes and bypass identity conversions."""
+    removed = []
+    nodes = filter_nodes(nodes, ('unitConversion',))
+    candidates = set(nodes)
+
+    for node in nodes:
+        if not node.exists or not is_editable(node):
+            continue
+
+        # merge chains
+        src = node['input'].input()
+        while src is not None and src in candidates and is_editable(src):
+            plug_in = src['input'].input(plug=True)
+            if plug_in is None:
+                break
+
+            node['conversionFactor'] = src['conversionFactor'].read() * node['conversionFactor'].read()
+            mc.connectAttr(plug_in.path(full=True), node['input'].path(full=True), force=True)
+            if is_dead(src):
+                removed.append(src)
+            src = node['input'].input()
+
+        # bypass identity
+        if node['conversionFactor'].read() != 1:
+            continue
+        plug_in = node['input'].input(plug=True)
+        if plug_in is None:
+            continue
+        unit = get_unit_type(plug_in)
+        if unit is False:
+            continue
+
+        outputs = list(node['output'].outputs(plugs=True))
+        if not outputs or any(plug.locked or get_unit_type(plug) != unit for plug in outputs):
+            continue
+
+        for plug in outputs:
+            mc.connectAttr(plug_in.path(full=True), plug.path(full=True), force=True)
+        if is_dead(node):
+            removed.append(node)
+
+    return removed
+
+
+@GraphOptimizer.register('compose_decompose')
+def optimize_compose_decompose(nodes):
+    """Bypass composeMatrix nodes rebuilding the input matrix of a decomposeMatrix."""
+    removed = []
+    pairs = (
+        ('inputTranslate', 'outputTranslate'),
+        ('inputScale', 'outputScale'),
+        ('inputShear', 'outputShear'),
+    )
+
+    for node in filter_nodes(nodes, ('composeMatrix',)):
+        if not is_editable(node):
+            continue
+
+        dmx = node['inputTranslate'].input()
+        if dmx is None or not dmx.is_a(mx.tDecomposeMatrix):
+            continue
+
+        valid = True
+        for attr_in, attr_out in pairs:
+            plug = node[attr_in].input(plug=True)
+            if plug is None or plug.node() != dmx or plug.name() != attr_out:
+                valid = False
+                break
+
+        # rotation
+        if node['useEulerRotation'].read():
+            plug = node['inputRotate'].input(plug=True)
+            if plug is None or plug.node() != dmx or plug.name() != 'outputRotate':
+                valid = False
+            if node['inputRotateOrder'].input() is not None or dmx['inputRotateOrder'].input() is not None:
+                valid = False
+            elif node['inputRotateOrder'].read() != dmx['inputRotateOrder'].read():
+                valid = False
+        else:
+            plug = node['inputQuat'].input(plug=True)
+            if plug is None or plug.node() != dmx or plug.name() != 'outputQuat':
+                valid = False
+
+        if not valid:
+            continue
+
+        # reconnect matrix
+        plug_in = dmx['inputMatrix'].input(plug=True)
+        outputs = list(node['outputMatrix'].outputs(plugs=True))
+        if not outputs or any(plug.locked for plug in outputs):
+            continue
+
+        for plug in outputs:
+            if plug_in is not None:
+                mc.connectAttr(plug_in.path(full=True), plug.path(full=True), force=True)
+            else:
+                mc.disconnectAttr(node['outputMatrix'].path(full=True), plug.path(full=True))
+                value = mc.getAttr(dmx['inputMatrix'].path(full=True))
+                mc.setAttr(plug.path(full=True), value, type='matrix')
+
+        if is_dead(node):
+            removed.append(node)
+
+    return removed
+
+
+@GraphOptimizer.register('constant_folding')
+def optimize_constant_folding(nodes):
+    """Replace math nodes without input connections by their output values."""
+    removed = []
+
+    for node_type, attrs in MATH_NODES.items():
+        if node_type == 'unitConversion':
+            # generic output, value units depend on destination
+            continue
+
+        for node in filter_nodes(nodes, (node_type,)):
+            if not is_editable(node) or has_inputs(node, attrs):
+                continue
+
+            outputs = list(node.outputs(plugs=True, connections=True))
+            if not outputs or any(dst.locked for dst, src in outputs):
+                continue
+
+            for dst, src in outputs:
+                src = src.path(full=True)
+                dst = dst.path(full=True)
+                value = mc.getAttr(src)
+                mc.disconnectAttr(src, dst)
+
+                if isinstance(value, list) and value and isinstance(value[0], tuple):
+                    mc.setAttr(dst, *value[0])
+                elif isinstance(value, list):
+                    mc.setAttr(dst, value, type='matrix')
+                else:
+                    mc.setAttr(dst, value)
+
+            removed.append(node)
+
+    return removed
+
+
+@GraphOptimizer.register('deduplicate')
+def optimize_deduplicate(nodes):
+    """Merge math nodes of same type reading the same inputs."""
+    removed = []
+
+    # merging nodes can make their outputs identical, repeat until stable
+    changed = True
+    while changed:
+        changed = False
+
+        for node_type, attrs in MATH_NODES.items():
+            kept = {}
+            for node in filter_nodes(nodes, (node_type,)):
+                if not node.exists or not is_editable(node):
+                    continue
+                key = tuple(get_input_key(node, attr) for attr in attrs)
+
+                if key not in kept:
+                    kept[key] = node
+                    continue
+
+                if redirect_outputs(node, kept[key]) and is_dead(node):
+                    mx.delete(node)
+                    removed.append(node)
+                    changed = True
+
+    return removed
+
+
+@GraphOptimizer.register('dead_nodes')
+def optimize_dead_nodes(nodes):
+    """Delete utility nodes whose outputs are not connected."""
+    removed = []
+
+    candidates = set(node for node in filter_nodes(nodes, DEAD_NODES) if is_editable(node))
+    nodes = list(candidates)
+    while nodes:
+        dead = [node for node in nodes if node.exists and is_dead(node)]
+        if not dead:
+            break
+
+        upstream = set()
+        for node in dead:
+            for _node in node.inputs():
+                if _node in candidates:
+                    upstream.add(_node)
+
+        mx.delete(dead)
+        removed += dead
+        nodes = [node for node in upstream if node.exists]
+
+    return removed
@@ -0,0 +1,47 @@
+# coding: utf-8
+
+"""
+Scene node counter for the build profiler.
+
+NodeCounter tracks the dependency nodes created and deleted with DG callbacks
+while it is entered, so that the node count deltas of the profiler spans cost
+nothing more than a lookup.
+"""
+
+import maya.api.OpenMaya as om
+
+__all__ = ['NodeCounter']
+
+
+class NodeCounter(object):
+    """
+    Callable counting the nodes added to the scene since the counter was entered.
+
+    Usage:
+        profiler = BuildProfiler(counter=NodeCounter())
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.callbacks = []
+
+    def __call__(self):
+        return self.count
+
+    def node_added(self, node, data):
+        self.count += 1
+
+    def node_removed(self, node, data):
+        self.count -= 1
+
+    def __enter__(self):
+        self.callbacks = [
+            om.MDGMessage.addNodeAddedCallback(self.node_added, 'dependNode'),
+            om.MDGMessage.addNodeRemovedCallback(self.node_removed, 'dependNode'),
+        ]
+        return self
+
+    def __exit__(self, *args):
+        if self.callbacks:
+            om.MMessage.removeCallbacks(self.callbacks)
+        self.callbacks = []
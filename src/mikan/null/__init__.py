@@ -0,0 +1,12 @@
+# coding: utf-8
+
+from mikan.core.logger import get_version, create_logger
+
+from .lib import *
+from .core import *
+
+# log version
+version = get_version()
+if version:
+    log = create_logger()
+    log.info(f'{version} loaded')
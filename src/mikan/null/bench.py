@@ -0,0 +1,170 @@
+# coding: utf-8
+
+"""
+Synthetic build benchmark of the null backend.
+
+Generates an asset in a null scene (a hierarchy of templates with branches,
+mod sections referencing the ids of other templates and skinned meshes) and
+builds it with the build profiler, without any DCC. The timings of each stage
+are printed, the profiler trace can be saved and opened in chrome://tracing.
+
+Usage:
+    python -m mikan.null.bench --templates 500 --meshes 50 --trace build.json
+"""
+
+import argparse
+from random import Random
+from timeit import default_timer
+
+from mikan.core.logger import create_logger, time_to_str
+from mikan.null.lib.scene import Scene, Node, TRANSFORM, GEOMETRY
+from mikan.null.lib.configparser import ConfigParser
+from mikan.null.core.node import Nodes
+from mikan.null.core.template import Template
+from mikan.null.core.deformer import Deformer, WeightMatrix
+from mikan.null.core.asset import Asset
+
+__all__ = ['create_asset', 'run']
+
+log = create_logger()
+
+# mods of the generated sections, with the number of ids they reference
+MODS = (('parent', 2), ('constraint', 2), ('connect', 2), ('space', 3), ('hook', 1), ('tag', 1))
+
+
+def get_tag(rnd, tpl, key='ctrls'):
+    branch_id = rnd.choice(tpl.get_branch_ids())
+    n = len(tpl.get_template_nodes())
+    return f'{tpl.name}{branch_id}::{key}.{rnd.randrange(n)}'
+
+
+def create_asset(templates=200, guides=3, branched=0.3, mods=2, meshes=20, points=2000, influences=8, seed=0):
+    """
+    Create a synthetic asset in the current null scene.
+
+    Parameters:
+    - templates: int, number of templates (core.joints chains)
+    - guides: int, maximum number of guides of each template
+    - branched: float, ratio of top templates branched left and right
+    - mods: int, number of mod commands written on each template
+    - meshes: int, number of skinned meshes
+    - points: int, number of points of each mesh
+    - influences: int, number of influences of each skin
+    - seed: int, seed of the generated hierarchy and weights
+
+    Returns:
+    - Asset
+    """
+    rnd = Random(seed)
+
+    asset = Asset.create('bench')
+    root = asset.get_template_root()
+
+    # templates
+    tpls = []
+    for i in range(templates):
+        parent = root
+        if tpls and rnd.random() < 0.9:
+            parent = rnd.choice(rnd.choice(tpls).get_template_nodes())
+
+        tpl = Template.create('core.joints', parent=parent, name=f'bone{i}', data={'number': rnd.randint(1, guides)})
+        if parent is root and rnd.random() < branched:
+            tpl.set_opt('branches', ['L', 'R'])
+        tpls.append(tpl)
+
+    # mods referencing other templates
+    for tpl in tpls:
+        lines = []
+        for j in range(mods):
+            mod, n = rnd.choice(MODS)
+            tags = [get_tag(rnd, rnd.choice(tpls)) for _ in range(n)]
+            lines.append(f'{mod}:')
+            lines += [f'  - {tag}' for tag in tags]
+        ConfigParser(tpl.node)['mod'].write('\n'.join(lines))
+
+    # skinned meshes
+    geo = asset.get_folder('geometry')
+    dfm = Node(asset.node, 'deformers', TRANSFORM)
+    for i in range(meshes):
+        name = f'mesh{i}'
+        xfo = Node(geo, name, TRANSFORM)
+        shp = Node(xfo, name + 'Shape', GEOMETRY)
+        shp.points.set_value([(0., float(p), 0.) for p in range(points)])
+
+        infs = {}
+        for k in range(influences):
+            infs[k] = get_tag(rnd, rnd.choice(tpls), 'skin')
+
+        # two influences per point
+        weights = [[0.] * points for _ in range(influences)]
+        for p in range(points):
+            a, b = rnd.sample(range(influences), 2)
+            w = rnd.random()
+            weights[a][p] = w
+            weights[b][p] = 1 - w
+        matrix = WeightMatrix.from_dense(list(range(influences)), weights)
+
+        skin = Deformer(deformer='skin', transform=xfo, data={'infs': infs})
+        skin.set_weight_matrix(matrix)
+        ConfigParser(dfm).append('deformer').write(skin.encode_data())
+
+    Nodes.rebuild()
+    return asset
+
+
+def run(templates=200, guides=3, branched=0.3, mods=2, meshes=20, points=2000, influences=8, seed=0, trace=None):
+    """
+    Create a synthetic asset in a new null scene and build it.
+
+    Parameters:
+    - trace: str, path of the profiler trace to save (optional)
+    (other parameters are passed to create_asset)
+
+    Returns:
+    - dict: duration of each stage in seconds
+    """
+    timings = {}
+
+    with Scene('bench') as root:
+        t0 = default_timer()
+        asset = create_asset(
+            templates=templates, guides=guides, branched=branched, mods=mods,
+            meshes=meshes, points=points, influences=influences, seed=seed
+        )
+        timings['create'] = default_timer() - t0
+        nodes = root.scene.get_node_count()
+
+        t0 = default_timer()
+        asset.make(profile=trace or True)
+        timings['make'] = default_timer() - t0
+
+        # stages of the build
+        for row in asset.profiler.get_stats(sort='total'):
+            if row['cat'] == 'timed' and row['name'].startswith('make: '):
+                timings[row['name'][6:]] = row['total']
+
+        log.info(f'bench: {templates} templates, {meshes} meshes, {nodes} nodes')
+        for name, t in timings.items():
+            log.info(f'bench: {name}: {time_to_str(t)}')
+
+    return timings
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(prog='mikan.null.bench', description='Build a synthetic asset with the null backend')
+    parser.add_argument('--templates', type=int, default=200, help='number of templates')
+    parser.add_argument('--guides', type=int, default=3, help='maximum number of guides per template')
+    parser.add_argument('--branched', type=float, default=0.3, help='ratio of branched top templates')
+    parser.add_argument('--mods', type=int, default=2, help='number of mods per template')
+    parser.add_argument('--meshes', type=int, default=20, help='number of skinned meshes')
+    parser.add_argument('--points', type=int, default=2000, help='number of points per mesh')
+    parser.add_argument('--influences', type=int, default=8, help='number of influences per skin')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the generated asset')
+    parser.add_argument('--trace', help='path of the chrome trace to save')
+    args = parser.parse_args(args)
+
+    run(**vars(args))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,7 @@
+# coding: utf-8
+
+from .node import *
+from .deformer import *
+from .mod import *
+from .template import *
+from .asset import *
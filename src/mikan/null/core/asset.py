@@ -0,0 +1,382 @@
+# encoding: utf-8
+
+import re
+import traceback
+
+from mikan.core.ascii import ascii_title
+from mikan.core.abstract.monitor import BuildMonitor
+from mikan.core.abstract.node import ResolveCache
+from mikan.core.abstract.scheduler import SchedulerError
+from mikan.core.logger import create_logger, timed_code, get_version, BuildProfiler
+import mikan.core.abstract.asset as abstract
+import mikan.core.abstract.scheduler as abstract_scheduler
+
+from ..lib.scene import Node, TRANSFORM, DEFORMER, find_root, ls, add_plug, is_plug
+from ..lib import ConfigParser
+
+from .node import Nodes, parse_node
+from .template import Template
+from .mod import Mod
+from .deformer import Deformer
+
+__all__ = ['Asset', 'Helper']
+
+log = create_logger()
+
+
+class Asset(abstract.Asset):
+
+    def __new__(cls, node):
+        if not isinstance(node, Node) or not node.get_dynamic_plug('gem_type'):
+            raise RuntimeError(f'node "{node}" is not valid')
+        if node.gem_type.get_value() == Asset.type_name:
+            return super(Asset, cls).__new__(cls)
+
+    def __init__(self, node):
+        self.node = node
+
+        # debug data
+        self.monitor = None
+        self.profiler = None
+
+    # nodes management -------------------------------------------------------------------------------------------------
+
+    @staticmethod
+    def create(name=None):
+
+        node = Node(find_root(), 'asset', TRANSFORM)
+        add_plug(node, 'gem_type', str, default_value=Asset.type_name)
+
+        if not name:
+            name = 'mikan'
+        name = name.lower()
+        Nodes.set_asset_id(node, name)
+
+        return Asset(node)
+
+    def remove(self):
+        self.node.remove_from_parent()
+        Nodes.rebuild()
+
+    @property
+    def name(self):
+        for i in self.node.gem_id.get_value().split(';'):
+            if '::' not in i:
+                return i
+
+    @staticmethod
+    def get_assets():
+        assets = []
+        for node in ls():
+            if not node.get_plug('gem_type'):
+                continue
+            if node.gem_type.get_value() == Asset.type_name:
+                assets.append(Asset(node))
+        return assets
+
+    def init_cleanup(self):
+
+        current_asset = Nodes.current_asset
+        Nodes.rebuild()
+        Nodes.current_asset = Nodes.get_asset_id(self.node)
+
+        # delete built hierarchies and deformers
+        for tag in ('::rig', '::bind'):
+            node = Nodes.get_id(tag)
+            if node:
+                node.remove_from_parent()
+        for node in ls(root=self.node):
+            if node.type == DEFORMER:
+                node.remove_from_parent()
+        Nodes.rebuild()
+
+        Nodes.current_asset = current_asset
+
+    def set_version(self):
+        plug = self.node.get_dynamic_plug('gem_version')
+        if not plug:
+            plug = add_plug(self.node, 'gem_version', str)
+        plug.set_value(get_version())
+
+    def get_version(self, as_tuple=False):
+        plug = self.node.get_dynamic_plug('gem_version')
+        if plug:
+            version = plug.get_value()
+        else:
+            version = '0.0.0'
+
+        if as_tuple:
+            version = [int(x) for x in version.split()[0].split('.')]
+            version += [float('inf')] * (3 - len(version))
+            version = tuple(version[:3])
+        return version
+
+    # templates --------------------------------------------------------------------------------------------------------
+
+    def get_folder(self, name):
+        name = name.lower()
+        node = self.node.find(name)
+        if not node:
+            node = Node(self.node, name, TRANSFORM)
+        return node
+
+    def get_template_root(self):
+        current_asset = Nodes.current_asset
+        Nodes.current_asset = Nodes.get_asset_id(self.node)
+
+        tpl = Nodes.get_id('::template')
+        if not tpl:
+            tpl = self.get_folder('template')
+            Nodes.set_id(tpl, '::template')
+
+        Nodes.current_asset = current_asset
+
+        return tpl
+
+    def get_templates(self, modes=None):
+        for tpl_root in self.get_top_templates():
+            if modes and Helper(tpl_root.node).disabled(modes):
+                continue
+            yield tpl_root
+
+            for child in tpl_root.get_all_children():
+                if modes and Helper(child.node).disabled(modes):
+                    continue
+                yield child
+
+    def get_top_templates(self):
+        templates = []
+        for tpl in self.get_template_root().get_children():
+            if tpl.get_dynamic_plug('gem_type') and tpl.gem_type.get_value() == Template.type_name:
+                templates.append(Template(tpl))
+        return templates
+
+    # processor --------------------------------------------------------------------------------------------------------
+
+    def make(self, modes=None, pipeline=False, profile=None):
+        monitor = BuildMonitor()
+        self.monitor = monitor
+        self.profiler = None
+
+        # cleanup ids
+        Nodes.rebuild()
+        asset_id = Nodes.get_asset_id(self.node)
+
+        # modes
+        if isinstance(modes, str):
+            modes = {modes}
+        elif isinstance(modes, (list, tuple, set)):
+            modes = set(modes)
+        else:
+            modes = set()
+        modes.add('null')
+
+        # init logging
+        log.info(ascii_title)
+        log.info(f'make: build "{asset_id}" ({", ".join(modes)})')
+        if 'debug' in modes:
+            log.setLevel(10)
+
+        # profiling (trace saved if profile is a path)
+        if profile or 'profile' in modes:
+            self.profiler = BuildProfiler(counter=self.node.scene.get_node_count)
+
+        # processor (tags resolved by parse_node are memoized for the whole build)
+        with BuildProfiler.use(self.profiler), ResolveCache.use(ResolveCache()), timed_code('make', force=True):
+
+            # cleanup
+            with timed_code('make: ' + monitor.set_step(monitor.STEP_CLEANUP_RIG)):
+                self.init_cleanup()
+
+            # build all templates
+            exception = None
+            current_asset = Nodes.current_asset
+            try:
+                # build templates
+                monitor.set_step(monitor.STEP_TEMPLATES)
+                Nodes.current_asset = asset_id
+
+                templates = list(self.get_templates(modes=modes))
+
+                for tpl in templates:
+                    if not tpl.check_validity():
+                        raise RuntimeError(f'/!\\ "{tpl}" shares the same id with another template')
+
+                with timed_code('make: branches'):
+                    for template in self.get_top_templates():
+                        template.build_template_branches()
+
+                with timed_code('make: templates'):
+                    for tpl in templates:
+                        monitor.current_task = tpl
+                        module = tpl.get_module_from_node(tpl.node)
+                        with BuildProfiler.span('template: ' + module, 'template', template=tpl.name):
+                            tpl.build(modes=modes)
+                    monitor.current_task = None
+
+                # schedule and run mod and deformers
+                with timed_code('make: ' + monitor.set_step(monitor.STEP_SCHEDULER)):
+                    scheduler = Scheduler([self.node], modes=modes, monitor=monitor)
+                with timed_code('make: ' + monitor.set_step(monitor.STEP_MODS_DEFORMERS)):
+                    scheduler.run(pipeline=pipeline)
+
+            except SchedulerError as e:
+                exception = e
+                log.warning('make: mods/deformer aborted!')
+
+            except Exception as e:
+                exception = e
+                msg = traceback.format_exc().strip('\n')
+                log.critical(msg)
+                monitor.errors += 1
+
+            Nodes.current_asset = current_asset
+
+            if exception is not None and ('debug' in modes or pipeline):
+                msg = u'make: aborted! 😱' + (' (halt from pipeline)' if pipeline else '')
+                raise RuntimeError(msg)
+
+            # cleanup
+            with timed_code('make: ' + monitor.set_step(monitor.STEP_CLEANUP)):
+                log.info('make: cleaning template')
+                self.get_template_root().show.set_value(False)
+                for template in self.get_top_templates():
+                    template.delete_template_branches()
+
+            # exit
+            self.set_version()
+
+        monitor.report()
+        if self.profiler:
+            self.profiler.report()
+            if isinstance(profile, str):
+                self.profiler.save(profile)
+
+        if monitor.errors:
+            log.info(u'make: job\'s done! 🧐')
+        else:
+            log.success(u'make: job\'s done! 😎')
+        monitor.set_step(monitor.STEP_FINISHED)
+
+
+class Scheduler(abstract_scheduler.Scheduler):
+    mod_class = Mod
+    deformer_class = Deformer
+    nodes_class = Nodes
+    config_class = ConfigParser
+
+    parse_node = staticmethod(parse_node)
+    is_plug = staticmethod(is_plug)
+
+    def __init__(self, roots, modes=None, mod_flags=None, dfm_flags=None, monitor=None):
+        Deformer.cache_nodes()
+        super().__init__(roots, modes=modes, mod_flags=mod_flags, dfm_flags=dfm_flags, monitor=monitor)
+
+    def walk(self):
+        for root in self.roots:
+            yield root
+            yield from ls(root=root)
+
+    @staticmethod
+    def get_helper(node):
+        return Helper(node)
+
+    @staticmethod
+    def has_notes(node):
+        return bool(node.get_dynamic_plug('notes'))
+
+    @staticmethod
+    def get_node_name(node):
+        return node.get_name()
+
+    @staticmethod
+    def node_exists(node):
+        return not isinstance(node, Node) or node.has_parent()
+
+    @staticmethod
+    def read_plug(plug):
+        return plug.get_value()
+
+    @staticmethod
+    def write_plug(plug, value):
+        plug.set_value(value)
+
+
+class Helper(object):
+
+    def __init__(self, node):
+        self.node = node
+
+    @property
+    def name(self):
+        return self.node.get_name()
+
+    def has_mod(self):
+        if self.node.get_dynamic_plug('notes'):
+            cfg = ConfigParser(self.node)
+            if 'mod' in cfg:
+                return True
+
+    def has_deformer(self):
+        if self.node.get_dynamic_plug('notes'):
+            cfg = ConfigParser(self.node)
+            if 'deformer' in cfg:
+                return True
+
+    def disabled(self, modes=None, value=None):
+        if modes is None:
+            modes = set()
+
+        enable_modes = ''
+        if value is not None:
+            node = None
+            enable_modes = value
+        else:
+            node = self.node
+
+        if node and node.get_dynamic_plug('gem_enable'):
+            if not node.gem_enable.get_value():
+                # item is specifically disabled
+                return True
+
+        if node and node.get_dynamic_plug('gem_enable_modes'):
+            enable_modes = node.gem_enable_modes.get_value() or ''
+
+        # get modes
+        modes_allowed = set()
+        modes_excluded = set()
+        for _mode in re.findall(r"[\w'^!*~+-]+", enable_modes):
+            if _mode[0] in r'-~^':
+                modes_excluded.add(_mode[1:])
+            else:
+                modes_allowed.add(_mode)
+
+        # modes requested
+        if modes_allowed and not modes_allowed.issubset(modes):
+            return True
+
+        # modes forbidden
+        if modes & modes_excluded:
+            return True
+
+        # check hierarchy
+        if node:
+            parent = node.get_parent()
+            if parent and not parent.is_root():
+                return Helper(parent).disabled(modes)
+
+        return False
+
+    def set_enable(self, enable):
+        if enable:
+            if self.node.get_dynamic_plug('gem_enable'):
+                self.node.gem_enable.set_value(True)
+        else:
+            if not self.node.get_dynamic_plug('gem_enable'):
+                add_plug(self.node, 'gem_enable', bool, default_value=True, keyable=1)
+            self.node.gem_enable.set_value(False)
+
+    def set_enable_modes(self, modes):
+        if not self.node.get_dynamic_plug('gem_enable_modes'):
+            add_plug(self.node, 'gem_enable_modes', str, default_value='')
+        self.node.gem_enable_modes.set_value(modes)
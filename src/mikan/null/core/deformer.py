@@ -0,0 +1,480 @@
+# coding: utf-8
+
+import yaml
+
+from mikan.core import abstract
+from mikan.core.logger import create_logger
+from mikan.core.abstract.deformer import DeformerError
+from ..lib.configparser import ConfigParser
+from ..lib.scene import Node, Plug, GEOMETRY, DEFORMER, TRANSFORM, ls, add_plug
+
+from .node import Nodes, parse_nodes
+
+WeightMap = abstract.WeightMap
+WeightMatrix = abstract.WeightMatrix
+DeltaMap = abstract.DeltaMap
+WeightStore = abstract.WeightStore
+WeightMapInterface = abstract.WeightMapInterface
+
+__all__ = ['Deformer', 'DeformerError', 'WeightMap', 'WeightMatrix', 'DeltaMap', 'WeightStore']
+
+log = create_logger()
+
+
+class Deformer(abstract.Deformer):
+    """
+    Deformers of the null backend.
+
+    Deformer modules have no null implementation: their classes are generated
+    from this one, which inserts a deformer node in the stack of the geometry,
+    connects the resolved influences and stores the decoded weight maps.
+    """
+    software = 'null'
+
+    def __repr__(self):
+        if self.transform or self.transform_id:
+            if self.transform:
+                node_name = Deformer.get_unique_name(self.transform, root=self.root)
+            else:
+                node_name = self.transform_id
+            if self.id:
+                return f"Deformer('{self.deformer}', id='{self.id}', transform='{node_name}')"
+            else:
+                return f"Deformer('{self.deformer}', transform='{node_name}')"
+        else:
+            return f"Deformer('{self.deformer}')"
+
+    def encode_data(self):
+        data = f'deformer: {self.deformer}\n'
+
+        if self.transform:
+            node_name = Deformer.get_unique_name(self.transform, root=self.root)
+            data += f'transform: {node_name}\n'
+        elif self.transform_id:
+            data += f'transform: {self.transform_id}\n'
+
+        if self.node:
+            data += f'id: {self.set_id()}\n'
+        elif self.id:
+            data += f'id: {self.id}\n'
+
+        if self.geometry_id:
+            data += f'geometry_id: {self.geometry_id}\n'
+
+        if self.order:
+            data += f'order: {self.order}\n'
+        if self.input_id:
+            data += f'input_id: {self.input_id}\n'
+        if self.output_id:
+            data += f'output_id: {self.output_id}\n'
+
+        if self.protected:
+            data += 'protected: true\n'
+        if self.decimals != self.default_decimals:
+            data += f'decimals: {self.decimals}\n'
+
+        data += self.encode_deformer_data()
+
+        if self.priority != 0:
+            data = f'#!{self.priority}\n{data}'
+
+        return data
+
+    @classmethod
+    def get_class(cls, name):
+        new_cls = super(Deformer, cls).get_class(name)
+        if new_cls is None:
+            module = cls.modules[name]
+            new_cls = type('Deformer', (Deformer,), {'deformer': name, 'deformer_data': module.deformer_data})
+            cls.classes[name] = new_cls
+        return new_cls
+
+    @classmethod
+    def is_node(cls, node):
+        return isinstance(node, Node) and node.type == DEFORMER and node.get_name() == cls.deformer
+
+    @classmethod
+    def parse(cls, ini):
+
+        # get data
+        root = None
+        if ConfigParser.is_section(ini):
+            raw_data = ini.read()
+
+            node = ini.parser.node
+            while node:
+                if node.get_dynamic_plug('gem_deformers'):
+                    root = node.gem_deformers.get_value()
+                    break
+                else:
+                    node = node.get_parent()
+                    if node is not None and node.is_root():
+                        node = None
+        else:
+            raw_data = str(ini)
+
+        # binary weight data: stores are written by maya only, they are read from the absolute path recorded in the data
+        stores = []
+        if '!weightref' in raw_data and not WeightStore.stack:
+            paths = WeightStore.get_paths(raw_data)
+            if not paths:
+                raise DeformerError('weight data stored without a recorded store path, update the deformer data in maya')
+            stores = [WeightStore.open(path) for path in reversed(paths)]
+
+        with WeightStore.use(*stores):
+            data = yaml.load(raw_data, abstract.DeformerLoader)
+        if root:
+            data['root'] = root
+
+        if ConfigParser.is_section(ini):
+            data['ini'] = ini
+
+        return data
+
+    def parse_nodes(self):
+        del self.unresolved[:]
+
+        # get root
+        if self.root is None and self.root_id:
+            try:
+                node = Deformer.get_node(self.root_id)
+            except:
+                node = None
+                self.unresolved.append(self.root_id)
+            if node:
+                self.root = node
+
+        # get transform (check under group root if any)
+        if self.transform is None and self.transform_id:
+            try:
+                node = Deformer.get_node(self.transform_id, root=self.root)
+            except:
+                node = None
+            if node:
+                self.transform = node
+
+        # parse input/output
+        for key in ('input', 'output'):
+            tag = getattr(self, key + '_id')
+            if not tag:
+                continue
+            try:
+                node, xfo = self.get_geometry_id(tag, root=self.root)
+            except:
+                node = None
+                xfo = None
+            if node is not None:
+                setattr(self, key, (node, xfo))
+            else:
+                self.unresolved.append(tag)
+
+        # parse data
+        self.data = parse_nodes(self.data, failed=self.unresolved, exclude=self.get_parser_excluded_keys(), root=self.root)
+
+    # build ------------------------------------------------------------------------------------------------------------
+
+    def build(self):
+        if not self.transform:
+            raise DeformerError('geometry missing')
+        if not self.geometry:
+            self.find_geometry()
+
+        # insert on top of the deformer stack
+        self.node = Node(self.geometry, self.deformer, DEFORMER)
+
+        geo_in = self.geometry.mesh_in
+        stack = geo_in.get_input()
+        if stack is not None:
+            self.node.input.connect(stack)
+        else:
+            self.node.input.set_value(self.geometry.points.get_value())
+        geo_in.connect(self.node.output)
+
+        self.write()
+
+    def write(self):
+        # influences (unparsed data is resolved here, like skin influences)
+        inputs = list(Deformer.get_inputs(self.data))
+        for key in self.get_parser_excluded_keys():
+            values = self.data.get(key)
+            if isinstance(values, dict):
+                values = values.values()
+            for v in values or ():
+                if not isinstance(v, str):
+                    continue
+                try:
+                    inputs.append(Deformer.get_node(v, root=self.root))
+                except RuntimeError:
+                    self.log_error(f'influence "{v}" does not exist')
+
+        for i, node in enumerate(inputs):
+            plug = self.node.get_dynamic_plug(f'input_{i}')
+            if plug is None:
+                plug = add_plug(self.node, f'input_{i}', float)
+            if isinstance(node, Node):
+                node = node.get_plug('world_transform') or node.get_plug('show')
+            plug.connect(node)
+
+        # weights (indexed maps viewing a sparse matrix are stored as is)
+        matrix = self.get_weight_matrix()
+        maps = {}
+        for key, wm in (self.data.get('maps') or {}).items():
+            if matrix is not None and isinstance(key, int):
+                continue
+            if isinstance(wm, WeightMap):
+                maps[key] = wm.read_weights()
+        if matrix is not None:
+            maps['matrix'] = matrix
+
+        size = self.get_size()
+        for key, weights in maps.items():
+            if len(weights) != size:
+                self.log_warning(f'map {key} has {len(weights)} weights for {size} points')
+
+        plug = self.node.get_dynamic_plug('gem_weights')
+        if plug is None:
+            plug = add_plug(self.node, 'gem_weights', dict)
+        plug.set_value(maps)
+
+    @staticmethod
+    def get_inputs(data):
+        if isinstance(data, dict):
+            for v in data.values():
+                for _input in Deformer.get_inputs(v):
+                    yield _input
+        elif isinstance(data, (list, tuple)):
+            for v in data:
+                for _input in Deformer.get_inputs(v):
+                    yield _input
+        elif isinstance(data, (Node, Plug)):
+            yield data
+
+    def get_size(self):
+        return len(self.geometry.points.get_value())
+
+    # ids --------------------------------------------------------------------------------------------------------------
+
+    @staticmethod
+    def get_deformer_ids(xfo, root=None):
+        ids = {}
+        name = Deformer.get_unique_name(xfo, root=root)
+
+        for shp in xfo.get_children():
+            if shp.type != GEOMETRY:
+                continue
+            for node in [shp] + list(shp.iter_descendants()):
+                if node.get_dynamic_plug('gem_deformer'):
+                    for tag in (node.gem_deformer.get_value() or '').split(';'):
+                        if node is shp or tag.startswith(name):
+                            ids[tag.split('->')[-1]] = node
+
+            if 'shape' not in ids and shp.show.get_value():
+                ids['shape'] = shp
+
+        ids['xfo'] = xfo
+        return ids
+
+    @staticmethod
+    def get_geometry_id(tag, root=None, add_hook=False):
+        hook = None
+        if '@' in tag:
+            tag, sep, hook = tag.partition('@')
+
+        xfo, sep, tag = tag.partition('->')
+        xfo = Deformer.get_node(xfo, root)
+
+        if not xfo:
+            return None, None
+
+        if tag:
+            dfm_ids = Deformer.get_deformer_ids(xfo, root)
+            if tag in dfm_ids:
+                dfm = dfm_ids[tag]
+                if hook:
+                    return Nodes.get_node_plug(dfm, hook, add=add_hook), xfo
+                return dfm, xfo
+            else:
+                return None, xfo
+        else:
+            return xfo, xfo
+
+    def set_geometry_id(self, node, key):
+        if not node.get_dynamic_plug('gem_deformer'):
+            add_plug(node, 'gem_deformer', str)
+
+        name = Deformer.get_unique_name(self.transform, root=self.root)
+        tags = [tag for tag in (node.gem_deformer.get_value() or '').split(';') if tag]
+
+        # find if already set (node under same self.transform)
+        for tag in tags:
+            if tag.startswith(f'{name}->{key}'):
+                return tag.split('->')[-1]
+
+        # assign new
+        indices = [-1]
+        for tag in self.get_ids():
+            if tag.startswith(key + '.'):
+                try:
+                    indices.append(int(tag.split('.')[-1]))
+                except:
+                    pass
+
+        if '.' in key:
+            tag = f'{name}->{key}'
+        else:
+            tag = f'{name}->{key}.{max(indices) + 1}'
+
+        # write ids
+        tags.append(tag)
+        node.gem_deformer.set_value(';'.join(tags))
+        return tag.split('->')[-1]
+
+    def set_id(self):
+        if not self.node:
+            return ''
+
+        if self.id:
+            self.set_geometry_id(self.node, self.id)
+        else:
+            self.id = self.set_geometry_id(self.node, self.deformer)
+
+        return self.id
+
+    def find_root(self):
+        if isinstance(self.root, Node):
+            self.root_id = Deformer.get_unique_name(self.root)
+        elif isinstance(self.root, str):
+            self.root_id = self.root
+            self.root = None
+
+    def find_transform(self):
+        if isinstance(self.transform, Node):
+            self.transform_id = Deformer.get_unique_name(self.transform, root=self.root)
+        else:
+            self.transform_id = self.transform
+            self.transform = None
+
+    def find_geometry(self):
+        if self.geometry_id:
+            node, xfo = self.get_geometry_id(self.geometry_id, self.root)
+            if isinstance(node, Node) and node.type == GEOMETRY:
+                self.geometry = node
+                return node
+
+        if self.node:
+            node = self.node
+            while node is not None and node.type != GEOMETRY:
+                node = node.get_parent()
+            self.geometry = node
+
+        else:
+            for node in self.transform.get_children():
+                if node.type != GEOMETRY or not node.show.get_value():
+                    continue
+                if node.get_dynamic_plug('gem_deformer') and '->data.' in node.gem_deformer.get_value():
+                    continue
+                self.geometry = node
+                break
+
+        if not self.geometry:
+            raise RuntimeError(f'/!\\ failed to find the deformable geometry of {self.transform}')
+
+    # nodes ------------------------------------------------------------------------------------------------------------
+
+    _nodes = {}
+
+    @classmethod
+    def cache_nodes(cls):
+        log.info('cache scene nodes for Deformer')
+        cls._nodes = ls(as_dict=True)
+
+    @staticmethod
+    def get_unique_name(node, root=None):
+        name = node.get_name()
+        nodes = Deformer._nodes.get(name)
+        if not isinstance(nodes, list):
+            return name
+
+        # shortest unique path
+        path = node.get_full_name().split('/')[2:]
+        for i in range(2, len(path) + 1):
+            key = '/'.join(path[-i:])
+            if sum(1 for n in nodes if n.get_full_name().endswith('/' + key)) == 1:
+                return key
+        return '/'.join(path)
+
+    @staticmethod
+    def get_node(node_name, root=None):
+        """Resolve a node from a list of ids and node paths
+
+        Args:
+            node_name (str): list of ids and paths separated by spaces
+            root (Node, optional): root to restrict the search for the node when using paths
+
+        Returns:
+            Node: resolved node
+
+        Raises:
+            RuntimeError: if nothing is found
+        """
+        if not Deformer._nodes:
+            Deformer.cache_nodes()
+
+        if isinstance(node_name, Node):
+            return node_name
+
+        # find root
+        if isinstance(root, str):
+            root = Deformer.get_node(root)
+        root_name = root.get_full_name() + '/' if root else '/'
+
+        overflow = False
+        for n in node_name.split():
+            if '::' in n:
+                n = Nodes.get_id(n)
+                if n:
+                    return n
+                continue
+
+            n = n.replace('|', '/').strip('/')
+            nodes = Deformer._nodes.get(n.split('/')[-1])
+            if nodes is None:
+                continue
+            if not isinstance(nodes, list):
+                nodes = [nodes]
+
+            if '/' in n:
+                nodes = [node for node in nodes if node.get_full_name().endswith('/' + n)]
+            if len(nodes) > 1:
+                nodes = [node for node in nodes if node.get_full_name().startswith(root_name)]
+
+            if len(nodes) == 1:
+                return nodes[0]
+            if len(nodes) > 1:
+                overflow = True
+
+        msg = f'no object name "{node_name}"'
+        if overflow:
+            msg = f'too many geometries named "{node_name}"'
+        if root:
+            msg += f' under root "{root_name}"'
+        raise RuntimeError(msg)
+
+    @staticmethod
+    def get_node_id(node, find=None):
+        if node.get_dynamic_plug('gem_id'):
+            gem_id = node.gem_id.get_value() or ''
+            if find and str(find) in gem_id:
+                for tag in gem_id.split(';'):
+                    if find in tag:
+                        return tag + ' ' + str(node)
+            return gem_id.split(';')[0] + ' ' + str(node)
+        return str(node)
+
+    @staticmethod
+    def create_geometry(parent, name, points):
+        """Create a transform with a geometry holding the given points."""
+        xfo = Node(parent, name, TRANSFORM)
+        shp = Node(xfo, name + 'Shape', GEOMETRY)
+        shp.points.set_value(points)
+        return xfo
@@ -0,0 +1,256 @@
+# coding: utf-8
+
+from mikan.core import abstract
+from mikan.core.logger import create_logger
+from mikan.core.abstract.mod import ModError, ModArgumentError
+from mikan.core.utils import re_is_int, re_is_float, ordered_load, ordered_dump
+from ..lib import ConfigParser
+from ..lib.scene import Node, Plug, NODE, is_plug, add_plug
+
+from .template import Template
+from .node import *
+
+__all__ = ['Mod', 'ModError', 'ModArgumentError']
+
+log = create_logger()
+
+
+class Mod(abstract.Mod):
+    """
+    Mods of the null backend.
+
+    Mod modules have no null implementation: their classes are generated from
+    this one, which resolves the mod data like any backend and records the
+    result as an operator node connected to the resolved plugs.
+    """
+    software = 'null'
+
+    def __repr__(self):
+        if self.data:
+            if isinstance(self.data, str):
+                return f"Mod('{self.mod}', node='{self.node}', data='{self.data}')"
+            else:
+                return f"Mod('{self.mod}', node='{self.node}', data={self.data})"
+        else:
+            return f"Mod('{self.mod}', node='{self.node}')"
+
+    @classmethod
+    def get_class(cls, name):
+        new_cls = super(Mod, cls).get_class(name)
+        if new_cls is None:
+            new_cls = type('Mod', (Mod,), {'mod': name, 'mod_data': cls.modules[name].mod_data})
+            cls.classes[name] = new_cls
+        return new_cls
+
+    def run(self):
+        node = self.node
+        if is_plug(node):
+            node = node.get_node()
+        if not isinstance(node, Node):
+            raise ModArgumentError('invalid node')
+
+        # operator node reading every resolved input
+        op = Node(node, f'_{self.mod}', NODE)
+        for i, _input in enumerate(Mod.get_inputs(self.data)):
+            if isinstance(_input, Node):
+                _input = _input.get_plug('world_transform')
+            if isinstance(_input, Plug):
+                add_plug(op, f'input_{i}', float).connect(_input)
+
+    @staticmethod
+    def get_inputs(data):
+        if isinstance(data, dict):
+            for k, v in data.items():
+                for _input in Mod.get_inputs(k):
+                    yield _input
+                for _input in Mod.get_inputs(v):
+                    yield _input
+        elif isinstance(data, (list, tuple)):
+            for v in data:
+                for _input in Mod.get_inputs(v):
+                    yield _input
+        elif isinstance(data, (Node, Plug)):
+            yield data
+
+    @staticmethod
+    def execute_cmd(cmd):
+        commands = []
+        for line in cmd.splitlines():
+            # mod options
+            if line.strip().startswith('#!'):
+                continue
+            elif len(line) == 0 or line.startswith('#'):
+                continue
+            # preserve commands order by grouping them into a list
+            elif not line.startswith(' '):
+                commands.append([line])
+            else:
+                if commands:
+                    commands[-1].append(line)
+                else:
+                    commands.append([line])
+
+        for i, cmd in enumerate(commands):
+            failed = []
+            cmd = '\n'.join(cmd)
+            mod_data = Mod.load(cmd)
+            if not mod_data:
+                log.error(f'/!\\ failed to parse mod #{i + 1}')
+                continue
+            mod_data = parse_nodes(mod_data, failed=failed)
+            if failed:
+                log.error(f'/!\\ failed to resolve {failed}')
+
+            for mod, data in mod_data.items():
+                mod = Mod(mod, data=data)
+                mod.execute()
+
+    @staticmethod
+    def parse(ini):
+        data = {'node': ini.parser.node}
+        data['source'] = data['node']
+
+        # commands and inline replace/loops
+        parsed = Mod.parse_commands(ini)
+        data['replace'] = parsed['replace']
+
+        # update node
+        hook = data['node']
+        while hook:
+            _hook = hook.get_dynamic_plug('gem_hook')
+            if _hook:
+                result = Nodes.get_id(_hook.get_value())
+                if result:
+                    data['node'] = result
+                    break
+            if hook.get_dynamic_plug('gem_id'):
+                break
+            hook = hook.get_parent()
+
+        if not parsed['commands']:
+            return
+
+        data['commands'] = parsed['commands']
+        return data
+
+    def parse_nodes(self):
+        # recursively lookup for nodes
+        del self.unresolved[:]
+
+        if isinstance(self.node, str):
+            self.node = self.parse_vars(self.node)
+            self.node = parse_nodes(self.node, failed=self.unresolved, silent=True)
+
+        parsed_data = self.parse_vars(self.data)
+        parsed_data = parse_nodes(parsed_data, failed=self.unresolved, silent=True)
+        self.data = parsed_data
+
+    @staticmethod
+    def add_var(var, node):
+        plug_name = f'gem_var_{var}'
+
+        # add variable
+        if not node.get_dynamic_plug(plug_name):
+            log.warning(f'/!\\ initialized variable ${var} on "{node}"')
+            add_plug(node, plug_name, float, keyable=True)
+
+        return node.get_dynamic_plug(plug_name)
+
+    @staticmethod
+    def get_var(var, node):
+        plug = Mod.add_var(var, node)
+        return plug.get_value()
+
+    @staticmethod
+    def load(cmd):
+        try:
+            data = ordered_load(cmd)
+        except:
+            return {}
+
+        # convert simple commands
+        if isinstance(data, dict):
+            _command = list(data)[0]
+            _data = data[_command]
+            if isinstance(_data, str):
+                _data = _data.split()
+                for j, v in enumerate(_data):
+                    if re_is_int.match(v):
+                        _data[j] = int(v)
+                    elif re_is_float.match(v):
+                        _data[j] = float(v)
+                if not _data:
+                    _data = None
+                return {_command: _data}
+            else:
+                return data
+
+        elif isinstance(data, str):
+            cmd = data.split()
+            if len(cmd) > 1:
+                return {cmd[0]: cmd[1:]}
+            else:
+                return {cmd[0]: None}
+
+    @staticmethod
+    def add(node, mod, data):
+        cmd = {mod: data}
+        cmd = ordered_dump(cmd)
+
+        mod = ConfigParser(node)['mod']
+        old = mod.read()
+        if old:
+            cmd = old + '\n' + cmd
+        mod.write(cmd)
+
+    def get_template(self):
+        tpl = None
+        if self.source:
+            tpl = Template.get_from_node(self.source)
+        if not tpl:
+            if isinstance(self.node, Node):
+                tpl = Template.get_from_node(self.node)
+            elif is_plug(self.node):
+                tpl = Template.get_from_node(self.node.get_node())
+        return tpl
+
+    def get_template_id(self, node=None):
+        if node is None:
+            node = self.source
+        if not node:
+            return
+
+        for plug in ('gem_hook', 'gem_id'):
+            plug = node.get_dynamic_plug(plug)
+            if plug:
+                for tag in plug.get_value().split(';'):
+                    if tag.startswith('::'):
+                        continue
+                    tpl_id = tag.split('::')[0]
+                    if tpl_id:
+                        return tpl_id
+
+        parent = node.get_parent()
+        if parent:
+            return self.get_template_id(parent)
+
+    def set_id(self, node, tag, subtag=None, prefix=None, multi=False):
+        if prefix is None:
+            prefix = self.id_prefix
+
+        tpl = self.get_template_id()
+        if not tpl:
+            tpl = ''
+        tag = f'{tpl}::{prefix}{tag}'
+
+        if subtag is not None and subtag:
+            tag = tag + '.' + subtag
+
+        if multi or not subtag:
+            # remove alpha suffix: mod.path.root.0
+            # keep num suffix: mod.path.0
+            nodes = Nodes.get_id(tag, as_dict=True)
+            count = max((int(k) for k in nodes if re_is_int.match(k)), default=-1)
+            tag += f'.{count + 1}'
+
+        Nodes.set_id(node, tag)
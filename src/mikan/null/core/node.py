@@ -0,0 +1,312 @@
+# coding: utf-8
+
+from mikan.core import abstract
+from mikan.core.tree import SuperTree
+from mikan.core.utils import flatten_list
+from mikan.core.logger import create_logger
+from mikan.null.lib.scene import Node, ls, add_plug, is_plug
+
+__all__ = ['Nodes', 'parse_nodes', 'parse_node']
+
+log = create_logger()
+
+
+class Nodes(abstract.Nodes):
+
+    @classmethod
+    def rebuild(cls):
+        cls.flush()
+
+        cls.rebuild_assets()
+        for _node, k in cls.assets.items():
+            cls.nodes[k] = SuperTree()
+            cls.shapes[k] = SuperTree()
+
+        cls.nodes[''] = SuperTree()
+        cls.shapes[''] = SuperTree()
+
+        # get all ids
+        nodes = ls()
+        for node in nodes:
+            if not node.get_dynamic_plug('gem_id'):
+                continue
+            asset = cls.get_asset_id(node)
+            if node in cls.assets:
+                cls.nodes[asset]['::asset'] = node
+                continue
+            for key in node.gem_id.get_value().split(';'):
+                if key and '::' not in key:
+                    cls.nodes[asset][key + '::template'] = node
+                cls.nodes[asset][key] = node
+
+        for node in nodes:
+            if not node.get_dynamic_plug('gem_shape'):
+                continue
+            asset = cls.get_asset_id(node)
+            for key in node.gem_shape.get_value().split(';'):
+                cls.shapes[asset][key] = node
+
+    @classmethod
+    def rebuild_assets(cls):
+        asset_nodes = []
+
+        # index all asset nodes
+        for node in ls():
+            if node.get_dynamic_plug('gem_type') and node.gem_type.get_value() == 'asset':
+                asset_nodes.append(node)
+        asset_nodes = sorted(asset_nodes, key=lambda x: x.get_full_name())
+        asset_nodes.sort(key=lambda x: not x.get_dynamic_plug('gem_index'))
+
+        # build asset tree
+        old_assets = cls.assets.copy()
+        cls.assets.clear()
+
+        for node in asset_nodes:
+            if not node.get_dynamic_plug('gem_id'):
+                continue
+            name = node.gem_id.get_value()
+            if not node.get_dynamic_plug('gem_index'):
+                add_plug(node, 'gem_index', int)
+
+            n = node.gem_index.get_value()
+            while True:
+                k = f'{name}.{n}'
+                if k in cls.assets.values():
+                    n += 1
+                else:
+                    if node.gem_index.get_value() != n:
+                        node.gem_index.set_value(n)
+                    break
+
+            cls.assets[node] = k
+            cls.geometries[k] = [node]
+
+        # rebuild check
+        for node, k in old_assets.items():
+            if cls.assets.get(node) != k:
+                cls.rebuild()
+                return
+
+    @classmethod
+    def set_asset_id(cls, node, name):
+        if not node.get_dynamic_plug('gem_id'):
+            add_plug(node, 'gem_id', str)
+        node.gem_id.set_value(name)
+
+        if not any(cls.nodes.values()):
+            cls.rebuild()
+        cls.rebuild_assets()
+
+        k = cls.assets[node]
+        if k not in cls.nodes:
+            cls.nodes[k] = SuperTree()
+            cls.nodes[k]['::asset'] = node
+        if k not in cls.shapes:
+            cls.shapes[k] = SuperTree()
+
+    @classmethod
+    def get_asset_id(cls, node):
+        # the null scene has no dependency nodes outside of the hierarchy
+        while node is not None:
+            if node in cls.assets:
+                return cls.assets[node]
+            node = node.get_parent()
+        return ''
+
+    @classmethod
+    def set_id(cls, node, tag):
+        if not any(cls.nodes.values()):
+            cls.rebuild()
+
+        if not node.get_dynamic_plug('gem_id'):
+            add_plug(node, 'gem_id', str)
+
+        gem_id = node.gem_id.get_value()
+
+        ids = [k for k in gem_id.split(';') if k]
+        if tag not in ids:
+            ids.append(tag)
+            node.gem_id.set_value(';'.join(ids))
+
+        asset = cls.current_asset
+        if asset is None:
+            asset = cls.get_asset_id(node)
+
+        cls.nodes[asset][tag] = node
+        cls.notify_id(tag)
+
+    @classmethod
+    def check_nodes(cls):
+        if not any(cls.nodes.values()):
+            cls.rebuild()
+
+    @staticmethod
+    def get_node_id(node, find=None, deformer=False):
+        if node.get_dynamic_plug('gem_id'):
+            gem_id = node.gem_id.get_value()
+            ids = gem_id.split(';')
+            node_id = ids[0]
+            if find and str(find) in gem_id:
+                for _id in ids:
+                    if find in _id:
+                        node_id = _id
+                        break
+            if deformer:
+                return node_id + ' ' + node.get_name()
+            return node_id
+        raise RuntimeError(f'{node} has no id')
+
+    @staticmethod
+    def get_node_plug(node, plug_name, add=True):
+        if is_plug(node):
+            node = node.get_node()
+
+        if node.is_dag():
+            if plug_name in {'xfo', 'ixfo', 'pxfo', 'pixfo', 'wxfo', 'wixfo'}:
+                plug_name = plug_name.replace('xfo', 'm')
+            if plug_name in {'m', 'pm', 'pim'}:
+                plug_name = 'transform'
+            elif plug_name in {'wm', 'wim'}:
+                plug_name = 'world_transform'
+
+        if plug_name in ('v', 'vis', 'visibility'):
+            plug_name = 'show'
+
+        # get plug (srt channels are plain dynamic plugs)
+        plug = node.get_plug(plug_name)
+        if not plug:
+            if add:
+                k = not plug_name.startswith('_') and node.get_dynamic_plug('gem_id') and '::ctrls.' in node.gem_id.get_value()
+                return add_plug(node, plug_name, float, k=k)
+            else:
+                return
+
+        return plug
+
+    @classmethod
+    def get_id_children(cls, tag, as_dict=False):
+        from .template import Template  # avoid circular import
+
+        root_id, sep, key = tag.partition(':::')
+        asset_id, sep, root_id = root_id.rpartition('#')
+        root_id, sep, root_branch = root_id.partition('.')
+        root_branch = sep + root_branch
+        root = cls.get_id(root_id)
+        if not root:
+            return []
+
+        tpl_root = Template(root)
+        children = tpl_root.get_all_children()
+        _children = set(children)
+
+        # templates grouped under the root or its children
+        names = set([root_id] + [tpl.name for tpl in children])
+        asset_id = Nodes.get_asset_id(tpl_root.node)
+        tpl_asset = Nodes.get_id(asset_id + '#::template') if asset_id else None
+        if tpl_asset:
+            for node in ls(root=tpl_asset):
+                if not (node.get_dynamic_plug('gem_type') and node.gem_type.get_value() == Template.type_name):
+                    continue
+                tpl = Template(node)
+                if tpl.get_opt('group') not in names:
+                    continue
+                for tpl in [tpl] + tpl.get_all_children():
+                    if tpl not in _children:
+                        children.append(tpl)
+                        _children.add(tpl)
+
+        nodes = []
+        for tpl in [tpl_root] + children:
+            _tag = tpl.name + root_branch + '::' + key
+            _nodes = cls.get_id(_tag, as_dict)
+            if _nodes:
+                nodes.append(_nodes)
+
+        if as_dict:
+            nodes_dict = {}
+            for _nodes in nodes:
+                nodes_dict.update(_nodes)
+            return nodes_dict
+        else:
+            return list(flatten_list(nodes))
+
+
+def parse_nodes(data, failed=None, exclude=None, root=None, silent=False):
+    if failed is None:
+        failed = []
+    if exclude is None:
+        exclude = []
+
+    if isinstance(data, dict):
+        new_data = type(data)()
+        for k, v in data.items():
+            if k in exclude:
+                new_data[k] = v
+                continue
+            if isinstance(k, str) and ('::' in k or '->' in k):
+                k = parse_node(k, failed=failed, silent=silent)
+                if isinstance(k, list):
+                    if len(k) == 1:
+                        k = k[0]
+                    else:
+                        k = tuple(k)
+            new_data[k] = parse_nodes(v, failed=failed, root=root, silent=silent)
+        return new_data
+
+    elif isinstance(data, list):
+        return [parse_nodes(e, failed=failed, silent=silent) for e in data]
+
+    elif isinstance(data, str):
+        if '::' in data or '->' in data:
+            return parse_node(data, failed=failed, root=root, silent=silent)
+
+    return data
+
+
+def node_exists(node):
+    if is_plug(node):
+        node = node.get_node()
+    if isinstance(node, Node):
+        return node.has_parent()
+    return True
+
+
+@abstract.ResolveCache.memoize(exists=node_exists)
+def parse_node(tag, failed=None, root=None, silent=False, add_hook=True):
+    from .deformer import Deformer
+
+    if failed is None:
+        failed = []
+
+    if '::' in tag:
+        try:
+            if len(tag.split()) > 1:
+                result = Deformer.get_node(tag, root)
+            else:
+                result = Nodes.get_id(tag)
+            if result is None:
+                raise KeyError()
+            return result
+        except:
+            failed.append(tag)
+            return
+
+    elif '->' in tag:
+        try:
+            nodes = Deformer.get_geometry_id(tag, root=root, add_hook=add_hook)
+            if not nodes[0]:
+                raise RuntimeError('failed to resolve id')
+        except Exception as e:
+            if log.level <= 10 and not silent:
+                log.error(e)
+            failed.append(tag)
+            if '@' in tag or tag.endswith('->xfo'):
+                return
+            else:
+                return [None, None]
+
+        if '@' in tag:
+            return nodes[0]
+        if tag.endswith('->xfo') or tag.endswith('->'):
+            return nodes[1]
+        return nodes
@@ -0,0 +1,545 @@
+# coding: utf-8
+
+import yaml
+
+from mikan.core import abstract
+from mikan.core.logger import create_logger, BuildProfiler
+from mikan.core.utils.yamlutils import YamlLoader
+
+from ..lib.scene import Node, TRANSFORM, JOINT, find_root, ls, add_plug
+
+from .node import Nodes
+
+__all__ = ['Template']
+
+log = create_logger()
+
+
+class Template(abstract.Template):
+    """
+    Templates of the null backend.
+
+    Template modules have no null implementation: their classes are generated
+    from this one, which builds a generic rig from the guides (a root, a
+    controller and a skin joint for each guide node). This keeps the costs of
+    the pipeline itself (ids, hooks, options, branches) without emulating the
+    rig of each module.
+    """
+    software = 'null'
+
+    def __repr__(self):
+        return f"Template('{self.node.get_name()}')"
+
+    @classmethod
+    def get_class_module(cls, name):
+        cls_module = super(Template, cls).get_class_module(name)
+        if cls_module is None:
+            cls_module = GenericModule(Template)
+        return cls_module
+
+    @classmethod
+    def get_module_from_node(cls, node):
+        if not node.get_dynamic_plug('gem_module'):
+            raise RuntimeError(f'node "{node}" is not valid')
+        return node.gem_module.get_value()
+
+    @property
+    def name(self):
+        for i in self.node.gem_id.get_value().split(';'):
+            if '::' not in i:
+                return i
+
+    @staticmethod
+    def create(tpl, parent=None, name=None, data=None, root=None, joint=True):
+        """
+        initialize node to create a proper template instance.
+        need module name, a base name and a parent eventually
+        if a root is given, it will use it instead of creating a new hierarchy
+        """
+
+        # check if module exists
+        cls = Template.get_class(tpl)
+
+        # check if nodes exist
+        if root is not None:
+            if root.get_dynamic_plug('gem_type'):
+                if root.gem_type.get_value() == Template.type_name:
+                    return Template(root)
+                else:
+                    raise RuntimeError('root is invalid (gem_type already exists)')
+
+        if parent is None:
+            parent = find_root()
+
+        if root is not None and root.get_parent() != parent:
+            root.reparent(parent)
+
+        # get name
+        if name is None:
+            name = cls.template_data['name']
+        name = Template.cleanup_name(name)
+        name = Template.get_next_unique_name(name, parent)
+
+        # create root node
+        joint = cls.template_data.get('guides', {}).get('joint', joint)
+
+        if root is None:
+            root = Node(parent, f'tpl_{name}', JOINT if joint else TRANSFORM)
+
+        # add attributes
+        add_plug(root, 'gem_type', str, default_value=Template.type_name)
+        Nodes.set_id(root, name)
+        add_plug(root, 'gem_module', str, default_value=tpl)
+
+        # return instance from created node
+        it = Template(root)
+        data = it.get_guide_data(data)
+        it.build_template(data)
+
+        return it
+
+    def remove(self):
+        self.node.remove_from_parent()
+        Nodes.rebuild()
+
+    def build(self, modes=None):
+        with self.snapshot_opts():
+            for self.branches, self.root in self.get_branches():
+                log.debug(f'-- build: {repr(self)} {self.branches}')
+
+                if not self.root:
+                    log.warning('/!\\ no template root, skip for this branch')
+                    continue
+
+                # get valid hook
+                self.hook = self.get_hook()
+                if not self.hook:
+                    log.warning('/!\\ no hook, skip build for this branch')
+                    continue
+
+                branch = '.'.join(self.branches)
+                with BuildProfiler.span('build_rig', 'template', branch=branch):
+                    self.build_rig()
+
+    def build_template(self, data):
+        # guide chain
+        number = data.get('number', 1) if isinstance(data, dict) else 1
+
+        parent = self.node
+        for i in range(1, number):
+            parent = Node(parent, f'tpl_{self.name}{i + 1}', parent.type)
+
+    def build_rig(self):
+        n_end = self.get_branch_suffix()
+        bind = self.get_bind_hook()
+
+        # top templates are hooked to the asset
+        hook = self.hook
+        if self.get_parent() is None:
+            hook = self.get_rig_hook()
+
+        ctrls = {}
+        for i, guide in enumerate(self.get_template_nodes()):
+            parent = ctrls.get(guide.get_parent(), hook)
+
+            root = Node(parent, f'root_{self.name}{n_end}_{i}', TRANSFORM)
+            root.transform.set_value(guide.transform.get_value())
+            ctrl = Node(root, f'c_{self.name}{n_end}_{i}', TRANSFORM)
+            ctrls[guide] = ctrl
+
+            sk = Node(bind, f'sk_{self.name}{n_end}_{i}', JOINT)
+            sk.transform.connect(ctrl.world_transform)
+
+            self.set_id(root, f'roots.{i}')
+            self.set_id(ctrl, f'ctrls.{i}')
+            self.set_id(sk, f'skin.{i}')
+            self.set_hook(guide, ctrl, f'hooks.{i}')
+
+    @staticmethod
+    def get_from_node(node):
+        branch_id = ''
+
+        if not (node.get_dynamic_plug('gem_type') and node.gem_type.get_value() == Template.type_name) or node.get_dynamic_plug('gem_branch'):
+            if node.get_dynamic_plug('gem_id'):
+                tpl_id = node.gem_id.get_value().split(';')[0].split('::')[0]
+                tpl, _, branch_id = tpl_id.partition('.')
+                _node = node
+                node = Nodes.get_id(tpl)
+
+                if isinstance(node, list):
+                    asset = Nodes.get_asset_id(_node)
+                    node = Nodes.get_id(tpl, asset=asset)
+
+        if not node:
+            return
+
+        if not node.get_dynamic_plug('gem_module'):
+            parent = node.get_parent()
+            if parent:
+                return Template.get_from_node(parent)
+            else:
+                return
+
+        tpl = Template(node)
+        if branch_id:
+            tpl.branches = branch_id.split('.')
+        return tpl
+
+    # options ----------------------------------------------------------------------------------------------------------
+
+    def get_name(self, name):
+        if self.opts_snapshot is not None:
+            return self.get_snapshot_value('names', name, self.read_name)
+        return self.read_name(name)
+
+    def read_name(self, name):
+        data = self.template_data.get('names', {})
+
+        if name not in data:
+            raise RuntimeError(f'name {name} not available in module "{self.node.gem_module.get_value()}"')
+
+        plug = self.node.get_dynamic_plug(f'gem_name_{name}')
+        if plug:
+            return plug.get_value()
+
+        return data[name]
+
+    def set_name(self, name, v):
+        self.discard_snapshot_value('names', name)
+        data = self.template_data.get('names', {})
+
+        if name not in data:
+            raise RuntimeError(f'name {name} not available in module "{self.node.gem_module.get_value()}"')
+
+        attr = f'gem_name_{name}'
+        plug = self.node.get_dynamic_plug(attr)
+        if v != data[name]:
+            if not plug:
+                plug = add_plug(self.node, attr, str)
+            plug.set_value(v)
+        elif plug:
+            self.node.remove_dynamic_plug(attr)
+        return True
+
+    def get_opt_plug(self, opt):
+        plug = self.node.get_dynamic_plug(f'gem_opt_{opt}')
+        if plug:
+            return plug
+
+        data = self.template_data['opts']
+        if 'legacy' in data[opt]:
+            return self.node.get_dynamic_plug(f'gem_opt_{data[opt]["legacy"]}')
+
+    def get_opt(self, opt, default=False):
+        if self.opts_snapshot is not None and not default:
+            return self.get_snapshot_value('opts', opt, self.read_opt)
+        return self.read_opt(opt, default=default)
+
+    def read_opt(self, opt, default=False):
+        data = self.template_data['opts']
+
+        if opt not in data:
+            raise RuntimeError(f'option {opt} not available in module "{self.node.gem_module.get_value()}"')
+
+        v = data[opt]['value']
+
+        # check saved data
+        plug = self.get_opt_plug(opt)
+        if plug and not default:
+            v = plug.get_value()
+
+        # yaml eval
+        if data[opt].get('yaml') and v:
+            v = yaml.load(v, Loader=YamlLoader)
+
+        # enum filter
+        if 'enum' in data[opt]:
+            if isinstance(v, int) and v in data[opt]['enum']:
+                return data[opt]['enum'][v]
+            elif str(v) in data[opt]['enum'].values():
+                return str(v)
+            else:
+                return self.read_opt(opt, default=True)
+
+        return v
+
+    def get_branch_opt(self, opt):
+        # return automatically reversed option
+        v = self.get_opt(opt)
+        if self.do_flip():
+            v = Template.branch_opt(v)
+        return v
+
+    def set_opt(self, opt, v):
+        self.discard_snapshot_value('opts', opt)
+        data = self.template_data['opts']
+
+        if opt not in data:
+            raise RuntimeError(f'"{opt}" option is not available in template "{self.node.gem_module.get_value()}"')
+
+        dv = data[opt]['value']
+
+        # filter
+        if data[opt].get('yaml'):
+            if v:
+                v = yaml.dump(v, default_flow_style=True).replace('...', '').strip('\n')
+
+        enum = data[opt].get('enum')
+        if enum:
+            if not isinstance(v, int):
+                for k in enum:
+                    if enum[k] == str(v):
+                        v = k
+            if not isinstance(dv, int):
+                for k in enum:
+                    if enum[k] == str(dv):
+                        dv = k
+
+        # save opts
+        plug = self.get_opt_plug(opt)
+        if not plug:
+            if v == dv:
+                return False
+            plug = add_plug(self.node, f'gem_opt_{opt}', type(v), default_value=dv)
+
+        if v == plug.get_value():
+            return False
+
+        plug.set_value(v)
+
+    def reset_opt(self, opt):
+        self.discard_snapshot_value('opts', opt)
+        plug = self.get_opt_plug(opt)
+        if plug is None:
+            return
+
+        self.node.remove_dynamic_plug(plug.get_name())
+
+    # navigation -------------------------------------------------------------------------------------------------------
+
+    def check_validity(self):
+        asset_id = Nodes.current_asset
+        if asset_id is None:
+            asset_id = Nodes.get_asset_id(self.node)
+
+        node = Nodes.get_id(self.name, asset=asset_id)
+        check = node == self.node
+        if not check:
+            log.warning(f'/!\\ {self} is not valid! (duplicate ids)')
+        return check
+
+    @staticmethod
+    def get_all_template_nodes():
+        tpls = []
+        for node in ls():
+            if node.get_dynamic_plug('gem_type') and node.gem_type.get_value() == Template.type_name:
+                tpls.append(node)
+        return tpls
+
+    @staticmethod
+    def get_next_unique_name(name, node):
+        Nodes.check_nodes()
+        asset_id = Nodes.get_asset_id(node) if node else ''
+        names = Nodes.nodes[asset_id].dict
+
+        while name in names:
+            head = name.rstrip('0123456789')
+            tail = name[len(head):]
+            if not tail:
+                tail = 1
+            tail = int(tail) + 1
+            name = head + str(tail)
+        return name
+
+    def get_children(self, root=None, children=None):
+        if root is None:
+            root = self.node
+
+        if children is None:
+            children = []
+
+        for child in root.get_children():
+            if child.get_dynamic_plug('gem_type') and child.gem_type.get_value() == Template.type_name:
+                children.append(Template(child))
+            else:
+                self.get_children(child, children)
+
+        return children
+
+    def get_parent(self, root=None):
+        if root is None:
+            root = self.node
+
+        node = root.get_parent()
+        if node:
+            if node.get_dynamic_plug('gem_type') and node.gem_type.get_value() == Template.type_name:
+                return Template(node)
+            else:
+                return self.get_parent(root=node)
+
+        return None
+
+    def get_siblings(self):
+        siblings = []
+
+        for node in self.node.get_parent().get_children():
+            if node.get_dynamic_plug('gem_type') and node.gem_type.get_value() == Template.type_name:
+                siblings.append(Template(node))
+
+        return siblings
+
+    # structures -------------------------------------------------------------------------------------------------------
+
+    def get_template_nodes(self, root=None, nodes=None, hidden=True):
+        if root is None:
+            root = self.root
+        if nodes is None:
+            nodes = [root]
+
+        for child in root.get_children():
+            if child.get_dynamic_plug('gem_type'):
+                # skip other templates and their branches
+                continue
+            if not hidden and child.get_name().startswith('_'):
+                continue
+            nodes.append(child)
+            self.get_template_nodes(child, nodes, hidden=hidden)
+
+        return nodes
+
+    def delete_template_branches(self):
+        roots = Nodes.get_id(f'{self.name}::branch', as_list=True)
+
+        for root in [self.node] + [n for n in roots if n]:
+            for node in [root] + ls(root=root):
+                if node.get_dynamic_plug('gem_type') and node.gem_type.get_value() == 'branch':
+                    node.remove_from_parent()
+
+    def build_template_branches(self):
+        """
+        Duplicate the guides of the branched templates of this hierarchy.
+
+        Templates are processed from the top, the guides of each branch
+        (the original ones and the copies made by the parent templates) are
+        duplicated for the other branch ids. Copied template roots are tagged
+        with their branch combination, as get_branches expects them.
+        """
+        current_asset = Nodes.current_asset
+        Nodes.current_asset = Nodes.get_asset_id(self.node)
+
+        self.delete_template_branches()
+        templates = [self] + self.get_all_children()
+
+        # branch combination of the original guides
+        combos = {}
+        for tpl in templates:
+            parent = tpl.get_parent()
+            combo = list(combos[parent.node][1]) if parent and parent.node in combos else []
+            branch_ids = tpl.get_opt('branches')
+            if branch_ids:
+                combo.append(branch_ids[0])
+            combos[tpl.node] = tpl.name, combo
+
+        for tpl in templates:
+            branch_ids = tpl.get_opt('branches')
+            if not branch_ids or len(branch_ids) < 2:
+                continue
+
+            sources = [node for node, (name, combo) in combos.items() if name == tpl.name]
+            for source in sources:
+                n = len(combos[source][1]) - 1
+
+                for branch_id in branch_ids[1:]:
+                    copies = {}
+                    source.duplicate(nodes=copies)
+
+                    for node, copy in copies.items():
+                        for plug in ('gem_id', 'gem_hook'):
+                            if copy.get_dynamic_plug(plug):
+                                copy.remove_dynamic_plug(plug)
+                        if node not in combos:
+                            continue
+
+                        name, combo = combos[node]
+                        combo = combo[:n] + [branch_id] + combo[n + 1:]
+                        combos[copy] = name, combo
+
+                        key = ('.{}' * len(combo)).format(*combo)
+                        copy.gem_type.set_value('branch')
+                        if not copy.get_dynamic_plug('gem_branch'):
+                            add_plug(copy, 'gem_branch', str)
+                        copy.gem_branch.set_value(key)
+                        Nodes.set_id(copy, f'{name}{key}::branch')
+
+        Nodes.current_asset = current_asset
+
+    # tag system -------------------------------------------------------------------------------------------------------
+
+    def set_id(self, node, tag, template=True):
+        if template:
+            tag = f'{self.name}{self.get_branch_id()}::{tag}'
+        else:
+            tag = f'::{tag}'
+
+        Nodes.set_id(node, tag)
+        return tag
+
+    def set_hook(self, node, hook, tag):
+        tag = self.set_id(hook, tag)
+        plug = node.get_dynamic_plug('gem_hook')
+        if not plug:
+            plug = add_plug(node, 'gem_hook', str)
+        plug.set_value(tag)
+
+    def get_hook(self, node=None, tag=False, plug=None):
+        """Returns associated hook from given template node
+
+        Arguments:
+            node (Node, optional): template node to get hook. If no node is given, it will use template root instead
+            tag (bool, default: False): returns tag name instead
+            plug (str, optional): plug name where hook id is stored, "gem_hook" by default
+
+        Returns:
+            Node: the associated hook node
+            str: tag name of the hook if tag argument is on
+        """
+        if node is None:
+            node = self.root
+        if plug is None:
+            plug = 'gem_hook'
+
+        parent = node.get_parent()
+        if parent is not None and not parent.is_root():
+            gem_hook = parent.get_dynamic_plug(plug)
+            if gem_hook:
+                if tag:
+                    return gem_hook.get_value()
+                hook = Nodes.get_id(gem_hook.get_value())
+                if hook:
+                    return hook
+            return self.get_hook(parent, tag=tag, plug=plug)
+
+        elif node != self.root:
+            if not tag:
+                return node
+
+    def get_rig_hook(self):
+        node = Nodes.get_id('::rig')
+        if not node:
+            node = Node(self.get_first_hook(), 'rig', TRANSFORM)
+            Nodes.set_id(node, '::rig')
+        return node
+
+    def get_bind_hook(self):
+        node = Nodes.get_id('::bind')
+        if not node:
+            node = Node(self.get_first_hook(), 'bind', TRANSFORM)
+            Nodes.set_id(node, '::bind')
+        return node
+
+
+class GenericModule(object):
+    """Null module of the templates implemented for the DCC backends only."""
+
+    def __init__(self, base):
+        self.Template = type('Template', (base,), {})
@@ -0,0 +1,5 @@
+# coding: utf-8
+
+from .scene import *
+
+from .configparser import ConfigParser
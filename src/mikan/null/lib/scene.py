@@ -0,0 +1,396 @@
+# coding: utf-8
+
+"""
+In-memory scene graph of the null backend.
+
+The null backend builds assets without any DCC: nodes are plain Python objects
+organized in a hierarchy, holding named plugs that store values or read them
+from a connected input plug. The API follows the subset of the tangerine kernel
+used by the build pipeline (get_dynamic_plug, get_children, get_full_name...),
+dynamic plugs are also reachable as node attributes (node.gem_id.get_value()).
+
+Usage:
+    with Scene() as root:
+        node = Node(root, 'asset', 'transform')
+        add_plug(node, 'gem_type', str, default_value='asset')
+"""
+
+from mikan.core.utils import ordered_dict
+
+__all__ = [
+    'Scene', 'Node', 'Plug', 'is_plug', 'find_root', 'ls', 'add_plug',
+    'NODE', 'TRANSFORM', 'JOINT', 'GEOMETRY', 'DEFORMER', 'ROOT',
+]
+
+NODE = 'node'
+TRANSFORM = 'transform'
+JOINT = 'joint'
+GEOMETRY = 'geometry'
+DEFORMER = 'deformer'
+ROOT = 'root'
+
+IDENTITY = (1., 0., 0., 0., 0., 1., 0., 0., 0., 0., 1., 0., 0., 0., 0., 1.)
+
+# built-in plugs of each node type
+NODE_PLUGS = {
+    NODE: (),
+    ROOT: (),
+    TRANSFORM: (('transform', IDENTITY), ('world_transform', IDENTITY), ('show', True)),
+    JOINT: (('transform', IDENTITY), ('world_transform', IDENTITY), ('show', True)),
+    GEOMETRY: (('points', ()), ('mesh_in', None), ('show', True)),
+    DEFORMER: (('input', None), ('output', None), ('enable', True)),
+}
+
+
+class Scene(object):
+    """
+    Root of a null scene, entered as a context to be the current scene.
+
+    The scene counts its nodes, Scene.get_node_count is used as the node
+    counter of the build profiler.
+    """
+
+    current = None
+
+    def __init__(self, name='scene'):
+        self.count = 0
+        self.previous = None
+        self.root = Node(None, name, ROOT, scene=self)
+
+    def __enter__(self):
+        self.previous = Scene.current
+        Scene.current = self
+        return self.root
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        Scene.current = self.previous
+        self.previous = None
+
+    def get_node_count(self):
+        return self.count
+
+
+class Plug(object):
+    """
+    Named value of a node, connected plugs read the value of their input.
+    """
+
+    __slots__ = ('node', 'name', 'value', 'input', 'outputs', 'dynamic', 'keyable')
+
+    def __init__(self, node, name, value=None, dynamic=True):
+        self.node = node
+        self.name = name
+        self.value = value
+        self.input = None
+        self.outputs = []
+        self.dynamic = dynamic
+        self.keyable = False
+
+    def __repr__(self):
+        return f'{self.node.get_full_name()}.{self.name}'
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def get_name(self):
+        return self.name
+
+    def get_node(self):
+        return self.node
+
+    def get_value(self):
+        plug = self
+        while plug.input is not None:
+            plug = plug.input
+        return plug.value
+
+    def get_stored_value(self):
+        return self.value
+
+    def set_value(self, value):
+        self.value = value
+
+    def get_input(self):
+        return self.input
+
+    def get_outputs(self):
+        return list(self.outputs)
+
+    def is_connected(self):
+        return self.input is not None
+
+    def connect(self, plug):
+        """Connect the input of this plug from another plug."""
+        if plug is self:
+            raise RuntimeError(f'cannot connect {self} to itself')
+        self.disconnect()
+        self.input = plug
+        plug.outputs.append(self)
+
+    def disconnect(self, restore=False):
+        if self.input is None:
+            return
+        if restore:
+            self.value = self.get_value()
+        self.input.outputs.remove(self)
+        self.input = None
+
+
+class Node(object):
+    """
+    Node of the null scene graph.
+
+    Nodes have a type (see NODE_PLUGS), a parent, ordered children and plugs.
+    Dynamic plugs are added and removed at runtime and are the only ones
+    copied when duplicating nodes.
+    """
+
+    def __init__(self, parent, name, node_type=NODE, scene=None):
+        self.name = name
+        self.type = node_type
+        self.parent = None
+        self.children = []
+        self.plugs = ordered_dict()
+        self.dynamic_plugs = ordered_dict()
+
+        for plug_name, value in NODE_PLUGS[node_type]:
+            self.plugs[plug_name] = Plug(self, plug_name, value, dynamic=False)
+
+        if scene is None:
+            scene = parent.scene if parent is not None else find_root().scene
+            if parent is None:
+                parent = scene.root
+        self.scene = scene
+        scene.count += 1
+
+        if parent is not None:
+            self.parent = parent
+            parent.children.append(self)
+
+    def __repr__(self):
+        return self.get_full_name()
+
+    def __str__(self):
+        return self.name
+
+    def __getattr__(self, name):
+        plugs = self.__dict__.get('dynamic_plugs')
+        if plugs is not None and name in plugs:
+            return plugs[name]
+        plugs = self.__dict__.get('plugs')
+        if plugs is not None and name in plugs:
+            return plugs[name]
+        raise AttributeError(f"node '{self.__dict__.get('name')}' has no plug '{name}'")
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    # hierarchy
+
+    def get_name(self):
+        return self.name
+
+    def rename(self, name):
+        self.name = name
+
+    def get_full_name(self):
+        names = []
+        node = self
+        while node is not None:
+            names.append(node.name)
+            node = node.parent
+        return '/' + '/'.join(names[::-1])
+
+    def get_type(self):
+        return self.type
+
+    def is_dag(self):
+        return self.type in (TRANSFORM, JOINT)
+
+    def is_root(self):
+        return self.type == ROOT
+
+    def get_parent(self):
+        return self.parent
+
+    def has_parent(self):
+        return self.parent is not None
+
+    def get_children(self):
+        return list(self.children)
+
+    def find(self, path):
+        node = self
+        for name in path.strip('/').split('/'):
+            for child in node.children:
+                if child.name == name:
+                    node = child
+                    break
+            else:
+                return
+        return node
+
+    def reparent(self, parent):
+        if self.parent is not None:
+            self.parent.children.remove(self)
+        self.parent = parent
+        parent.children.append(self)
+
+    def iter_descendants(self):
+        stack = self.children[::-1]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(node.children[::-1])
+
+    def remove_from_parent(self):
+        if self.parent is None:
+            return
+
+        removed = [self] + list(self.iter_descendants())
+        for node in removed:
+            for plug in node.get_plugs():
+                plug.disconnect(restore=True)
+                for output in plug.get_outputs():
+                    output.disconnect(restore=True)
+
+        root = self.parent
+        while root.parent is not None:
+            root = root.parent
+
+        self.parent.children.remove(self)
+        self.parent = None
+        if root is self.scene.root:
+            self.scene.count -= len(removed)
+
+    def duplicate(self, parent=None, nodes=None):
+        """
+        Copy the node and its descendants with their dynamic plug values.
+
+        Parameters:
+        - parent: Node, parent of the copy (same parent by default)
+        - nodes: dict, filled with the copy of each duplicated node
+
+        Returns:
+        - Node: the copy
+        """
+        if parent is None:
+            parent = self.parent
+        if nodes is None:
+            nodes = {}
+
+        node = Node(parent, self.name, self.type)
+        nodes[self] = node
+        for name, plug in self.plugs.items():
+            node.plugs[name].value = plug.get_value()
+        for name, plug in self.dynamic_plugs.items():
+            node.add_dynamic_plug(name, plug.get_value())
+
+        for child in self.children:
+            child.duplicate(node, nodes)
+        return node
+
+    # plugs
+
+    def get_plug(self, name):
+        plug = self.dynamic_plugs.get(name)
+        if plug is None:
+            plug = self.plugs.get(name)
+        return plug
+
+    def get_dynamic_plug(self, name):
+        return self.dynamic_plugs.get(name)
+
+    def get_dynamic_plugs(self):
+        return list(self.dynamic_plugs.values())
+
+    def get_plugs(self):
+        return list(self.plugs.values()) + list(self.dynamic_plugs.values())
+
+    def add_dynamic_plug(self, name, value=None):
+        if name in self.plugs or name in self.dynamic_plugs:
+            raise RuntimeError(f'{self}.{name} already exists')
+        plug = Plug(self, name, value)
+        self.dynamic_plugs[name] = plug
+        return plug
+
+    def remove_dynamic_plug(self, name):
+        plug = self.dynamic_plugs.pop(name)
+        plug.disconnect()
+        for output in plug.get_outputs():
+            output.disconnect(restore=True)
+
+
+def is_plug(obj):
+    return isinstance(obj, Plug)
+
+
+def find_root():
+    if Scene.current is None:
+        Scene.current = Scene()
+    return Scene.current.root
+
+
+def ls(root=None, as_dict=False, hidden=False):
+    """
+    List the nodes of the scene, depth first.
+
+    Parameters:
+    - root: Node, list the descendants of this node only (scene root by default)
+    - as_dict: bool, return the nodes by name instead (a list when a name is not unique)
+    - hidden: bool, list __hidden__ nodes and their descendants too
+
+    Returns:
+    - list or dict
+    """
+    if root is None:
+        root = find_root()
+
+    nodes = []
+    stack = root.children[::-1]
+    while stack:
+        node = stack.pop()
+        if not hidden and node.name.startswith('__') and node.name.endswith('__'):
+            continue
+        nodes.append(node)
+        stack.extend(node.children[::-1])
+
+    if as_dict:
+        names = {}
+        for node in nodes:
+            name = node.name
+            if name not in names:
+                names[name] = node
+            elif isinstance(names[name], list):
+                names[name].append(node)
+            else:
+                names[name] = [names[name], node]
+        return names
+
+    return nodes
+
+
+def add_plug(node, plug_name, kernel_class=float, default_value=None, keyable=None, k=None, **kw):
+    """
+    Add a dynamic plug initialized with the default value of its type.
+
+    Extra keyword arguments of the tangerine wrapper (min/max values, enums...)
+    are accepted and ignored.
+    """
+    if node.get_plug(plug_name):
+        raise RuntimeError(plug_name + ' already exists')
+
+    if default_value is None:
+        default_value = {int: 0, float: 0., bool: False, str: ''}.get(kernel_class)
+    elif kernel_class in (int, float, bool, str):
+        default_value = kernel_class(default_value)
+
+    plug = node.add_dynamic_plug(plug_name, default_value)
+    plug.keyable = bool(keyable or k)
+    return plug
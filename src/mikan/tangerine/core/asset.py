@@ -2,16 +2,17 @@
 
 import os
 import re
-import logging
 import traceback
 
 import meta_nodal_py as kl
 
 from mikan.core.ascii import ascii_title
-from mikan.core.utils import re_is_int, ordered_load
 from mikan.core.abstract.monitor import BuildMonitor
+from mikan.core.abstract.node import ResolveCache
+from mikan.core.abstract.scheduler import SchedulerError
 from mikan.core.logger import create_logger, timed_code, get_version
 import mikan.core.abstract.asset as abstract
+import mikan.core.abstract.scheduler as abstract_scheduler
 from mikan.core.prefs import Prefs
 
 from ..lib.cleanup import *
@@ -348,8 +349,8 @@ class Asset(abstract.Asset):
         # patch
         self.run_custom_patch('init')
 
-        # processor
-        with timed_code('make'):
+        # processor (tags resolved by parse_node are memoized for the whole build)
+        with ResolveCache.use(ResolveCache()), timed_code('make'):
 
             # cleanup
             monitor.set_step(monitor.STEP_CLEANUP_RIG)
@@ -430,310 +431,47 @@ class Asset(abstract.Asset):
         monitor.set_step(monitor.STEP_FINISHED)
 
 
-class Scheduler(object):
-    mod_flags = ['mod']
-    dfm_flags = ['deformer']
+class Scheduler(abstract_scheduler.Scheduler):
+    mod_class = Mod
+    deformer_class = Deformer
+    nodes_class = Nodes
+    config_class = ConfigParser
 
-    def __init__(self, roots, modes=None, mod_flags=None, dfm_flags=None, monitor=None):
+    parse_node = staticmethod(parse_node)
+    is_plug = staticmethod(kl.is_plug)
 
+    def __init__(self, roots, modes=None, mod_flags=None, dfm_flags=None, monitor=None):
         Deformer.cache_nodes()
+        super().__init__(roots, modes=modes, mod_flags=mod_flags, dfm_flags=dfm_flags, monitor=monitor)
 
-        self.roots = roots
-        self.stack = []
-
-        if monitor is None:
-            monitor = BuildMonitor()
-        self.monitor = monitor
-
-        # parse hierarchy
-        self.modes = modes
-        if mod_flags is None:
-            mod_flags = Scheduler.mod_flags
-        if dfm_flags is None:
-            dfm_flags = Scheduler.dfm_flags
-
+    def walk(self):
         for root in self.roots:
-            for node in [root] + ls(root=root):
-                helper = Helper(node)
-                if node.get_dynamic_plug('notes') and not helper.disabled(self.modes):
-                    cfg = ConfigParser(node)
-
-                    for flag in mod_flags:
-                        for ini in cfg[flag]:
-
-                            args = self.get_args(ini)
-                            if helper.disabled(self.modes, args['mode']):
-                                continue
-
-                            data = Mod.parse(ini)
-                            if data:
-                                # split block
-                                for cmd in data['commands']:
-
-                                    if 'errors' in cmd:
-                                        monitor.log(
-                                            Mod.STATUS_CANCEL,
-                                            [(logging.ERROR, msg) for msg in cmd['errors']],
-                                            'mod',
-                                            node.get_name(),
-                                            cmd['yml']
-                                        )
-                                        continue
-
-                                    mod_data = {
-                                        'data': {
-                                            'mod': cmd['mod'],
-                                            'data': cmd['data'],
-                                            'node': data['node']
-                                        },
-                                        'class': Mod,
-                                        'source': node,
-                                        'yml': cmd['yml']
-                                    }
-
-                                    mod_data.update(args)
-                                    self.stack.append(mod_data)
-
-                    for flag in dfm_flags:
-                        for ini in cfg[flag]:
-
-                            args = self.get_args(ini)
-                            if helper.disabled(self.modes, args['mode']):
-                                continue
-
-                            data = Deformer.parse(ini)
-                            if data:
-                                dfm_data = {
-                                    'data': data,
-                                    'class': Deformer,
-                                    'source': node,
-                                    'yml': ini.read()
-                                }
-                                dfm_data.update(args)
-                                self.stack.append(dfm_data)
-
-        # first pass reorder
-        stack_mod = []
-        stack_dfm = []
-        stack_mod_dfm = []
-        for cmd in self.stack:
-            if cmd['class'] == Mod:
-                # if '->' in cmd['yml']:
-                #     stack_mod_dfm.append(cmd)
-                # else:
-                stack_mod.append(cmd)
-            else:
-                stack_dfm.append(cmd)
-        self.stack = stack_mod + stack_dfm + stack_mod_dfm
-
-        self.stack = sorted(self.stack, key=lambda x: (x['priority'] * -1))
+            yield root
+            yield from ls(root=root)
 
     @staticmethod
-    def get_args(ini):
-        data = {'priority': 0, 'condition': None}
-        modes = []
-
-        for line in ini.get_lines():
-            if line.startswith('#/') and 'ignore' in line[2:].split():
-                modes.append('ignore')
-
-            elif line.startswith('#!'):
-                for arg in re.findall(r"[\w'^!*~+-]+", line[2:]):
-                    if re_is_int.match(arg):
-                        data['priority'] = int(arg)
-                    else:
-                        modes.append(arg)
-
-            elif line.startswith('#?'):
-                condition = line[2:].strip()
-                if not Scheduler.evaluate_condition(condition, ini.parser.node):
-                    data['condition'] = condition
-
-            elif line.startswith('#$'):
-                line = line[2:].strip()
-                var, sep, plug = line.partition(':')
-                var_plug = Mod.add_var(var.strip(), ini.parser.node)
-
-                plug = parse_node(plug.strip(), silent=True, add_hook=False)
-                if kl.is_plug(plug):
-                    var_plug.set_value(plug.get_value())
-
-        data['mode'] = ';'.join(modes)
-        return data
+    def get_helper(node):
+        return Helper(node)
 
     @staticmethod
-    def uniq(seq):
-        seen = set()
-        seen_add = seen.add
-        return [x for x in seq if x not in seen and not seen_add(x)]
-
-    def run(self, pipeline=False):
-        if len(self.stack) == 0:
-            return
-
-        debug = 'debug' in self.modes
-        halt_on_error = debug or pipeline
-
-        failed_count = 0
-        failed_stack = []
-        while True:
-            if failed_count:
-                log.debug('scheduler: delayed stack')
-
-            for job in self.stack:
-                cls = job['class']
-                data = job['data']
-                source = job['source']
-                source_str = source.get_name()
-
-                self.monitor.current_task = None
-                self.monitor.current_yaml = job['yml']
-
-                if job['condition']:
-                    data.pop('ini', None)  # strip ini repr from deformers
-                    log.warning(f"/!\\ {job['condition']} skip: {cls.__name__}, {data}")
-                    continue
-
-                if cls is Mod:
-                    if not data['node'].has_parent():
-                        continue
-
-                    # check if module exists
-                    cmd = data['mod']
-                    if cmd not in Mod.modules:
-                        msg = f"-- mod '{cmd}' does not exist ({source_str})"
-                        log.error(msg)
-                        if halt_on_error:
-                            raise SchedulerError()
-                        self.monitor.log(Mod.STATUS_CANCEL, [(logging.ERROR, msg)], 'mod', source_str, job['yml'])
-                        continue
-
-                    mod = Mod(cmd, node=data['node'], data=data['data'], source=source)
-                    if mod:
-                        self.monitor.current_task = mod
-                        state = mod.execute(modes=self.modes, source=source_str)
-
-                        if state == Mod.STATUS_DELAY:
-                            job['unresolved'] = mod.unresolved[:]
-                            failed_stack.append(job)
-                            continue
-
-                        self.monitor.log(state, mod.logs, 'mod', source_str, job['yml'])
-                        if state == Mod.STATUS_CRASH and halt_on_error:
-                            raise SchedulerError()
-
-                elif cls is Deformer:
-                    dfm = Deformer(**data)
-                    if 'transform' not in data:
-                        continue
-                    if not dfm:  # hotfix
-                        continue
-
-                    self.monitor.current_task = dfm
-                    state = dfm.bind(modes=self.modes, source=source_str)
-
-                    if state == Deformer.STATUS_DELAY:
-                        job['unresolved'] = dfm.unresolved[:]
-                        failed_stack.append(job)
-                        continue
+    def has_notes(node):
+        return bool(node.get_dynamic_plug('notes'))
 
-                    self.monitor.log(state, dfm.logs, 'deformer', source_str, job['yml'])
-                    if state == Deformer.STATUS_CRASH and halt_on_error:
-                        raise SchedulerError()
-
-            # retry failed stack
-            if len(failed_stack) != failed_count:
-                self.stack = failed_stack
-                failed_count = len(failed_stack)
-                failed_stack = []
-
-            else:
-                for job in failed_stack:
-                    cls = job['class']
-                    data = job['data']
-                    source = job['source']
-                    source_str = source.get_name()
-
-                    if cls is Mod:
-                        cmd = data['mod']
-                        mod = Mod(cmd, node=data['node'], data=data['data'], source=source)
-                        if mod:
-                            mod.log_error(f'-- cancel: {mod}  # source: {source_str}')
-                            mod.log_warning(f'unresolved ids: {job["unresolved"]}')
-                            mod.log_summary()
-                            self.monitor.log(Mod.STATUS_CANCEL, mod.logs, 'mod', source_str, job['yml'])
-
-                    elif cls is Deformer:
-                        dfm = Deformer(**data)
-                        if dfm:
-                            dfm.log_error(f'-- cancel: {dfm}  # source: {source_str}')
-                            dfm.log_warning(f'unresolved ids: {job["unresolved"]}')
-                            dfm.log_summary()
-                            self.monitor.log(Deformer.STATUS_CANCEL, dfm.logs, 'deformer', source_str, job['yml'])
-
-                # stop retry stack when unchanged
-                break
+    @staticmethod
+    def get_node_name(node):
+        return node.get_name()
 
-        self.monitor.current_task = None
-        self.monitor.current_yaml = None
+    @staticmethod
+    def node_exists(node):
+        return node.has_parent()
 
     @staticmethod
-    def evaluate_condition(condition, parser_node):
-        if not condition:
-            return True
+    def read_plug(plug):
+        return plug.get_value()
 
-        # parse condition
-        condition = condition.replace('->', '--')
-        tokens = re.split(r"(==|!=|<=|>=|<|>|&&|\|\|)", condition)
-        tokens = [token.strip().replace('--', '->') for token in tokens if token.strip()]
-
-        # get nodes and plug values
-        for i, e in enumerate(tokens):
-
-            if e.startswith('$'):
-                tokens[i] = Mod.get_var(e[1:], parser_node)
-
-            elif '::' in e or '->' in e:
-                failed = []
-                node = parse_node(e, failed=failed, silent=True)
-                if failed:
-                    return False
-                tokens[i] = node
-                if isinstance(node, list):
-                    tokens[i] = node[0]
-            else:
-                tokens[i] = ordered_load(tokens[i])
-
-            if kl.is_plug(tokens[i]):
-                tokens[i] = tokens[i].get_value()
-
-        # evaluate
-        if len(tokens) == 1:
-            return bool(tokens[0])
-        elif len(tokens) == 2:
-            a, b = tokens
-            return a == b
-        elif len(tokens) == 3 and tokens[1] in ('==', '!=', '<', '<=', '>', '>='):
-            a, op, b = tokens
-            if op == '==':
-                return a == b
-            elif op == '!=':
-                return a != b
-            elif op == '<':
-                return a < b
-            elif op == '<=':
-                return a <= b
-            elif op == '>':
-                return a > b
-            elif op == '>=':
-                return a >= b
-
-        log.warning('/!\\ invalid condition: {}'.format(' '.join(condition)))
-        return True
-
-
-class SchedulerError(Exception):
-    pass
+    @staticmethod
+    def write_plug(plug, value):
+        plug.set_value(value)
 
 
 class SplitPostponer(object):
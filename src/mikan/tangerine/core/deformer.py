@@ -14,9 +14,12 @@ from ..lib.commands import *
 from .node import Nodes, parse_nodes
 
 WeightMap = abstract.WeightMap
+WeightMatrix = abstract.WeightMatrix
+DeltaMap = abstract.DeltaMap
+WeightStore = abstract.WeightStore
 WeightMapInterface = abstract.WeightMapInterface
 
-__all__ = ['Deformer', 'DeformerError', 'WeightMap']
+__all__ = ['Deformer', 'DeformerError', 'WeightMap', 'WeightMatrix', 'DeltaMap', 'WeightStore']
 
 log = create_logger()
 
@@ -96,7 +99,16 @@ class Deformer(abstract.Deformer):
         else:
             raw_data = str(ini)
 
-        data = yaml.load(raw_data, abstract.DeformerLoader)
+        # binary weight data: stores are written by maya only, they are read from the absolute path recorded in the data
+        stores = []
+        if '!weightref' in raw_data and not WeightStore.stack:
+            paths = WeightStore.get_paths(raw_data)
+            if not paths:
+                raise DeformerError('weight data stored without a recorded store path, update the deformer data in maya')
+            stores = [WeightStore.open(path) for path in reversed(paths)]
+
+        with WeightStore.use(*stores):
+            data = yaml.load(raw_data, abstract.DeformerLoader)
         if root:
             data['root'] = root
 
@@ -207,6 +207,7 @@ class Nodes(abstract.Nodes):
             asset = cls.get_asset_id(node)
 
         cls.nodes[asset][tag] = node
+        cls.notify_id(tag)
 
     @staticmethod
     def get_node_id(node, find=None, deformer=False):
@@ -416,6 +417,15 @@ def parse_nodes(data, failed=None, exclude=None, root=None, silent=False):
     return data
 
 
+def node_exists(node):
+    if kl.is_plug(node):
+        node = node.get_node()
+    if hasattr(node, 'has_parent'):
+        return node.has_parent()
+    return True
+
+
+@abstract.ResolveCache.memoize(exists=node_exists)
 def parse_node(tag, failed=None, root=None, silent=False, add_hook=True):
     from .deformer import Deformer
 
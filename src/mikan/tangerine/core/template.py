@@ -125,27 +125,28 @@ class Template(abstract.Template):
         pass
 
     def build(self, modes=None):
-        isolate = False
-        if self.get_opt('isolate_skin'):
-            isolate = True
+        with self.snapshot_opts():
+            isolate = False
+            if self.get_opt('isolate_skin'):
+                isolate = True
 
-        for self.branches, self.root in self.get_branches():
-            log.debug(f'-- build: {repr(self)} {self.branches}')
+            for self.branches, self.root in self.get_branches():
+                log.debug(f'-- build: {repr(self)} {self.branches}')
 
-            if not self.root:
-                log.warning('/!\\ no template root, skip for this branch')
-                continue
+                if not self.root:
+                    log.warning('/!\\ no template root, skip for this branch')
+                    continue
 
-            # get valid hook
-            self.hook = self.get_hook()
-            if not self.hook:
-                log.warning('/!\\ no hook, skip build for this branch')
-                continue
+                # get valid hook
+                self.hook = self.get_hook()
+                if not self.hook:
+                    log.warning('/!\\ no hook, skip build for this branch')
+                    continue
 
-            self.build_rig()
-            self.build_shapes()
-            if isolate:
-                self.build_isolate_skin()
+                self.build_rig()
+                self.build_shapes()
+                if isolate:
+                    self.build_isolate_skin()
 
     @staticmethod
     def get_from_node(node):
@@ -178,6 +179,11 @@ class Template(abstract.Template):
         return tpl
 
     def get_name(self, name):
+        if self.opts_snapshot is not None:
+            return self.get_snapshot_value('names', name, self.read_name)
+        return self.read_name(name)
+
+    def read_name(self, name):
         data = self.template_data.get('names', {})
 
         if name not in data:
@@ -192,6 +198,7 @@ class Template(abstract.Template):
         return data[name]
 
     def set_name(self, name, v):
+        self.discard_snapshot_value('names', name)
         data = self.template_data.get('names', {})
 
         if name not in data:
@@ -230,6 +237,11 @@ class Template(abstract.Template):
                 return plug
 
     def get_opt(self, opt, default=False):
+        if self.opts_snapshot is not None and not default:
+            return self.get_snapshot_value('opts', opt, self.read_opt)
+        return self.read_opt(opt, default=default)
+
+    def read_opt(self, opt, default=False):
         data = self.template_data['opts']
 
         if opt not in data:
@@ -253,7 +265,7 @@ class Template(abstract.Template):
             elif str(v) in data[opt]['enum'].values():
                 return str(v)
             else:
-                return self.get_opt(opt, default=True)
+                return self.read_opt(opt, default=True)
 
         return v
 
@@ -265,6 +277,7 @@ class Template(abstract.Template):
         return v
 
     def set_opt(self, opt, v):
+        self.discard_snapshot_value('opts', opt)
         data = self.template_data['opts']
 
         if opt not in data:
@@ -321,6 +334,7 @@ class Template(abstract.Template):
         plug.set_value(v)
 
     def reset_opt(self, opt):
+        self.discard_snapshot_value('opts', opt)
         plug = self.get_opt_plug(opt)
         if plug is None:
             return
@@ -1,6 +1,7 @@
 # coding: utf-8
 
 import math
+from collections import OrderedDict
 
 import meta_nodal_py as kl
 from meta_nodal_py.Imath import V3f, M44f, Euler
@@ -10,6 +11,7 @@ from mikan.vendor.geomdl.fitting import approximate_curve
 from mikan.vendor.geomdl.utilities import generate_knot_vector
 from mikan.vendor.geomdl.operations import split_curve, length_curve
 from mikan.core.abstract.deformer import WeightMap
+from mikan.core.lib.nurbs import HAS_NUMPY, NurbsCurve
 
 from mikan.tangerine.lib.commands import copy_transform
 
@@ -157,6 +159,11 @@ def get_curve_length(curve, u=None):
     cps = [(cp[0], cp[1], cp[2]) for cp in cps]
     knots = spline.get_knots()
 
+    if HAS_NUMPY:
+        cv = get_nurbs_curve(cps, degree, knots)
+        start, stop = cv.domain
+        return float(cv.get_length(start + u * (stop - start)))
+
     cv = BSpline.Curve()
     cv.degree = degree
     cv.ctrlpts = cps
@@ -174,6 +181,21 @@ def get_curve_length(curve, u=None):
     return d
 
 
+_nurbs_curves = OrderedDict()
+
+
+def get_nurbs_curve(cps, degree, knots):
+    # arc length tables are kept for the last evaluated curves
+    key = (degree, tuple(cps), tuple(knots))
+    cv = _nurbs_curves.pop(key, None)
+    if cv is None:
+        cv = NurbsCurve(cps, degree, knots)
+        while len(_nurbs_curves) >= 64:
+            _nurbs_curves.popitem(last=False)
+    _nurbs_curves[key] = cv
+    return cv
+
+
 def rebuild_curve(curve, degree=3, num_cvs=None, legacy=0):
     if not isinstance(curve, kl.SplineCurve):
         raise RuntimeError('not a curve')
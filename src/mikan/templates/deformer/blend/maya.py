@@ -10,7 +10,7 @@ import mikan.maya.cmdx as mx
 
 import mikan.maya.core as mk
 from mikan.core import re_is_int, create_logger, timed_code
-from mikan.maya.core.deformer import WeightMap
+from mikan.maya.core.deformer import WeightMap, DeltaMap
 
 has_numpy = False
 try:
@@ -590,7 +590,7 @@ class Deformer(mk.Deformer):
 
                 return {1.0: WeightMap(wm_flat)}
 
-        # serialize point positions
+        # keep moved vertices only
         maps = {}
 
         for k, d in delta.items():
@@ -600,29 +600,22 @@ class Deformer(mk.Deformer):
             cpts, pts = d
 
             if has_numpy:
-                wm_matrix = np.zeros((count, 3), dtype=float)
-                wm_matrix[cpts] = pts
-
-                if np.any(wm_matrix):
-                    maps[k] = WeightMap(wm_matrix.flatten())
-
+                cpts = np.asarray(cpts, dtype=np.int64)
+                pts = np.asarray(pts, dtype=np.float64).reshape(-1, 3)
+                moved = pts.any(axis=1) & (cpts < count)
+                cpts = cpts[moved]
+                pts = pts[moved]
             else:
-                wm = [0.0] * count * 3
-                has_data = False
-
+                _cpts = []
+                _pts = []
                 for cp, pt in zip(cpts, pts):
-                    idx = cp * 3
-                    x, y, z = pt
-
-                    wm[idx] = x
-                    wm[idx + 1] = y
-                    wm[idx + 2] = z
-
-                    if not has_data and (x or y or z):
-                        has_data = True
+                    if cp < count and any(pt):
+                        _cpts.append(cp)
+                        _pts.append(tuple(pt))
+                cpts, pts = _cpts, _pts
 
-                if has_data:
-                    maps[k] = WeightMap(wm)
+            if len(cpts):
+                maps[k] = DeltaMap(count, cpts, pts)
 
         if maps:
             return maps
@@ -650,12 +643,23 @@ class Deformer(mk.Deformer):
                 log.debug('{} has input geometry at target index {}'.format(bs, index))
                 continue
             else:
-                cpts, points = zip(*delta[k])
-                points = [om.MPoint(p) for p in points]
-
-                if reference:
-                    for i in range(len(points)):
-                        points[i] -= ref_points[i]
+                cpts, points = delta[k]
+
+                if has_numpy:
+                    cpts = np.asarray(cpts, dtype=np.int64)
+                    points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+                    if reference:
+                        flat_stream = itertools.chain.from_iterable(ref_points)
+                        ref = np.fromiter(flat_stream, dtype=np.float64).reshape(-1, 4)[:, :3]
+                        points = points - ref[cpts]
+                    cpts = cpts.tolist()
+                    points = om.MPointArray(points.tolist())
+                else:
+                    cpts = list(cpts)
+                    points = [om.MPoint(p) for p in points]
+                    if reference:
+                        points = [p - om.MVector(ref_points[cp]) for cp, p in zip(cpts, points)]
+                    points = om.MPointArray(points)
 
                 id_cpts_fn = om.MFnSingleIndexedComponent()
                 id_cpts_data = id_cpts_fn.create(om.MFn.kMeshVertComponent)
@@ -678,19 +682,14 @@ class Deformer(mk.Deformer):
         delta = {}
 
         for k in maps:
-            cpts = []
-            points = []
-
             wm = maps[k]
-            count = int(len(wm.weights) / 3)
-            for i in range(count):
-                pt = wm.weights[i * 3:i * 3 + 3]
-                if any(pt):
-                    cpts.append(i)
-                    points.append(pt)
-
-            if cpts:
-                delta[k] = zip(cpts, points)
+            if isinstance(wm, DeltaMap):
+                cpts, points = wm.get_sparse_points()
+            else:
+                cpts, points = DeltaMap.get_flat_sparse_points(wm.read_weights())
+
+            if len(cpts):
+                delta[k] = (cpts, points)
 
         if delta:
             Deformer.set_delta(bs, index, delta, reference=reference)
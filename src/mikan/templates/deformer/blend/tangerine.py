@@ -246,8 +246,7 @@ class Deformer(mk.Deformer):
             if spline.get_wrap():
                 degree = spline.get_degree()
                 m = self.maps[-1]
-                for i in range(degree):
-                    m.weights.append(m.weights[i])
+                m.extend(m.weights[:degree])
 
         # target weightmaps
         for t, weights in self.data.get('maps', {}).items():
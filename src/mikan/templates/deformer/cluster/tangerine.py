@@ -133,8 +133,7 @@ class Deformer(mk.Deformer):
             if spline.get_wrap():
                 degree = spline.get_degree()
                 m = self.data['maps'][0]
-                for i in range(degree):
-                    m.weights.append(m.weights[i])
+                m.extend(m.weights[:degree])
 
         # write
         vtx_indices = []
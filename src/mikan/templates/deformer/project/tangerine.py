@@ -91,8 +91,7 @@ class Deformer(mk.Deformer):
             spline = self.node.spline_in.get_value()
             if spline.get_wrap():
                 degree = spline.get_degree()
-                for i in range(degree):
-                    wm.weights.append(wm.weights[i])
+                wm.extend(wm.weights[:degree])
 
         # write
         vtx_indices = []
@@ -18,6 +18,7 @@ from mikan.core.logger import create_logger
 has_numpy = False
 try:
     import numpy as np
+    from mikan.core.lib.symmetry import get_symmetry_arrays
 
     has_numpy = True
 except ImportError:
@@ -50,15 +51,7 @@ class Deformer(mk.Deformer):
         cps = self.get_components_mobject(self.geometry)
         weights_marray, num_inf = fn.getWeights(self.geometry.dag_path(), cps)
 
-        if has_numpy:
-            weights = np.fromiter(weights_marray, dtype=np.float32)
-            num_verts = len(weights) // num_inf
-            weights = weights.reshape((num_verts, num_inf)).T
-        else:
-            weights_raw = tuple(weights_marray)
-            weights = [weights_raw[i::num_inf] for i in range(num_inf)]
-
-        if len(infs) != len(weights) and len(infs) != len(inf_ids):
+        if len(infs) != num_inf and len(infs) != len(inf_ids):
             log.error('/!\\ failed! skin influences mismatch')
             return
 
@@ -71,9 +64,17 @@ class Deformer(mk.Deformer):
         bpms = self.data['bind_pose']
         bpm_roots = self.data['bind_pose_root']
 
-        for i, inf, wmap in zip(inf_ids, infs, weights):
-            maps[i] = mk.WeightMap(wmap)
+        # store weights as sparse matrix (vertex major, like the api)
+        if has_numpy:
+            weights = np.fromiter(weights_marray, dtype=np.float64, count=len(weights_marray))
+            weights = weights.reshape((-1, num_inf))[:, :len(inf_ids)]
+            self.set_weight_matrix(mk.WeightMatrix.from_flat(inf_ids[:num_inf], weights.ravel()))
+        else:
+            weights_raw = tuple(weights_marray)
+            for i, _i in enumerate(inf_ids):
+                maps[_i] = mk.WeightMap(weights_raw[i::num_inf])
 
+        for i, inf in zip(inf_ids, infs):
             self.data['infs'][i] = self.get_node_id(inf, '::skin.')
 
             bpm = self.node['bindPreMatrix'][i].input()
@@ -371,16 +372,20 @@ class Deformer(mk.Deformer):
 
         # check size
         n = self.get_size()
-        if maps and len(maps[0].weights) != n:
+        if maps and len(maps[0]) != n:
             self.log_warning('cannot write {}, bad map length'.format(self.node))
             return
 
         # fix normalization?
         if self.data['normalize'] == 1:
             self.normalize()
+            ids, maps = self.get_indexed_maps()
 
         # write maps
-        if has_numpy and isinstance(maps[0].weights, np.ndarray):
+        matrix = self.get_weight_matrix()
+        if matrix is not None:
+            weights = om.MDoubleArray(matrix.to_flat())
+        elif has_numpy and isinstance(maps[0].weights, np.ndarray):
             w = np.stack([m.weights for m in maps], axis=1).astype(np.float64, copy=False)
             weights = om.MDoubleArray(w.ravel())
         else:
@@ -542,17 +547,7 @@ class Deformer(mk.Deformer):
                     id_nosym.remove(i)
                     id_nosym.remove(rev_id)
 
-        # mirror paired maps weights per vertex
-        for m0, m1 in map_sym:
-            wm0 = m0.weights
-            wm1 = m1.weights
-
-            for table in (1, 0, -1):
-                for i in sym[table].keys():
-                    j = sym[table][i]
-                    wm1[j] = wm0[i]
-
-        # mirror unpaired maps weights per vertex
+        # exclude unpaired maps
         for i in id_nosym[:]:
             for pattern in exclude_list:
                 for name in self.data['infs'][i].split():
@@ -564,49 +559,63 @@ class Deformer(mk.Deformer):
                     continue  # only executed if the inner loop did NOT break
                 break  # only executed if the inner loop DID break
 
-        for i in id_nosym[:]:
-            wm = self.data['maps'][i].weights
-            for i in sym[direction].keys():
-                j = sym[direction][i]
-                wm[j] = wm[i]
-
-        # custom normalization
-        idx = {}
-        for i, x in enumerate(ids):
-            idx[x] = i
-
-        weights = zip(*[wm.weights for wm in maps])
-
-        for vtx, w in enumerate(weights):
-            # weight sum
-            s = 0
-            for wi in w:
-                s += wi
-            s = round(s, self.decimals)
-
-            # weight sum of paired maps
-            sp = 0
-            for i0, i1 in id_sym:
-                sp += w[idx[i0]] + w[idx[i1]]
-            sp = round(sp, self.decimals)
-
-            # weight sum of unpaired maps
-            su = s - sp
-
-            # normalize weights
-            sn = 1 - su
-            if sp > 0 and sn > 0:
-                # normalize weights of paired maps
+        if has_numpy:
+            self.smart_mirror_matrix(sym, id_sym, id_nosym, direction=direction)
+        else:
+            # mirror paired maps weights per vertex
+            for m0, m1 in map_sym:
+                wm0 = m0.weights
+                wm1 = m1.weights
+
+                for table in (1, 0, -1):
+                    for i in sym[table].keys():
+                        j = sym[table][i]
+                        wm1[j] = wm0[i]
+
+            # mirror unpaired maps weights per vertex
+            for i in id_nosym[:]:
+                wm = self.data['maps'][i].weights
+                for i in sym[direction].keys():
+                    j = sym[direction][i]
+                    wm[j] = wm[i]
+
+            # custom normalization
+            idx = {}
+            for i, x in enumerate(ids):
+                idx[x] = i
+
+            weights = zip(*[wm.weights for wm in maps])
+
+            for vtx, w in enumerate(weights):
+                # weight sum
+                s = 0
+                for wi in w:
+                    s += wi
+                s = round(s, self.decimals)
+
+                # weight sum of paired maps
+                sp = 0
                 for i0, i1 in id_sym:
-                    self.data['maps'][i0].weights[vtx] *= sn / sp
-                    self.data['maps'][i1].weights[vtx] *= sn / sp
-            else:
-                # normalize weights of unpaired maps
-                if s > 0:
-                    for i, w in enumerate(w):
-                        self.data['maps'][ids[i]].weights[vtx] *= 1 / s
+                    sp += w[idx[i0]] + w[idx[i1]]
+                sp = round(sp, self.decimals)
+
+                # weight sum of unpaired maps
+                su = s - sp
+
+                # normalize weights
+                sn = 1 - su
+                if sp > 0 and sn > 0:
+                    # normalize weights of paired maps
+                    for i0, i1 in id_sym:
+                        self.data['maps'][i0].weights[vtx] *= sn / sp
+                        self.data['maps'][i1].weights[vtx] *= sn / sp
                 else:
-                    mc.warning('skipped vertex {0} (no weights to mirror)'.format(vtx))
+                    # normalize weights of unpaired maps
+                    if s > 0:
+                        for i, w in enumerate(w):
+                            self.data['maps'][ids[i]].weights[vtx] *= 1 / s
+                    else:
+                        mc.warning('skipped vertex {0} (no weights to mirror)'.format(vtx))
 
         # mirror dq?
         if 'dq' in self.data['maps']:
@@ -617,6 +626,91 @@ class Deformer(mk.Deformer):
                     j = sym[table][i]
                     weights[j] = weights[i]
 
+    def smart_mirror_matrix(self, sym, id_sym, id_nosym, direction=1):
+        ids, maps = self.get_indexed_maps()
+
+        matrix = self.get_weight_matrix()
+        if matrix is None:
+            matrix = mk.WeightMatrix.from_maps(dict(zip(ids, maps)))
+
+        size = matrix.size
+        columns = dict((k, c) for c, k in enumerate(matrix.keys))
+        rows = matrix.get_rows()
+        indices = matrix.indices
+        values = matrix.values
+
+        def get_sources(tables):
+            # source vertex of each mirrored vertex, later tables win like sequential assignments
+            sources = np.full(size, -1, dtype=np.int64)
+            for table in tables:
+                src, dst = get_symmetry_arrays(sym, table)
+                sources[dst] = src
+            dst = np.flatnonzero(sources >= 0)
+            src = sources[dst]
+            order = np.argsort(src, kind='stable')
+            return sources >= 0, src[order], dst[order]
+
+        def mirror(targets, tables):
+            # entries of the source columns copied to the mirrored vertices of the target columns
+            mirrored, src, dst = get_sources(tables)
+            target = np.full(len(matrix.keys), -1, dtype=np.int64)
+            for c0, c1 in targets:
+                target[c0] = c1
+
+            pos = np.flatnonzero(target[indices] >= 0)
+            lo = np.searchsorted(src, rows[pos], side='left')
+            n = np.searchsorted(src, rows[pos], side='right') - lo
+            pos = np.repeat(pos, n)
+            offset = np.arange(len(pos)) - np.repeat(np.cumsum(n) - n, n)
+            new_rows = dst[np.repeat(lo, n) + offset]
+
+            replaced = np.zeros(len(matrix.keys), dtype=bool)
+            replaced[[c1 for c0, c1 in targets]] = True
+            return replaced[indices] & mirrored[rows], (new_rows, target[indices[pos]], values[pos])
+
+        # mirror paired maps weights per vertex
+        drop = np.zeros(matrix.nnz, dtype=bool)
+        coo = []
+        if id_sym:
+            _drop, entries = mirror([(columns[i0], columns[i1]) for i0, i1 in id_sym], (1, 0, -1))
+            drop |= _drop
+            coo.append(entries)
+
+        # mirror unpaired maps weights per vertex
+        if id_nosym:
+            _drop, entries = mirror([(columns[i], columns[i]) for i in id_nosym], (direction,))
+            drop |= _drop
+            coo.append(entries)
+
+        keep = ~drop
+        rows = np.concatenate([rows[keep]] + [e[0] for e in coo])
+        indices = np.concatenate([indices[keep]] + [e[1] for e in coo])
+        values = np.concatenate([values[keep]] + [e[2] for e in coo]).astype(np.float64)
+
+        # custom normalization
+        s = np.round(np.bincount(rows, weights=values, minlength=size), self.decimals)
+
+        paired = np.zeros(len(matrix.keys), dtype=bool)
+        for i0, i1 in id_sym:
+            paired[[columns[i0], columns[i1]]] = True
+        is_paired = paired[indices]
+        sp = np.round(np.bincount(rows[is_paired], weights=values[is_paired], minlength=size), self.decimals)
+
+        # normalize weights of paired maps
+        sn = 1 - (s - sp)
+        mask_paired = (sp > 0) & (sn > 0)
+        k = np.where(mask_paired, sn / np.where(sp > 0, sp, 1), 1)
+        values[is_paired] *= k[rows[is_paired]]
+
+        # normalize weights of unpaired maps
+        mask_all = ~mask_paired & (s > 0)
+        values /= np.where(mask_all, s, 1)[rows]
+
+        for vtx in np.flatnonzero(~mask_paired & (s <= 0)):
+            mc.warning('skipped vertex {0} (no weights to mirror)'.format(vtx))
+
+        self.set_weight_matrix(mk.WeightMatrix.from_coo(matrix.keys, size, rows, indices, values))
+
     def merge(self, new_weights):
         if not isinstance(new_weights, mk.Deformer):
             raise RuntimeError('invalid argument: not a deformer')
@@ -664,6 +758,10 @@ class Deformer(mk.Deformer):
                 inf_unshared.append(i)
                 log.debug('unshared: {}'.format(self.data['infs'][i]))
 
+        if has_numpy:
+            self.merge_matrix(new_weights, inf_shared, inf_unshared, inf_locked)
+            return
+
         # compute locked/drop/replace
         for vtx in range(s0):
 
@@ -771,6 +869,78 @@ class Deformer(mk.Deformer):
                     if inf_shared[i] in inf_locked:
                         maps[inf_shared[i]].weights[vtx] *= k_shared_locked
 
+    def merge_matrix(self, new_weights, inf_shared, inf_unshared, inf_locked):
+        ids, maps = self.get_indexed_maps()
+        new_maps = new_weights.data['maps']
+
+        matrix = self.get_weight_matrix()
+        if matrix is None:
+            matrix = mk.WeightMatrix.from_maps(dict(zip(ids, maps)))
+
+        w = matrix.to_dense()
+        rows = dict((k, r) for r, k in enumerate(matrix.keys))
+        size = w.shape[1]
+
+        # influence groups
+        shared = [rows[i] for i in inf_shared.values() if i not in inf_locked]
+        shared_locked = [rows[i] for i in inf_shared.values() if i in inf_locked]
+        unshared = [rows[i] for i in inf_unshared if i not in inf_locked]
+        unshared_locked = [rows[i] for i in inf_unshared if i in inf_locked]
+
+        # replace shared weights, locked weights can only grow
+        for _i, i in iteritems(inf_shared):
+            w_new = np.asarray(new_maps[_i].read_weights(), dtype=np.float64)
+            if i in inf_locked:
+                np.maximum(w[rows[i]], w_new, out=w[rows[i]])
+            else:
+                w[rows[i]] = w_new
+
+        def weight_sum(group):
+            if not group:
+                return np.zeros(size)
+            return w[group].sum(axis=0)
+
+        w_unshared = weight_sum(unshared)
+        w_unshared_locked = weight_sum(unshared_locked)
+        w_shared = weight_sum(shared)
+        w_shared_locked = weight_sum(shared_locked)
+
+        w_delta = w_unshared + w_unshared_locked + w_shared + w_shared_locked - 1
+
+        def ratio(a, b):
+            return np.divide(a, b, out=np.ones(size), where=b != 0)
+
+        k_groups = []
+
+        # step by step drop
+        drop = w_delta > 0
+        delta = np.where(drop, w_delta, 0)
+        for w_group in (w_unshared, w_shared, w_shared_locked):
+            k = np.where(w_group > delta, 1 - ratio(delta, w_group), 0)
+            k = np.where(delta > 0, k, 1)
+            delta = np.where(w_group > delta, 0, delta - w_group)
+            k_groups.append(k)
+
+        # if still delta, unshared locked are > 1 (and it's awkward)
+        k_groups.append(np.where(delta > 0, 1 - ratio(delta, w_unshared_locked), 1))
+
+        # step by step fill
+        delta = np.where(drop, 0, w_delta)
+        for n, w_group in enumerate((w_unshared, w_shared, w_shared_locked, w_unshared_locked)):
+            fill = (delta < 0) & (w_group > 0)
+            if n == 0:
+                fill = w_group > 0
+            k = np.where(fill, ratio(w_group - delta, w_group), 1)
+            k_groups[n] = np.where(drop, k_groups[n], k)
+            delta = np.where(fill, 0, delta)
+
+        # update weights
+        for group, k in zip((unshared, shared, shared_locked, unshared_locked), k_groups):
+            if group:
+                w[group] *= k
+
+        self.set_weight_matrix(mk.WeightMatrix.from_dense(matrix.keys, w))
+
     def merge_replace(self, new_weights, vertices=[]):
         if not isinstance(new_weights, mk.Deformer):
             raise RuntimeError('invalid argument: not a deformer')
@@ -783,30 +953,50 @@ class Deformer(mk.Deformer):
         maps = self.data['maps']
         in_maps = new_weights.data['maps']
 
-        new_infs_info = []
-        for i, in_inf in in_infs.items():
+        inf_ids = {}
+        for i, inf in iteritems(infs):
+            inf_ids.setdefault(inf, i)
+
+        size = len(in_maps[0])
+        next_id = max(list(infs) + [-1]) + 1
 
-            if all([in_maps[i].weights[vtx] == 0.0 for vtx in vertices]):
+        new_ids = {}
+        for i, in_inf in in_infs.items():
+            weights = in_maps[i].read_weights()
+            if all([weights[vtx] == 0.0 for vtx in vertices]):
                 continue
 
-            info = {'name': in_inf}
-            if in_inf in infs:
-                info['id'] = list(infs.values()).index(in_inf)
-                info['is_in_old'] = True
+            if in_inf in inf_ids:
+                new_ids[i] = inf_ids[in_inf]
             else:
-                info['id'] = len(infs)
-                info['is_in_old'] = False
-                infs[info['id']] = in_inf
-                maps[info['id']] = WeightMap([0.0] * len(in_maps[0].weights))
+                new_ids[i] = next_id
+                inf_ids[in_inf] = next_id
+                infs[next_id] = in_inf
+                maps[next_id] = WeightMap([0.0] * size)
+                next_id += 1
+
+        # update weights
+        if has_numpy:
+            ids, _maps = self.get_indexed_maps()
+            matrix = self.get_weight_matrix()
+            if matrix is None:
+                matrix = mk.WeightMatrix.from_maps(dict(zip(ids, _maps)))
+
+            w = matrix.to_dense()
+            rows = dict((k, r) for r, k in enumerate(matrix.keys))
+            vertices = np.asarray(vertices, dtype=np.int64)
 
-            new_infs_info.append(info)
+            w[[rows[int(i)] for i in infs if int(i) in rows], vertices[:, None]] = 0
+            for i, i_old in iteritems(new_ids):
+                in_weights = np.asarray(in_maps[i].read_weights(), dtype=np.float64)
+                w[rows[i_old], vertices] = in_weights[vertices]
 
-            # update infs
+            self.set_weight_matrix(mk.WeightMatrix.from_dense(matrix.keys, w))
+            return
 
         for vtx in vertices:
             for i, inf in infs.items():
                 maps[int(i)].weights[vtx] = 0
 
-            for i, in_inf in in_infs.items():
-                i_old = new_infs_info[int(i)]['id']
-                maps[i_old].weights[vtx] = in_maps[int(i)].weights[vtx]
+            for i, i_old in iteritems(new_ids):
+                maps[i_old].weights[vtx] = in_maps[i].weights[vtx]
@@ -186,8 +186,7 @@ class Deformer(mk.Deformer):
                 degree = spline.get_degree()
                 size += degree
                 for m in maps:
-                    for i in range(degree):
-                        m.weights.append(m.weights[i])
+                    m.extend(m.weights[:degree])
 
         # write
         offset = 0
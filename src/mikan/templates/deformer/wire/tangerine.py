@@ -98,8 +98,7 @@ class Deformer(mk.Deformer):
             if spline.get_wrap():
                 degree = spline.get_degree()
                 m = self.maps[0]
-                for i in range(degree):
-                    m.weights.append(m.weights[i])
+                m.extend(m.weights[:degree])
 
         # write
         vtx_indices = []